@@ -32,6 +32,7 @@ Examples:
 import os
 import sys
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -390,17 +391,20 @@ class NeuAIBridge:
         try:
             responses = []
             for msg in messages:
+                started = time.perf_counter()
                 response = self.assistant.chat(msg)
                 responses.append({
                     "input": msg,
-                    "response": response
+                    "response": response,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1)
                 })
 
             return {
                 "success": True,
                 "command": "multi_chat",
                 "turns": len(responses),
-                "conversation": responses
+                "conversation": responses,
+                "connections": self.assistant.client.connection_stats()
             }
         except Exception as e:
             return {
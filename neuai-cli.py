@@ -15,20 +15,39 @@ Environment Variables Required:
 
 Optional:
     AZURE_OPENAI_API_VERSION - API version (default: 2024-02-15-preview)
+    NEUAI_STORAGE - Storage engine for memories and context: json (default)
+                    or sqlite
+    NEUAI_CONTEXT_TOKENS - Prompt token budget per request (default: 8000)
 """
 
 import os
+import re
 import sys
 import json
+import math
 import uuid
 import time
+import sqlite3
+import threading
+import bisect
+import hashlib
+import heapq
+import random
+import select
+import functools
+import http.client
+import email.utils
+import urllib.parse
 import urllib.request
 import urllib.error
 import ssl
 import getpass
-from datetime import datetime
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Tuple, Iterable, Iterator, Callable
 from abc import ABC, abstractmethod
 
 
@@ -77,6 +96,13 @@ class Config:
 
         self.memory_file = self.data_dir / "memories.json"
         self.context_file = self.data_dir / "context.json"
+        self.database_file = self.data_dir / "neuai.db"
+
+        # Storage engine for memories and context: "json" or "sqlite"
+        self.storage = os.environ.get("NEUAI_STORAGE", "json").strip().lower()
+
+        # Prompt token budget per request (system prompt, memories and history)
+        self.context_tokens = int(os.environ.get("NEUAI_CONTEXT_TOKENS", "8000"))
 
         # Create directories
         self.global_dir.mkdir(parents=True, exist_ok=True)
@@ -388,22 +414,289 @@ Need Azure OpenAI? Visit:
 # Azure OpenAI Client (No External Dependencies)
 # =============================================================================
 
+def iter_sse_events(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """Parse server-sent events from response lines into JSON chunks.
+
+    Comment lines (keep-alives) are skipped, multi-line data fields are
+    joined, and the stream ends at a "data: [DONE]" event.
+    """
+    data_lines: List[str] = []
+    for raw in lines:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data_lines:
+                payload = "\n".join(data_lines)
+                data_lines = []
+                if payload == "[DONE]":
+                    return
+                yield json.loads(payload)
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+    if data_lines and "\n".join(data_lines) != "[DONE]":
+        yield json.loads("\n".join(data_lines))
+
+
+class StreamedCompletion:
+    """Assembles streamed chat completion chunks into one completion.
+
+    Content deltas are concatenated, tool calls are rebuilt from their
+    per-index deltas (id and name first, then argument fragments), and the
+    stream is timed for time-to-first-token and tokens per second.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.content: List[str] = []
+        self.tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.finish_reason: Optional[str] = None
+        self.usage: Optional[Dict[str, int]] = None
+        # Deltas carrying content or tool calls; one token each when usage isn't sent
+        self.deltas = 0
+
+    def add(self, chunk: Dict[str, Any]) -> str:
+        """Add a chunk, returning the content text it carried."""
+        if "error" in chunk:
+            error = chunk["error"]
+            raise ValueError(f"API Error: {error.get('message', error) if isinstance(error, dict) else error}")
+        if chunk.get("usage"):
+            self.usage = chunk["usage"]
+
+        text = ""
+        # Azure sends a first chunk with no choices (prompt filter results)
+        for choice in chunk.get("choices") or []:
+            if choice.get("index", 0) != 0:
+                continue
+            delta = choice.get("delta") or {}
+            produced = False
+            if delta.get("content"):
+                self.content.append(delta["content"])
+                text += delta["content"]
+                produced = True
+            for call in delta.get("tool_calls") or []:
+                slot = self.tool_calls.setdefault(call.get("index", 0), {
+                    "id": "", "type": "function", "function": {"name": "", "arguments": ""}
+                })
+                if call.get("id"):
+                    slot["id"] = call["id"]
+                if call.get("type"):
+                    slot["type"] = call["type"]
+                function = call.get("function") or {}
+                slot["function"]["name"] += function.get("name") or ""
+                slot["function"]["arguments"] += function.get("arguments") or ""
+                produced = True
+            if produced:
+                self.deltas += 1
+                if self.first_token_at is None:
+                    self.first_token_at = time.perf_counter()
+            if choice.get("finish_reason"):
+                self.finish_reason = choice["finish_reason"]
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        """Timing of the stream: ttft, duration and generation seconds, tokens, tokens/s."""
+        finished = self.finished_at or time.perf_counter()
+        tokens = (self.usage or {}).get("completion_tokens", self.deltas)
+        generation = finished - self.first_token_at if self.first_token_at is not None else 0.0
+        return {
+            "ttft": self.first_token_at - self.started if self.first_token_at is not None else None,
+            "duration": finished - self.started,
+            "generation": generation,
+            "tokens": tokens,
+            "tokens_per_second": tokens / generation if generation > 0 else None
+        }
+
+    def result(self) -> Dict[str, Any]:
+        """The completion in the non-streaming response shape, plus stream_stats."""
+        message: Dict[str, Any] = {"role": "assistant", "content": "".join(self.content)}
+        if self.tool_calls:
+            message["tool_calls"] = [self.tool_calls[i] for i in sorted(self.tool_calls)]
+        response = {
+            "choices": [{"index": 0, "message": message, "finish_reason": self.finish_reason}],
+            "stream_stats": self.stats()
+        }
+        if self.usage:
+            response["usage"] = self.usage
+        return response
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections pooled per endpoint.
+
+    Reusing a connection skips the TCP and TLS handshakes a fresh one
+    pays. Idle connections are evicted after idle_timeout seconds (before
+    the server is likely to drop them), and a connection that failed or
+    that the server will close is not returned to the pool, so the next
+    request reconnects.
+    """
+
+    def __init__(self, max_idle_per_host: int = 4, idle_timeout: float = 50.0, timeout: float = 60.0):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        # (scheme, host, port) -> [(released at, connection)], most recently released last
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[float, http.client.HTTPConnection]]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self.opened = 0
+        self.reused = 0
+        self.evicted = 0
+        self.dropped = 0
+
+    @staticmethod
+    def key_for(url: str) -> Tuple[str, str, int]:
+        """Pool key of a URL: (scheme, host, port)."""
+        parts = urllib.parse.urlsplit(url)
+        return parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80)
+
+    def acquire(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection for key, or a new one.
+
+        Returns:
+            Tuple of (connection, was_reused)
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            if idle and now - idle[-1][0] < self.idle_timeout:
+                self.reused += 1
+                return idle.pop()[1], True
+            # The newest idle connection is too old, so all of them are
+            for _, conn in idle:
+                conn.close()
+            self.evicted += len(idle)
+            idle.clear()
+            self.opened += 1
+        return self._connect(key), False
+
+    def release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection, reusable: bool = True):
+        """Return a connection after its response was read, or close it if not reusable."""
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append((time.monotonic(), conn))
+                    return
+        else:
+            with self._lock:
+                self.dropped += 1
+        conn.close()
+
+    @staticmethod
+    def is_dropped(conn: http.client.HTTPConnection) -> bool:
+        """Whether the server closed an idle connection (it reads as ready before any request)."""
+        if conn.sock is None:
+            return False  # Not connected yet: request() connects it
+        try:
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def warm(self, url: str):
+        """Open a connection to url in the background, ready for the first request."""
+        key = self.key_for(url)
+
+        def connect():
+            conn = self._connect(key)
+            try:
+                conn.connect()
+            except OSError:
+                conn.close()
+                return
+            with self._lock:
+                self.opened += 1
+            self.release(key, conn)
+
+        threading.Thread(target=connect, daemon=True).start()
+
+    def _connect(self, key: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        """A new (unconnected) connection, tunnelled through the environment's proxy if any."""
+        scheme, host, port = key
+        target_host, target_port = host, port
+        proxy = urllib.request.getproxies().get(scheme)
+        if proxy and not urllib.request.proxy_bypass(host):
+            proxy_parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            host, port = proxy_parts.hostname, proxy_parts.port or 80
+        else:
+            proxy = None
+
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        if proxy:
+            conn.set_tunnel(target_host, target_port)
+        return conn
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            for idle in self._idle.values():
+                for _, conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Connections opened, reused, evicted and dropped, and the reuse rate."""
+        with self._lock:
+            acquired = self.opened + self.reused
+            return {
+                "connections_opened": self.opened,
+                "connections_reused": self.reused,
+                "connections_evicted": self.evicted,
+                "connections_dropped": self.dropped,
+                "idle_connections": sum(len(idle) for idle in self._idle.values()),
+                "reuse_rate": round(self.reused / acquired, 3) if acquired else 0.0
+            }
+
+
+# Connections are shared by every client in the process
+_connection_pool = ConnectionPool()
+
+
 class AzureOpenAIClient:
-    """Minimal Azure OpenAI client using only standard library."""
+    """Minimal Azure OpenAI client using only standard library.
 
-    def __init__(self, config: Config):
+    Requests go over keep-alive connections from a ConnectionPool, so a
+    multi-turn session (and the two requests of a tool-using turn) pays
+    the TCP and TLS handshakes once.
+    """
+
+    # Errors sending on a reused connection that mean the server had already
+    # closed it; the request is resent at once, without counting as a retry.
+    # Any other error, or one after the request went out (e.g. a timeout
+    # waiting for the response), is retried with backoff
+    STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+    def __init__(self, config: Config, pool: Optional[ConnectionPool] = None):
         self.config = config
+        self.pool = pool or _connection_pool
         self.max_retries = 3
         self.retry_delay = 1
-
-    def chat_completion(
+        # Longest wait between retries, whatever Retry-After asks for
+        self.max_retry_wait = 60
+        self.requests = 0
+        self.retries = 0
+        self.reconnects = 0
+        # Seconds from sending a request to its response headers
+        self.latencies: deque = deque(maxlen=500)
+
+    def _build_request(
         self,
         messages: List[Dict[str, str]],
-        temperature: float = 0.7,
-        max_tokens: int = 2000,
-        tools: Optional[List[Dict]] = None
-    ) -> Dict[str, Any]:
-        """Make a chat completion request to Azure OpenAI."""
+        temperature: float,
+        max_tokens: int,
+        tools: Optional[List[Dict]],
+        stream: bool = False
+    ) -> Tuple[str, Dict[str, str], bytes]:
+        """Build the URL, headers and body of a chat completion request."""
 
         if not self.config.is_configured():
             raise ValueError("Azure OpenAI not configured. Run with --configure first.")
@@ -435,50 +728,705 @@ class AzureOpenAIClient:
             payload["tools"] = tools
             payload["tool_choice"] = "auto"
 
+        if stream:
+            payload["stream"] = True
+
         headers = {
             "Content-Type": "application/json",
             "api-key": self.config.api_key
         }
 
-        data = json.dumps(payload).encode('utf-8')
+        return url, headers, json.dumps(payload).encode('utf-8')
 
-        # Create SSL context
-        ctx = ssl.create_default_context()
+    @contextmanager
+    def _post(self, url: str, headers: Dict[str, str], data: bytes) -> Iterator[http.client.HTTPResponse]:
+        """POST a request on a pooled connection, retrying rate limits and connection errors.
 
-        for attempt in range(self.max_retries):
+        Yields:
+            The 200 response. Once the caller is done, whatever it left
+            unread is drained and the connection goes back to the pool; if
+            the caller raised, the connection is closed instead.
+        """
+        key = self.pool.key_for(url)
+        parts = urllib.parse.urlsplit(url)
+        path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        conn, response = self._send(key, path, headers, data)
+        try:
+            yield response
+            response.read()
+        except BaseException:
+            self.pool.release(key, conn, reusable=False)
+            raise
+        self.pool.release(key, conn, reusable=not response.will_close)
+
+    def _send(
+        self,
+        key: Tuple[str, str, int],
+        path: str,
+        headers: Dict[str, str],
+        data: bytes
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send until a 200 response, returning it with its connection."""
+        attempt = 0
+        while True:
+            conn, reused = self.pool.acquire(key)
+            if reused and self.pool.is_dropped(conn):
+                # The server closed the idle connection: reconnect right away
+                self.pool.release(key, conn, reusable=False)
+                self.reconnects += 1
+                continue
+            started = time.perf_counter()
+            sent = False
             try:
-                req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-                with urllib.request.urlopen(req, context=ctx, timeout=60) as response:
-                    result = json.loads(response.read().decode('utf-8'))
-                    return result
-
-            except urllib.error.HTTPError as e:
-                error_body = e.read().decode('utf-8') if e.fp else str(e)
-                if e.code == 429:  # Rate limited
-                    wait_time = self.retry_delay * (2 ** attempt)
-                    print(f"\n⏳ Rate limited. Waiting {wait_time}s...")
-                    time.sleep(wait_time)
+                conn.request("POST", path, body=data, headers=headers)
+                sent = True
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                self.pool.release(key, conn, reusable=False)
+                if reused and not sent and isinstance(e, self.STALE_CONNECTION_ERRORS):
+                    # Closed as the request went out, so the server never got it
+                    self.reconnects += 1
                     continue
-                elif e.code == 401:
-                    raise ValueError("Authentication failed. Check your API key.")
-                elif e.code == 404:
-                    raise ValueError(f"Deployment '{self.config.deployment}' not found.")
-                else:
-                    raise ValueError(f"API Error {e.code}: {error_body}")
+                attempt += 1
+                if attempt >= self.max_retries:
+                    raise ValueError(f"Connection error: {e}")
+                self.retries += 1
+                time.sleep(self._backoff(attempt - 1))
+                continue
+
+            self.requests += 1
+            self.latencies.append(time.perf_counter() - started)
+            if response.status == 200:
+                return conn, response
+
+            error_body = response.read().decode('utf-8', errors='replace')
+            self.pool.release(key, conn, reusable=not response.will_close)
+            if response.status == 429:  # Rate limited
+                attempt += 1
+                if attempt >= self.max_retries:
+                    raise ValueError("Max retries exceeded")
+                self.retries += 1
+                wait_time = self._retry_after(response)
+                if wait_time is None:
+                    wait_time = self._backoff(attempt - 1)
+                print(f"\n⏳ Rate limited. Waiting {wait_time:.1f}s...")
+                time.sleep(wait_time)
+                continue
+            elif response.status == 401:
+                raise ValueError("Authentication failed. Check your API key.")
+            elif response.status == 404:
+                raise ValueError(f"Deployment '{self.config.deployment}' not found.")
+            else:
+                raise ValueError(f"API Error {response.status}: {error_body}")
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter, so clients rate limited together retry apart."""
+        delay = min(self.max_retry_wait, self.retry_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _retry_after(self, response: http.client.HTTPResponse) -> Optional[float]:
+        """Seconds the server asked us to wait (retry-after-ms or Retry-After), capped."""
+        try:
+            milliseconds = response.getheader("retry-after-ms")
+            if milliseconds:
+                return min(self.max_retry_wait, max(0.0, float(milliseconds) / 1000))
+            value = response.getheader("Retry-After")
+            if not value:
+                return None
+            try:
+                seconds = float(value)
+            except ValueError:
+                retry_at = email.utils.parsedate_to_datetime(value)
+                seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            return min(self.max_retry_wait, max(0.0, seconds))
+        except (TypeError, ValueError):
+            return None
+
+    def warm(self):
+        """Open a connection to the endpoint in the background, ahead of the first request."""
+        if self.config.is_configured():
+            self.pool.warm(self.config.endpoint)
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Request, retry and connection reuse counts, and request latency in ms."""
+        stats = {
+            "requests": self.requests,
+            "retries": self.retries,
+            "reconnects": self.reconnects,
+            **self.pool.stats()
+        }
+        latencies = sorted(self.latencies)
+        if latencies:
+            stats["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+                "max": round(latencies[-1] * 1000, 1)
+            }
+        return stats
+
+    def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        tools: Optional[List[Dict]] = None
+    ) -> Dict[str, Any]:
+        """Make a chat completion request to Azure OpenAI."""
+        url, headers, data = self._build_request(messages, temperature, max_tokens, tools)
+        with self._post(url, headers, data) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        tools: Optional[List[Dict]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """Make a streaming (SSE) chat completion request to Azure OpenAI.
+
+        Args:
+            messages: Conversation messages
+            temperature: Sampling temperature
+            max_tokens: Maximum completion tokens
+            tools: Tool definitions
+            on_token: Called with each piece of content as it arrives
+
+        Returns:
+            The assembled completion in the same shape as chat_completion,
+            plus "stream_stats" (ttft, duration, generation, tokens,
+            tokens_per_second)
+        """
+        url, headers, data = self._build_request(messages, temperature, max_tokens, tools, stream=True)
+        completion = StreamedCompletion()
+        with self._post(url, headers, data) as response:
+            try:
+                for chunk in iter_sse_events(response):
+                    text = completion.add(chunk)
+                    if text and on_token:
+                        on_token(text)
+            except (OSError, json.JSONDecodeError) as e:
+                raise ValueError(f"Stream interrupted: {e}")
+        completion.finished_at = time.perf_counter()
+        return completion.result()
+
+
+# =============================================================================
+# Tool Call Deadlines
+# =============================================================================
+
+_deadlines = threading.local()
+
+
+@contextmanager
+def tool_deadline(deadline: float):
+    """Give the current thread's work until deadline (time.monotonic()) to finish."""
+    previous = getattr(_deadlines, "deadline", None)
+    _deadlines.deadline = deadline
+    try:
+        yield
+    finally:
+        _deadlines.deadline = previous
+
+
+def time_left() -> Optional[float]:
+    """Seconds before the current thread's deadline, or None when it has none.
+
+    Blocking waits in tool code (locks, database busy waits, sockets) are
+    bounded by this, so a call that runs out of time fails and frees its
+    worker instead of waiting on.
+    """
+    deadline = getattr(_deadlines, "deadline", None)
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _acquire(lock, what: str):
+    """Acquire lock, waiting no longer than the current deadline."""
+    remaining = time_left()
+    if not lock.acquire(timeout=-1 if remaining is None else remaining):
+        raise TimeoutError(f"{what} is busy; gave up at the tool call deadline")
+
+
+# =============================================================================
+# Storage (SQLite)
+# =============================================================================
+
+class SQLiteStore:
+    """Transactional SQLite storage for memories and conversation context.
+
+    An alternative to the JSON files: each store, link, unlink and message
+    is one small transaction touching only its own rows, instead of a
+    rewrite of the whole file. The database runs in WAL mode, so the CLI
+    and the agent bridge can share it across processes: readers never
+    block, and writers wait on a busy timeout rather than failing. Every
+    memory write bumps a version in meta, so a process can tell when
+    another one changed memories and reload them.
+
+    Tables:
+        memories(id, timestamp, updated, data)  - data is the memory as JSON,
+                                                  without subjects/updated
+        subjects(id, name, created)
+        memory_subjects(memory_id, subject_id)  - links, in link order
+        messages(id, data)                      - conversation context
+        meta(key, value)                        - memory version, migration markers
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memories (
+            id TEXT PRIMARY KEY,
+            timestamp TEXT NOT NULL DEFAULT '',
+            updated TEXT NOT NULL DEFAULT '',
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS memories_timestamp ON memories (timestamp);
+        CREATE TABLE IF NOT EXISTS subjects (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            created TEXT NOT NULL DEFAULT ''
+        );
+        CREATE TABLE IF NOT EXISTS memory_subjects (
+            memory_id TEXT NOT NULL REFERENCES memories (id) ON DELETE CASCADE,
+            subject_id TEXT NOT NULL REFERENCES subjects (id) ON DELETE CASCADE,
+            UNIQUE (subject_id, memory_id)
+        );
+        CREATE INDEX IF NOT EXISTS memory_subjects_memory ON memory_subjects (memory_id);
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        # Autocommit mode; writes open their own BEGIN IMMEDIATE transactions
+        self.conn = sqlite3.connect(str(self.path), timeout=timeout,
+                                    isolation_level=None, check_same_thread=False)
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self.conn.close()
+
+    def transaction(self, write: bool = True):
+        """Context manager for a transaction yielding a cursor.
+
+        Write transactions take the database write lock up front (BEGIN
+        IMMEDIATE), so they wait on the busy timeout instead of failing
+        to upgrade a read lock; read transactions see one snapshot.
+        """
+        return _Transaction(self, write)
+
+    def memory_version(self) -> int:
+        """Count of memory writes committed to the database by any process."""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'memory_version'").fetchone()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    def _bump_memory_version(cur: sqlite3.Cursor) -> int:
+        """Bump the memory version inside a write transaction, returning the previous one."""
+        row = cur.execute("SELECT value FROM meta WHERE key = 'memory_version'").fetchone()
+        previous = int(row[0]) if row else 0
+        cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('memory_version', ?)",
+                    (str(previous + 1),))
+        return previous
+
+    # -- Migration -------------------------------------------------------------
+
+    def migrate_once(self, key: str, load: Callable[[], Any], write: Callable[[sqlite3.Cursor, Any], None]) -> bool:
+        """Import legacy data once per database.
+
+        The marker is checked inside the write transaction, so processes
+        starting together import it exactly once.
+
+        Returns:
+            True if this call performed the import
+        """
+        with self.transaction() as cur:
+            if cur.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return False
+            data = load()
+            if data:
+                write(cur, data)
+                self._bump_memory_version(cur)
+            cur.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, datetime.now().isoformat()))
+            return True
+
+    # -- Memories --------------------------------------------------------------
+
+    @staticmethod
+    def _memory_row(mem: Dict) -> Tuple[str, str, str, str]:
+        body = {k: v for k, v in mem.items() if k not in ("subjects", "updated")}
+        return (mem["id"], mem.get("timestamp", ""), mem.get("updated", ""), json.dumps(body))
+
+    @staticmethod
+    def _subject_row(subject_id: str, subject: Dict) -> Tuple[str, str, str]:
+        return (subject_id, subject.get("name", subject_id), subject.get("created", ""))
+
+    def write_memory_data(self, cur: sqlite3.Cursor, data: Dict[str, Any]):
+        """Insert a whole normalized memory structure (for migration)."""
+        cur.executemany("INSERT OR IGNORE INTO subjects (id, name, created) VALUES (?, ?, ?)",
+                        [self._subject_row(sid, subj) for sid, subj in data.get("subjects", {}).items()])
+        for memory_id, mem in data.get("memories", {}).items():
+            mem.setdefault("id", memory_id)
+            cur.execute("INSERT OR REPLACE INTO memories (id, timestamp, updated, data) VALUES (?, ?, ?, ?)",
+                        self._memory_row(mem))
+            for subject_id in mem.get("subjects", []):
+                cur.execute("INSERT OR IGNORE INTO subjects (id, name, created) VALUES (?, ?, ?)",
+                            (subject_id, subject_id, datetime.now().isoformat()))
+                cur.execute("INSERT OR IGNORE INTO memory_subjects (memory_id, subject_id) VALUES (?, ?)",
+                            (memory_id, subject_id))
+
+    def load_memory_data(self) -> Tuple[Dict[str, Any], int]:
+        """Read every memory and subject into the normalized dict structure.
+
+        Returns:
+            Tuple of (data, memory version it reflects)
+        """
+        with self.transaction(write=False) as cur:
+            version_row = cur.execute("SELECT value FROM meta WHERE key = 'memory_version'").fetchone()
+            memories: Dict[str, Dict] = {}
+            for memory_id, updated, body in cur.execute(
+                    "SELECT id, updated, data FROM memories ORDER BY rowid").fetchall():
+                mem = json.loads(body)
+                mem["id"] = memory_id
+                mem["subjects"] = []
+                mem["updated"] = updated
+                memories[memory_id] = mem
+            subjects = {
+                subject_id: {"name": name, "memory_ids": [], "created": created}
+                for subject_id, name, created in cur.execute(
+                    "SELECT id, name, created FROM subjects ORDER BY rowid").fetchall()
+            }
+            for memory_id, subject_id in cur.execute(
+                    "SELECT memory_id, subject_id FROM memory_subjects ORDER BY rowid").fetchall():
+                memories[memory_id]["subjects"].append(subject_id)
+                subjects[subject_id]["memory_ids"].append(memory_id)
+        version = int(version_row[0]) if version_row else 0
+        return {"memories": memories, "subjects": subjects}, version
+
+    def insert_memory(self, mem: Dict, subjects: Dict[str, Dict]) -> int:
+        """Store a new memory and link it to its subjects.
+
+        Memory writes return the memory version from before the write.
+        """
+        with self.transaction() as cur:
+            cur.execute("INSERT INTO memories (id, timestamp, updated, data) VALUES (?, ?, ?, ?)",
+                        self._memory_row(mem))
+            for subject_id in mem["subjects"]:
+                cur.execute("INSERT OR IGNORE INTO subjects (id, name, created) VALUES (?, ?, ?)",
+                            self._subject_row(subject_id, subjects[subject_id]))
+                cur.execute("INSERT OR IGNORE INTO memory_subjects (memory_id, subject_id) VALUES (?, ?)",
+                            (mem["id"], subject_id))
+            return self._bump_memory_version(cur)
+
+    def link_memory(self, mem: Dict, subject_id: str, subject: Dict) -> int:
+        """Link an existing memory to a subject."""
+        with self.transaction() as cur:
+            cur.execute("INSERT OR IGNORE INTO subjects (id, name, created) VALUES (?, ?, ?)",
+                        self._subject_row(subject_id, subject))
+            cur.execute("INSERT OR IGNORE INTO memory_subjects (memory_id, subject_id) VALUES (?, ?)",
+                        (mem["id"], subject_id))
+            cur.execute("UPDATE memories SET updated = ? WHERE id = ?", (mem.get("updated", ""), mem["id"]))
+            return self._bump_memory_version(cur)
+
+    def unlink_memory(self, mem: Dict, subject_id: str) -> int:
+        """Unlink a memory from a subject, deleting it once no subject remains."""
+        with self.transaction() as cur:
+            self._unlink(cur, [mem["id"]], subject_id, mem.get("updated", ""))
+            return self._bump_memory_version(cur)
+
+    def clear_subject(self, subject_id: str, updated: str) -> int:
+        """Unlink every memory from a subject in one transaction."""
+        with self.transaction() as cur:
+            memory_ids = [row[0] for row in cur.execute(
+                "SELECT memory_id FROM memory_subjects WHERE subject_id = ?", (subject_id,)).fetchall()]
+            self._unlink(cur, memory_ids, subject_id, updated)
+            return self._bump_memory_version(cur)
+
+    @staticmethod
+    def _unlink(cur: sqlite3.Cursor, memory_ids: List[str], subject_id: str, updated: str):
+        for memory_id in memory_ids:
+            cur.execute("DELETE FROM memory_subjects WHERE memory_id = ? AND subject_id = ?",
+                        (memory_id, subject_id))
+            if cur.execute("SELECT 1 FROM memory_subjects WHERE memory_id = ? LIMIT 1",
+                           (memory_id,)).fetchone():
+                cur.execute("UPDATE memories SET updated = ? WHERE id = ?", (updated, memory_id))
+            else:
+                cur.execute("DELETE FROM memories WHERE id = ?", (memory_id,))
+
+    # -- Conversation context --------------------------------------------------
+
+    def write_messages(self, cur: sqlite3.Cursor, messages: List[Dict]):
+        """Append messages inside an open transaction (for migration)."""
+        cur.executemany("INSERT INTO messages (data) VALUES (?)", [(json.dumps(m),) for m in messages])
+
+    def recent_messages(self, limit: int) -> List[Dict]:
+        """The newest messages, oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM messages ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(body) for (body,) in reversed(rows)]
+
+    def append_message(self, message: Dict, keep: int):
+        """Append a message and drop all but the newest keep messages."""
+        with self.transaction() as cur:
+            cur.execute("INSERT INTO messages (data) VALUES (?)", (json.dumps(message),))
+            # The primary key index makes this a range delete of at most a few rows
+            cur.execute("DELETE FROM messages WHERE id <= ?", (cur.lastrowid - keep,))
+
+    def clear_messages(self):
+        """Delete the conversation context."""
+        with self.transaction() as cur:
+            cur.execute("DELETE FROM messages")
+
+
+class _Transaction:
+    """BEGIN ... COMMIT/ROLLBACK around a SQLiteStore cursor."""
+
+    def __init__(self, store: SQLiteStore, write: bool):
+        self.store = store
+        self.write = write
+
+    def __enter__(self) -> sqlite3.Cursor:
+        _acquire(self.store.lock, "The memory database")
+        try:
+            self.cursor = self.store.conn.cursor()
+            remaining = time_left()
+            if remaining is None or not self.write:
+                self.cursor.execute("BEGIN IMMEDIATE" if self.write else "BEGIN")
+            else:
+                # Wait for other processes' writes only until the deadline
+                self.cursor.execute(f"PRAGMA busy_timeout = {int(remaining * 1000)}")
+                try:
+                    self.cursor.execute("BEGIN IMMEDIATE")
+                finally:
+                    self.cursor.execute(f"PRAGMA busy_timeout = {int(self.store.timeout * 1000)}")
+        except BaseException:
+            self.store.lock.release()
+            raise
+        return self.cursor
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.cursor.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.store.lock.release()
+        return False
 
-            except urllib.error.URLError as e:
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
-                    continue
-                raise ValueError(f"Connection error: {e.reason}")
 
-        raise ValueError("Max retries exceeded")
+_stores: Dict[str, SQLiteStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(config: Config) -> Optional[SQLiteStore]:
+    """The process-wide SQLiteStore for config's data directory, or None for JSON storage."""
+    if getattr(config, "storage", "json") != "sqlite":
+        return None
+    path = Path(getattr(config, "database_file", config.data_dir / "neuai.db"))
+    with _stores_lock:
+        store = _stores.get(str(path))
+        if store is None:
+            store = _stores[str(path)] = SQLiteStore(path)
+        return store
 
 
 # =============================================================================
 # Memory System (Normalized Multi-Subject Storage)
 # =============================================================================
 
+def _synchronized(method):
+    """Run a method under the instance's lock (agents may call it from several threads).
+
+    Within a tool call the lock is waited for only until the call's
+    deadline, so calls queued behind a stuck one time out rather than pile up.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        _acquire(self._lock, type(self).__name__)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._lock.release()
+    return wrapper
+
+
+class MemoryIndex:
+    """In-memory indexes over stored memories for fast recall.
+
+    - Inverted index of content tokens, ranked with BM25
+    - Content hash -> memory IDs, for O(1) duplicate detection
+    - Per-subject (timestamp, memory_id) lists kept sorted, for newest-first
+      recall without sorting every memory
+
+    The indexes are rebuilt when memories are loaded and then updated
+    incrementally as memories are stored, linked, unlinked and deleted.
+    """
+
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+    # BM25 term frequency saturation and length normalization
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}   # token -> {memory_id: term frequency}
+        self.lengths: Dict[str, int] = {}               # memory_id -> token count
+        self.total_length = 0
+        self.by_content: Dict[str, List[str]] = {}      # content hash -> memory_ids, oldest first
+        self.by_subject: Dict[str, List[Tuple[str, str]]] = {}
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Split text into lowercase alphanumeric tokens."""
+        return cls.TOKEN_PATTERN.findall(text.lower())
+
+    @staticmethod
+    def content_key(content: str) -> str:
+        """Hash of content as compared for duplicates (case and edge whitespace ignored)."""
+        return hashlib.sha1(content.lower().strip().encode("utf-8")).hexdigest()
+
+    def build(self, memories: Dict[str, Dict]):
+        """Rebuild every index from the memories dict."""
+        self.__init__()
+        for memory_id, mem in memories.items():
+            mem.setdefault("id", memory_id)
+            self._add_content(mem)
+            for subj in mem.get("subjects", []):
+                self.by_subject.setdefault(subj, []).append((mem.get("timestamp", ""), mem["id"]))
+        for entries in self.by_subject.values():
+            entries.sort()
+
+    def _add_content(self, mem: Dict):
+        memory_id = mem["id"]
+        content = mem.get("content", "")
+        tokens = self.tokenize(content)
+        for token in tokens:
+            postings = self.postings.setdefault(token, {})
+            postings[memory_id] = postings.get(memory_id, 0) + 1
+        self.lengths[memory_id] = len(tokens)
+        self.total_length += len(tokens)
+        self.by_content.setdefault(self.content_key(content), []).append(memory_id)
+
+    def add(self, mem: Dict):
+        """Index a newly stored memory."""
+        self._add_content(mem)
+        for subj in mem.get("subjects", []):
+            self.link(mem, subj)
+
+    def remove(self, mem: Dict):
+        """Drop a deleted memory from every index."""
+        memory_id = mem["id"]
+        content = mem.get("content", "")
+        for token in set(self.tokenize(content)):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(memory_id, None)
+                if not postings:
+                    del self.postings[token]
+        self.total_length -= self.lengths.pop(memory_id, 0)
+        key = self.content_key(content)
+        ids = self.by_content.get(key, [])
+        if memory_id in ids:
+            ids.remove(memory_id)
+            if not ids:
+                del self.by_content[key]
+        for subj in mem.get("subjects", []):
+            self.unlink(mem, subj)
+
+    def link(self, mem: Dict, subject_id: str):
+        """Add a memory to a subject's timestamp-ordered list."""
+        entries = self.by_subject.setdefault(subject_id, [])
+        entry = (mem.get("timestamp", ""), mem["id"])
+        pos = bisect.bisect_left(entries, entry)
+        if pos == len(entries) or entries[pos] != entry:
+            entries.insert(pos, entry)
+
+    def unlink(self, mem: Dict, subject_id: str):
+        """Remove a memory from a subject's timestamp-ordered list."""
+        entries = self.by_subject.get(subject_id, [])
+        entry = (mem.get("timestamp", ""), mem["id"])
+        pos = bisect.bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            del entries[pos]
+
+    def find_duplicate(self, content: str) -> Optional[str]:
+        """ID of the oldest memory with the same content, if any."""
+        ids = self.by_content.get(self.content_key(content))
+        return ids[0] if ids else None
+
+    def subject_size(self, subjects: Iterable[str]) -> int:
+        """Memory links across subjects (shared memories counted per subject)."""
+        return sum(len(self.by_subject.get(subj, ())) for subj in subjects)
+
+    def newest(self, subjects: List[str]) -> Iterator[str]:
+        """Memory IDs linked to any of the subjects, newest first, without repeats."""
+        lists = [self.by_subject.get(subj, []) for subj in subjects]
+        if len(lists) == 1:
+            yield from (memory_id for _, memory_id in reversed(lists[0]))
+            return
+        seen = set()
+        for _, memory_id in heapq.merge(*(reversed(entries) for entries in lists), reverse=True):
+            if memory_id not in seen:
+                seen.add(memory_id)
+                yield memory_id
+
+    def score(self, terms: Iterable[str], subjects: List[str], memories: Dict[str, Dict]) -> Dict[str, float]:
+        """BM25 scores of the subjects' memories that contain any of the terms.
+
+        Each term's postings are scanned, or the subjects' memories are when
+        those are fewer, so a common term within a small subject stays cheap.
+        """
+        count = len(self.lengths)
+        if not count:
+            return {}
+        average_length = (self.total_length / count) or 1
+        lengths = self.lengths
+        base = self.K1 * (1 - self.B)
+        scale = self.K1 * self.B / average_length
+        subject_set = set(subjects)
+        subject_size = self.subject_size(subjects)
+        subject_ids: Optional[List[str]] = None
+        scores: Dict[str, float] = {}
+
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            frequency = len(postings)
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            weight = idf * (self.K1 + 1)
+            if subject_size < frequency:
+                if subject_ids is None:
+                    subject_ids = list(self.newest(subjects))
+                matches = [(mid, postings[mid]) for mid in subject_ids if mid in postings]
+            else:
+                matches = [(mid, tf) for mid, tf in postings.items()
+                           if not subject_set.isdisjoint(memories[mid].get("subjects", ()))]
+            for memory_id, tf in matches:
+                norm = base + scale * lengths[memory_id]
+                scores[memory_id] = scores.get(memory_id, 0.0) + weight * tf / (tf + norm)
+        return scores
+
+    def partial_matches(self, terms: Iterable[str]) -> List[str]:
+        """Indexed tokens that contain one of the terms without being equal to it."""
+        terms = set(terms)
+        return [token for token in self.postings
+                if token not in terms and any(term in token for term in terms)]
+
+
 class MemoryManager:
     """Manages persistent memory storage with multi-subject support.
 
@@ -497,6 +1445,15 @@ class MemoryManager:
             "subject-id": {name, memory_ids: [...]}
         }
     }
+
+    A MemoryIndex over the data serves keyword recall, duplicate detection
+    and newest-first listing without scanning every memory.
+
+    With NEUAI_STORAGE=sqlite the data is persisted in a SQLiteStore, one
+    transaction per change, and reloaded when another process changes it;
+    otherwise the whole structure is saved to memory_file on each change.
+
+    Public methods hold a lock, since tool calls run concurrently.
     """
 
     def __init__(self, config: Config, subject_id: Optional[str] = None):
@@ -504,6 +1461,10 @@ class MemoryManager:
         # Primary subject (formerly user_guid) - now called subject for universality
         self.subject_id = subject_id or config.user_guid
         self.data: Dict[str, Any] = {"memories": {}, "subjects": {}}
+        self.index = MemoryIndex()
+        self._lock = threading.RLock()
+        self.store = open_store(config)
+        self._memory_version = 0
         self._load_memories()
         self._ensure_subject_exists(self.subject_id)
 
@@ -513,21 +1474,70 @@ class MemoryManager:
         return self.subject_id
 
     def _load_memories(self):
-        """Load memories from file, handling legacy format migration."""
-        if self.config.memory_file.exists():
-            try:
-                with open(self.config.memory_file, 'r') as f:
-                    raw_data = json.load(f)
+        """Load memories from the store or file, handling legacy format migration."""
+        if self.store is not None:
+            # One-shot import of the JSON file into a new database
+            self.store.migrate_once(
+                "memories_json", lambda: self._read_memory_file()[0], self.store.write_memory_data
+            )
+            self._reload_from_store()
+            return
 
-                # Check if this is the new normalized format
-                if "memories" in raw_data and "subjects" in raw_data:
-                    self.data = raw_data
-                else:
-                    # Migrate from legacy format (subject_id -> [memories])
-                    self.data = self._migrate_legacy_format(raw_data)
-                    self._save_memories()  # Save migrated data
-            except Exception:
-                self.data = {"memories": {}, "subjects": {}}
+        data, migrated = self._read_memory_file()
+        if data is not None:
+            self.data = data
+            if migrated:
+                self._save_memories()  # Save migrated data
+        self.index.build(self.data["memories"])
+
+    def _read_memory_file(self) -> Tuple[Optional[Dict], bool]:
+        """Read memory_file in the normalized format.
+
+        Returns:
+            Tuple of (data or None if missing or unreadable, was_legacy_format)
+        """
+        if not self.config.memory_file.exists():
+            return None, False
+        try:
+            with open(self.config.memory_file, 'r') as f:
+                raw_data = json.load(f)
+
+            # Check if this is the new normalized format
+            if "memories" in raw_data and "subjects" in raw_data:
+                return raw_data, False
+            # Migrate from legacy format (subject_id -> [memories])
+            return self._migrate_legacy_format(raw_data), True
+        except Exception:
+            return {"memories": {}, "subjects": {}}, False
+
+    def _reload_from_store(self):
+        """Replace the in-memory data and index with the store's contents."""
+        self.data, self._memory_version = self.store.load_memory_data()
+        self.index.build(self.data["memories"])
+        self._ensure_subject_exists(self.subject_id)
+
+    def _refresh(self):
+        """Pick up memory changes committed by other processes (SQLite storage only)."""
+        if self.store is not None and self.store.memory_version() != self._memory_version:
+            self._reload_from_store()
+
+    def _persist(self, write: Callable[[SQLiteStore], int]):
+        """Persist a change already applied in memory.
+
+        Args:
+            write: Writes just the change to the SQLite store, returning the
+                memory version from before it; with JSON storage the whole
+                file is saved instead
+        """
+        if self.store is None:
+            self._save_memories()
+            return
+        previous = write(self.store)
+        if previous == self._memory_version:
+            self._memory_version = previous + 1
+        else:
+            # Another process wrote in between; our change is in the store too
+            self._reload_from_store()
 
     def _migrate_legacy_format(self, legacy_data: Dict) -> Dict:
         """Migrate from legacy format to normalized structure."""
@@ -540,6 +1550,7 @@ class MemoryManager:
             memory_ids = []
             for mem in memories:
                 mem_id = mem.get("id", str(uuid.uuid4()))
+                mem["id"] = mem_id
                 # Add subject tracking to memory
                 mem["subjects"] = [subject_id]
                 new_data["memories"][mem_id] = mem
@@ -563,10 +1574,11 @@ class MemoryManager:
             }
 
     def _save_memories(self):
-        """Save memories to file."""
+        """Save memories to file (JSON storage)."""
         with open(self.config.memory_file, 'w') as f:
             json.dump(self.data, f, indent=2)
 
+    @_synchronized
     def store_memory(
         self,
         content: str,
@@ -587,6 +1599,7 @@ class MemoryManager:
         Returns:
             The memory ID
         """
+        self._refresh()
         memory_id = str(uuid.uuid4())
         now = datetime.now()
 
@@ -613,15 +1626,17 @@ class MemoryManager:
 
         # Store memory in normalized structure
         self.data["memories"][memory_id] = memory_entry
+        self.index.add(memory_entry)
 
         # Link memory to each subject
         for subj in target_subjects:
             if memory_id not in self.data["subjects"][subj]["memory_ids"]:
                 self.data["subjects"][subj]["memory_ids"].append(memory_id)
 
-        self._save_memories()
+        self._persist(lambda store: store.insert_memory(memory_entry, self.data["subjects"]))
         return memory_id
 
+    @_synchronized
     def link_memory_to_subject(self, memory_id: str, subject_id: str) -> bool:
         """Link an existing memory to an additional subject.
 
@@ -632,6 +1647,7 @@ class MemoryManager:
         Returns:
             True if successful, False if memory doesn't exist
         """
+        self._refresh()
         if memory_id not in self.data["memories"]:
             return False
 
@@ -641,28 +1657,39 @@ class MemoryManager:
         if subject_id not in self.data["memories"][memory_id]["subjects"]:
             self.data["memories"][memory_id]["subjects"].append(subject_id)
             self.data["memories"][memory_id]["updated"] = datetime.now().isoformat()
+            self.index.link(self.data["memories"][memory_id], subject_id)
 
         # Add memory to subject's memory list
         if memory_id not in self.data["subjects"][subject_id]["memory_ids"]:
             self.data["subjects"][subject_id]["memory_ids"].append(memory_id)
 
-        self._save_memories()
+        mem = self.data["memories"][memory_id]
+        self._persist(lambda store: store.link_memory(mem, subject_id, self.data["subjects"][subject_id]))
         return True
 
+    @_synchronized
     def unlink_memory_from_subject(self, memory_id: str, subject_id: str) -> bool:
         """Remove a memory's link to a subject (doesn't delete the memory).
 
         If the memory has no remaining subjects, it will be deleted.
         """
+        self._refresh()
         if memory_id not in self.data["memories"]:
             return False
 
+        mem = self._unlink(memory_id, subject_id, datetime.now().isoformat())
+        self._persist(lambda store: store.unlink_memory(mem, subject_id))
+        return True
+
+    def _unlink(self, memory_id: str, subject_id: str, now: str) -> Dict:
+        """Unlink a memory in memory only, deleting it if no subjects remain."""
         mem = self.data["memories"][memory_id]
 
         # Remove subject from memory
         if subject_id in mem["subjects"]:
             mem["subjects"].remove(subject_id)
-            mem["updated"] = datetime.now().isoformat()
+            mem["updated"] = now
+            self.index.unlink(mem, subject_id)
 
         # Remove memory from subject
         if subject_id in self.data["subjects"]:
@@ -673,10 +1700,11 @@ class MemoryManager:
         # Delete memory if no subjects remain
         if not mem["subjects"]:
             del self.data["memories"][memory_id]
+            self.index.remove(mem)
 
-        self._save_memories()
-        return True
+        return mem
 
+    @_synchronized
     def recall_memories(
         self,
         keywords: Optional[List[str]] = None,
@@ -687,45 +1715,55 @@ class MemoryManager:
         """Recall memories with automatic deduplication across subjects.
 
         Args:
-            keywords: Filter by keywords in content
+            keywords: Rank by these keywords, matched against content words
+                (or, failing that, anywhere in the content, ignoring case)
             max_results: Maximum number of results
             memory_type: Filter by memory type
             subjects: List of subjects to search (defaults to current subject)
 
         Returns:
-            Deduplicated list of memories sorted by timestamp
+            Deduplicated list of memories, best BM25 match first when keywords
+            are given (newest first among equal scores), otherwise newest first.
+            Memories that contain a keyword only inside a longer word (e.g.
+            "prefer" in "preferences") come after the full-word matches,
+            ranked by BM25 over the words that contain it.
         """
+        self._refresh()
         target_subjects = subjects or [self.subject_id]
-
-        # Collect unique memory IDs from all target subjects
-        memory_ids = set()
-        for subj in target_subjects:
-            if subj in self.data["subjects"]:
-                memory_ids.update(self.data["subjects"][subj]["memory_ids"])
-
-        # Fetch actual memories (automatic deduplication via set)
-        memories = []
-        for mem_id in memory_ids:
-            if mem_id in self.data["memories"]:
-                memories.append(self.data["memories"][mem_id].copy())
-
-        # Filter by type
+        memories = self.data["memories"]
+
+        terms = [token for kw in keywords or [] for token in MemoryIndex.tokenize(kw)]
+        if keywords and not terms:
+            return []
+        if not terms:
+            results = []
+            for mem_id in self.index.newest(target_subjects):
+                mem = memories[mem_id]
+                if memory_type and mem.get("type") != memory_type:
+                    continue
+                results.append(mem.copy())
+                if len(results) >= max_results:
+                    break
+            return results
+
+        scores = self.index.score(terms, target_subjects, memories)
+        # Full-word matches rank first; memories holding a keyword as a
+        # substring, as plain keyword filtering found them, follow
+        lowered = [kw.lower() for kw in keywords]
+        partial = self.index.score(self.index.partial_matches(terms), target_subjects, memories)
+        ranked = {mid: (1, score) for mid, score in scores.items()}
+        for mid, score in partial.items():
+            if mid not in ranked:
+                content = memories[mid].get("content", "").lower()
+                if any(kw in content for kw in lowered):
+                    ranked[mid] = (0, score)
         if memory_type:
-            memories = [m for m in memories if m.get("type") == memory_type]
-
-        # Filter by keywords
-        if keywords:
-            filtered = []
-            for mem in memories:
-                content_lower = mem.get("content", "").lower()
-                if any(kw.lower() in content_lower for kw in keywords):
-                    filtered.append(mem)
-            memories = filtered
-
-        # Sort by timestamp (newest first)
-        memories.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return memories[:max_results]
+            ranked = {mid: r for mid, r in ranked.items() if memories[mid].get("type") == memory_type}
+        best = heapq.nlargest(
+            max_results, ranked,
+            key=lambda mid: (ranked[mid], memories[mid].get("timestamp", ""), mid)
+        )
+        return [memories[mid].copy() for mid in best]
 
     def get_all_memories(self, subjects: Optional[List[str]] = None) -> List[Dict]:
         """Get all memories for specified subjects with deduplication.
@@ -738,12 +1776,16 @@ class MemoryManager:
         """
         return self.recall_memories(subjects=subjects, max_results=9999)
 
+    @_synchronized
     def get_memory_by_id(self, memory_id: str) -> Optional[Dict]:
         """Get a specific memory by ID."""
+        self._refresh()
         return self.data["memories"].get(memory_id)
 
+    @_synchronized
     def get_subjects(self) -> List[Dict]:
         """Get all subjects with their metadata."""
+        self._refresh()
         result = []
         for subj_id, subj_data in self.data["subjects"].items():
             result.append({
@@ -754,11 +1796,13 @@ class MemoryManager:
             })
         return result
 
+    @_synchronized
     def clear_memories(self, subject_id: Optional[str] = None):
         """Clear all memories for a subject (or current subject).
 
         Memories shared with other subjects are unlinked, not deleted.
         """
+        self._refresh()
         target = subject_id or self.subject_id
 
         if target not in self.data["subjects"]:
@@ -767,40 +1811,45 @@ class MemoryManager:
         # Get memory IDs for this subject
         memory_ids = self.data["subjects"][target]["memory_ids"].copy()
 
-        # Unlink each memory from this subject
+        # Unlink each memory from this subject, then persist once
+        now = datetime.now().isoformat()
         for mem_id in memory_ids:
-            self.unlink_memory_from_subject(mem_id, target)
+            if mem_id in self.data["memories"]:
+                self._unlink(mem_id, target, now)
 
         # Clear the subject's memory list
         self.data["subjects"][target]["memory_ids"] = []
-        self._save_memories()
+        self._persist(lambda store: store.clear_subject(target, now))
 
+    @_synchronized
     def format_memories_for_context(self, subjects: Optional[List[str]] = None) -> str:
         """Format memories as context for the AI.
 
         Args:
             subjects: List of subjects to include (defaults to current subject)
         """
-        memories = self.get_all_memories(subjects=subjects)
+        memories = self.recall_memories(subjects=subjects, max_results=20)  # Newest 20 memories
         if not memories:
             return "No stored memories."
 
         lines = ["Stored memories:"]
-        for mem in memories[-20:]:  # Last 20 memories
-            subj_count = len(mem.get("subjects", []))
-            shared_indicator = f" [shared:{subj_count}]" if subj_count > 1 else ""
-            lines.append(f"- [{mem.get('type', 'note')}]{shared_indicator} {mem.get('content', '')}")
-
+        lines.extend(self.format_memory_line(mem) for mem in memories)
         return "\n".join(lines)
 
+    @staticmethod
+    def format_memory_line(mem: Dict) -> str:
+        """One memory as a context line: type, sharing and content."""
+        subj_count = len(mem.get("subjects", []))
+        shared_indicator = f" [shared:{subj_count}]" if subj_count > 1 else ""
+        return f"- [{mem.get('type', 'note')}]{shared_indicator} {mem.get('content', '')}"
+
+    @_synchronized
     def find_duplicate_content(self, content: str) -> Optional[str]:
         """Find if identical content already exists, return memory_id if found."""
-        content_lower = content.lower().strip()
-        for mem_id, mem in self.data["memories"].items():
-            if mem.get("content", "").lower().strip() == content_lower:
-                return mem_id
-        return None
+        self._refresh()
+        return self.index.find_duplicate(content)
 
+    @_synchronized
     def store_or_link_memory(
         self,
         content: str,
@@ -835,6 +1884,9 @@ class MemoryManager:
 class BasicAgent(ABC):
     """Base class for all agents."""
 
+    # Seconds a call may run before the assistant gives up on it
+    timeout: float = 30.0
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -971,7 +2023,8 @@ class WebSearchAgent(BasicAgent):
         }
 
     def perform(self, query: str) -> str:
-        # In a full implementation, this would call a search API
+        # In a full implementation, this would call a search API with
+        # timeout=time_left() (or self.timeout outside a tool call)
         return (
             f"[Web search for '{query}' - This is a simulated result. "
             f"In production, integrate with Bing Search API or similar. "
@@ -1059,31 +2112,50 @@ class ConversationManager:
         self.config = config
         self.messages: List[Dict[str, str]] = []
         self.max_history = 50
+        self.store = open_store(config)
         self._load_context()
 
     def _load_context(self):
-        """Load conversation context from file."""
+        """Load conversation context from the SQLite store or file."""
+        if self.store is not None:
+            # One-shot import of the JSON context into a new database
+            self.store.migrate_once("context_json", self._read_context_file, self.store.write_messages)
+            self.messages = self.store.recent_messages(self.max_history)
+        else:
+            self.messages = self._read_context_file()
+
+    def _read_context_file(self) -> List[Dict]:
+        """Read the newest messages from context_file."""
         if self.config.context_file.exists():
             try:
                 with open(self.config.context_file, 'r') as f:
                     data = json.load(f)
-                    self.messages = data.get("messages", [])[-self.max_history:]
+                    return data.get("messages", [])[-self.max_history:]
             except Exception:
-                self.messages = []
+                pass
+        return []
 
     def _save_context(self):
-        """Save conversation context to file."""
+        """Save conversation context to file (JSON storage)."""
+        if self.store is not None:
+            return
         with open(self.config.context_file, 'w') as f:
             json.dump({"messages": self.messages[-self.max_history:]}, f, indent=2)
 
+    def _append(self, msg: Dict):
+        """Append a message, inserting just that row with SQLite storage."""
+        self.messages.append(msg)
+        if self.store is not None:
+            self.store.append_message(msg, self.max_history)
+
     def add_message(self, role: str, content: str):
         """Add a message to the conversation."""
-        self.messages.append({"role": role, "content": content})
+        self._append({"role": role, "content": content})
         self._save_context()
 
     def add_tool_result(self, tool_call_id: str, result: str):
         """Add a tool result to the conversation."""
-        self.messages.append({
+        self._append({
             "role": "tool",
             "tool_call_id": tool_call_id,
             "content": result
@@ -1094,7 +2166,7 @@ class ConversationManager:
         msg = {"role": "assistant", "content": content or ""}
         if tool_calls:
             msg["tool_calls"] = tool_calls
-        self.messages.append(msg)
+        self._append(msg)
 
     def get_messages(self) -> List[Dict[str, str]]:
         """Get all messages."""
@@ -1103,9 +2175,201 @@ class ConversationManager:
     def clear(self):
         """Clear conversation history."""
         self.messages = []
+        if self.store is not None:
+            self.store.clear_messages()
         self._save_context()
 
 
+# =============================================================================
+# Context Builder
+# =============================================================================
+
+def approximate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class ContextBuilder:
+    """Assembles request messages under a token budget.
+
+    Messages are, in order: the system prompt, a block of memories ranked by
+    relevance to the user's input (newest memories fill in when few
+    match), the newest conversation history that fits, and the current
+    input. The current turn (the user's latest message and the assistant
+    and tool messages answering it) is reserved first and always sent;
+    when it alone exceeds the budget, its tool results are truncated.
+    Memories may use up to memory_share of the budget; earlier history
+    gets whatever is left. History is never cut so that it starts with a
+    tool result orphaned from its tool call.
+
+    Token counts come from a pluggable tokenizer (text -> count; the
+    default approximates) and are cached per text, so history messages
+    are counted once rather than on every turn.
+    """
+
+    # Tokens each message adds for its role and framing
+    MESSAGE_OVERHEAD = 4
+    # Appended to tool results cut to fit the budget
+    TRUNCATION_MARKER = "\n[truncated to fit the context budget]"
+
+    def __init__(
+        self,
+        memory: "MemoryManager",
+        budget: int = 8000,
+        tokenizer: Optional[Callable[[str], int]] = None,
+        memory_share: float = 0.25,
+        max_memories: int = 20,
+        cache_size: int = 4096
+    ):
+        self.memory = memory
+        self.budget = budget
+        self.tokenizer = tokenizer or approximate_tokens
+        self.memory_share = memory_share
+        self.max_memories = max_memories
+        self.cache_size = cache_size
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        # What the last build included, for inspection and tests
+        self.last_stats: Dict[str, int] = {}
+
+    def count_text(self, text: str) -> int:
+        """Token count of text, cached."""
+        count = self._counts.get(text)
+        if count is not None:
+            self._counts.move_to_end(text)
+            return count
+        count = self.tokenizer(text)
+        self._counts[text] = count
+        if len(self._counts) > self.cache_size:
+            self._counts.popitem(last=False)
+        return count
+
+    def count_message(self, message: Dict) -> int:
+        """Token count of a chat message, including tool calls."""
+        tokens = self.MESSAGE_OVERHEAD + self.count_text(message.get("content") or "")
+        if message.get("tool_calls"):
+            for call in message["tool_calls"]:
+                function = call.get("function", {})
+                tokens += self.count_text(function.get("name", "")) + self.count_text(function.get("arguments", ""))
+        return tokens
+
+    def truncate_text(self, text: str, tokens: int) -> str:
+        """text cut (with TRUNCATION_MARKER) to at most tokens tokens."""
+        count = self.count_text(text)
+        if count <= tokens:
+            return text
+        cut = len(text) * tokens // count
+        while cut > 0 and self.tokenizer(text[:cut] + self.TRUNCATION_MARKER) > tokens:
+            cut = cut * 9 // 10
+        return text[:cut] + self.TRUNCATION_MARKER if cut > 0 else ""
+
+    def _fit_turn(self, turn: List[Dict], available: int) -> Tuple[List[Dict], int]:
+        """The current turn within available tokens, shrinking its tool results evenly.
+
+        Returns the (copied where cut) messages and how many tool results were cut.
+        """
+        costs = [self.count_message(m) for m in turn]
+        if sum(costs) <= available:
+            return turn, 0
+        tools = sorted((i for i, m in enumerate(turn) if m.get("role") == "tool"), key=costs.__getitem__)
+        # Tool results share what the other messages leave, smallest first
+        remaining = available - sum(cost for i, cost in enumerate(costs) if i not in tools)
+        fitted = list(turn)
+        truncated = 0
+        for position, i in enumerate(tools):
+            share = max(0, remaining // (len(tools) - position))
+            if costs[i] > share:
+                content = self.truncate_text(turn[i].get("content") or "", max(0, share - self.MESSAGE_OVERHEAD))
+                fitted[i] = {**turn[i], "content": content}
+                truncated += 1
+            remaining -= self.count_message(fitted[i])
+        return fitted, truncated
+
+    def _memory_block(self, query: str, allowance: int) -> Tuple[Optional[Dict], int]:
+        """The memory system message within allowance tokens, and how many memories it holds."""
+        ranked = self.memory.recall_memories(keywords=[query], max_results=self.max_memories) if query else []
+        if len(ranked) < self.max_memories:
+            seen = {mem["id"] for mem in ranked}
+            ranked += [mem for mem in self.memory.recall_memories(max_results=self.max_memories)
+                       if mem["id"] not in seen][:self.max_memories - len(ranked)]
+        if not ranked:
+            return None, 0
+
+        header = "[Context from memory system]\nStored memories:"
+        used = self.MESSAGE_OVERHEAD + self.count_text(header)
+        lines = [header]
+        for mem in ranked:
+            line = MemoryManager.format_memory_line(mem)
+            cost = self.count_text(line) + 1  # newline
+            if used + cost > allowance:
+                break
+            lines.append(line)
+            used += cost
+        if len(lines) == 1:
+            return None, 0
+        return {"role": "system", "content": "\n".join(lines)}, len(lines) - 1
+
+    def build(self, system_prompt: str, history: List[Dict], user_input: Optional[str] = None) -> List[Dict]:
+        """Assemble the messages for a request.
+
+        Args:
+            system_prompt: The assistant's system prompt
+            history: Conversation messages, oldest first
+            user_input: The new user message, if not already in history
+
+        Returns:
+            Messages that fit the budget (the system prompt and current turn
+            are always included)
+        """
+        system = {"role": "system", "content": system_prompt}
+        used = self.count_message(system)
+
+        # The current turn: the new input, or history from its latest user message on
+        if user_input is not None:
+            end = len(history)
+            turn = [{"role": "user", "content": user_input}]
+        else:
+            end = next((i for i in range(len(history) - 1, -1, -1) if history[i].get("role") == "user"),
+                       len(history))
+            turn = history[end:]
+        turn, truncated = self._fit_turn(turn, self.budget - used)
+        used += sum(self.count_message(m) for m in turn)
+
+        query = (turn[0].get("content") or "") if turn and turn[0].get("role") == "user" else ""
+        allowance = min(int(self.budget * self.memory_share), max(0, self.budget - used))
+        memory_message, memory_count = self._memory_block(query, allowance)
+        if memory_message:
+            used += self.count_message(memory_message)
+
+        # Newest earlier history first, while it fits
+        start = end
+        while start > 0:
+            cost = self.count_message(history[start - 1])
+            if used + cost > self.budget:
+                break
+            used += cost
+            start -= 1
+        # Don't open with tool results whose assistant tool call was cut
+        while start < end and history[start].get("role") == "tool":
+            used -= self.count_message(history[start])
+            start += 1
+
+        messages = [system]
+        if memory_message:
+            messages.append(memory_message)
+        messages.extend(history[start:end])
+        messages.extend(turn)
+
+        self.last_stats = {
+            "tokens": used,
+            "budget": self.budget,
+            "memories": memory_count,
+            "history": end - start + (len(turn) if user_input is None else 0),
+            "history_dropped": start,
+            "truncated": truncated
+        }
+        return messages
+
+
 # =============================================================================
 # Main Assistant
 # =============================================================================
@@ -1136,7 +2400,13 @@ Your personality: Intelligent, intuitive, and genuinely helpful. You adapt to ea
         self.client = AzureOpenAIClient(config)
         self.memory = MemoryManager(config)
         self.conversation = ConversationManager(config)
+        self.context = ContextBuilder(self.memory, budget=getattr(config, "context_tokens", 8000))
         self.agents: Dict[str, BasicAgent] = {}
+        # Tool calls of a turn run concurrently on these workers (a call
+        # stuck past its deadline holds one; see _handle_tool_calls)
+        self.tool_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="neuai-tool")
+        # Timing of the last streamed chat turn (see chat)
+        self.last_turn_stats: Optional[Dict[str, Any]] = None
         self._register_agents()
 
     def _register_agents(self):
@@ -1151,57 +2421,101 @@ Your personality: Intelligent, intuitive, and genuinely helpful. You adapt to ea
         """Get tool definitions for all agents."""
         return [agent.get_tool_definition() for agent in self.agents.values()]
 
-    def _build_messages(self, user_input: str) -> List[Dict]:
-        """Build the message list for the API call."""
-        messages = [{"role": "system", "content": self.SYSTEM_PROMPT}]
+    def _build_messages(self, user_input: Optional[str]) -> List[Dict]:
+        """Build the message list for the API call within the context token budget.
 
-        # Add memory context
-        memory_context = self.memory.format_memories_for_context()
-        if memory_context and memory_context != "No stored memories.":
-            messages.append({
-                "role": "system",
-                "content": f"[Context from memory system]\n{memory_context}"
-            })
-
-        # Add conversation history
-        messages.extend(self.conversation.get_messages())
+        Args:
+            user_input: The new user message, or None when it is already in
+                the conversation (follow-up requests after tool calls)
+        """
+        return self.context.build(self.SYSTEM_PROMPT, self.conversation.get_messages(), user_input)
 
-        # Add current user message
-        messages.append({"role": "user", "content": user_input})
+    def _run_tool(self, function_name: str, arguments_json: str, deadline: float) -> str:
+        """Run one tool call under its deadline, returning its result or error text."""
+        try:
+            arguments = json.loads(arguments_json)
+        except json.JSONDecodeError:
+            arguments = {}
 
-        return messages
+        agent = self.agents.get(function_name)
+        if agent is None:
+            return f"Unknown tool: {function_name}"
+        try:
+            with tool_deadline(deadline):
+                return agent.perform(**arguments)
+        except Exception as e:
+            return f"Error executing {function_name}: {str(e)}"
 
     def _handle_tool_calls(self, tool_calls: List[Dict]) -> List[Dict]:
-        """Execute tool calls and return results."""
-        results = []
+        """Execute tool calls concurrently and return results in call order.
+
+        Each call gets its agent's timeout, counted from when the calls were
+        submitted. The deadline is enforced inside the call: memory locks,
+        database busy waits and (for tools doing I/O) socket timeouts are
+        bounded by time_left(), so the call fails and frees its worker.
+        A call still running at its deadline is reported as an error here,
+        but Python cannot stop its thread: work that never waits (a long
+        computation) keeps its worker until it finishes, and while all
+        tool_executor workers are held that way, later tool calls queue
+        behind them and time out.
+        """
+        started = time.monotonic()
+        futures = []
+        for call in tool_calls:
+            agent = self.agents.get(call["function"]["name"])
+            deadline = started + (agent.timeout if agent else BasicAgent.timeout)
+            futures.append(self.tool_executor.submit(
+                self._run_tool, call["function"]["name"], call["function"]["arguments"], deadline
+            ))
 
-        for tool_call in tool_calls:
+        results = []
+        for tool_call, future in zip(tool_calls, futures):
             function_name = tool_call["function"]["name"]
-            tool_call_id = tool_call["id"]
-
+            agent = self.agents.get(function_name)
+            timeout = agent.timeout if agent else BasicAgent.timeout
             try:
-                arguments = json.loads(tool_call["function"]["arguments"])
-            except json.JSONDecodeError:
-                arguments = {}
-
-            if function_name in self.agents:
-                agent = self.agents[function_name]
-                try:
-                    result = agent.perform(**arguments)
-                except Exception as e:
-                    result = f"Error executing {function_name}: {str(e)}"
-            else:
-                result = f"Unknown tool: {function_name}"
+                result = future.result(timeout=max(0.0, started + timeout - time.monotonic()))
+            except FutureTimeout:
+                future.cancel()  # Only stops calls that haven't started
+                result = f"Error executing {function_name}: timed out after {timeout:g}s"
 
             results.append({
-                "tool_call_id": tool_call_id,
+                "tool_call_id": tool_call["id"],
                 "result": result
             })
 
         return results
 
-    def chat(self, user_input: str) -> str:
-        """Process user input and return assistant response."""
+    def _complete(self, messages: List[Dict], on_token: Optional[Callable[[str], None]],
+                  streams: List[Dict]) -> Dict[str, Any]:
+        """Request a completion, streaming it when on_token is given."""
+        if on_token is None:
+            return self.client.chat_completion(messages=messages, tools=self._get_tools())
+        response = self.client.stream_chat_completion(
+            messages=messages, tools=self._get_tools(), on_token=on_token
+        )
+        streams.append(response["stream_stats"])
+        return response
+
+    def chat(self, user_input: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Process user input and return assistant response.
+
+        Args:
+            user_input: The user's message
+            on_token: Stream the response, calling this with each piece of
+                text as it arrives. Timing of the turn (time to first
+                token, tokens, tokens per second, across tool-call rounds)
+                is left in last_turn_stats.
+        """
+        turn_started = time.perf_counter()
+        streams: List[Dict] = []
+        first_token_at: List[float] = []
+        render = None
+        if on_token is not None:
+            def render(text: str):
+                if not first_token_at:
+                    first_token_at.append(time.perf_counter())
+                on_token(text)
 
         # Build messages
         messages = self._build_messages(user_input)
@@ -1210,10 +2524,7 @@ Your personality: Intelligent, intuitive, and genuinely helpful. You adapt to ea
         self.conversation.add_message("user", user_input)
 
         # Get initial response
-        response = self.client.chat_completion(
-            messages=messages,
-            tools=self._get_tools()
-        )
+        response = self._complete(messages, render, streams)
 
         choice = response["choices"][0]
         message = choice["message"]
@@ -1237,19 +2548,11 @@ Your personality: Intelligent, intuitive, and genuinely helpful. You adapt to ea
                     result["result"]
                 )
 
-            # Get final response after tool execution
-            final_messages = self._build_messages("")
-            # Remove the duplicate user message
-            final_messages.pop()
-            # Use conversation history which now includes tool results
-            final_messages = [
-                {"role": "system", "content": self.SYSTEM_PROMPT}
-            ] + self.conversation.get_messages()
-
-            final_response = self.client.chat_completion(
-                messages=final_messages,
-                tools=self._get_tools()
-            )
+            # Get final response after tool execution; the conversation now
+            # holds the user message and tool results
+            final_messages = self._build_messages(None)
+
+            final_response = self._complete(final_messages, render, streams)
 
             assistant_content = final_response["choices"][0]["message"]["content"]
         else:
@@ -1258,8 +2561,22 @@ Your personality: Intelligent, intuitive, and genuinely helpful. You adapt to ea
         # Save assistant response
         self.conversation.add_message("assistant", assistant_content)
 
+        self.last_turn_stats = self._turn_stats(turn_started, first_token_at, streams) if streams else None
         return assistant_content
 
+    @staticmethod
+    def _turn_stats(started: float, first_token_at: List[float], streams: List[Dict]) -> Dict[str, Any]:
+        """Timing of a streamed turn: the user waits for the first rendered token."""
+        tokens = sum(stream["tokens"] for stream in streams)
+        generation = sum(stream["generation"] for stream in streams)
+        return {
+            "ttft": first_token_at[0] - started if first_token_at else None,
+            "duration": time.perf_counter() - started,
+            "tokens": tokens,
+            "tokens_per_second": tokens / generation if generation > 0 else None,
+            "requests": len(streams)
+        }
+
     def new_conversation(self):
         """Start a new conversation."""
         self.conversation.clear()
@@ -1344,15 +2661,19 @@ def main():
         print("  --configure    Run configuration setup")
         print("  --test         Test current credentials")
         print("  --reset        Delete saved credentials and start fresh")
+        print("  --no-stream    Wait for complete responses instead of streaming them")
         print("  --help, -h     Show this help message")
         print("\nEnvironment Variables (optional, overrides saved config):")
         print("  AZURE_OPENAI_ENDPOINT    Your Azure OpenAI endpoint URL")
         print("  AZURE_OPENAI_KEY         Your Azure OpenAI API key")
         print("  AZURE_OPENAI_DEPLOYMENT  Your deployment name (e.g., gpt-4)")
+        print("  NEUAI_STORAGE            Storage engine: json (default) or sqlite")
+        print("  NEUAI_CONTEXT_TOKENS     Prompt token budget per request (default: 8000)")
         print("\nData Location:")
         print("  ~/.neuai/config.json     Saved credentials")
         print("  ~/.neuai/memories.json   Persistent memory")
         print("  ~/.neuai/context.json    Conversation history")
+        print("  ~/.neuai/neuai.db        Memories and history (NEUAI_STORAGE=sqlite)")
         return
 
     # Initialize configuration
@@ -1414,6 +2735,12 @@ def main():
         print(f"\n❌ Failed to initialize: {e}")
         return
 
+    # Stream responses as they are generated unless asked not to
+    stream = "--no-stream" not in sys.argv
+
+    # Connect while the user types the first message
+    assistant.client.warm()
+
     # Print banner
     print_banner()
     print("Type /help for commands or just start chatting!\n")
@@ -1466,6 +2793,11 @@ def main():
                     print(f"\nData Directory: {config.data_dir}")
                     print(f"Memories: {len(assistant.memory.get_all_memories())} stored")
                     print(f"Conversation: {len(assistant.conversation.messages)} messages")
+                    net = assistant.client.connection_stats()
+                    print(f"Requests: {net['requests']} | Connections opened: {net['connections_opened']}, "
+                          f"reused: {net['connections_reused']}")
+                    if "latency_ms" in net:
+                        print(f"Latency: p50 {net['latency_ms']['p50']}ms, p95 {net['latency_ms']['p95']}ms")
                     print("\nTesting connection...")
                     success, message = config.test_connection()
                     print(f"Connection: {'✅ ' + message if success else '❌ ' + message}")
@@ -1497,8 +2829,16 @@ def main():
             print("\n🧠 NeuAI: ", end="", flush=True)
 
             try:
-                response = assistant.chat(user_input)
-                print(response)
+                if stream:
+                    assistant.chat(user_input, on_token=lambda text: print(text, end="", flush=True))
+                    print()
+                    stats = assistant.last_turn_stats
+                    if stats and stats["ttft"] is not None:
+                        rate = f" · {stats['tokens_per_second']:.1f} tok/s" if stats["tokens_per_second"] else ""
+                        print(f"   ⏱  first token {stats['ttft']:.2f}s{rate}")
+                else:
+                    response = assistant.chat(user_input)
+                    print(response)
             except ValueError as e:
                 print(f"\n❌ Error: {e}")
             except Exception as e:
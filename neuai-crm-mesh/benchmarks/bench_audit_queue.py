@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the indexed audit queue at schema-audit UI scale.
+
+Queues 50,000 pending proposals and times what the audit UI does: fetching
+filtered pages sorted by confidence, and approving proposals one at a
+time. Compares a plain list (filter, sort and slice per page; scan to find
+a proposal) with AuditQueue (index lookups, cursor pages).
+
+Usage:
+    python benchmarks/bench_audit_queue.py
+    python benchmarks/bench_audit_queue.py --proposals 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.services.audit_queue import AuditQueue
+from neuai_crm.services.schema_discovery import FieldMetadata, FieldType, MappingProposal
+
+ENTITIES = [f"custom{i}__c" for i in range(40)] + ["account", "contact", "opportunity"]
+
+
+def proposals(n: int) -> list:
+    """n pending proposals spread over entities, with two-decimal confidences."""
+    rng = random.Random(5)
+    result = []
+    for i in range(n):
+        entity = rng.choice(ENTITIES)
+        source = FieldMetadata(name=f"Field{i}__c", label=f"Field {i}", field_type=FieldType.STRING,
+                               platform="salesforce", entity=entity)
+        result.append(MappingProposal(
+            id=f"{i:012x}", source_platform="salesforce", source_entity=entity, source_field=source,
+            target_platform="dynamics365", target_entity=entity.replace("__c", ""), target_field=None,
+            confidence=rng.randint(30, 94) / 100
+        ))
+    return result
+
+
+def list_pages(queue: list, entity, pages: int) -> list:
+    """Pages built the way /discovery/audit-queue built them: filter, sort, slice."""
+    result = []
+    for n in range(pages):
+        matching = queue
+        if entity:
+            matching = [p for p in queue if p.source_entity == entity or p.target_entity == entity]
+        result.append(sorted(matching, key=lambda x: x.confidence, reverse=True)[n * 50:n * 50 + 50])
+    return result
+
+
+def list_remove(queue: list, proposal_id: str):
+    """Find and remove a proposal the way approve_proposal scanned the list."""
+    for i, p in enumerate(queue):
+        if p.id == proposal_id:
+            return queue.pop(i)
+    return None
+
+
+def indexed_pages(queue: AuditQueue, entity, pages: int) -> list:
+    """Pages followed by cursor."""
+    result, cursor = [], None
+    for _ in range(pages):
+        page = queue.query(entity=entity, limit=50, cursor=cursor)
+        result.append(page["proposals"])
+        cursor = page["next_cursor"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed audit queue benchmark")
+    parser.add_argument("--proposals", type=int, default=50000)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--approvals", type=int, default=1000)
+    args = parser.parse_args()
+    items = proposals(args.proposals)
+    approve_ids = [p.id for p in random.Random(9).sample(items, args.approvals)]
+
+    start = time.perf_counter()
+    indexed = AuditQueue(items)
+    build_s = time.perf_counter() - start
+    plain = list(items)
+
+    results = {}
+    for name, queue, pages, remove in (("list", plain, list_pages, list_remove),
+                                       ("indexed", indexed, indexed_pages, AuditQueue.remove)):
+        start = time.perf_counter()
+        fetched = [pages(queue, entity, args.pages) for entity in (None, "contact")]
+        page_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for proposal_id in approve_ids:
+            remove(queue, proposal_id)
+        approve_s = time.perf_counter() - start
+        results[name] = (page_s, approve_s, [[p.id for p in page] for run in fetched for page in run])
+
+    assert results["list"][2] == results["indexed"][2]
+    print(f"{args.proposals:,} pending proposals (index build {build_s:.2f}s)\n")
+    print(f"{'':<10} {'ms/page':>10} {'ms/approval':>12}")
+    for name, (page_s, approve_s, _) in results.items():
+        print(f"{name:<10} {page_s / (2 * args.pages) * 1000:>10.2f} {approve_s / args.approvals * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batch Schema Brain translation.
+
+Translates a migration batch of synthetic Salesforce opportunities with
+per-record translate_field/translate_value calls (what /brain/translate
+does for each request) and with SchemaBrain.translate_records.
+
+Usage:
+    python benchmarks/bench_brain_batch.py
+    python benchmarks/bench_brain_batch.py --records 50000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.schema_brain import SchemaBrain
+
+
+def opportunities(n: int) -> list:
+    """Build n opportunities in a few shapes, with a custom field on some."""
+    stages = ["Prospecting", "Qualification", "Proposal", "Closed Won"]
+    records = []
+    for i in range(n):
+        record = {"Id": f"006{i:012d}", "Name": f"Deal {i}", "Amount": 1000.0 + i,
+                  "StageName": stages[i % 4], "AccountId": f"001{i % 1000:012d}",
+                  "Probability": 20, "CloseDate": "2024-12-31"}
+        if i % 5 == 0:
+            record["Region__c"] = "EMEA"
+        records.append(record)
+    return records
+
+
+def per_record(brain: SchemaBrain, records: list) -> list:
+    """Translate each record with its own field and value calls."""
+    source, target = Platform.SALESFORCE, Platform.DYNAMICS365
+    results = []
+    for record in records:
+        translated = {}
+        for field_name, value in record.items():
+            target_field, _, _ = brain.translate_field(field_name, source, target, "deals", record)
+            if target_field:
+                translated[target_field] = brain.translate_value(
+                    value, field_name, source, target, "deals"
+                )[0]
+            else:
+                translated[field_name] = value
+        results.append(translated)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch Schema Brain translation benchmark")
+    parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args()
+    records = opportunities(args.records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        expected = per_record(SchemaBrain(memory_path=f"{tmp}/a"), records)
+        single_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = SchemaBrain(memory_path=f"{tmp}/b").translate_records(
+            records, Platform.SALESFORCE, Platform.DYNAMICS365, "deals"
+        )
+        batch_s = time.perf_counter() - start
+
+    assert result["translated"] == expected
+    print(f"{args.records:,} opportunities, {result['shapes']} shapes\n")
+    print(f"{'per-record calls':<20} {single_s:>8.2f}s {args.records / single_s:>12,.0f} rec/s")
+    print(f"{'translate_records':<20} {batch_s:>8.2f}s {args.records / batch_s:>12,.0f} rec/s"
+          f"  ({single_s / batch_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Schema Brain field inference against large schemas.
+
+Teaches a brain mappings to thousands of custom Dynamics fields (as a large
+org accumulates), then infers mappings for unseen Salesforce custom fields
+with trigram-pruned candidates and with CANDIDATE_LIMIT = None, which scores
+every known field as inference used to. Reports how often the two proposals
+differ.
+
+Usage:
+    python benchmarks/bench_brain_inference.py
+    python benchmarks/bench_brain_inference.py --fields 1000 5000 --queries 200
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.schema_brain import SchemaBrain
+
+WORDS = ["Region", "Tier", "Score", "Email", "Phone", "Renewal", "Owner", "Budget",
+         "Segment", "Status", "Partner", "Channel", "Territory", "Forecast", "Margin"]
+
+
+def custom_field(i: int) -> str:
+    """A Salesforce custom field name."""
+    n = len(WORDS)
+    return f"{WORDS[i % n]}_{WORDS[(i // n) % n]}_{i}__c"
+
+
+def teach(n: int, tmp: str) -> SchemaBrain:
+    """A brain with n learned custom field mappings."""
+    brain = SchemaBrain(memory_path=tmp)
+    brain._save_memory = lambda: None  # Measure inference, not memory writes
+    for i in range(n):
+        name = custom_field(i)
+        brain.provide_feedback("salesforce", name, "dynamics365", "deals", f"new_{name.lower()[:-3]}")
+    return brain
+
+
+def infer(brain: SchemaBrain, fields: list) -> list:
+    """Proposed target field for each source field."""
+    return [
+        brain._infer_field_mapping(name, Platform.SALESFORCE, Platform.DYNAMICS365, "deals").proposed_mapping
+        for name in fields
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema Brain inference benchmark")
+    parser.add_argument("--fields", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'known fields':>12} {'exhaustive ms':>14} {'pruned ms':>10} {'speedup':>8} {'differ':>7}")
+    for n in args.fields:
+        with tempfile.TemporaryDirectory() as tmp:
+            brain = teach(n, tmp)
+            queries = [custom_field(n + i) for i in range(args.queries)]
+            infer(brain, queries[:1])  # Build the indexes
+
+            brain.CANDIDATE_LIMIT = None
+            start = time.perf_counter()
+            exhaustive = infer(brain, queries)
+            exhaustive_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            brain.CANDIDATE_LIMIT = SchemaBrain.CANDIDATE_LIMIT
+            start = time.perf_counter()
+            pruned = infer(brain, queries)
+            pruned_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        differ = sum(a != b for a, b in zip(exhaustive, pruned))
+        print(f"{n:>12} {exhaustive_ms:>14.2f} {pruned_ms:>10.2f} "
+              f"{exhaustive_ms / pruned_ms:>7.1f}x {differ:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Schema Brain persistence.
+
+Grows a brain to a number of learned mappings, then times single-feedback
+saves: a full rewrite of the memory files (snapshot_memory, which is what
+every save used to do) versus the journaled save, which appends only the
+changed entries. Also times loading the memory back.
+
+Usage:
+    python benchmarks/bench_brain_persistence.py
+    python benchmarks/bench_brain_persistence.py --mappings 1000 10000 --fsync always
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.services.brain_journal import FSYNC_POLICIES
+from neuai_crm.services.schema_brain import SchemaBrain
+
+
+def feedback(brain: SchemaBrain, i: int) -> None:
+    """Teach one custom field mapping."""
+    brain.provide_feedback("salesforce", f"Custom_{i}__c", "dynamics365", "deals", f"new_custom{i}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema Brain persistence benchmark")
+    parser.add_argument("--mappings", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="snapshot")
+    args = parser.parse_args()
+
+    print(f"{'mappings':>9} {'full save ms':>13} {'journal save ms':>16} {'speedup':>8} {'load s':>7}")
+    for n in args.mappings:
+        with tempfile.TemporaryDirectory() as tmp:
+            brain = SchemaBrain(memory_path=tmp, fsync=args.fsync, snapshot_every=10 ** 9)
+            save = brain._save_memory
+            brain._save_memory = lambda: None  # Grow without saving
+            for i in range(n):
+                feedback(brain, i)
+            brain._save_memory = save
+            brain.snapshot_memory()
+
+            brain._save_memory = brain.snapshot_memory
+            start = time.perf_counter()
+            for i in range(args.saves):
+                feedback(brain, n + i)
+            full_ms = (time.perf_counter() - start) * 1000 / args.saves
+
+            brain._save_memory = save
+            start = time.perf_counter()
+            for i in range(args.saves):
+                feedback(brain, n + args.saves + i)
+            journal_ms = (time.perf_counter() - start) * 1000 / args.saves
+
+            start = time.perf_counter()
+            restored = SchemaBrain(memory_path=tmp)
+            load_s = time.perf_counter() - start
+            assert len(restored.field_mappings) == len(brain.field_mappings)
+
+        print(f"{n:>9} {full_ms:>13.2f} {journal_ms:>16.3f} {full_ms / journal_ms:>7.0f}x {load_s:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for delta sync.
+
+Syncs synthetic Salesforce contacts to Dynamics 365 with a full sync, a
+first delta sync, a repeated delta sync over unchanged data, and a delta
+sync after a fraction of the records changed.
+
+Usage:
+    python benchmarks/bench_delta_sync.py
+    python benchmarks/bench_delta_sync.py --records 500000 --changed 0.01 --watermarks
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+
+
+def contacts(n: int, watermarks: bool) -> list:
+    """Build n Salesforce contacts, optionally with LastModifiedDate."""
+    records = []
+    for i in range(n):
+        record = {
+            "Id": f"003{i:012d}", "FirstName": "Jane", "LastName": f"Doe{i}",
+            "Email": f"jane{i}@example.com", "Phone": "+1-555-0100",
+            "AccountId": f"001{i % 1000:012d}", "Title": "Director",
+            "CreatedDate": "2024-01-15T09:00:00Z"
+        }
+        if watermarks:
+            record["LastModifiedDate"] = f"2024-02-{1 + i % 28:02d}T00:00:00Z"
+        records.append(record)
+    return records
+
+
+def timed(label: str, func) -> None:
+    """Run a sync and print its duration and counts."""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    keys = ("inserted", "updated", "skipped") if "skipped" in result else ("synced",)
+    counts = ", ".join(f"{key} {result[key]:,}" for key in keys)
+    print(f"{label:<28} {elapsed:>8.2f}s  {counts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta sync benchmark")
+    parser.add_argument("--records", type=int, default=500000)
+    parser.add_argument("--changed", type=float, default=0.01, help="Fraction of records changed")
+    parser.add_argument("--watermarks", action="store_true",
+                        help="Give records a LastModifiedDate watermark")
+    args = parser.parse_args()
+
+    mesh = DataMesh()
+    mesh.load_data(Platform.SALESFORCE, {"Contact": contacts(args.records, args.watermarks)})
+    source, target = Platform.SALESFORCE, Platform.DYNAMICS365
+
+    print(f"{args.records:,} Salesforce contacts"
+          f"{' with LastModifiedDate' if args.watermarks else ''}\n")
+    timed("full sync", lambda: mesh.sync_platforms(source, target))
+    timed("delta sync (first)", lambda: mesh.sync_platforms(source, target, delta=True))
+    timed("delta sync (unchanged)", lambda: mesh.sync_platforms(source, target, delta=True))
+
+    records = mesh.data[source]["contacts"]
+    step = max(1, int(1 / args.changed)) if args.changed else len(records) + 1
+    for i in range(0, len(records), step):
+        records[i] = dict(records[i], Title="VP", LastModifiedDate="2024-03-01T00:00:00Z")
+    timed(f"delta sync ({args.changed:.0%} changed)",
+          lambda: mesh.sync_platforms(source, target, delta=True))
+
+
+if __name__ == "__main__":
+    main()
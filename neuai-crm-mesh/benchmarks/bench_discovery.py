@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Salesforce schema discovery.
+
+Runs discover_salesforce against a local client that mimics the
+simple_salesforce describe surface with a fixed per-call latency, for an
+org with many custom objects: serially, on a worker pool, and again with
+the describe cache after a few objects changed. A full describe takes
+--describe-latency; a 304 Not Modified answer to a conditional describe
+(and the global describe) takes --latency.
+
+Usage:
+    python benchmarks/bench_discovery.py
+    python benchmarks/bench_discovery.py --custom-objects 500 --describe-latency 0.3 --workers 16
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.services.schema_discovery import SchemaDiscovery
+
+
+class NotModified(Exception):
+    """simple_salesforce-style error for a 304 answer."""
+    status = 304
+
+
+class LatencySalesforce:
+    """Describe-only Salesforce stand-in with fixed call latencies."""
+
+    def __init__(self, custom_objects: int, latency: float, describe_latency: float):
+        self.latency = latency
+        self.describe_latency = describe_latency
+        standard = ['Account', 'Contact', 'Opportunity', 'Task', 'Lead', 'Campaign', 'Case', 'Event', 'Note']
+        self.objects = standard + [f"Custom{i}__c" for i in range(custom_objects)]
+        self.changed = set(self.objects)
+
+    def describe(self):
+        time.sleep(self.latency)
+        return {"sobjects": [{"name": n, "custom": n.endswith("__c"), "queryable": True} for n in self.objects]}
+
+    def __getattr__(self, name):
+        client = self
+
+        class SObject:
+            def describe(self, headers=None):
+                if headers and name not in client.changed:
+                    time.sleep(client.latency)
+                    raise NotModified()
+                time.sleep(client.describe_latency)
+                return {"fields": [{"name": f"Field{i}__c", "type": "string"} for i in range(40)]}
+
+        return SObject()
+
+
+def timed(func) -> float:
+    """Seconds taken by func."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema discovery benchmark")
+    parser.add_argument("--custom-objects", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.03, help="Seconds per small API call")
+    parser.add_argument("--describe-latency", type=float, default=0.15, help="Seconds per full describe")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    client = LatencySalesforce(args.custom_objects, args.latency, args.describe_latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        discovery = SchemaDiscovery(storage_path=tmp)
+        serial = timed(lambda: discovery.discover_salesforce(client, use_cache=False))
+        parallel = timed(lambda: discovery.discover_salesforce(client, workers=args.workers))
+        client.changed = set(client.objects[-5:])
+        cached = timed(lambda: discovery.discover_salesforce(client, workers=args.workers))
+        result = discovery.discovery_history[-1]
+
+    print(f"{len(client.objects)} objects, {args.describe_latency * 1000:.0f} ms per describe, "
+          f"{args.workers} workers\n")
+    print(f"{'serial':<28} {serial:>8.2f}s")
+    print(f"{'worker pool':<28} {parallel:>8.2f}s  ({serial / parallel:.1f}x)")
+    print(f"{'worker pool, 5 changed':<28} {cached:>8.2f}s  ({result.entities_from_cache} from cache)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for persisting schema discovery state during an audit session.
+
+Queues mapping proposals for a large Account schema and approves them one
+at a time, as the audit UI does, saving after each decision either the
+way discovery used to (the whole state rewritten to one
+discovery_state.json) or with the sharded store (a journal append). Also
+times loading the state back.
+
+Usage:
+    python benchmarks/bench_discovery_state.py
+    python benchmarks/bench_discovery_state.py --fields 2000 --entities 200
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.services.schema_discovery import FieldMetadata, FieldType, SchemaDiscovery
+
+TYPES = [FieldType.STRING, FieldType.PICKLIST, FieldType.DECIMAL, FieldType.DATE]
+
+
+def fields(platform: str, entity: str, n: int) -> list:
+    """n custom fields in the platform's naming style."""
+    return [
+        FieldMetadata(name=f"Field_{i}__c" if platform == "salesforce" else f"new_field{i}",
+                      label=f"Field {i}", field_type=TYPES[i % 4], platform=platform, entity=entity)
+        for i in range(n)
+    ]
+
+
+def save_single_file(discovery: SchemaDiscovery) -> None:
+    """Rewrite all state to one file, as _save_state did before sharding."""
+    data = {
+        "schemas": {platform: {entity: [f.to_dict() for f in fields] for entity, fields in entities.items()}
+                    for platform, entities in discovery.schemas.items()},
+        "audit_queue": [p.to_dict() for p in discovery.audit_queue],
+        "approved_mappings": {k: v.to_dict() for k, v in discovery.approved_mappings.items()},
+        "discovery_history": [asdict(r) for r in discovery.discovery_history]
+    }
+    with open(Path(discovery.storage_path) / "single_file_state.json", 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def session(storage: str, n_fields: int, n_entities: int, approvals: int, single_file: bool) -> tuple:
+    """Seconds to approve proposals one at a time, and seconds to load the state."""
+    discovery = SchemaDiscovery(storage_path=storage)
+    for platform in ("salesforce", "dynamics365"):
+        discovery.schemas[platform] = {"account": fields(platform, "account", n_fields)}
+        for i in range(n_entities):
+            discovery.schemas[platform][f"custom{i}__c"] = fields(platform, f"custom{i}__c", 20)
+    discovery._save_state()
+    discovery.generate_mapping_proposals("salesforce", "dynamics365", auto_approve_threshold=1.1)
+    pending = [p.id for p in discovery.audit_queue][:approvals]
+
+    start = time.perf_counter()
+    for proposal_id in pending:
+        discovery.approve_proposal(proposal_id, reviewer="bench")
+        if single_file:
+            save_single_file(discovery)
+    approve_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reloaded = SchemaDiscovery(storage_path=storage)
+    reloaded.schemas["salesforce"]["account"]
+    load_s = time.perf_counter() - start
+    return approve_s, load_s, len(pending)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discovery state persistence benchmark")
+    parser.add_argument("--fields", type=int, default=500)
+    parser.add_argument("--entities", type=int, default=50)
+    parser.add_argument("--approvals", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "a").mkdir()
+        Path(tmp, "b").mkdir()
+        single_s, _, approvals = session(f"{tmp}/a", args.fields, args.entities, args.approvals, True)
+        journal_s, load_s, _ = session(f"{tmp}/b", args.fields, args.entities, args.approvals, False)
+
+    print(f"{approvals} approvals, {args.fields} account fields + {args.entities} entities per platform\n")
+    print(f"{'full-file rewrite':<20} {single_s:>8.2f}s {single_s / approvals * 1000:>8.2f} ms/approval")
+    print(f"{'journal append':<20} {journal_s:>8.2f}s {journal_s / approvals * 1000:>8.2f} ms/approval"
+          f"  ({single_s / journal_s:.0f}x)")
+    print(f"{'lazy load':<20} {load_s:>8.2f}s  (audit state + one entity shard)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the fuzzy duplicate engine.
+
+Generates synthetic contacts spread across all three platforms (with a share
+of typo'd cross-platform duplicates), times DuplicateDetector.detect_fuzzy_duplicates
+at increasing sizes and fits the log-log slope of runtime vs. record count.
+A slope well below 2.0 demonstrates sub-quadratic scaling.
+
+Usage:
+    python benchmarks/bench_duplicates.py
+    python benchmarks/bench_duplicates.py --sizes 100000 250000 500000 1000000
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.duplicates import DuplicateDetector
+
+
+FIRST_NAMES = [
+    "james", "mary", "john", "patricia", "robert", "jennifer", "michael", "linda",
+    "william", "elizabeth", "david", "barbara", "richard", "susan", "joseph", "jessica",
+    "thomas", "sarah", "charles", "karen", "wei", "priya", "carlos", "fatima", "yuki",
+]
+LAST_NAMES = [
+    "smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis",
+    "rodriguez", "martinez", "hernandez", "lopez", "gonzalez", "wilson", "anderson",
+    "thomas", "taylor", "moore", "jackson", "martin", "chen", "patel", "nguyen", "kim",
+]
+DOMAINS = ["gmail.com", "outlook.com", "acme.com", "globex.io", "initech.net", "yahoo.com"]
+
+FIELDS = {
+    Platform.SALESFORCE: ("Id", "FirstName", "LastName", "Email", "Phone"),
+    Platform.DYNAMICS365: ("contactid", "firstname", "lastname", "emailaddress1", "telephone1"),
+    Platform.LOCAL: ("id", "firstName", "lastName", "email", "phone"),
+}
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    """Swap two adjacent characters."""
+    if len(text) < 3:
+        return text
+    i = rng.randrange(len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def generate(n: int, duplicate_rate: float = 0.1, seed: int = 42) -> dict:
+    """Generate n contacts across the three platforms."""
+    rng = random.Random(seed)
+    platforms = list(Platform)
+    data = {p: {"contacts": []} for p in platforms}
+
+    people = []
+    for i in range(n):
+        if people and rng.random() < duplicate_rate:
+            first, last, email, phone = rng.choice(people)
+            email = _typo(rng, email.split("@")[0]) + "@" + email.split("@")[1]
+        else:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f"{first}.{last}{rng.randrange(100000)}@{rng.choice(DOMAINS)}"
+            phone = f"+1-{rng.randrange(200, 999)}-{rng.randrange(200, 999)}-{rng.randrange(10000):04d}"
+            people.append((first, last, email, phone))
+
+        platform = platforms[i % 3]
+        id_key, first_key, last_key, email_key, phone_key = FIELDS[platform]
+        data[platform]["contacts"].append({
+            id_key: f"{platform.value}-{i}",
+            first_key: first.title(),
+            last_key: last.title(),
+            email_key: email,
+            phone_key: phone,
+        })
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy duplicate engine scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25000, 50000, 100000, 200000])
+    args = parser.parse_args()
+
+    detector = DuplicateDetector()
+    timings = []
+
+    print(f"{'records':>10} {'seconds':>10} {'clusters':>10} {'rec/s':>12}")
+    for n in args.sizes:
+        data = generate(n)
+        start = time.perf_counter()
+        matches = detector.detect_fuzzy_duplicates(data)
+        elapsed = time.perf_counter() - start
+        timings.append((n, elapsed))
+        print(f"{n:>10} {elapsed:>10.2f} {len(matches):>10} {n / elapsed:>12,.0f}")
+
+    if len(timings) >= 2:
+        xs = [math.log(n) for n, _ in timings]
+        ys = [math.log(t) for _, t in timings]
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        slope = (
+            sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+            / sum((x - mean_x) ** 2 for x in xs)
+        )
+        print(f"\nScaling exponent (log-log slope): {slope:.2f}  (2.0 = quadratic)")
+        if slope >= 1.5:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
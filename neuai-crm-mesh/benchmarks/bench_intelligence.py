@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark for intent routing and conversation memory under chat traffic.
+
+Times routing a mix of queries with the keyword chain process_query used
+to run (one substring test per keyword, intent by intent) against the
+compiled IntentRouter, then sends a stream of export queries and measures
+the memory the conversation history holds: full responses kept forever,
+as before, or bounded summaries.
+
+Usage:
+    python benchmarks/bench_intelligence.py
+    python benchmarks/bench_intelligence.py --records 5000 --queries 500
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.intelligence import IntelligenceLayer
+from neuai_crm.services.intent_router import FALLBACK_INTENT, INTENT_KEYWORDS, IntentRouter
+
+QUERIES = [
+    "Sync Salesforce to Dynamics 365",
+    "Find duplicates across all systems",
+    "Show me conflicts between local and Salesforce",
+    "How many records are in each CRM?",
+    "Migrate from Dynamics to Salesforce",
+    "Export data for Salesforce",
+    "Show me the schema mappings",
+    "What can you help me with?",
+    "Tell me something about our biggest customers this quarter",
+]
+
+
+def keyword_chain(query: str) -> str:
+    """Route the way process_query did: first intent with a keyword substring."""
+    query_lower = query.lower()
+    for intent, keywords in INTENT_KEYWORDS:
+        if any(word in query_lower for word in keywords):
+            return intent
+    return FALLBACK_INTENT
+
+
+def history_memory(intelligence: IntelligenceLayer, queries: int) -> float:
+    """MB the intelligence layer still holds after a stream of export queries."""
+    gc.collect()
+    tracemalloc.start()
+    for i in range(queries):
+        intelligence.process_query(f"Export data for Salesforce ({i})")
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent routing and conversation memory benchmark")
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--routes", type=int, default=200000)
+    args = parser.parse_args()
+
+    router = IntentRouter()
+    queries = (QUERIES * (args.routes // len(QUERIES) + 1))[:args.routes]
+    timings = {}
+    for name, route in (("keyword chain", keyword_chain), ("compiled", lambda q: router.route(q).intent)):
+        start = time.perf_counter()
+        for query in queries:
+            route(query)
+        timings[name] = time.perf_counter() - start
+
+    # Columnar storage, so every export builds its records as a real export does
+    mesh = DataMesh(storage="columnar")
+    mesh.load_data(Platform.SALESFORCE, {
+        "Account": [{"Id": f"001{i:06d}", "Name": f"Company {i}", "Industry": "Technology"}
+                    for i in range(args.records)]
+    })
+    # Keeping every result in an unbounded history holds what the old history did
+    full_mb = history_memory(IntelligenceLayer(mesh, max_history=None, keep_results=args.queries),
+                             args.queries)
+    bounded_mb = history_memory(IntelligenceLayer(mesh), args.queries)
+
+    print(f"Routing {args.routes:,} queries\n")
+    for name, seconds in timings.items():
+        print(f"{name:<16} {seconds / args.routes * 1e6:>8.2f} us/query")
+    print(f"\nHistory after {args.queries} exports of {args.records:,} records\n")
+    print(f"{'full responses':<16} {full_mb:>8.1f} MB")
+    print(f"{'summaries':<16} {bounded_mb:>8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark for API responsiveness during a long sync.
+
+Loads a large Salesforce tenant and times /health requests while a sync
+to Dynamics 365 runs three ways: on the event loop (how /sync used to
+run), inline on the threadpool (how /sync runs now) and as a background
+job followed over /jobs/{id}. Reports /health latency percentiles for
+each, next to an idle baseline.
+
+Usage:
+    python benchmarks/bench_jobs.py
+    python benchmarks/bench_jobs.py --records 1000000
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+
+from neuai_crm.api import server
+from neuai_crm.models.schemas import Platform
+
+
+@server.app.post("/bench/sync-on-loop", include_in_schema=False)
+async def sync_on_loop():
+    """The pre-job /sync: translation runs on the event loop."""
+    return server.data_mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+
+
+def salesforce_data(n: int) -> dict:
+    """n contacts split over accounts and contacts."""
+    return {
+        "Account": [{"Id": f"001{i:09d}", "Name": f"Company {i}", "Industry": "Technology"}
+                    for i in range(n // 4)],
+        "Contact": [{"Id": f"003{i:09d}", "FirstName": "Jane", "LastName": f"Doe{i}",
+                     "Email": f"jane{i}@example.com"} for i in range(n - n // 4)]
+    }
+
+
+def health_latencies(client: TestClient, running: threading.Event) -> list:
+    """Milliseconds per /health request while running is set."""
+    latencies = []
+    while running.is_set():
+        start = time.perf_counter()
+        client.get("/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+    return latencies
+
+
+def measure(client: TestClient, start_sync) -> tuple:
+    """Run a sync with start_sync(client) while polling /health."""
+    running = threading.Event()
+    running.set()
+    latencies = []
+    poller = threading.Thread(target=lambda: latencies.extend(health_latencies(client, running)))
+    start = time.perf_counter()
+    poller.start()
+    start_sync(client)
+    elapsed = time.perf_counter() - start
+    running.clear()
+    poller.join()
+    return elapsed, latencies
+
+
+def run_job(client: TestClient) -> None:
+    """Submit a sync job and wait for it over the events stream."""
+    job_id = client.post("/jobs/sync", json={"source": "salesforce", "target": "dynamics365"}).json()["id"]
+    with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+        for _ in stream.iter_text():
+            pass
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "succeeded"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API responsiveness during sync benchmark")
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    server.data_mesh.load_data(Platform.SALESFORCE, salesforce_data(args.records))
+
+    runs = {}
+    with TestClient(server.app) as client:
+        client.get("/health")
+        idle = threading.Event()
+        idle.set()
+        threading.Timer(1.0, idle.clear).start()
+        runs["idle"] = (0.0, health_latencies(client, idle))
+        runs["sync on loop"] = measure(client, lambda c: c.post("/bench/sync-on-loop"))
+        runs["/sync (threadpool)"] = measure(
+            client, lambda c: c.post("/sync", json={"source": "salesforce", "target": "dynamics365"})
+        )
+        runs["/jobs/sync"] = measure(client, run_job)
+
+    print(f"{args.records:,} records synced salesforce -> dynamics365\n")
+    print(f"{'':<20} {'sync s':>8} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, (elapsed, latencies) in runs.items():
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(f"{name:<20} {elapsed:>8.2f} {len(ordered):>9} {statistics.median(ordered):>8.1f} "
+              f"{p99:>8.1f} {ordered[-1]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the durable mesh store.
+
+Persists synthetic Salesforce contacts to a SQLite mesh store and compares
+a warm start from the store with re-importing the same records from a JSON
+export. The warm start defers the duplicate index to first use, so it is
+also reported with the first duplicate check included.
+
+Usage:
+    python benchmarks/bench_mesh_store.py
+    python benchmarks/bench_mesh_store.py --records 1000000 --storage columnar
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.mesh_store import SQLiteMeshStore
+
+
+def contacts(n: int) -> list:
+    """Build n Salesforce contacts."""
+    return [
+        {"Id": f"003{i:012d}", "FirstName": "Jane", "LastName": f"Doe{i}",
+         "Email": f"jane{i}@example.com", "Phone": f"+1-555-{i:07d}",
+         "AccountId": f"001{i % 1000:012d}", "Title": "Director",
+         "CreatedDate": "2024-01-15T09:00:00Z"}
+        for i in range(n)
+    ]
+
+
+def timed(func):
+    """Run func, returning (result, seconds)."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesh store warm start benchmark")
+    parser.add_argument("--records", type=int, default=1000000)
+    parser.add_argument("--storage", choices=DataMesh.STORAGE_BACKENDS, default="dict")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "mesh.db")
+        json_path = os.path.join(tmp, "salesforce.json")
+
+        mesh = DataMesh(storage=args.storage, store=SQLiteMeshStore(db_path))
+        _, write_s = timed(lambda: mesh.load_data(Platform.SALESFORCE,
+                                                  {"Contact": contacts(args.records)}))
+        mesh.save_to_file(Platform.SALESFORCE, json_path)
+        mesh.store.close()
+        del mesh
+
+        restored, warm_s = timed(lambda: DataMesh(storage=args.storage,
+                                                  store=SQLiteMeshStore(db_path)))
+        assert restored.get_stats()["salesforce"]["contacts"] == args.records
+        _, index_s = timed(restored.detect_duplicates)
+        del restored
+
+        def reimport():
+            mesh = DataMesh(storage=args.storage)
+            mesh.load_from_file(Platform.SALESFORCE, json_path)
+            return mesh
+
+        _, import_s = timed(reimport)
+
+        print(f"{args.records:,} contacts, {args.storage} storage, "
+              f"store {os.path.getsize(db_path) / (1024 * 1024):.0f} MB\n")
+        print(f"{'load + persist':<24} {write_s:>8.2f}s")
+        print(f"{'warm start from store':<24} {warm_s:>8.2f}s")
+        print(f"{'  + first duplicate check':<24} {warm_s + index_s:>8.2f}s")
+        print(f"{'re-import JSON export':<24} {import_s:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
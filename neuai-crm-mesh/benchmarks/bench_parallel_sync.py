@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for parallel sync_platforms.
+
+Syncs synthetic Salesforce contacts and opportunities to Dynamics 365 with
+an increasing number of pool workers and reports records/second and the
+speedup over a serial sync.
+
+Usage:
+    python benchmarks/bench_parallel_sync.py
+    python benchmarks/bench_parallel_sync.py --records 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+
+
+def salesforce_data(n: int) -> dict:
+    """Build n contacts and n opportunities."""
+    return {
+        "Contact": [
+            {"Id": f"003{i:012d}", "FirstName": "Jane", "LastName": f"Doe{i}",
+             "Email": f"jane{i}@example.com", "Phone": "+1-555-0100",
+             "AccountId": f"001{i % 1000:012d}", "Title": "Director",
+             "CreatedDate": "2024-01-15T09:00:00Z"}
+            for i in range(n)
+        ],
+        "Opportunity": [
+            {"Id": f"006{i:012d}", "Name": f"Deal {i}", "Amount": 1000.0 + i,
+             "StageName": "Qualification", "AccountId": f"001{i % 1000:012d}",
+             "Probability": 20, "CloseDate": "2024-12-31",
+             "CreatedDate": "2024-01-15T09:00:00Z"}
+            for i in range(n)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel sync scaling benchmark")
+    parser.add_argument("--records", type=int, default=200000, help="Records per entity")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    parser.add_argument("--executor", choices=DataMesh.SYNC_EXECUTORS, default="process")
+    args = parser.parse_args()
+
+    mesh = DataMesh()
+    mesh.load_data(Platform.SALESFORCE, salesforce_data(args.records))
+    total = 2 * args.records
+
+    print(f"{total:,} records, {args.executor} pool, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>8} {'seconds':>8} {'rec/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, workers=workers,
+                            chunk_size=args.chunk_size, executor=args.executor)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>8.2f} {total / elapsed:>12,.0f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
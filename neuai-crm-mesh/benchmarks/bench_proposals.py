@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SchemaDiscovery.generate_mapping_proposals on large schemas.
+
+Builds a Salesforce Account and a Dynamics 365 account with hundreds of
+custom fields each and times proposal generation with trigram-pruned name
+similarity and with CANDIDATE_LIMIT = None, which scores every same-type
+field as proposal generation used to. Reports how many proposals differ.
+
+Usage:
+    python benchmarks/bench_proposals.py
+    python benchmarks/bench_proposals.py --source-fields 2000 --target-fields 1500
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.services.schema_discovery import FieldMetadata, FieldType, SchemaDiscovery
+
+WORDS = ["Region", "Tier", "Score", "Email", "Phone", "Renewal", "Owner", "Budget", "Segment",
+         "Status", "Partner", "Channel", "Territory", "Forecast", "Margin", "Contract"]
+TYPES = [FieldType.STRING, FieldType.PICKLIST, FieldType.DECIMAL, FieldType.DATE,
+         FieldType.BOOLEAN, FieldType.REFERENCE]
+
+
+def fields(platform: str, n: int, seed: int) -> list:
+    """n custom account fields in the platform's naming style."""
+    result = []
+    for i in range(n):
+        a, b = WORDS[(i * seed) % 16], WORDS[(i // 16 + seed) % 16]
+        name = f"{a}_{b}_{i}__c" if platform == "salesforce" else f"new_{a.lower()}{b.lower()}{i}"
+        result.append(FieldMetadata(name=name, label=f"{a} {b} {i}", field_type=TYPES[i % 6],
+                                    platform=platform, entity="account"))
+    return result
+
+
+def generate(discovery: SchemaDiscovery) -> tuple:
+    """Seconds to generate proposals, and (target, confidence) per proposal."""
+    discovery.audit_queue.clear()
+    discovery.approved_mappings.clear()
+    start = time.perf_counter()
+    proposals = discovery.generate_mapping_proposals("salesforce", "dynamics365")
+    elapsed = time.perf_counter() - start
+    return elapsed, [(p.target_field.name if p.target_field else None, round(p.confidence, 9))
+                     for p in proposals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mapping proposal benchmark")
+    parser.add_argument("--source-fields", type=int, default=600)
+    parser.add_argument("--target-fields", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        discovery = SchemaDiscovery(storage_path=tmp)
+        discovery.schemas["salesforce"] = {"account": fields("salesforce", args.source_fields, 1)}
+        discovery.schemas["dynamics365"] = {"account": fields("dynamics365", args.target_fields, 3)}
+
+        pruned_s, pruned = generate(discovery)
+        discovery.CANDIDATE_LIMIT = None
+        exhaustive_s, exhaustive = generate(discovery)
+
+    differ = sum(a != b for a, b in zip(pruned, exhaustive))
+    print(f"{args.source_fields} x {args.target_fields} account fields\n")
+    print(f"{'every same-type field':<24} {exhaustive_s:>8.2f}s")
+    print(f"{'trigram-pruned':<24} {pruned_s:>8.2f}s  ({exhaustive_s / pruned_s:.1f}x, "
+          f"{differ} of {len(pruned)} proposals differ)")
+
+
+if __name__ == "__main__":
+    main()
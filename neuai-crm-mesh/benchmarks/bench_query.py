@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for indexed record queries.
+
+Loads synthetic Salesforce opportunities and times DataMesh.query against
+exporting everything and filtering client-side. The first query on a field
+includes building its index; later queries reuse it.
+
+Usage:
+    python benchmarks/bench_query.py
+    python benchmarks/bench_query.py --records 1000000 --storage columnar
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+
+
+def opportunities(n: int) -> list:
+    """Build n opportunities across 1000 accounts and four stages."""
+    stages = ["Prospecting", "Qualification", "Proposal", "Closed Won"]
+    return [
+        {"Id": f"006{i:012d}", "Name": f"Deal {i}", "Amount": float((i * 7919) % 1000000),
+         "StageName": stages[i % 4], "AccountId": f"001{i % 1000:012d}",
+         "CloseDate": "2024-12-31"}
+        for i in range(n)
+    ]
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Average seconds per call of func."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed query benchmark")
+    parser.add_argument("--records", type=int, default=500000)
+    parser.add_argument("--storage", choices=DataMesh.STORAGE_BACKENDS, default="dict")
+    args = parser.parse_args()
+
+    mesh = DataMesh(storage=args.storage)
+    mesh.load_data(Platform.SALESFORCE, {"Opportunity": opportunities(args.records)})
+    account = f"001{7:012d}"
+
+    def export_and_filter():
+        data = mesh.export_to_platform(Platform.SALESFORCE)["Opportunity"]
+        return [r for r in data if r["AccountId"] == account]
+
+    queries = {
+        "account = X": dict(where={"AccountId": account}),
+        "account = X, by -Amount": dict(where={"AccountId": account}, sort="-Amount"),
+        "Amount in [5000, 6000)": dict(where={"Amount": {"gte": 5000, "lt": 6000}}),
+        "top 100 by -Amount": dict(sort="-Amount"),
+    }
+
+    print(f"{args.records:,} opportunities, {args.storage} storage\n")
+    print(f"{'query':<28} {'first (ms)':>11} {'indexed (ms)':>13} {'rows':>6}")
+    print(f"{'export + filter (account)':<28} {timed(export_and_filter) * 1000:>11.1f}")
+    for label, kwargs in queries.items():
+        first = timed(lambda: mesh.query(Platform.SALESFORCE, "opportunities", **kwargs))
+        indexed = timed(lambda: mesh.query(Platform.SALESFORCE, "opportunities", **kwargs), 20)
+        count = mesh.query(Platform.SALESFORCE, "opportunities", **kwargs)["count"]
+        print(f"{label:<28} {first * 1000:>11.1f} {indexed * 1000:>13.2f} {count:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the DataMesh storage backends.
+
+Loads the same synthetic Salesforce contacts into a dict-of-lists mesh and a
+columnar mesh and compares the traced memory retained by each, plus the
+time to sync the contacts to Dynamics 365.
+
+Usage:
+    python benchmarks/bench_record_store.py
+    python benchmarks/bench_record_store.py --records 1000000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+
+
+def contacts(n: int):
+    """Yield n Salesforce contact records, built one at a time."""
+    for i in range(n):
+        yield {
+            "Id": f"003{i:012d}",
+            "FirstName": "Jane",
+            "LastName": f"Doe{i % 5000}",
+            "Email": f"jane.doe{i}@example.com",
+            "Phone": f"+1-555-{i % 1000:03d}-{i % 10000:04d}",
+            "AccountId": f"001{i % 20000:012d}",
+            "Title": "Director",
+            "CreatedDate": "2024-01-15T09:00:00Z",
+        }
+
+
+def measure(storage: str, n: int) -> tuple:
+    """Return (retained MB, load seconds, sync seconds) for a backend."""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    mesh = DataMesh(storage=storage)
+    start = time.perf_counter()
+    mesh.data[Platform.SALESFORCE]["contacts"] = mesh._new_table(contacts(n))
+    load_seconds = time.perf_counter() - start
+
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+    sync_seconds = time.perf_counter() - start
+
+    return (retained - baseline) / (1024 * 1024), load_seconds, sync_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage backend memory benchmark")
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{args.records:,} Salesforce contacts\n")
+    print(f"{'backend':>10} {'memory MB':>10} {'bytes/rec':>10} {'load s':>8} {'sync s':>8}")
+    results = {}
+    for storage in DataMesh.STORAGE_BACKENDS:
+        memory, load_s, sync_s = measure(storage, args.records)
+        results[storage] = memory
+        print(f"{storage:>10} {memory:>10.1f} {memory * 1024 * 1024 / args.records:>10.0f} "
+              f"{load_s:>8.2f} {sync_s:>8.2f}")
+
+    saving = 1 - results["columnar"] / results["dict"]
+    print(f"\nColumnar storage uses {saving:.0%} less memory than dict-of-lists")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for dashboard polling against the query result cache.
+
+Loads overlapping Salesforce and Dynamics 365 contacts and times one
+dashboard poll (stats, duplicates and conflicts, as /stats, /duplicates
+and /conflicts/{source}/{target} compute them) with the result cache
+disabled and enabled, then the first poll after a load, which recomputes.
+
+Usage:
+    python benchmarks/bench_result_cache.py
+    python benchmarks/bench_result_cache.py --records 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.result_cache import ResultCache
+
+
+def contacts(platform: Platform, n: int) -> dict:
+    """n contacts; every tenth email also exists on the other platform."""
+    if platform == Platform.SALESFORCE:
+        return {"Contact": [{"Id": f"003{i:09d}", "FirstName": "Jane", "LastName": f"Doe{i}",
+                             "Email": f"jane{i}@example.com"} for i in range(n)]}
+    return {"contact": [{"contactid": f"c-{i:09d}", "firstname": "Jane", "lastname": f"Roe{i}",
+                         "emailaddress1": f"jane{i if i % 10 == 0 else n + i}@example.com"}
+                        for i in range(n)]}
+
+
+def poll(mesh: DataMesh) -> None:
+    """One dashboard refresh."""
+    mesh.get_stats()
+    mesh.detect_duplicates(0.8)
+    mesh.get_conflicts(Platform.SALESFORCE, Platform.DYNAMICS365)
+
+
+def timed(mesh: DataMesh, polls: int) -> float:
+    """Milliseconds per poll."""
+    start = time.perf_counter()
+    for _ in range(polls):
+        poll(mesh)
+    return (time.perf_counter() - start) / polls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query result cache polling benchmark")
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    mesh = DataMesh()
+    for platform in (Platform.SALESFORCE, Platform.DYNAMICS365):
+        mesh.load_data(platform, contacts(platform, args.records))
+    poll(mesh)  # Build the duplicate index
+
+    cache = mesh.result_cache
+    mesh.result_cache = ResultCache(max_size=0)  # Caches nothing
+    uncached_ms = timed(mesh, args.polls)
+    mesh.result_cache = cache
+    cached_ms = timed(mesh, args.polls)
+
+    mesh.load_data(Platform.SALESFORCE, contacts(Platform.SALESFORCE, args.records))
+    after_load_ms = timed(mesh, 1)
+
+    print(f"{args.records:,} contacts per platform, {args.polls} polls\n")
+    print(f"{'uncached':<16} {uncached_ms:>10.2f} ms/poll")
+    print(f"{'cached':<16} {cached_ms:>10.3f} ms/poll  ({uncached_ms / cached_ms:.0f}x)")
+    print(f"{'after a load':<16} {after_load_ms:>10.2f} ms/poll")
+    print(f"\ncache: {mesh.result_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the streaming import path.
+
+Writes synthetic Salesforce exports of increasing size and measures the
+parser's peak traced memory with json.load versus the streaming reader
+(records are consumed and discarded, so only parser overhead is measured).
+Streaming peak memory should stay flat as the file grows.
+
+Usage:
+    python benchmarks/bench_streaming_load.py
+    python benchmarks/bench_streaming_load.py --sizes 50000 200000 --format ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.services.streaming import iter_export_records, iter_ndjson_records
+
+
+def write_export(path: str, n: int, fmt: str) -> None:
+    """Write n Salesforce contacts as a JSON export or NDJSON."""
+    with open(path, "w") as f:
+        if fmt == "ndjson":
+            for i in range(n):
+                f.write(json.dumps({
+                    "attributes": {"type": "Contact"}, "Id": f"003{i:012d}",
+                    "FirstName": "Jane", "LastName": f"Doe{i}", "Email": f"jane{i}@example.com"
+                }) + "\n")
+            return
+
+        f.write('{"Contact": [')
+        for i in range(n):
+            if i:
+                f.write(",")
+            f.write(json.dumps({
+                "Id": f"003{i:012d}", "FirstName": "Jane", "LastName": f"Doe{i}",
+                "Email": f"jane{i}@example.com"
+            }))
+        f.write("]}")
+
+
+def measure(func) -> tuple:
+    """Run func under tracemalloc, returning (seconds, peak MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming import memory benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'file MB':>9} {'json.load MB':>13} {'stream MB':>10} {'stream s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            path = os.path.join(tmp, f"export.{args.format}")
+            write_export(path, n, args.format)
+            file_mb = os.path.getsize(path) / (1024 * 1024)
+
+            def eager():
+                with open(path) as f:
+                    if args.format == "ndjson":
+                        [json.loads(line) for line in f]
+                    else:
+                        json.load(f)
+
+            def streamed():
+                with open(path, "rb") as f:
+                    reader = iter_ndjson_records if args.format == "ndjson" else iter_export_records
+                    for _ in reader(f):
+                        pass
+
+            _, eager_peak = measure(eager)
+            stream_time, stream_peak = measure(streamed)
+            print(f"{n:>10} {file_mb:>9.1f} {eager_peak:>13.1f} {stream_peak:>10.2f} {stream_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for SchemaTranslator.
+
+Translates synthetic Salesforce records to Dynamics 365 with the entity
+classes (``from_platform``/``to_platform`` per record, as translate_entity
+used to) and with the compiled translation plans, and reports records/second
+for each entity type.
+
+Usage:
+    python benchmarks/bench_translator.py
+    python benchmarks/bench_translator.py --records 500000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neuai_crm.models.entities import Activity, Company, Contact, Deal
+from neuai_crm.models.schemas import Platform, SCHEMA_MAPPINGS
+from neuai_crm.services.translator import SchemaTranslator
+
+ENTITY_CLASSES = {"contacts": Contact, "companies": Company, "deals": Deal, "activities": Activity}
+
+
+def records(entity: str, n: int) -> list:
+    """Build n Salesforce records of an entity type."""
+    fields = SCHEMA_MAPPINGS["fields"][entity]["salesforce"]
+    stages = SCHEMA_MAPPINGS["stages"]["salesforce"]
+    statuses = SCHEMA_MAPPINGS["status"]["salesforce"]
+    result = []
+    for i in range(n):
+        record = {field: f"{field}-{i}" for field in fields}
+        if entity == "deals":
+            record.update({"Amount": 1000.0 + i, "StageName": stages[i % len(stages)],
+                           "Probability": i % 100})
+        elif entity == "activities":
+            record["Status"] = statuses[i % len(statuses)]
+        result.append(record)
+    return result
+
+
+def rate(func, n: int) -> float:
+    """Run func and return records/second."""
+    start = time.perf_counter()
+    func()
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation throughput benchmark")
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    translator = SchemaTranslator()
+    source, target = Platform.SALESFORCE, Platform.DYNAMICS365
+
+    print(f"{args.records:,} records per entity, salesforce -> dynamics365\n")
+    print(f"{'entity':>12} {'entity class/s':>15} {'plan/s':>12} {'speedup':>8}")
+    for entity, entity_class in ENTITY_CLASSES.items():
+        batch = records(entity, args.records)
+
+        def legacy():
+            for record in batch:
+                entity_class.from_platform(record, source).to_platform(target)
+
+        def compiled():
+            translator.translate_batch(batch, source, target, entity)
+
+        before = rate(legacy, args.records)
+        after = rate(compiled, args.records)
+        print(f"{entity:>12} {before:>15,.0f} {after:>12,.0f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,59 @@
 FastAPI server for NeuAI CRM Data Mesh API.
 """
 
+import functools
+import json
+import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
 from neuai_crm.models.schemas import Platform, SCHEMA_MAPPINGS
 from neuai_crm.services.data_mesh import DataMesh
 from neuai_crm.services.intelligence import IntelligenceLayer
+from neuai_crm.services.jobs import JobManager, JobQueueFull, JobStatus, Report
+from neuai_crm.services.mesh_store import SQLiteMeshStore
+from neuai_crm.services.streaming import gzip_chunks
 
 
 # Initialize core services
-data_mesh = DataMesh()
+data_mesh = DataMesh(
+    storage=os.getenv("MESH_STORAGE", "dict"),
+    store=SQLiteMeshStore(os.environ["MESH_STORE_PATH"]) if os.getenv("MESH_STORE_PATH") else None
+)
 intelligence = IntelligenceLayer(data_mesh)
+job_manager = JobManager(
+    max_workers=int(os.getenv("MESH_JOB_WORKERS", "1")),
+    max_pending=int(os.getenv("MESH_JOB_QUEUE", "16"))
+)
+
+# A heavy operation bound to its validated request: called as operation(report)
+# in a job, or with report=None inline
+Operation = Callable[[Optional[Report]], Dict]
+
+# The data mesh and the intelligence layer lock themselves (the mesh with a
+# readers-writer lock held only around each read or write, never for a whole
+# job), so handlers that use them are plain functions run on the threadpool.
+# The Schema Brain and schema discovery each have a lock of their own, taken
+# by the handlers that use them
+
+
+def _holding(lock) -> Callable[[Callable], Callable]:
+    """Run a (synchronous) route handler, on the threadpool, under a lock."""
+    def decorate(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def locked(*args, **kwargs):
+            with lock:
+                return handler(*args, **kwargs)
+
+        return locked
+
+    return decorate
 
 
 def create_app() -> FastAPI:
@@ -33,6 +71,7 @@ Unified API for managing CRM data across Salesforce, Dynamics 365, and Local CRM
 - **Conflict Resolution**: Identify and resolve data conflicts
 - **Data Sync**: Synchronize data between platforms
 - **Natural Language Queries**: Process queries in plain English
+- **Background Jobs**: Run syncs, duplicate and conflict scans as jobs with progress and cancellation
 
 ## Platforms Supported
 
@@ -105,12 +144,18 @@ class SyncRequest(BaseModel):
     """Platform sync request."""
     source: str = Field(..., description="Source platform")
     target: str = Field(..., description="Target platform")
+    workers: int = Field(1, ge=1, le=64, description="Parallel translation workers")
+    chunk_size: int = Field(10000, ge=1, description="Records per parallel chunk")
+    executor: str = Field("process", description="Parallel pool type: process or thread")
+    delta: bool = Field(False, description="Sync only records changed since the last delta sync")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "source": "salesforce",
-                "target": "dynamics365"
+                "target": "dynamics365",
+                "workers": 4,
+                "chunk_size": 10000
             }
         }
 
@@ -132,6 +177,27 @@ class LoadDataRequest(BaseModel):
         }
 
 
+class RecordQueryRequest(BaseModel):
+    """Record query request."""
+    where: Optional[Dict[str, Any]] = Field(
+        None, description="Field predicates: a value for equality, or {operator: value}"
+    )
+    fields: Optional[List[str]] = Field(None, description="Fields to return (default: all)")
+    sort: Optional[str] = Field(None, description="Sort field, prefixed with - for descending")
+    limit: int = Field(100, ge=1, le=1000, description="Records per page")
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "where": {"StageName": "Prospecting", "Amount": {"gte": 50000}},
+                "fields": ["Id", "Name", "Amount"],
+                "sort": "-Amount",
+                "limit": 50
+            }
+        }
+
+
 class ConflictResolutionRequest(BaseModel):
     """Conflict resolution request."""
     conflict_id: str = Field(..., description="ID of the conflict to resolve")
@@ -168,7 +234,7 @@ async def health():
 
 
 @app.get("/stats", tags=["Data"])
-async def get_stats():
+def get_stats():
     """Get record counts across all platforms."""
     stats = data_mesh.get_stats()
     total = sum(sum(v.values()) for v in stats.values())
@@ -178,6 +244,15 @@ async def get_stats():
     }
 
 
+@app.get("/cache", tags=["Data"])
+def get_cache_stats():
+    """Get query result cache counters and the current data version."""
+    return {
+        "data_version": data_mesh.data_version,
+        **data_mesh.result_cache.stats()
+    }
+
+
 @app.get("/schema", tags=["Schema"])
 async def get_schema():
     """Get schema mappings between platforms."""
@@ -207,7 +282,7 @@ async def get_entity_schema(entity_type: str):
 
 
 @app.post("/query", tags=["Intelligence"])
-async def process_query(request: QueryRequest):
+def process_query(request: QueryRequest):
     """
     Process a natural language query.
 
@@ -221,7 +296,7 @@ async def process_query(request: QueryRequest):
 
 
 @app.post("/translate", tags=["Translation"])
-async def translate_record(request: TranslateRequest):
+def translate_record(request: TranslateRequest):
     """Translate a record between platforms."""
     try:
         from_platform = Platform(request.from_platform)
@@ -245,60 +320,100 @@ async def translate_record(request: TranslateRequest):
     }
 
 
-@app.post("/sync", tags=["Sync"])
-async def sync_platforms(request: SyncRequest):
-    """Sync data between platforms."""
+def _sync_operation(request: SyncRequest) -> Operation:
+    """Validate a sync request and bind it as an operation."""
     try:
         source = Platform(request.source)
         target = Platform(request.target)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid platform: {e}")
+    if request.executor not in DataMesh.SYNC_EXECUTORS:
+        raise HTTPException(status_code=400, detail=f"Unknown sync executor: {request.executor}")
+
+    def operation(report: Optional[Report] = None) -> Dict:
+        result = data_mesh.sync_platforms(
+            source, target,
+            workers=request.workers,
+            chunk_size=request.chunk_size,
+            executor=request.executor,
+            delta=request.delta,
+            progress=report
+        )
+        return {
+            "status": "success",
+            "source": request.source,
+            "target": request.target,
+            "result": result
+        }
 
-    result = data_mesh.sync_platforms(source, target)
-
-    return {
-        "status": "success",
-        "source": request.source,
-        "target": request.target,
-        "result": result
-    }
+    return operation
 
 
-@app.get("/duplicates", tags=["Duplicates"])
-async def detect_duplicates(
-    threshold: float = Query(0.8, ge=0.0, le=1.0, description="Match confidence threshold")
-):
-    """Detect duplicate records across platforms."""
-    duplicates = data_mesh.detect_duplicates(threshold)
+def _duplicates_operation(threshold: float, fuzzy: bool) -> Operation:
+    """Bind a duplicate scan as an operation."""
+    def operation(report: Optional[Report] = None) -> Dict:
+        duplicates = data_mesh.detect_duplicates(threshold, fuzzy=fuzzy, progress=report)
+        return {
+            "count": len(duplicates),
+            "threshold": threshold,
+            "fuzzy": fuzzy,
+            "duplicates": duplicates
+        }
 
-    return {
-        "count": len(duplicates),
-        "threshold": threshold,
-        "duplicates": duplicates
-    }
+    return operation
 
 
-@app.get("/conflicts/{source}/{target}", tags=["Conflicts"])
-async def get_conflicts(source: str, target: str):
-    """Get conflicts between two platforms."""
+def _conflicts_operation(source: str, target: str) -> Operation:
+    """Validate a conflict scan and bind it as an operation."""
     try:
         source_platform = Platform(source)
         target_platform = Platform(target)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid platform: {e}")
 
-    conflicts = data_mesh.get_conflicts(source_platform, target_platform)
+    def operation(report: Optional[Report] = None) -> Dict:
+        conflicts = data_mesh.get_conflicts(source_platform, target_platform, progress=report)
+        return {
+            "source": source,
+            "target": target,
+            "count": len(conflicts),
+            "conflicts": conflicts
+        }
 
-    return {
-        "source": source,
-        "target": target,
-        "count": len(conflicts),
-        "conflicts": conflicts
-    }
+    return operation
+
+
+def _run_inline(operation: Operation) -> Dict:
+    """Run an operation in a handler, answering 400 for invalid arguments."""
+    try:
+        return operation()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/sync", tags=["Sync"])
+def sync_platforms(request: SyncRequest):
+    """Sync data between platforms."""
+    return _run_inline(_sync_operation(request))
+
+
+@app.get("/duplicates", tags=["Duplicates"])
+def detect_duplicates(
+    threshold: float = Query(0.8, ge=0.0, le=1.0, description="Match confidence threshold"),
+    fuzzy: bool = Query(False, description="Use fuzzy matching (typos, name variants)")
+):
+    """Detect duplicate records across platforms."""
+    return _run_inline(_duplicates_operation(threshold, fuzzy))
+
+
+@app.get("/conflicts/{source}/{target}", tags=["Conflicts"])
+def get_conflicts(source: str, target: str):
+    """Get conflicts between two platforms."""
+    return _run_inline(_conflicts_operation(source, target))
 
 
 @app.post("/conflicts/resolve", tags=["Conflicts"])
-async def resolve_conflict(request: ConflictResolutionRequest):
+def resolve_conflict(request: ConflictResolutionRequest):
     """Resolve a specific conflict."""
     result = data_mesh.resolve_conflict(
         request.conflict_id,
@@ -310,7 +425,7 @@ async def resolve_conflict(request: ConflictResolutionRequest):
 
 
 @app.post("/load", tags=["Data"])
-async def load_data(request: LoadDataRequest):
+def load_data(request: LoadDataRequest):
     """Load data into a platform."""
     try:
         platform = Platform(request.platform)
@@ -327,24 +442,83 @@ async def load_data(request: LoadDataRequest):
 
 
 @app.get("/export/{platform}", tags=["Data"])
-async def export_data(platform: str):
-    """Export data in platform-specific format."""
+def export_data(
+    platform: str,
+    format: str = Query("json", description="json (streamed in chunks) or ndjson (one record per line)"),
+    gzip: bool = Query(False, description="gzip-compress the response")
+):
+    """Export data in platform-specific format, streamed as it is serialized."""
+    try:
+        platform_enum = Platform(platform)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid platform: {e}")
+
+    # Counted as records are serialized, so it matches the data sent even
+    # if the platform changes between chunks
+    record_count = [0]
+
+    def count(records: int) -> None:
+        record_count[0] += records
+
+    try:
+        chunks = data_mesh.iter_export(platform_enum, format, on_records=count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "json":
+        chunks = _export_envelope(platform, chunks, record_count)
+    headers = {}
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type="application/x-ndjson" if format == "ndjson" else "application/json",
+        headers=headers
+    )
+
+
+def _export_envelope(platform: str, data_chunks, record_count: List[int]):
+    """Wrap streamed export data in the {platform, data, record_count} response object.
+
+    record_count holds the running count of records in data_chunks; it is
+    written after the data, once every chunk is out.
+    """
+    yield f'{{"platform":{json.dumps(platform)},"data":'.encode()
+    yield from data_chunks
+    yield f',"record_count":{record_count[0]}}}'.encode()
+
+
+@app.post("/records/{platform}/{entity}/query", tags=["Data"])
+def query_records(platform: str, entity: str, request: RecordQueryRequest):
+    """Query one entity's records with predicates, projection, sorting and pagination."""
     try:
         platform_enum = Platform(platform)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid platform: {e}")
 
-    data = data_mesh.export_to_platform(platform_enum)
+    try:
+        result = data_mesh.query(
+            platform_enum, entity,
+            where=request.where,
+            fields=request.fields,
+            sort=request.sort,
+            limit=request.limit,
+            cursor=request.cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
         "platform": platform,
-        "data": data,
-        "record_count": sum(len(v) for v in data.values())
+        "entity": entity,
+        **result
     }
 
 
 @app.delete("/clear/{platform}", tags=["Data"])
-async def clear_platform(platform: str):
+def clear_platform(platform: str):
     """Clear all data for a platform."""
     try:
         platform_enum = Platform(platform)
@@ -357,7 +531,7 @@ async def clear_platform(platform: str):
 
 
 @app.get("/sync-log", tags=["Sync"])
-async def get_sync_log():
+def get_sync_log():
     """Get the sync operation log."""
     return {
         "log": data_mesh.get_sync_log(),
@@ -366,7 +540,7 @@ async def get_sync_log():
 
 
 @app.get("/conversation", tags=["Intelligence"])
-async def get_conversation():
+def get_conversation():
     """Get the conversation history."""
     return {
         "history": intelligence.get_conversation_history(),
@@ -374,8 +548,17 @@ async def get_conversation():
     }
 
 
+@app.get("/conversation/results/{result_id}", tags=["Intelligence"])
+def get_conversation_result(result_id: str):
+    """Get the full response behind a conversation history entry."""
+    result = intelligence.get_result(result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Result {result_id} not found or no longer kept")
+    return result
+
+
 @app.delete("/conversation", tags=["Intelligence"])
-async def clear_conversation():
+def clear_conversation():
     """Clear the conversation history."""
     intelligence.clear_history()
     return {"status": "cleared"}
@@ -426,8 +609,30 @@ class AnalyzeRecordRequest(BaseModel):
     entity_type: str = Field(..., description="Entity type")
 
 
+class BatchTranslateRequest(BaseModel):
+    """Batch record translation request."""
+    records: List[Dict] = Field(..., description="Records to translate")
+    from_platform: str = Field(..., description="Source platform")
+    to_platform: str = Field(..., description="Target platform")
+    entity_type: str = Field(..., description="Entity type")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "records": [
+                    {"FirstName": "John", "LastName": "Doe", "Email": "john.doe@example.com"},
+                    {"FirstName": "Jane", "LastName": "Roe", "Email": "jane.roe@example.com"}
+                ],
+                "from_platform": "salesforce",
+                "to_platform": "dynamics365",
+                "entity_type": "contacts"
+            }
+        }
+
+
 @app.get("/brain/status", tags=["Schema Brain"])
-async def get_brain_status():
+@_holding(schema_brain.lock)
+def get_brain_status():
     """Get Schema Brain status and statistics."""
     stats = schema_brain.get_mapping_stats()
     return {
@@ -438,7 +643,8 @@ async def get_brain_status():
 
 
 @app.get("/brain/mappings", tags=["Schema Brain"])
-async def get_learned_mappings(
+@_holding(schema_brain.lock)
+def get_learned_mappings(
     entity: Optional[str] = Query(None, description="Filter by entity type"),
     source: Optional[str] = Query(None, description="Filter by mapping source"),
     min_confidence: Optional[float] = Query(None, description="Minimum confidence")
@@ -466,7 +672,8 @@ async def get_learned_mappings(
 
 
 @app.get("/brain/pending", tags=["Schema Brain"])
-async def get_pending_reviews():
+@_holding(schema_brain.lock)
+def get_pending_reviews():
     """Get mappings that need human review."""
     pending = schema_brain.get_pending_reviews()
     return {
@@ -476,7 +683,8 @@ async def get_pending_reviews():
 
 
 @app.post("/brain/teach", tags=["Schema Brain"])
-async def teach_mapping(request: TeachMappingRequest):
+@_holding(schema_brain.lock)
+def teach_mapping(request: TeachMappingRequest):
     """Teach the Schema Brain a new field mapping."""
     mapping = schema_brain.provide_feedback(
         source_platform=request.source_platform,
@@ -495,7 +703,8 @@ async def teach_mapping(request: TeachMappingRequest):
 
 
 @app.post("/brain/confirm", tags=["Schema Brain"])
-async def confirm_mapping(request: ConfirmMappingRequest):
+@_holding(schema_brain.lock)
+def confirm_mapping(request: ConfirmMappingRequest):
     """Confirm an inferred mapping is correct (boosts confidence)."""
     mapping = schema_brain.confirm_mapping(
         source_platform=request.source_platform,
@@ -515,7 +724,8 @@ async def confirm_mapping(request: ConfirmMappingRequest):
 
 
 @app.post("/brain/reject", tags=["Schema Brain"])
-async def reject_mapping(request: ConfirmMappingRequest):
+@_holding(schema_brain.lock)
+def reject_mapping(request: ConfirmMappingRequest):
     """Reject an inferred mapping (decreases confidence)."""
     success = schema_brain.reject_mapping(
         source_platform=request.source_platform,
@@ -531,7 +741,8 @@ async def reject_mapping(request: ConfirmMappingRequest):
 
 
 @app.post("/brain/analyze", tags=["Schema Brain"])
-async def analyze_record(request: AnalyzeRecordRequest):
+@_holding(schema_brain.lock)
+def analyze_record(request: AnalyzeRecordRequest):
     """Analyze a record and propose mappings for unknown fields."""
     try:
         source = Platform(request.source_platform)
@@ -566,7 +777,8 @@ async def analyze_record(request: AnalyzeRecordRequest):
 
 
 @app.post("/brain/translate", tags=["Schema Brain"])
-async def smart_translate(request: TranslateRequest):
+@_holding(schema_brain.lock)
+def smart_translate(request: TranslateRequest):
     """
     Translate a record using the Schema Brain's learned mappings.
 
@@ -623,8 +835,40 @@ async def smart_translate(request: TranslateRequest):
     }
 
 
+@app.post("/brain/translate/batch", tags=["Schema Brain"])
+@_holding(schema_brain.lock)
+def smart_translate_batch(request: BatchTranslateRequest):
+    """
+    Translate many records using the Schema Brain's learned mappings.
+
+    Field mappings are resolved once per record shape (set of fields) and
+    reused for every record with that shape; mapping info is aggregated
+    over the batch.
+    """
+    try:
+        source = Platform(request.from_platform)
+        target = Platform(request.to_platform)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid platform: {e}")
+
+    result = schema_brain.translate_records(
+        request.records, source, target, request.entity_type
+    )
+
+    return {
+        "status": "success",
+        "count": len(result["translated"]),
+        "shapes": result["shapes"],
+        "translated": result["translated"],
+        "field_mappings": result["field_mappings"],
+        "needs_review": result["needs_review"],
+        "review_count": len(result["needs_review"])
+    }
+
+
 @app.get("/brain/export", tags=["Schema Brain"])
-async def export_mappings(
+@_holding(schema_brain.lock)
+def export_mappings(
     format: str = Query("json", description="Export format (json or markdown)")
 ):
     """Export all learned mappings."""
@@ -648,6 +892,8 @@ class DiscoverSalesforceRequest(BaseModel):
     password: str = Field(..., description="Salesforce password")
     security_token: str = Field(..., description="Salesforce security token")
     domain: str = Field("login", description="Salesforce domain (login or test)")
+    workers: int = Field(1, ge=1, le=32, description="Concurrent describe calls")
+    use_cache: bool = Field(True, description="Reuse unchanged describes from the describe cache")
 
     class Config:
         json_schema_extra = {
@@ -655,7 +901,8 @@ class DiscoverSalesforceRequest(BaseModel):
                 "username": "user@example.com",
                 "password": "password123",
                 "security_token": "XXXXXXXXXXXX",
-                "domain": "login"
+                "domain": "login",
+                "workers": 8
             }
         }
 
@@ -664,12 +911,15 @@ class DiscoverDynamicsRequest(BaseModel):
     """Request to discover Dynamics 365 schema."""
     access_token: str = Field(..., description="OAuth access token")
     environment_url: str = Field(..., description="Dynamics 365 environment URL")
+    workers: int = Field(1, ge=1, le=32, description="Concurrent metadata requests")
+    use_cache: bool = Field(True, description="Reuse unchanged entity metadata from the describe cache")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "access_token": "eyJ0eXAi...",
-                "environment_url": "https://yourorg.crm.dynamics.com"
+                "environment_url": "https://yourorg.crm.dynamics.com",
+                "workers": 8
             }
         }
 
@@ -811,7 +1061,8 @@ def _init_mock_schemas():
 
 
 @app.get("/discovery/status", tags=["Schema Discovery"])
-async def get_discovery_status():
+@_holding(schema_discovery.lock)
+def get_discovery_status():
     """Get schema discovery status and statistics."""
     summary = schema_discovery.get_audit_summary()
 
@@ -833,7 +1084,7 @@ async def get_discovery_status():
 
 
 @app.post("/discovery/salesforce", tags=["Schema Discovery"])
-async def discover_salesforce_schema(request: DiscoverSalesforceRequest):
+def discover_salesforce_schema(request: DiscoverSalesforceRequest):
     """
     Discover schema from a Salesforce instance.
 
@@ -850,7 +1101,9 @@ async def discover_salesforce_schema(request: DiscoverSalesforceRequest):
             domain=request.domain
         )
 
-        result = schema_discovery.discover_salesforce(sf)
+        result = schema_discovery.discover_salesforce(
+            sf, workers=request.workers, use_cache=request.use_cache
+        )
 
         return {
             "status": "success",
@@ -858,6 +1111,7 @@ async def discover_salesforce_schema(request: DiscoverSalesforceRequest):
                 "entities_discovered": result.entities_discovered,
                 "fields_discovered": result.fields_discovered,
                 "custom_fields": result.custom_fields,
+                "entities_from_cache": result.entities_from_cache,
                 "duration_seconds": result.duration_seconds,
                 "errors": result.errors
             }
@@ -873,7 +1127,7 @@ async def discover_salesforce_schema(request: DiscoverSalesforceRequest):
 
 
 @app.post("/discovery/dynamics365", tags=["Schema Discovery"])
-async def discover_dynamics365_schema(request: DiscoverDynamicsRequest):
+def discover_dynamics365_schema(request: DiscoverDynamicsRequest):
     """
     Discover schema from a Dynamics 365 instance.
 
@@ -883,7 +1137,9 @@ async def discover_dynamics365_schema(request: DiscoverDynamicsRequest):
     try:
         result = schema_discovery.discover_dynamics365(
             request.access_token,
-            request.environment_url
+            request.environment_url,
+            workers=request.workers,
+            use_cache=request.use_cache
         )
 
         return {
@@ -892,6 +1148,7 @@ async def discover_dynamics365_schema(request: DiscoverDynamicsRequest):
                 "entities_discovered": result.entities_discovered,
                 "fields_discovered": result.fields_discovered,
                 "custom_fields": result.custom_fields,
+                "entities_from_cache": result.entities_from_cache,
                 "duration_seconds": result.duration_seconds,
                 "errors": result.errors
             }
@@ -902,7 +1159,8 @@ async def discover_dynamics365_schema(request: DiscoverDynamicsRequest):
 
 
 @app.post("/discovery/mock", tags=["Schema Discovery"])
-async def load_mock_schemas():
+@_holding(schema_discovery.lock)
+def load_mock_schemas():
     """
     Load mock schema data for testing without live CRM connections.
 
@@ -928,101 +1186,110 @@ async def load_mock_schemas():
     }
 
 
+def _propose_operation(request: GenerateProposalsRequest) -> Operation:
+    """Bind a proposal request as an operation."""
+    def operation(report: Optional[Report] = None) -> Dict:
+        # The schemas are checked under the same lock as the proposals are
+        # generated, so a reset or rediscovery can't slip in between
+        with schema_discovery.lock:
+            for platform in (request.source_platform, request.target_platform):
+                if not schema_discovery.schemas.get(platform):
+                    raise ValueError(f"No schema discovered for {platform}. Run discovery first.")
+            proposals = schema_discovery.generate_mapping_proposals(
+                request.source_platform,
+                request.target_platform,
+                request.auto_approve_threshold,
+                progress=report
+            )
+
+        # Categorize results
+        auto_approved = [p for p in proposals if p.status == AuditStatus.AUTO_APPROVED]
+        pending = [p for p in proposals if p.status == AuditStatus.PENDING]
+
+        return {
+            "status": "success",
+            "total_proposals": len(proposals),
+            "auto_approved": len(auto_approved),
+            "pending_review": len(pending),
+            "summary": {
+                "high_confidence": len([p for p in pending if p.confidence >= 0.8]),
+                "medium_confidence": len([p for p in pending if 0.6 <= p.confidence < 0.8]),
+                "low_confidence": len([p for p in pending if p.confidence < 0.6])
+            }
+        }
+
+    return operation
+
+
 @app.post("/discovery/propose", tags=["Schema Discovery"])
-async def generate_proposals(request: GenerateProposalsRequest):
+def generate_proposals(request: GenerateProposalsRequest):
     """
     Generate mapping proposals between two platforms.
 
     The AI analyzes field names, types, and patterns to propose intelligent mappings.
     High-confidence proposals may be auto-approved.
     """
-    if not schema_discovery.schemas.get(request.source_platform):
-        raise HTTPException(
-            status_code=400,
-            detail=f"No schema discovered for {request.source_platform}. Run discovery first."
-        )
-
-    if not schema_discovery.schemas.get(request.target_platform):
-        raise HTTPException(
-            status_code=400,
-            detail=f"No schema discovered for {request.target_platform}. Run discovery first."
-        )
-
-    proposals = schema_discovery.generate_mapping_proposals(
-        request.source_platform,
-        request.target_platform,
-        request.auto_approve_threshold
-    )
-
-    # Categorize results
-    auto_approved = [p for p in proposals if p.status == AuditStatus.AUTO_APPROVED]
-    pending = [p for p in proposals if p.status == AuditStatus.PENDING]
-
-    return {
-        "status": "success",
-        "total_proposals": len(proposals),
-        "auto_approved": len(auto_approved),
-        "pending_review": len(pending),
-        "summary": {
-            "high_confidence": len([p for p in pending if p.confidence >= 0.8]),
-            "medium_confidence": len([p for p in pending if 0.6 <= p.confidence < 0.8]),
-            "low_confidence": len([p for p in pending if p.confidence < 0.6])
-        }
-    }
+    return _run_inline(_propose_operation(request))
 
 
 @app.get("/discovery/audit-queue", tags=["Schema Discovery"])
-async def get_audit_queue(
+@_holding(schema_discovery.lock)
+def get_audit_queue(
     status: Optional[str] = Query(None, description="Filter by status"),
     entity: Optional[str] = Query(None, description="Filter by entity"),
+    platform: Optional[str] = Query(None, description="Filter by source or target platform"),
+    bucket: Optional[str] = Query(None, description="Filter by confidence bucket (high, medium, low)"),
     min_confidence: Optional[float] = Query(None, description="Minimum confidence"),
+    sort: str = Query("-confidence", description="-confidence (highest first) or confidence"),
     limit: int = Query(50, description="Maximum results to return"),
-    offset: int = Query(0, description="Results offset")
+    offset: int = Query(0, description="Results offset"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
     """
     Get proposals pending human audit.
 
     Returns proposals sorted by confidence (highest first) for efficient review.
+    Filters are answered from the queue's indexes; pass next_cursor back as
+    cursor to fetch the following page.
     """
-    queue = schema_discovery.audit_queue
-
-    # Filter by status
+    status_enum = None
     if status:
         try:
             status_enum = AuditStatus(status)
-            queue = [p for p in queue if p.status == status_enum]
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
 
-    # Filter by entity
-    if entity:
-        queue = [p for p in queue if p.source_entity == entity or p.target_entity == entity]
-
-    # Filter by confidence
-    if min_confidence:
-        queue = [p for p in queue if p.confidence >= min_confidence]
-
-    # Sort by confidence (highest first)
-    queue = sorted(queue, key=lambda x: x.confidence, reverse=True)
-
-    # Paginate
-    total = len(queue)
-    queue = queue[offset:offset + limit]
+    try:
+        page = schema_discovery.query_audit_queue(
+            status=status_enum,
+            bucket=bucket,
+            platform=platform,
+            entity=entity,
+            min_confidence=min_confidence,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
-        "total": total,
+        "total": page["total"],
         "offset": offset,
         "limit": limit,
-        "proposals": [p.to_dict() for p in queue]
+        "next_cursor": page["next_cursor"],
+        "proposals": [p.to_dict() for p in page["proposals"]]
     }
 
 
 @app.get("/discovery/audit-queue/{proposal_id}", tags=["Schema Discovery"])
-async def get_proposal(proposal_id: str):
+@_holding(schema_discovery.lock)
+def get_proposal(proposal_id: str):
     """Get a specific proposal by ID."""
-    for p in schema_discovery.audit_queue:
-        if p.id == proposal_id:
-            return {"proposal": p.to_dict()}
+    proposal = schema_discovery.audit_queue.get(proposal_id)
+    if proposal is not None:
+        return {"proposal": proposal.to_dict()}
 
     # Check approved mappings
     if proposal_id in schema_discovery.approved_mappings:
@@ -1032,7 +1299,8 @@ async def get_proposal(proposal_id: str):
 
 
 @app.post("/discovery/approve/{proposal_id}", tags=["Schema Discovery"])
-async def approve_proposal(proposal_id: str, request: ApproveProposalRequest):
+@_holding(schema_discovery.lock)
+def approve_proposal(proposal_id: str, request: ApproveProposalRequest):
     """
     Approve a mapping proposal.
 
@@ -1054,7 +1322,8 @@ async def approve_proposal(proposal_id: str, request: ApproveProposalRequest):
 
 
 @app.post("/discovery/reject/{proposal_id}", tags=["Schema Discovery"])
-async def reject_proposal(proposal_id: str, request: ApproveProposalRequest):
+@_holding(schema_discovery.lock)
+def reject_proposal(proposal_id: str, request: ApproveProposalRequest):
     """
     Reject a mapping proposal.
 
@@ -1076,7 +1345,8 @@ async def reject_proposal(proposal_id: str, request: ApproveProposalRequest):
 
 
 @app.post("/discovery/modify/{proposal_id}", tags=["Schema Discovery"])
-async def modify_proposal(proposal_id: str, request: ModifyProposalRequest):
+@_holding(schema_discovery.lock)
+def modify_proposal(proposal_id: str, request: ModifyProposalRequest):
     """
     Modify and approve a proposal with a different target field.
 
@@ -1099,7 +1369,8 @@ async def modify_proposal(proposal_id: str, request: ModifyProposalRequest):
 
 
 @app.post("/discovery/bulk-approve", tags=["Schema Discovery"])
-async def bulk_approve_proposals(request: BulkApproveRequest):
+@_holding(schema_discovery.lock)
+def bulk_approve_proposals(request: BulkApproveRequest):
     """
     Bulk approve all proposals above a confidence threshold.
 
@@ -1119,7 +1390,8 @@ async def bulk_approve_proposals(request: BulkApproveRequest):
 
 
 @app.get("/discovery/approved", tags=["Schema Discovery"])
-async def get_approved_mappings(
+@_holding(schema_discovery.lock)
+def get_approved_mappings(
     entity: Optional[str] = Query(None, description="Filter by entity"),
     source_platform: Optional[str] = Query(None, description="Filter by source platform")
 ):
@@ -1139,7 +1411,8 @@ async def get_approved_mappings(
 
 
 @app.get("/discovery/export", tags=["Schema Discovery"])
-async def export_approved_mappings():
+@_holding(schema_discovery.lock)
+def export_approved_mappings():
     """
     Export approved mappings in a format usable by the sync engine.
 
@@ -1150,7 +1423,8 @@ async def export_approved_mappings():
 
 
 @app.get("/discovery/schemas/{platform}", tags=["Schema Discovery"])
-async def get_discovered_schema(platform: str):
+@_holding(schema_discovery.lock)
+def get_discovered_schema(platform: str):
     """Get the discovered schema for a platform."""
     if platform not in schema_discovery.schemas:
         raise HTTPException(status_code=404, detail=f"Platform {platform} not found")
@@ -1168,7 +1442,8 @@ async def get_discovered_schema(platform: str):
 
 
 @app.get("/discovery/schemas/{platform}/{entity}", tags=["Schema Discovery"])
-async def get_entity_fields(platform: str, entity: str):
+@_holding(schema_discovery.lock)
+def get_entity_fields(platform: str, entity: str):
     """Get discovered fields for a specific entity."""
     if platform not in schema_discovery.schemas:
         raise HTTPException(status_code=404, detail=f"Platform {platform} not found")
@@ -1189,10 +1464,11 @@ async def get_entity_fields(platform: str, entity: str):
 
 
 @app.delete("/discovery/reset", tags=["Schema Discovery"])
-async def reset_discovery():
+@_holding(schema_discovery.lock)
+def reset_discovery():
     """Reset all discovery data (schemas, proposals, approvals)."""
     schema_discovery.schemas = {"salesforce": {}, "dynamics365": {}, "local": {}}
-    schema_discovery.audit_queue = []
+    schema_discovery.audit_queue.clear()
     schema_discovery.approved_mappings = {}
     schema_discovery.discovery_history = []
     schema_discovery._save_state()
@@ -1201,7 +1477,8 @@ async def reset_discovery():
 
 
 @app.get("/discovery/history", tags=["Schema Discovery"])
-async def get_discovery_history():
+@_holding(schema_discovery.lock)
+def get_discovery_history():
     """Get history of all discovery operations."""
     from dataclasses import asdict
 
@@ -1209,3 +1486,109 @@ async def get_discovery_history():
         "runs": [asdict(r) for r in schema_discovery.discovery_history],
         "total_runs": len(schema_discovery.discovery_history)
     }
+
+
+# =============================================================================
+# Background Jobs
+# =============================================================================
+
+def _submit(kind: str, operation: Operation) -> Dict:
+    """Queue an operation as a job, answering 429 when the queue is full."""
+    try:
+        job = job_manager.submit(kind, operation)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Job queue is full: {e}")
+    return job.to_dict()
+
+
+@app.post("/jobs/sync", status_code=202, tags=["Jobs"])
+async def submit_sync_job(request: SyncRequest):
+    """Run a platform sync as a background job, reporting progress per chunk."""
+    return _submit("sync", _sync_operation(request))
+
+
+@app.post("/jobs/duplicates", status_code=202, tags=["Jobs"])
+async def submit_duplicates_job(
+    threshold: float = Query(0.8, ge=0.0, le=1.0, description="Match confidence threshold"),
+    fuzzy: bool = Query(False, description="Use fuzzy matching (typos, name variants)")
+):
+    """Run duplicate detection as a background job."""
+    return _submit("duplicates", _duplicates_operation(threshold, fuzzy))
+
+
+@app.post("/jobs/conflicts/{source}/{target}", status_code=202, tags=["Jobs"])
+async def submit_conflicts_job(source: str, target: str):
+    """Run a conflict scan as a background job."""
+    return _submit("conflicts", _conflicts_operation(source, target))
+
+
+@app.post("/jobs/discovery/propose", status_code=202, tags=["Jobs"])
+async def submit_propose_job(request: GenerateProposalsRequest):
+    """Generate mapping proposals as a background job."""
+    return _submit("discovery_propose", _propose_operation(request))
+
+
+@app.get("/jobs", tags=["Jobs"])
+async def list_jobs(status: Optional[str] = Query(None, description="Filter by status")):
+    """List recent jobs, oldest first, without their results."""
+    try:
+        job_status = JobStatus(status) if status else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+    jobs = job_manager.list(job_status)
+    return {
+        "count": len(jobs),
+        "jobs": [job.to_dict(include_result=False) for job in jobs]
+    }
+
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str):
+    """Get a job's status, progress and, once finished, its result."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/events", tags=["Jobs"])
+async def stream_job_events(job_id: str):
+    """
+    Stream a job's progress as server-sent events.
+
+    Sends an event named after the job status on every change, a keepalive
+    comment while nothing changes, and ends after the finishing event,
+    which carries the result.
+    """
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def events():
+        version = -1
+        while True:
+            job = await run_in_threadpool(job_manager.wait, job_id, version, 15.0)
+            if job is None:
+                return
+            if job.version == version:
+                yield ": keepalive\n\n"
+                continue
+            version = job.version
+            data = json.dumps(job.to_dict(include_result=job.finished), default=str)
+            yield f"event: {job.status.value}\ndata: {data}\n\n"
+            if job.finished:
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@app.delete("/jobs/{job_id}", tags=["Jobs"])
+async def cancel_job(job_id: str):
+    """Cancel a job: queued jobs never start, running jobs stop at their next progress report."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict(include_result=False)
@@ -98,7 +98,9 @@ def cmd_sync(args):
             print(f"Error: File not found - {args.source_file}")
             sys.exit(1)
 
-    result = data_mesh.sync_platforms(source, target)
+    result = data_mesh.sync_platforms(
+        source, target, workers=args.workers, chunk_size=args.chunk_size
+    )
     print(f"\nSync complete!")
     print(f"  Records synced: {result['synced']}")
     print(f"  Errors: {len(result['errors'])}")
@@ -147,8 +149,9 @@ def cmd_duplicates(args):
         print("No data files loaded. Use --salesforce, --dynamics, or --local to specify files.")
         return
 
-    print(f"\nDetecting duplicates (threshold: {args.threshold})...")
-    duplicates = data_mesh.detect_duplicates(args.threshold)
+    mode = "fuzzy" if args.fuzzy else "exact"
+    print(f"\nDetecting duplicates ({mode}, threshold: {args.threshold})...")
+    duplicates = data_mesh.detect_duplicates(args.threshold, fuzzy=args.fuzzy)
 
     print(f"\nFound {len(duplicates)} potential duplicates:\n")
 
@@ -287,14 +290,11 @@ def cmd_export(args):
             print(f"Error: File not found - {args.source_file}")
             sys.exit(1)
 
-    output = data_mesh.export_to_platform(platform)
-
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(output, f, indent=2)
+        data_mesh.save_to_file(platform, args.output)
         print(f"Exported to {args.output}")
     else:
-        print(json.dumps(output, indent=2))
+        print(json.dumps(data_mesh.export_to_platform(platform), indent=2))
 
 
 def cmd_schema(args):
@@ -373,6 +373,10 @@ Examples:
     sync_parser.add_argument("--target", required=True,
                              choices=["salesforce", "dynamics365", "local"])
     sync_parser.add_argument("--source-file", help="Source data file")
+    sync_parser.add_argument("--workers", type=int, default=1,
+                             help="Parallel translation processes")
+    sync_parser.add_argument("--chunk-size", type=int, default=10000,
+                             help="Records per parallel chunk")
 
     # Duplicates command
     dup_parser = subparsers.add_parser("detect-duplicates", help="Detect duplicates")
@@ -380,6 +384,8 @@ Examples:
     dup_parser.add_argument("--salesforce", help="Salesforce data file")
     dup_parser.add_argument("--dynamics", help="Dynamics 365 data file")
     dup_parser.add_argument("--local", help="Local CRM data file")
+    dup_parser.add_argument("--fuzzy", action="store_true",
+                            help="Fuzzy matching (typos, name variants)")
 
     # Migrate command
     migrate_parser = subparsers.add_parser("migrate", help="Migrate data between platforms")
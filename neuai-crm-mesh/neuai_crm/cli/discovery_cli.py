@@ -132,13 +132,16 @@ def cmd_discover(args):
                 print()
 
                 print("  Discovering objects and fields...")
-                result = schema_discovery.discover_salesforce(sf)
+                result = schema_discovery.discover_salesforce(
+                    sf, workers=args.workers, use_cache=not args.no_cache
+                )
 
                 print()
                 print(c("  DISCOVERY COMPLETE", Colors.GREEN + Colors.BOLD))
                 print(f"  • Entities discovered: {result.entities_discovered}")
                 print(f"  • Fields discovered: {result.fields_discovered}")
                 print(f"  • Custom fields: {result.custom_fields}")
+                print(f"  • Unchanged (cached): {result.entities_from_cache}")
                 print(f"  • Duration: {result.duration_seconds:.1f}s")
 
                 if result.errors:
@@ -189,13 +192,17 @@ def cmd_discover(args):
                 print()
 
                 print("  Discovering entities and attributes...")
-                result = schema_discovery.discover_dynamics365(token_result['access_token'], env_url)
+                result = schema_discovery.discover_dynamics365(
+                    token_result['access_token'], env_url,
+                    workers=args.workers, use_cache=not args.no_cache
+                )
 
                 print()
                 print(c("  DISCOVERY COMPLETE", Colors.GREEN + Colors.BOLD))
                 print(f"  • Entities discovered: {result.entities_discovered}")
                 print(f"  • Fields discovered: {result.fields_discovered}")
                 print(f"  • Custom fields: {result.custom_fields}")
+                print(f"  • Unchanged (cached): {result.entities_from_cache}")
                 print(f"  • Duration: {result.duration_seconds:.1f}s")
 
                 if result.errors:
@@ -548,6 +555,8 @@ The AI proposes, you audit. Not the other way around!
     discover_parser = subparsers.add_parser("discover", help="Discover schema from live CRM")
     discover_parser.add_argument("platform", choices=["salesforce", "dynamics365"])
     discover_parser.add_argument("--mock", action="store_true", help="Use mock data for testing")
+    discover_parser.add_argument("--workers", type=int, default=8, help="Concurrent describe calls (default: 8)")
+    discover_parser.add_argument("--no-cache", action="store_true", help="Refetch every object, ignoring the describe cache")
 
     # Propose
     propose_parser = subparsers.add_parser("propose", help="Generate mapping proposals")
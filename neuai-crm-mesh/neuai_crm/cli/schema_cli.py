@@ -441,7 +441,7 @@ def cmd_forget(args):
         confirm = input("  Confirm deletion? [y/n]: ").strip().lower()
 
         if confirm == 'y':
-            del schema_brain.field_mappings[key]
+            schema_brain._drop_mapping(key)
             schema_brain._save_memory()
             print(colorize("  ✓ Mapping forgotten.", Colors.GREEN))
         else:
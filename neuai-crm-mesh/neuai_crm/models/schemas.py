@@ -115,6 +115,14 @@ SCHEMA_MAPPINGS: Dict = {
 }
 
 
+# Plural entity keys used by the data mesh for platform entities
+MESH_ENTITY_ALIASES: Dict[str, str] = {
+    "accounts": "companies",
+    "opportunities": "deals",
+    "tasks": "activities"
+}
+
+
 def get_entity_name(local_entity: str, platform: Platform) -> str:
     """Get the platform-specific entity name."""
     return SCHEMA_MAPPINGS["entities"][platform.value].get(local_entity, local_entity)
@@ -151,4 +159,4 @@ def get_local_entity_name(entity_type: str, platform: Platform) -> str:
     for local_name, platform_name in entity_map.items():
         if platform_name.lower() == entity_type.lower():
             return local_name
-    return entity_type
+    return MESH_ENTITY_ALIASES.get(entity_type.lower(), entity_type)
@@ -0,0 +1,253 @@
+"""
+Indexed audit queue for schema discovery proposals.
+
+Pending mapping proposals are kept by ID, with secondary indexes on status,
+confidence bucket, platform and entity, and a list of keys sorted by
+confidence. Approving or rejecting a proposal is a dict lookup, filtered
+pages are read from the smallest matching index, and cursors resume a
+page from its last key rather than re-filtering and re-sorting the queue.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from neuai_crm.services.query_index import decode_cursor, encode_cursor
+
+# Lower bounds of the confidence buckets, highest first
+CONFIDENCE_BUCKETS = (("high", 0.8), ("medium", 0.6), ("low", float("-inf")))
+
+# Queue orders: highest or lowest confidence first
+SORTS = ("-confidence", "confidence")
+
+# Indexed attributes, by filter name; a proposal is indexed under each value
+_INDEXED = {
+    "status": lambda p: [p.status.value],
+    "bucket": lambda p: [confidence_bucket(p.confidence)],
+    "platform": lambda p: [p.source_platform, p.target_platform],
+    "entity": lambda p: [p.source_entity, p.target_entity],
+}
+
+# Sort key: (-confidence, insertion sequence), unique per queued proposal
+QueueKey = Tuple[float, int]
+
+
+def _confidence_end(order: List[Tuple[float, int, str]], min_confidence: float) -> int:
+    """Position in a sorted order after the last key with at least min_confidence."""
+    return bisect_right(order, (-min_confidence, float("inf")))
+
+
+def confidence_bucket(confidence: float) -> str:
+    """Name of the bucket a confidence falls in."""
+    for name, floor in CONFIDENCE_BUCKETS:
+        if confidence >= floor:
+            return name
+    return CONFIDENCE_BUCKETS[-1][0]
+
+
+class AuditQueue:
+    """
+    Proposals pending audit, indexed for lookup, filtering and paging.
+
+    Iterates in the order proposals were queued. Index entries are taken
+    when a proposal is added, so a proposal should be removed before its
+    status or confidence changes.
+    """
+
+    def __init__(self, proposals: Iterable[Any] = ()):
+        self._by_id: Dict[str, Any] = {}
+        self._keys: Dict[str, QueueKey] = {}
+        self._order: List[Tuple[float, int, str]] = []
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {name: {} for name in _INDEXED}
+        self._seq = 0
+        self.extend(proposals)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, proposal_id: str) -> bool:
+        return proposal_id in self._by_id
+
+    def get(self, proposal_id: str) -> Optional[Any]:
+        """A queued proposal by ID, or None."""
+        return self._by_id.get(proposal_id)
+
+    def add(self, proposal: Any) -> None:
+        """Queue a proposal, replacing a queued one with the same ID."""
+        self.remove(proposal.id)
+        self._seq += 1
+        key = (-proposal.confidence, self._seq)
+        self._by_id[proposal.id] = proposal
+        self._keys[proposal.id] = key
+        insort(self._order, key + (proposal.id,))
+        for name, values in _INDEXED.items():
+            for value in values(proposal):
+                self._indexes[name].setdefault(value, set()).add(proposal.id)
+
+    def extend(self, proposals: Iterable[Any]) -> None:
+        """Queue several proposals."""
+        for proposal in proposals:
+            self.add(proposal)
+
+    def remove(self, proposal_id: str) -> Optional[Any]:
+        """
+        Take a proposal off the queue.
+
+        Returns:
+            The removed proposal, or None if it wasn't queued
+        """
+        proposal = self._by_id.pop(proposal_id, None)
+        if proposal is None:
+            return None
+        key = self._keys.pop(proposal_id) + (proposal_id,)
+        del self._order[bisect_left(self._order, key)]
+        self._unindex(proposal)
+        return proposal
+
+    def remove_many(self, proposal_ids: Iterable[str]) -> List[Any]:
+        """Take several proposals off the queue, re-sorting the order once."""
+        removed = []
+        for proposal_id in proposal_ids:
+            proposal = self._by_id.pop(proposal_id, None)
+            if proposal is not None:
+                del self._keys[proposal_id]
+                self._unindex(proposal)
+                removed.append(proposal)
+        if removed:
+            self._order = [entry for entry in self._order if entry[2] in self._keys]
+        return removed
+
+    def clear(self) -> None:
+        """Remove every proposal."""
+        self.__init__()
+
+    def _unindex(self, proposal: Any) -> None:
+        for name, index in self._indexes.items():
+            for value in _INDEXED[name](proposal):
+                ids = index.get(value)
+                if ids is not None:
+                    ids.discard(proposal.id)
+                    if not ids:
+                        del index[value]
+
+    def counts(self, name: str) -> Dict[str, int]:
+        """Queued proposals per value of an index ("status", "bucket", ...)."""
+        return {value: len(ids) for value, ids in self._indexes[name].items()}
+
+    def _matching(self, filters: Dict[str, Optional[str]]) -> Optional[Set[str]]:
+        """IDs matching every given filter (None when nothing is filtered)."""
+        sets = sorted(
+            (self._indexes[name].get(value, set()) for name, value in filters.items() if value is not None),
+            key=len
+        )
+        if not sets:
+            return None
+        return set(sets[0]).intersection(*sets[1:])
+
+    def select(self, **filters: Optional[str]) -> List[Any]:
+        """
+        Queued proposals matching index filters, in queue order.
+
+        Args:
+            **filters: status, bucket, platform and/or entity values
+        """
+        ids = self._matching(filters)
+        if ids is None:
+            return list(self._by_id.values())
+        return [p for proposal_id, p in self._by_id.items() if proposal_id in ids]
+
+    def above(self, min_confidence: float) -> List[Any]:
+        """Queued proposals with at least min_confidence, highest first."""
+        end = _confidence_end(self._order, min_confidence)
+        return [self._by_id[entry[2]] for entry in self._order[:end]]
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        bucket: Optional[str] = None,
+        platform: Optional[str] = None,
+        entity: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        sort: str = "-confidence",
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        One page of queued proposals sorted by confidence.
+
+        Ties keep queue order (reversed when sorting lowest first).
+
+        Args:
+            status: Only proposals with this status
+            bucket: Only proposals in this confidence bucket
+            platform: Only proposals from or to this platform
+            entity: Only proposals from or to this entity
+            min_confidence: Only proposals with at least this confidence
+            sort: One of SORTS
+            limit: Maximum proposals to return
+            offset: Proposals to skip (after the cursor, if given)
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dict with proposals, total (matching proposals) and next_cursor
+            (None on the last page)
+        """
+        if sort not in SORTS:
+            raise ValueError(f"Unsupported sort: {sort}. Use one of {', '.join(SORTS)}")
+        if limit < 1 or offset < 0:
+            raise ValueError("limit must be positive and offset non-negative")
+        after = decode_cursor(cursor, sort) if cursor else None
+
+        ids = self._matching({"status": status, "bucket": bucket, "platform": platform, "entity": entity})
+        if ids is not None and len(ids) <= len(self._order) // 8:
+            # Few matches: sort just those instead of scanning the queue
+            order = sorted(self._keys[proposal_id] + (proposal_id,) for proposal_id in ids)
+            ids = None
+        else:
+            order = self._order
+
+        # Keys before end have at least min_confidence
+        end = len(order)
+        if min_confidence is not None:
+            end = _confidence_end(order, min_confidence)
+
+        if sort == "-confidence":
+            start = bisect_right(order, after) if after else 0
+            positions = range(start, end)
+        else:
+            stop = min(bisect_left(order, after), end) if after else end
+            positions = range(stop - 1, -1, -1)
+
+        page = []
+        skipped = 0
+        for i in positions:
+            entry = order[i]
+            if ids is not None and entry[2] not in ids:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            page.append(entry)
+            if len(page) > limit:
+                break
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(sort, page[-1])
+
+        if ids is None:
+            total = end
+        elif min_confidence is None:
+            total = len(ids)
+        else:
+            total = sum(1 for proposal_id in ids if -self._keys[proposal_id][0] >= min_confidence)
+
+        return {
+            "proposals": [self._by_id[entry[2]] for entry in page],
+            "total": total,
+            "next_cursor": next_cursor
+        }
@@ -0,0 +1,186 @@
+"""
+Crash-safe persistence for Schema Brain memory.
+
+Memory is kept as a snapshot (schema_brain.json and learning_log.json)
+plus an append-only journal (schema_brain.journal) of the changes made
+since. Saving appends only what changed; once the journal grows long
+enough the brain writes a fresh snapshot and the journal starts over.
+
+Snapshots are written to a temporary file and renamed into place, so a
+crash leaves either the old or the new snapshot. Each journal entry
+carries a sequence number and the snapshot records the last one it
+includes, so entries that outlive a snapshot are skipped on replay. A
+journal line torn by a crash is dropped on load.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# When to fsync: after every journal append, only for snapshots, or never
+FSYNC_POLICIES = ("always", "snapshot", "never")
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a rename in a directory (a no-op where directories can't be opened)."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BrainJournal:
+    """Snapshot plus append-only journal in a Schema Brain memory directory."""
+
+    SNAPSHOT_FILE = "schema_brain.json"
+    LOG_FILE = "learning_log.json"
+    JOURNAL_FILE = "schema_brain.journal"
+
+    # Learning events kept in the snapshot's log file
+    LOG_LIMIT = 1000
+
+    def __init__(self, directory: str, fsync: str = "snapshot"):
+        """
+        Initialize the journal.
+
+        Args:
+            directory: Memory directory (created on first write)
+            fsync: One of FSYNC_POLICIES
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self.seq = 0
+        self.entries_since_snapshot = 0
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / self.SNAPSHOT_FILE
+
+    @property
+    def log_path(self) -> Path:
+        return self.directory / self.LOG_FILE
+
+    @property
+    def journal_path(self) -> Path:
+        return self.directory / self.JOURNAL_FILE
+
+    def load(self) -> Tuple[Optional[Dict], List[Dict], List[Dict]]:
+        """
+        Read the snapshot, learning log and journal tail.
+
+        A snapshot that can't be parsed is moved aside to
+        schema_brain.json.corrupt and the journal is replayed on its own.
+
+        Returns:
+            Tuple of (snapshot or None, learning log events, journal
+            entries newer than the snapshot, in order)
+        """
+        snapshot = None
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, 'r') as f:
+                    snapshot = json.load(f)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"Warning: Could not load {self.SNAPSHOT_FILE}: {e}")
+                os.replace(self.snapshot_path, self.snapshot_path.with_name(self.SNAPSHOT_FILE + ".corrupt"))
+
+        log = []
+        if snapshot is not None and self.log_path.exists():
+            try:
+                with open(self.log_path, 'r') as f:
+                    log = json.load(f)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"Warning: Could not load {self.LOG_FILE}: {e}")
+
+        self.seq = snapshot.get("journal_seq", 0) if snapshot else 0
+        entries = [entry for entry in self._read_journal() if entry["seq"] > self.seq]
+        if entries:
+            self.seq = entries[-1]["seq"]
+        self.entries_since_snapshot = len(entries)
+        return snapshot, log, entries
+
+    def _read_journal(self) -> List[Dict]:
+        """Read journal entries, truncating a torn or corrupt tail."""
+        if not self.journal_path.exists():
+            return []
+
+        entries = []
+        offset = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                entries.append(entry)
+                offset += len(line)
+            else:
+                return entries
+
+        print(f"Warning: Dropping torn {self.JOURNAL_FILE} tail after {len(entries)} entries")
+        with open(self.journal_path, 'r+b') as f:
+            f.truncate(offset)
+        return entries
+
+    def append(self, changes: List[Tuple[str, Optional[str], Any]]) -> None:
+        """
+        Append changes to the journal.
+
+        Args:
+            changes: (section, key, value) tuples; a None value deletes the key
+        """
+        if not changes:
+            return
+        lines = []
+        for section, key, value in changes:
+            self.seq += 1
+            lines.append(json.dumps({"seq": self.seq, "section": section, "key": key, "value": value},
+                                    default=str))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            if self.fsync == "always":
+                os.fsync(f.fileno())
+        self.entries_since_snapshot += len(lines)
+
+    def write_snapshot(self, data: Dict, log: List[Dict]) -> None:
+        """
+        Atomically replace the snapshot and learning log, then reset the journal.
+
+        Args:
+            data: Full brain state (journal_seq is added)
+            log: Learning events (the last LOG_LIMIT are kept)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(self.log_path, log[-self.LOG_LIMIT:])
+        self._write_atomic(self.snapshot_path, {**data, "journal_seq": self.seq})
+        if self.fsync != "never":
+            _fsync_directory(self.directory)
+
+        # Entries up to journal_seq are in the snapshot, so a crash before
+        # this truncation only leaves entries that replay skips
+        with open(self.journal_path, 'w'):
+            pass
+        self.entries_since_snapshot = 0
+
+    def _write_atomic(self, path: Path, data: Any) -> None:
+        """Write JSON to a temporary file and rename it over path."""
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+            f.flush()
+            if self.fsync != "never":
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
@@ -2,14 +2,123 @@
 Data Mesh service - unified data store for managing records across CRM platforms.
 """
 
+import copy
+import gc
+import hashlib
 import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 from pathlib import Path
 
-from neuai_crm.models.schemas import Platform, SCHEMA_MAPPINGS
-from neuai_crm.services.translator import SchemaTranslator
-from neuai_crm.services.duplicates import DuplicateDetector, DuplicateMatch
+from neuai_crm.models.schemas import Platform, SCHEMA_MAPPINGS, get_local_entity_name
+from neuai_crm.services.translator import SchemaTranslator, translator as default_translator
+from neuai_crm.services.duplicates import DuplicateDetector, DuplicateIndex, DuplicateMatch
+from neuai_crm.services.locks import ReadWriteLock
+from neuai_crm.services.mesh_store import MeshStore
+from neuai_crm.services.query_index import QueryIndex
+from neuai_crm.services.record_store import ColumnarTable, to_plain
+from neuai_crm.services.result_cache import ResultCache
+from neuai_crm.services.streaming import (
+    is_ndjson,
+    iter_export_records,
+    iter_json_export,
+    iter_ndjson_export,
+    iter_ndjson_records,
+    peak_memory_mb,
+)
+
+
+# An entity's records: a list of dicts, or a ColumnarTable of row views
+Records = Union[List[Dict], ColumnarTable]
+
+
+def _translate_chunk(
+    entity_type: str,
+    source: Platform,
+    target: Platform,
+    records: Iterable[Dict],
+    schema_translator: Optional[SchemaTranslator] = None
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Translate a run of records, collecting per-record errors.
+
+    Module-level so that process pool workers can run it; workers use their
+    own process's translator when none is passed.
+
+    Returns:
+        Tuple of (translated records, error reports)
+    """
+    plan = (schema_translator or default_translator).get_plan(entity_type, source, target)
+    translated: List[Dict] = []
+    errors: List[Dict] = []
+    append = translated.append
+
+    for record in records:
+        try:
+            append(plan(record))
+        except Exception as e:
+            errors.append({"record": record, "error": str(e)})
+
+    return translated, errors
+
+
+def _progress_reporter(
+    progress: Optional[Callable[[Dict], None]],
+    total_records: int
+) -> Callable[[str, int], None]:
+    """
+    Wrap a sync progress callback as report(entity, records_done_now).
+
+    The callback receives running totals; without one, reporting is a no-op.
+    """
+    done = 0
+
+    def report(entity: str, count: int) -> None:
+        nonlocal done
+        done += count
+        if progress:
+            progress({
+                "entity": entity,
+                "records_processed": done,
+                "total_records": total_records,
+                "percent": round(100.0 * done / total_records, 1) if total_records else 100.0
+            })
+
+    return report
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause cyclic garbage collection around bulk loads.
+
+    Building millions of records and index entries triggers repeated full
+    collections that find nothing (the new objects hold no cycles).
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _content_hash(record: Dict) -> str:
+    """
+    Fingerprint a record's content.
+
+    The digest is the same in every process (unlike hash(), which is salted
+    per process), so it can be compared across restarts.
+    """
+    content = json.dumps(dict(record), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
 
 class DataMesh:
@@ -21,45 +130,263 @@ class DataMesh:
     - Translating records between platform formats
     - Syncing data between platforms
     - Detecting duplicates and conflicts
+    - Querying records through lazily built secondary indexes
+
+    Loads, syncs and clears bump data_version. Stats, duplicate and
+    conflict results are cached per data version in result_cache, so
+    repeated reads of unchanged data are not recomputed; code that edits
+    self.data directly must call mark_changed.
     """
 
-    def __init__(self):
-        """Initialize the data mesh with empty data stores."""
-        self.data: Dict[Platform, Dict[str, List[Dict]]] = {
-            Platform.SALESFORCE: {"accounts": [], "contacts": [], "opportunities": [], "tasks": []},
-            Platform.DYNAMICS365: {"accounts": [], "contacts": [], "opportunities": [], "activities": []},
-            Platform.LOCAL: {"companies": [], "contacts": [], "deals": [], "activities": []}
+    # Platform entity lists and the import keys accepted for each, by precedence
+    IMPORT_KEYS: Dict[Platform, Dict[str, Tuple[str, ...]]] = {
+        Platform.SALESFORCE: {
+            "accounts": ("Account", "accounts"),
+            "contacts": ("Contact", "contacts"),
+            "opportunities": ("Opportunity", "opportunities"),
+            "tasks": ("Task", "tasks")
+        },
+        Platform.DYNAMICS365: {
+            "accounts": ("account", "accounts"),
+            "contacts": ("contact", "contacts"),
+            "opportunities": ("opportunity", "opportunities"),
+            "activities": ("activitypointer", "activities")
+        },
+        Platform.LOCAL: {
+            "companies": ("companies",),
+            "contacts": ("contacts",),
+            "deals": ("deals",),
+            "activities": ("activities",)
+        }
+    }
+
+    # Export key for each platform entity list
+    EXPORT_KEYS: Dict[Platform, Dict[str, str]] = {
+        platform: {keys[0]: entity for entity, keys in entity_keys.items()}
+        for platform, entity_keys in IMPORT_KEYS.items()
+    }
+
+    STORAGE_BACKENDS = ("dict", "columnar")
+
+    EXPORT_FORMATS = ("json", "ndjson")
+
+    SYNC_EXECUTORS = ("process", "thread")
+
+    # Last-modified timestamp fields used as delta sync watermarks, by precedence
+    WATERMARK_FIELDS: Dict[Platform, Tuple[str, ...]] = {
+        Platform.SALESFORCE: ("LastModifiedDate", "SystemModstamp"),
+        Platform.DYNAMICS365: ("modifiedon",),
+        Platform.LOCAL: ("updatedAt",)
+    }
+
+    def __init__(self, storage: str = "dict", store: Optional[MeshStore] = None):
+        """
+        Initialize the data mesh with empty data stores.
+
+        Args:
+            storage: Record storage backend - "dict" (a list of dicts per entity)
+                or "columnar" (a ColumnarTable per entity, for large datasets)
+            store: Durable store to write changes through to; its persisted
+                state is loaded on start
+        """
+        if storage not in self.STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend: {storage}")
+        self.storage = storage
+        self.data: Dict[Platform, Dict[str, Records]] = {
+            platform: self._empty_platform(platform) for platform in Platform
         }
         self.id_mappings: Dict[str, Dict[Platform, str]] = {}
         self.sync_log: List[Dict] = []
+        # (source, target, source entity) -> delta sync change-tracking state
+        self.delta_state: Dict[Tuple[Platform, Platform, str], Dict[str, Any]] = {}
         self.translator = SchemaTranslator()
         self.duplicate_detector = DuplicateDetector()
+        self.duplicate_index = DuplicateIndex(self.duplicate_detector)
+        self.query_index = QueryIndex()
+        # Bumped on every change to the records; keys cached query results
+        self.data_version = 0
+        self.result_cache = ResultCache()
+        # Platforms whose records are not in the duplicate index yet
+        self._unindexed: set = set()
+        # Readers (stats, queries, scans, exports) share the records; loads,
+        # clears and the write phase of a sync hold them alone
+        self.lock = ReadWriteLock()
+        # Lets one reader at a time index platforms restored by a warm start
+        self._index_lock = threading.Lock()
+        self.store = store
+        if store is not None:
+            self._warm_start()
+
+    def _warm_start(self) -> None:
+        """
+        Restore records, id mappings and the sync log from the store.
+
+        The duplicate index is rebuilt on first use rather than here, so the
+        mesh is available as soon as the records are read.
+        """
+        with _gc_paused():
+            state = self.store.load()
+            for platform, entities in state["data"].items():
+                for entity, records in entities.items():
+                    self.data[platform][entity] = self._new_table(records)
+                self._unindexed.add(platform)
+        self.id_mappings = state["id_mappings"]
+        self.sync_log = state["sync_log"]
 
-    def load_from_file(self, platform: Platform, filepath: str) -> Dict:
+    def _ensure_indexed(self) -> None:
+        """Index platforms restored by a warm start."""
+        with self.lock.read(), self._index_lock, _gc_paused():
+            for platform in list(self._unindexed):
+                self.duplicate_index.index_platform(platform, self.data[platform])
+                self._unindexed.discard(platform)
+
+    def _transaction(self):
+        """Group the store writes of one mesh operation."""
+        return self.store.transaction() if self.store is not None else nullcontext()
+
+    def mark_changed(self) -> None:
+        """Bump the data version, dropping cached query results."""
+        self.data_version += 1
+        self.result_cache.clear()
+
+    def _cached(self, operation: str, args: Tuple, compute: Callable[[], Any]) -> Any:
+        """Memoize a read-only query result for the current data version."""
+        with self.lock.read():
+            return self.result_cache.get_or_compute((operation, args, self.data_version), compute)
+
+    def _replace_platform(self, platform: Platform, data: Dict[str, Records]) -> None:
+        """Replace a platform's entity lists, reindexing and persisting them."""
+        self.data[platform] = data
+        self.mark_changed()
+        self.query_index.drop_platform(platform)
+        self._unindexed.discard(platform)
+        with _gc_paused():
+            self.duplicate_index.index_platform(platform, data)
+        if self.store is not None:
+            for entity, records in data.items():
+                self.store.replace_entity(platform, entity, records)
+
+    def load_from_file(
+        self,
+        platform: Platform,
+        filepath: str,
+        stream: Optional[bool] = None,
+        batch_size: int = 5000,
+        entity: Optional[str] = None,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
         """
         Load data from a JSON file into the mesh.
 
         Args:
             platform: The platform to load data into
             filepath: Path to the JSON file
+            stream: Parse incrementally instead of with json.load
+                (defaults to True for .ndjson/.jsonl files)
+            batch_size: Records per batch when streaming
+            entity: Entity key for streamed records that carry no type
+            progress: Callback receiving a progress dict after each batch
 
         Returns:
             Status dict with records loaded count
         """
+        if stream is None:
+            stream = is_ndjson(filepath)
+        if stream:
+            return self._stream_from_file(platform, filepath, batch_size, entity, progress)
+
         with open(filepath, 'r') as f:
             data = json.load(f)
 
         normalized = self._normalize_import(platform, data)
-        self.data[platform] = normalized
-
-        self._log_operation("load", platform=platform.value, file=filepath,
-                           records=sum(len(v) for v in normalized.values()))
+        with self.lock.write(), self._transaction():
+            self._replace_platform(platform, normalized)
+            self._log_operation("load", platform=platform.value, file=filepath,
+                               records=sum(len(v) for v in normalized.values()))
 
         return {
             "status": "success",
             "records_loaded": sum(len(v) for v in normalized.values())
         }
 
+    def _stream_from_file(
+        self,
+        platform: Platform,
+        filepath: str,
+        batch_size: int,
+        entity: Optional[str],
+        progress: Optional[Callable[[Dict], None]]
+    ) -> Dict:
+        """Load an NDJSON file or large JSON export record by record."""
+        start = time.perf_counter()
+        total_bytes = os.path.getsize(filepath)
+        import_keys = self.IMPORT_KEYS[platform]
+        key_lookup = {}
+        for entity_name, keys in import_keys.items():
+            for key in keys:
+                key_lookup[key] = (entity_name, key)
+                key_lookup.setdefault(key.lower(), (entity_name, key))
+
+        # Records are kept per source key so alias precedence matches _normalize_import
+        collected: Dict[Tuple[str, str], Records] = {}
+        batch: List[Tuple[Tuple[str, str], Dict]] = []
+        loaded = skipped = batches = 0
+
+        def flush(bytes_read: int) -> None:
+            nonlocal batches
+            for target, record in batch:
+                if target not in collected:
+                    collected[target] = self._new_table()
+                collected[target].append(record)
+            batch.clear()
+            batches += 1
+            if progress:
+                progress({
+                    "records_loaded": loaded,
+                    "records_skipped": skipped,
+                    "bytes_read": bytes_read,
+                    "total_bytes": total_bytes,
+                    "percent": round(100.0 * bytes_read / total_bytes, 1) if total_bytes else 100.0
+                })
+
+        with open(filepath, 'rb') as f:
+            if is_ndjson(filepath):
+                records = iter_ndjson_records(f, entity)
+            else:
+                records = iter_export_records(f, entity)
+
+            for key, record in records:
+                target = key_lookup.get(key) or key_lookup.get((key or "").lower())
+                if target is None:
+                    skipped += 1
+                    continue
+                batch.append((target, record))
+                loaded += 1
+                if len(batch) >= batch_size:
+                    flush(f.tell())
+            flush(f.tell())
+
+        normalized = {}
+        for entity_name, keys in import_keys.items():
+            present = [key for key in keys if (entity_name, key) in collected]
+            normalized[entity_name] = collected[(entity_name, present[0])] if present else self._new_table()
+
+        records_loaded = sum(len(v) for v in normalized.values())
+        with self.lock.write(), self._transaction():
+            self._replace_platform(platform, normalized)
+            self._log_operation("load", platform=platform.value, file=filepath,
+                               records=records_loaded, streamed=True)
+
+        return {
+            "status": "success",
+            "records_loaded": records_loaded,
+            "records_skipped": skipped,
+            "bytes_read": total_bytes,
+            "batches": batches,
+            "duration_seconds": round(time.perf_counter() - start, 3),
+            "peak_memory_mb": peak_memory_mb()
+        }
+
     def load_data(self, platform: Platform, data: Dict) -> Dict:
         """
         Load data directly into the mesh.
@@ -72,10 +399,10 @@ class DataMesh:
             Status dict with records loaded count
         """
         normalized = self._normalize_import(platform, data)
-        self.data[platform] = normalized
-
-        self._log_operation("load", platform=platform.value,
-                           records=sum(len(v) for v in normalized.values()))
+        with self.lock.write(), self._transaction():
+            self._replace_platform(platform, normalized)
+            self._log_operation("load", platform=platform.value,
+                               records=sum(len(v) for v in normalized.values()))
 
         return {
             "status": "success",
@@ -84,27 +411,20 @@ class DataMesh:
 
     def _normalize_import(self, platform: Platform, data: Dict) -> Dict:
         """Normalize imported data to platform's expected structure."""
-        if platform == Platform.SALESFORCE:
-            return {
-                "accounts": data.get("Account", data.get("accounts", [])),
-                "contacts": data.get("Contact", data.get("contacts", [])),
-                "opportunities": data.get("Opportunity", data.get("opportunities", [])),
-                "tasks": data.get("Task", data.get("tasks", []))
-            }
-        elif platform == Platform.DYNAMICS365:
-            return {
-                "accounts": data.get("account", data.get("accounts", [])),
-                "contacts": data.get("contact", data.get("contacts", [])),
-                "opportunities": data.get("opportunity", data.get("opportunities", [])),
-                "activities": data.get("activitypointer", data.get("activities", []))
-            }
-        else:  # LOCAL
-            return {
-                "companies": data.get("companies", []),
-                "contacts": data.get("contacts", []),
-                "deals": data.get("deals", []),
-                "activities": data.get("activities", [])
-            }
+        return {
+            entity: self._new_table(next((data[key] for key in keys if key in data), []))
+            for entity, keys in self.IMPORT_KEYS[platform].items()
+        }
+
+    def _new_table(self, records: Iterable[Dict] = ()) -> Records:
+        """Create an entity record list in the configured storage backend."""
+        if self.storage == "columnar":
+            return ColumnarTable(records)
+        return records if isinstance(records, list) else list(records)
+
+    def _empty_platform(self, platform: Platform) -> Dict[str, Records]:
+        """Create the empty entity lists of a platform."""
+        return {entity: self._new_table() for entity in self.IMPORT_KEYS[platform]}
 
     def get_stats(self) -> Dict[str, Dict[str, int]]:
         """
@@ -113,13 +433,13 @@ class DataMesh:
         Returns:
             Dict mapping platform names to entity counts
         """
-        return {
+        return self._cached("stats", (), lambda: {
             platform.value: {
                 entity: len(records)
                 for entity, records in self.data[platform].items()
             }
             for platform in Platform
-        }
+        })
 
     def translate_record(
         self,
@@ -144,17 +464,52 @@ class DataMesh:
             record, from_platform, to_platform, entity_type
         )
 
-    def sync_platforms(self, source: Platform, target: Platform) -> Dict:
+    def sync_platforms(
+        self,
+        source: Platform,
+        target: Platform,
+        workers: int = 1,
+        chunk_size: int = 10000,
+        executor: str = "process",
+        delta: bool = False,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
         """
         Sync all data from source to target platform.
 
+        With more than one worker, each entity list is split into chunks that
+        are translated on a pool; results keep the source order.
+
+        In delta mode only records that changed since the previous delta sync
+        are translated, and they are upserted into the target by id instead of
+        replacing the target lists. Delta mode always runs in-process.
+
+        A full sync writes the target only once every list is translated, so
+        an exception raised by the progress callback (e.g. to cancel) leaves
+        the target unchanged; a delta sync keeps the entity lists upserted
+        before it. Translation holds the read lock and only the writes take
+        the write lock, so other readers aren't held up by a long sync.
+
         Args:
             source: Source platform
             target: Target platform
+            workers: Number of pool workers (1 translates serially in-process)
+            chunk_size: Records per chunk in parallel mode, and between
+                progress reports
+            executor: Pool type for parallel mode - "process" or "thread"
+            delta: Sync only new and changed records
+            progress: Callback receiving a progress dict after each chunk
+                (after each entity list in delta mode)
 
         Returns:
             Dict with sync results
         """
+        if executor not in self.SYNC_EXECUTORS:
+            raise ValueError(f"Unknown sync executor: {executor}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self._ensure_indexed()
+
         results = {"synced": 0, "errors": [], "entity_counts": {}}
 
         entity_mapping = {
@@ -163,62 +518,349 @@ class DataMesh:
             Platform.DYNAMICS365: ["accounts", "contacts", "opportunities", "activities"]
         }
 
-        source_entities = entity_mapping[source]
-        target_entities = entity_mapping[target]
-
-        for i, source_entity in enumerate(source_entities):
-            target_entity = target_entities[i]
-            source_records = self.data[source].get(source_entity, [])
-            translated_records = []
-
-            for record in source_records:
-                try:
-                    translated = self.translator.translate_entity(
-                        record, source, target, source_entity
-                    )
-                    translated_records.append(translated)
-                    results["synced"] += 1
-                except Exception as e:
-                    results["errors"].append({
-                        "record": record,
-                        "error": str(e)
-                    })
-
-            self.data[target][target_entity] = translated_records
-            results["entity_counts"][target_entity] = len(translated_records)
-
-        self._log_operation("sync", source=source.value, target=target.value,
-                           records=results["synced"])
+        entity_pairs = list(zip(entity_mapping[source], entity_mapping[target]))
+        source_entities = [pair[0] for pair in entity_pairs]
+        with self.lock.read():
+            report = _progress_reporter(
+                progress, sum(len(self.data[source].get(entity, [])) for entity in source_entities)
+            )
+
+        if delta:
+            # Each entity list is upserted under the write lock on its own,
+            # so reads can run between lists
+            results.update({"skipped": 0, "inserted": 0, "updated": 0})
+            for source_entity, target_entity in entity_pairs:
+                with self.lock.write(), self._transaction():
+                    try:
+                        counts = self._delta_sync_entity(source, target, source_entity,
+                                                         target_entity, results["errors"])
+                    finally:
+                        # Upserts change the target lists in place
+                        self.mark_changed()
+                    for key, count in counts.items():
+                        results[key] += count
+                    results["entity_counts"][target_entity] = len(self.data[target][target_entity])
+                    source_count = len(self.data[source].get(source_entity, []))
+                report(source_entity, source_count)
+            results["synced"] = results["inserted"] + results["updated"]
+
+            with self.lock.write(), self._transaction():
+                self._log_operation("sync", source=source.value, target=target.value,
+                                   records=results["synced"], mode="delta",
+                                   skipped=results["skipped"], inserted=results["inserted"],
+                                   updated=results["updated"])
+            return results
+
+        # Translate under the read lock, then take the write lock only to
+        # swap in the translated lists
+        with self.lock.read():
+            translated = self._translate_source(
+                source, target, source_entities, workers, chunk_size, executor, progress, report
+            )
+
+        with self.lock.write(), self._transaction():
+            for (source_entity, target_entity), (records, errors) in zip(entity_pairs, translated):
+                translated_records = self._new_table(records)
+                results["synced"] += len(translated_records)
+                results["errors"].extend(errors)
+
+                self.data[target][target_entity] = translated_records
+                self.mark_changed()
+                self.duplicate_index.index_entity(target, target_entity, translated_records)
+                self.query_index.drop_entity(target, target_entity)
+                if self.store is not None:
+                    self.store.replace_entity(target, target_entity, translated_records)
+                results["entity_counts"][target_entity] = len(translated_records)
+
+            self._log_operation("sync", source=source.value, target=target.value,
+                               records=results["synced"], mode="full")
 
         return results
 
-    def detect_duplicates(self, threshold: float = 0.8) -> List[Dict]:
+    def _translate_source(
+        self,
+        source: Platform,
+        target: Platform,
+        source_entities: List[str],
+        workers: int,
+        chunk_size: int,
+        executor: str,
+        progress: Optional[Callable[[Dict], None]],
+        report: Callable[[str, int], None]
+    ) -> List[Tuple[List[Dict], List[Dict]]]:
+        """
+        Translate the source entity lists of a full sync.
+
+        Returns:
+            (translated records, error reports) per source entity, in order
+        """
+        if workers > 1:
+            return self._translate_parallel(
+                source, target, source_entities, workers, chunk_size, executor, report
+            )
+        if progress is None:
+            return [
+                _translate_chunk(source_entity, source, target,
+                                 self.data[source].get(source_entity, []), self.translator)
+                for source_entity in source_entities
+            ]
+
+        translated = []
+        for source_entity in source_entities:
+            records = self.data[source].get(source_entity, [])
+            merged: Tuple[List[Dict], List[Dict]] = ([], [])
+            for start in range(0, len(records), chunk_size):
+                chunk = records[start:start + chunk_size]
+                chunk_records, chunk_errors = _translate_chunk(
+                    source_entity, source, target, chunk, self.translator
+                )
+                merged[0].extend(chunk_records)
+                merged[1].extend(chunk_errors)
+                report(source_entity, len(chunk))
+            translated.append(merged)
+        return translated
+
+    def _delta_sync_entity(
+        self,
+        source: Platform,
+        target: Platform,
+        source_entity: str,
+        target_entity: str,
+        errors: List[Dict]
+    ) -> Dict[str, int]:
+        """
+        Upsert the new and changed records of one entity list into the target.
+
+        A record is skipped without hashing when its last-modified timestamp
+        is older than the watermark of the previous sync and its id was seen
+        then; otherwise it is skipped when its content hash is unchanged, or
+        when its translation equals the target row it would replace.
+
+        Returns:
+            Dict with skipped, inserted and updated counts
+        """
+        local_entity = get_local_entity_name(source_entity, source)
+        fields = SCHEMA_MAPPINGS["fields"].get(local_entity, {})
+        source_id_field = fields.get(source.value, ["id"])[0]
+        target_id_field = fields.get(target.value, ["id"])[0]
+        stamp_fields = self.WATERMARK_FIELDS[source]
+
+        table = self.data[target].get(target_entity)
+        if table is None:
+            table = self.data[target][target_entity] = self._new_table()
+
+        state = self.delta_state.get((source, target, source_entity))
+        if state is None or state["table"] is not table:
+            # First delta sync, or the target list was replaced since: match
+            # existing target rows by id and re-check every source record
+            state = self.delta_state[(source, target, source_entity)] = {
+                "table": table,
+                "rows": {
+                    row.get(target_id_field): i for i, row in enumerate(table)
+                    if row.get(target_id_field)
+                },
+                "hashes": {},
+                "watermark": None
+            }
+        rows, hashes, watermark = state["rows"], state["hashes"], state["watermark"]
+
+        plan = self.translator.get_plan(source_entity, source, target)
+        index = self.duplicate_index
+        query_index = self.query_index
+        counts = {"skipped": 0, "inserted": 0, "updated": 0}
+        written: List[Tuple[int, Dict]] = []
+        mapped: Dict[str, Dict[Platform, str]] = {}
+        latest = watermark
+
+        for record in self.data[source].get(source_entity, []):
+            get = record.get
+            source_id = get(source_id_field)
+            stamp = None
+            for stamp_field in stamp_fields:
+                stamp = get(stamp_field)
+                if stamp:
+                    break
+            if not isinstance(stamp, str):
+                stamp = None
+            elif latest is None or stamp > latest:
+                latest = stamp
+
+            if stamp and watermark and stamp < watermark and source_id in hashes:
+                counts["skipped"] += 1
+                continue
+
+            digest = _content_hash(record)
+            key = source_id or f"#{digest}"
+            if hashes.get(key) == digest:
+                counts["skipped"] += 1
+                continue
+
+            try:
+                translated = plan(record)
+            except Exception as e:
+                errors.append({"record": record, "error": str(e)})
+                continue
+            hashes[key] = digest
+
+            target_id = translated.get(target_id_field)
+            if source_id and target_id:
+                mesh_id = f"{local_entity}:{source_id}"
+                mapping = self.id_mappings.setdefault(mesh_id, {})
+                if mapping.get(source) != source_id or mapping.get(target) != target_id:
+                    mapping[source] = source_id
+                    mapping[target] = target_id
+                    mapped[mesh_id] = mapping
+
+            row = rows.get(target_id) if target_id else None
+            if row is None:
+                row = len(table)
+                if target_id:
+                    rows[target_id] = row
+                table.append(translated)
+                index.add_records(target, target_entity, [translated])
+                query_index.add_row(target, target_entity, row, translated)
+                counts["inserted"] += 1
+            elif table[row] == translated:
+                counts["skipped"] += 1
+                continue
+            else:
+                index.replace_record(target, target_entity, row, translated)
+                query_index.replace_row(target, target_entity, row, table[row], translated)
+                table[row] = translated
+                counts["updated"] += 1
+            written.append((row, translated))
+
+        state["watermark"] = latest
+        if self.store is not None:
+            self.store.upsert_rows(target, target_entity, written)
+            self.store.save_id_mappings(mapped)
+        return counts
+
+    def _translate_parallel(
+        self,
+        source: Platform,
+        target: Platform,
+        source_entities: List[str],
+        workers: int,
+        chunk_size: int,
+        executor: str,
+        report: Callable[[str, int], None]
+    ) -> List[Tuple[List[Dict], List[Dict]]]:
+        """
+        Translate entity lists in chunks on a worker pool.
+
+        At most two chunks per worker are in flight, so memory stays bounded
+        by the chunk size rather than by the dataset. report is called with
+        the entity and record count of each chunk as it is collected.
+
+        Returns:
+            (translated records, error reports) per source entity, in order
+        """
+        in_process = executor == "thread"
+        pool: Executor = (ThreadPoolExecutor if in_process else ProcessPoolExecutor)(
+            max_workers=workers
+        )
+
+        def chunks():
+            for index, source_entity in enumerate(source_entities):
+                records = self.data[source].get(source_entity, [])
+                for start in range(0, len(records), chunk_size):
+                    chunk = records[start:start + chunk_size]
+                    if not in_process and isinstance(records, ColumnarTable):
+                        chunk = [row.to_dict() for row in chunk]  # Row views don't pickle
+                    yield index, chunk
+
+        merged: List[Tuple[List[Dict], List[Dict]]] = [([], []) for _ in source_entities]
+        pending = deque()
+
+        def collect():
+            index, size, future = pending.popleft()
+            records, errors = future.result()
+            merged[index][0].extend(records)
+            merged[index][1].extend(errors)
+            report(source_entities[index], size)
+
+        with pool:
+            for index, chunk in chunks():
+                pending.append((index, len(chunk), pool.submit(
+                    _translate_chunk, source_entities[index], source, target, chunk,
+                    self.translator if in_process else None
+                )))
+                if len(pending) >= 2 * workers:
+                    collect()
+            while pending:
+                collect()
+
+        return merged
+
+    def detect_duplicates(
+        self,
+        threshold: float = 0.8,
+        fuzzy: bool = False,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
         """
         Detect duplicate records across all platforms.
 
+        Results are cached until the data changes; a cached result is
+        returned without progress reports. An exception raised by the
+        progress callback (e.g. to cancel) stops the scan and caches nothing.
+
         Args:
             threshold: Minimum confidence for a match
+            fuzzy: Use fuzzy (blocking + similarity) matching instead of exact
+            progress: Callback receiving a progress dict as blocks (fuzzy) or
+                duplicate groups (exact) are scanned
 
         Returns:
             List of duplicate matches
         """
-        self.duplicate_detector.threshold = threshold
-        duplicates = self.duplicate_detector.detect_duplicates(self.data)
-        return [d.to_dict() for d in duplicates]
+        def compute() -> List[Dict]:
+            if fuzzy:
+                # Scans may run concurrently, so each gets its own threshold
+                detector = copy.copy(self.duplicate_detector)
+                detector.threshold = threshold
+                duplicates = detector.detect_duplicates(self.data, fuzzy=True, progress=progress)
+            else:
+                self._ensure_indexed()
+                duplicates = self.duplicate_index.duplicates(progress)
+            return [d.to_dict() for d in duplicates]
 
-    def get_conflicts(self, source: Platform, target: Platform) -> List[Dict]:
+        return self._cached("duplicates", (threshold, fuzzy), compute)
+
+    def get_conflicts(
+        self,
+        source: Platform,
+        target: Platform,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
         """
         Identify conflicting records between platforms.
 
+        Results are cached until the data changes, as for detect_duplicates.
+
         Args:
             source: Source platform
             target: Target platform
+            progress: Callback receiving a progress dict as duplicate groups
+                are scanned
 
         Returns:
             List of conflicts
         """
+        return self._cached("conflicts", (source, target),
+                            lambda: self._find_conflicts(source, target, progress))
+
+    def _find_conflicts(
+        self,
+        source: Platform,
+        target: Platform,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """Compute the conflicts between two platforms."""
         conflicts = []
-        duplicates = self.duplicate_detector.detect_duplicates(self.data)
+        self._ensure_indexed()
+        duplicates = self.duplicate_index.conflicts(source, target, progress)
 
         for dup in duplicates:
             source_records = [r for r in dup.records if r["platform"] == source.value]
@@ -253,8 +895,9 @@ class DataMesh:
         Returns:
             Resolution status
         """
-        self._log_operation("resolve_conflict", conflict_id=conflict_id,
-                           resolution=resolution)
+        with self.lock.write():
+            self._log_operation("resolve_conflict", conflict_id=conflict_id,
+                               resolution=resolution)
 
         return {
             "status": "resolved",
@@ -263,6 +906,48 @@ class DataMesh:
             "timestamp": datetime.now().isoformat()
         }
 
+    def query(
+        self,
+        platform: Platform,
+        entity: str,
+        where: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        sort: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        Query the records of one platform entity.
+
+        Equality and membership predicates are answered from hash indexes,
+        range and prefix predicates and sorting from sorted indexes; both are
+        built per field on first use and kept current by loads and syncs.
+
+        Args:
+            platform: Platform to query
+            entity: Entity list name or import key (e.g. "contacts" or "Contact")
+            where: Maps fields to a value (equality) or to {operator: value},
+                with operators eq, ne, in, gt, gte, lt, lte and prefix
+            fields: Fields to return (all fields when omitted)
+            sort: Field to sort by, prefixed with "-" for descending
+            limit: Maximum records per page
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dict with records, count and next_cursor (None on the last page)
+        """
+        for name, keys in self.IMPORT_KEYS[platform].items():
+            if entity == name or entity in keys:
+                break
+        else:
+            raise ValueError(f"Unknown {platform.value} entity: {entity}")
+
+        with self.lock.read():
+            return self.query_index.query(
+                platform, name, self.data[platform][name],
+                where=where, fields=fields, sort=sort, limit=limit, cursor=cursor
+            )
+
     def export_to_platform(self, platform: Platform) -> Dict:
         """
         Export all data in platform-specific format.
@@ -273,31 +958,63 @@ class DataMesh:
         Returns:
             Data in platform-specific format
         """
-        if platform == Platform.SALESFORCE:
-            return {
-                "Account": self.data[platform]["accounts"],
-                "Contact": self.data[platform]["contacts"],
-                "Opportunity": self.data[platform]["opportunities"],
-                "Task": self.data[platform]["tasks"]
-            }
-        elif platform == Platform.DYNAMICS365:
-            return {
-                "account": self.data[platform]["accounts"],
-                "contact": self.data[platform]["contacts"],
-                "opportunity": self.data[platform]["opportunities"],
-                "activitypointer": self.data[platform]["activities"]
-            }
-        else:  # LOCAL
+        with self.lock.read():
             return {
-                "companies": self.data[platform]["companies"],
-                "contacts": self.data[platform]["contacts"],
-                "deals": self.data[platform]["deals"],
-                "activities": self.data[platform]["activities"]
+                export_key: to_plain(self.data[platform][entity])
+                for export_key, entity in self.EXPORT_KEYS[platform].items()
             }
 
+    def iter_export(
+        self,
+        platform: Platform,
+        format: str = "json",
+        batch_size: int = 1000,
+        pretty: bool = False,
+        on_records: Optional[Callable[[int], None]] = None
+    ) -> Iterator[bytes]:
+        """
+        Serialize a platform export in chunks, without building it in memory.
+
+        Each chunk is produced under the read lock, which is released
+        between chunks.
+
+        Args:
+            platform: The platform format to export in
+            format: "json" (the export_to_platform object) or "ndjson"
+                (one record per line, re-importable with load_from_file)
+            batch_size: Records serialized per chunk
+            pretty: One record per line in JSON output
+            on_records: Called with the number of records in each chunk as
+                it is produced
+
+        Returns:
+            Iterator over UTF-8 encoded chunks
+        """
+        if format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+        with self.lock.read():
+            entities = [
+                (export_key, self.data[platform][entity])
+                for export_key, entity in self.EXPORT_KEYS[platform].items()
+            ]
+        if format == "ndjson":
+            return self._read_chunks(iter_ndjson_export(entities, batch_size, on_records))
+        return self._read_chunks(iter_json_export(entities, batch_size, pretty, on_records))
+
+    def _read_chunks(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Produce each chunk of a serialization under the read lock."""
+        while True:
+            with self.lock.read():
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
     def save_to_file(self, platform: Platform, filepath: str) -> Dict:
         """
-        Save platform data to a JSON file.
+        Save platform data to a JSON file (NDJSON for .ndjson/.jsonl paths).
+
+        Records are written in batches as they are serialized.
 
         Args:
             platform: The platform to export
@@ -306,19 +1023,27 @@ class DataMesh:
         Returns:
             Status dict
         """
-        data = self.export_to_platform(platform)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        format = "ndjson" if is_ndjson(filepath) else "json"
+        records = 0
+
+        def count(batch: int) -> None:
+            nonlocal records
+            records += batch
+
+        with open(filepath, 'wb') as f:
+            for chunk in self.iter_export(platform, format, pretty=True, on_records=count):
+                f.write(chunk)
 
         return {
             "status": "success",
             "file": filepath,
-            "records": sum(len(v) for v in data.values())
+            "records": records
         }
 
     def get_sync_log(self) -> List[Dict]:
         """Get the sync operation log."""
-        return self.sync_log
+        with self.lock.read():
+            return list(self.sync_log)
 
     def clear_platform(self, platform: Platform) -> Dict:
         """
@@ -330,24 +1055,22 @@ class DataMesh:
         Returns:
             Status dict
         """
-        if platform == Platform.SALESFORCE:
-            self.data[platform] = {"accounts": [], "contacts": [], "opportunities": [], "tasks": []}
-        elif platform == Platform.DYNAMICS365:
-            self.data[platform] = {"accounts": [], "contacts": [], "opportunities": [], "activities": []}
-        else:
-            self.data[platform] = {"companies": [], "contacts": [], "deals": [], "activities": []}
-
-        self._log_operation("clear", platform=platform.value)
+        with self.lock.write(), self._transaction():
+            self._replace_platform(platform, self._empty_platform(platform))
+            self._log_operation("clear", platform=platform.value)
 
         return {"status": "success", "platform": platform.value}
 
     def _log_operation(self, action: str, **kwargs) -> None:
         """Log an operation to the sync log."""
-        self.sync_log.append({
+        entry = {
             "action": action,
             "timestamp": datetime.now().isoformat(),
             **kwargs
-        })
+        }
+        self.sync_log.append(entry)
+        if self.store is not None:
+            self.store.append_log(entry)
 
 
 # Global data mesh instance
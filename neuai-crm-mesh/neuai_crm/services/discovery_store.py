@@ -0,0 +1,197 @@
+"""
+Sharded persistence for schema discovery state.
+
+Each discovered entity schema is its own shard under
+schemas/<platform>/, listed in order with a digest of its content in
+schemas/<platform>/index.json. Re-discovery rewrites only the
+shards whose content changed, and shards are read on first access.
+
+The audit queue, approved mappings and discovery history are kept as a
+snapshot (audit_state.json and discovery_history.json) plus an
+append-only journal (audit.journal), so approving a proposal appends a
+couple of lines instead of rewriting the state. Every file except the
+journal is written to a temporary file and renamed into place.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from neuai_crm.services.brain_journal import BrainJournal
+
+
+class AuditJournal(BrainJournal):
+    """Snapshot plus journal of audit state; the snapshot log is the discovery history."""
+
+    SNAPSHOT_FILE = "audit_state.json"
+    LOG_FILE = "discovery_history.json"
+    JOURNAL_FILE = "audit.journal"
+
+
+class LazyShards(MutableMapping):
+    """
+    Mapping of entity name to schema whose values are loaded on first access.
+
+    Entities set or deleted through the mapping are tracked in dirty so a
+    save only writes those shards.
+    """
+
+    def __init__(self, names: List[str], load: Callable[[str], Any], loaded: Optional[Dict[str, Any]] = None):
+        self._names = dict.fromkeys(names)
+        self._load = load
+        self._loaded: Dict[str, Any] = dict(loaded or {})
+        self.dirty: Set[str] = set()
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._names:
+            raise KeyError(name)
+        if name not in self._loaded:
+            self._loaded[name] = self._load(name)
+        return self._loaded[name]
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._names[name] = None
+        self._loaded[name] = value
+        self.dirty.add(name)
+
+    def __delitem__(self, name: str) -> None:
+        del self._names[name]
+        self._loaded.pop(name, None)
+        self.dirty.add(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def loaded(self) -> Dict[str, Any]:
+        """Values read or set so far."""
+        return self._loaded
+
+
+class DiscoveryStore:
+    """Schema shards and the audit journal in a discovery storage directory."""
+
+    SCHEMA_DIR = "schemas"
+    INDEX_FILE = "index.json"
+    LEGACY_FILE = "discovery_state.json"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.audit = AuditJournal(directory)
+        self._indexes: Dict[str, Dict[str, Dict]] = {}
+
+    @property
+    def legacy_path(self) -> Path:
+        """Single-file state written before sharding."""
+        return self.directory / self.LEGACY_FILE
+
+    def _platform_dir(self, platform: str) -> Path:
+        return self.directory / self.SCHEMA_DIR / platform
+
+    def platforms(self) -> List[str]:
+        """Platforms with stored schemas."""
+        schema_dir = self.directory / self.SCHEMA_DIR
+        if not schema_dir.exists():
+            return []
+        return sorted(p.name for p in schema_dir.iterdir() if (p / self.INDEX_FILE).exists())
+
+    def _index(self, platform: str) -> Dict[str, Dict]:
+        """Entity name -> {"name", "file", "digest"}, in discovery order."""
+        if platform not in self._indexes:
+            self._indexes[platform] = self._read_index(platform)
+        return self._indexes[platform]
+
+    def _read_index(self, platform: str) -> Dict[str, Dict]:
+        path = self._platform_dir(platform) / self.INDEX_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return {entry["name"]: entry for entry in json.load(f)["entities"]}
+        except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"Warning: Could not load {platform} schema index: {e}")
+            return {}
+
+    def entity_names(self, platform: str) -> List[str]:
+        """Stored entity names of a platform, in discovery order."""
+        return list(self._index(platform))
+
+    def read_entity(self, platform: str, entity: str) -> List[Dict]:
+        """
+        Read one entity shard.
+
+        Returns:
+            Field dicts (empty if the shard is missing or corrupt)
+        """
+        entry = self._index(platform).get(entity)
+        if entry is None:
+            return []
+        try:
+            with open(self._platform_dir(platform) / entry["file"], 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not load {platform}.{entity} schema: {e}")
+            return []
+
+    def write_platform(self, platform: str, names: List[str], shards: Dict[str, List[Dict]]) -> int:
+        """
+        Store a platform's entity list and the given shards.
+
+        Shards whose content matches the stored digest are not rewritten,
+        and shards of entities no longer in names are deleted.
+
+        Args:
+            platform: Platform name
+            names: Every entity of the platform, in order
+            shards: Field dicts of the entities that may have changed
+
+        Returns:
+            Number of shard files written
+        """
+        platform_dir = self._platform_dir(platform)
+        platform_dir.mkdir(parents=True, exist_ok=True)
+        index = dict(self._index(platform))
+        written = 0
+
+        for entity, fields in shards.items():
+            payload = json.dumps(fields, default=str)
+            digest = hashlib.sha1(payload.encode()).hexdigest()
+            entry = index.get(entity)
+            if entry is not None and entry.get("digest") == digest:
+                continue
+            file_name = self._shard_file(entity)
+            _write_atomic(platform_dir / file_name, payload)
+            index[entity] = {"name": entity, "file": file_name, "digest": digest}
+            written += 1
+
+        entries = [index[name] for name in names if name in index]
+        _write_atomic(platform_dir / self.INDEX_FILE, json.dumps({"entities": entries}, indent=2))
+        self._indexes[platform] = {entry["name"]: entry for entry in entries}
+
+        kept = {entry["file"] for entry in entries} | {self.INDEX_FILE}
+        for path in platform_dir.glob("*.json"):
+            if path.name not in kept:
+                path.unlink()
+        return written
+
+    def _shard_file(self, entity: str) -> str:
+        """File name for an entity shard (the hash keeps sanitized names distinct)."""
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", entity)
+        return f"{safe}-{hashlib.sha1(entity.encode()).hexdigest()[:8]}.json"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write text to a temporary file, fsync it and rename it over path."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
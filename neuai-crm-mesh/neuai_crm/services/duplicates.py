@@ -2,12 +2,29 @@
 Duplicate detection service for finding matching records across CRM platforms.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 import re
 
 from neuai_crm.models.schemas import Platform
 
+# Progress callback: receives a progress dict, may raise to stop the scan
+Progress = Optional[Callable[[Dict], None]]
+
+# Blocks (fuzzy engine) or groups (index) scanned between progress reports
+PROGRESS_EVERY = 1000
+
+
+def _report(progress: Progress, done: int, total: int, **fields) -> None:
+    """Publish a scan's running totals, if anyone is listening."""
+    if progress:
+        progress({
+            **fields,
+            "done": done,
+            "total": total,
+            "percent": round(100.0 * done / total, 1) if total else 100.0
+        })
+
 
 @dataclass
 class DuplicateMatch:
@@ -28,30 +45,79 @@ class DuplicateMatch:
         }
 
 
+_NON_DIGITS = re.compile(r"\D")
+
+
 class DuplicateDetector:
     """
     Detects duplicate records across CRM platforms using various matching strategies.
     """
 
-    def __init__(self, threshold: float = 0.8):
+    # Field weights for the fuzzy engine's weighted similarity score
+    CONTACT_WEIGHTS = {"email": 0.4, "name": 0.3, "phone": 0.3}
+    COMPANY_WEIGHTS = {"name": 0.6, "website": 0.25, "phone": 0.15}
+
+    # Platform field names read by the extractors
+    EMAIL_FIELDS = {
+        Platform.LOCAL: "email",
+        Platform.SALESFORCE: "Email",
+        Platform.DYNAMICS365: "emailaddress1"
+    }
+    NAME_FIELDS = {
+        Platform.LOCAL: ("firstName", "lastName"),
+        Platform.SALESFORCE: ("FirstName", "LastName"),
+        Platform.DYNAMICS365: ("firstname", "lastname")
+    }
+    PHONE_FIELDS = {
+        Platform.LOCAL: "phone",
+        Platform.SALESFORCE: "Phone",
+        Platform.DYNAMICS365: "telephone1"
+    }
+    COMPANY_NAME_FIELDS = {
+        Platform.LOCAL: "name",
+        Platform.SALESFORCE: "Name",
+        Platform.DYNAMICS365: "name"
+    }
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        max_block_size: int = 32,
+        window_size: int = 8
+    ):
         """
         Initialize the duplicate detector.
 
         Args:
             threshold: Minimum confidence score (0-1) for a match
+            max_block_size: Blocks larger than this are compared with a
+                sorted-neighborhood window instead of all pairs
+            window_size: Sliding window size for sorted-neighborhood blocks
         """
         self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.window_size = window_size
 
-    def detect_duplicates(self, data: Dict[Platform, Dict]) -> List[DuplicateMatch]:
+    def detect_duplicates(
+        self,
+        data: Dict[Platform, Dict],
+        fuzzy: bool = False,
+        progress: Progress = None
+    ) -> List[DuplicateMatch]:
         """
         Detect duplicate records across all platforms.
 
         Args:
             data: Dictionary of platform data {Platform: {entity: [records]}}
+            fuzzy: Use the blocking fuzzy engine instead of exact grouping
+            progress: Callback receiving a progress dict during fuzzy scans
 
         Returns:
             List of DuplicateMatch objects
         """
+        if fuzzy:
+            return self.detect_fuzzy_duplicates(data, progress)
+
         duplicates = []
 
         # Detect contact duplicates by email
@@ -74,17 +140,7 @@ class DuplicateDetector:
             platform_data = data.get(platform, {})
 
             for contact in platform_data.get(contacts_key, []):
-                email = self._extract_email(contact, platform)
-                name = self._extract_name(contact, platform)
-                phone = self._extract_phone(contact, platform)
-
-                all_contacts.append({
-                    "platform": platform.value,
-                    "record": contact,
-                    "email": email.lower() if email else "",
-                    "name": name.lower() if name else "",
-                    "phone": self._normalize_phone(phone) if phone else ""
-                })
+                all_contacts.append(self._contact_entry(contact, platform))
 
         # Group by email (exact match)
         email_groups = self._group_by_field(all_contacts, "email")
@@ -106,8 +162,7 @@ class DuplicateDetector:
             if phone and len(contacts) > 1:
                 platforms = list(set(c["platform"] for c in contacts))
                 # Check if these weren't already matched by email
-                emails = [c["email"] for c in contacts if c["email"]]
-                if len(platforms) > 1 and len(set(emails)) > 1:
+                if len(platforms) > 1 and self._has_distinct_emails(contacts):
                     duplicates.append(DuplicateMatch(
                         entity_type="contact",
                         match_field="phone",
@@ -134,13 +189,7 @@ class DuplicateDetector:
             platform_data = data.get(platform, {})
 
             for company in platform_data.get(entity_key, []):
-                name = self._extract_company_name(company, platform)
-
-                all_companies.append({
-                    "platform": platform.value,
-                    "record": company,
-                    "name": self._normalize_company_name(name) if name else ""
-                })
+                all_companies.append(self._company_entry(company, platform))
 
         # Group by normalized name
         name_groups = self._group_by_field(all_companies, "name")
@@ -158,6 +207,35 @@ class DuplicateDetector:
 
         return duplicates
 
+    def _contact_entry(self, contact: Dict, platform: Platform) -> Dict:
+        """Build the normalized match entry for a contact record."""
+        email = self._extract_email(contact, platform)
+        name = self._extract_name(contact, platform)
+        phone = self._extract_phone(contact, platform)
+
+        return {
+            "platform": platform.value,
+            "record": contact,
+            "email": email.lower() if email else "",
+            "name": name.lower() if name else "",
+            "phone": self._normalize_phone(phone) if phone else ""
+        }
+
+    def _company_entry(self, company: Dict, platform: Platform) -> Dict:
+        """Build the normalized match entry for a company record."""
+        name = self._extract_company_name(company, platform)
+
+        return {
+            "platform": platform.value,
+            "record": company,
+            "name": self._normalize_company_name(name) if name else ""
+        }
+
+    def _has_distinct_emails(self, contacts: List[Dict]) -> bool:
+        """Check whether a phone group holds more than one distinct email."""
+        emails = [c["email"] for c in contacts if c["email"]]
+        return len(set(emails)) > 1
+
     def _group_by_field(self, records: List[Dict], field: str) -> Dict[str, List[Dict]]:
         """Group records by a specific field value."""
         groups = {}
@@ -171,44 +249,25 @@ class DuplicateDetector:
 
     def _extract_email(self, record: Dict, platform: Platform) -> Optional[str]:
         """Extract email from a contact record."""
-        field_map = {
-            Platform.LOCAL: "email",
-            Platform.SALESFORCE: "Email",
-            Platform.DYNAMICS365: "emailaddress1"
-        }
-        return record.get(field_map[platform])
+        return record.get(self.EMAIL_FIELDS[platform])
 
     def _extract_name(self, record: Dict, platform: Platform) -> str:
         """Extract full name from a contact record."""
-        if platform == Platform.LOCAL:
-            return f"{record.get('firstName', '')} {record.get('lastName', '')}".strip()
-        elif platform == Platform.SALESFORCE:
-            return f"{record.get('FirstName', '')} {record.get('LastName', '')}".strip()
-        else:
-            return f"{record.get('firstname', '')} {record.get('lastname', '')}".strip()
+        first, last = self.NAME_FIELDS[platform]
+        return f"{record.get(first, '')} {record.get(last, '')}".strip()
 
     def _extract_phone(self, record: Dict, platform: Platform) -> Optional[str]:
         """Extract phone from a contact record."""
-        field_map = {
-            Platform.LOCAL: "phone",
-            Platform.SALESFORCE: "Phone",
-            Platform.DYNAMICS365: "telephone1"
-        }
-        return record.get(field_map[platform])
+        return record.get(self.PHONE_FIELDS[platform])
 
     def _extract_company_name(self, record: Dict, platform: Platform) -> Optional[str]:
         """Extract company name from an account record."""
-        field_map = {
-            Platform.LOCAL: "name",
-            Platform.SALESFORCE: "Name",
-            Platform.DYNAMICS365: "name"
-        }
-        return record.get(field_map[platform])
+        return record.get(self.COMPANY_NAME_FIELDS[platform])
 
     def _normalize_phone(self, phone: str) -> str:
         """Normalize a phone number for comparison."""
         # Remove all non-digit characters
-        return re.sub(r'\D', '', phone)
+        return _NON_DIGITS.sub("", phone)
 
     def _normalize_company_name(self, name: str) -> str:
         """Normalize a company name for comparison."""
@@ -226,6 +285,326 @@ class DuplicateDetector:
                 normalized = normalized[:-len(suffix)]
         return normalized.strip()
 
+    # =========================================================================
+    # Fuzzy matching engine (blocking + sorted neighborhood)
+    # =========================================================================
+
+    def detect_fuzzy_duplicates(
+        self,
+        data: Dict[Platform, Dict],
+        progress: Progress = None
+    ) -> List[DuplicateMatch]:
+        """
+        Detect near-duplicate records across platforms.
+
+        Records are grouped into blocks by cheap keys (phonetic name codes,
+        email domain + local-part n-grams, phone suffixes) and only records
+        sharing a block are scored. Oversized blocks fall back to a
+        sorted-neighborhood window, so the number of comparisons grows
+        linearly with the number of records rather than quadratically.
+
+        Args:
+            data: Dictionary of platform data {Platform: {entity: [records]}}
+            progress: Callback receiving the blocks compared so far, per
+                entity type, every PROGRESS_EVERY blocks; an exception it
+                raises (e.g. to cancel) stops the scan
+
+        Returns:
+            List of DuplicateMatch objects, one per cluster of matching records
+        """
+        duplicates = []
+        duplicates.extend(self._fuzzy_match(
+            "contact", self._contact_candidates(data),
+            self._contact_blocking_keys, self._score_contacts, progress
+        ))
+        duplicates.extend(self._fuzzy_match(
+            "company", self._company_candidates(data),
+            self._company_blocking_keys, self._score_companies, progress
+        ))
+        return duplicates
+
+    def _contact_candidates(self, data: Dict[Platform, Dict]) -> List["_Candidate"]:
+        """Extract and normalize the matchable fields of every contact."""
+        candidates = []
+        for platform in Platform:
+            for contact in data.get(platform, {}).get("contacts", []):
+                email = (self._extract_email(contact, platform) or "").strip().lower()
+                local, _, domain = email.partition("@")
+                name = self._normalize_person_name(self._extract_name(contact, platform))
+                phone = self._normalize_phone(self._extract_phone(contact, platform) or "")
+                candidates.append(_Candidate(
+                    platform.value, contact,
+                    {"email": email, "local": local, "domain": domain,
+                     "name": name, "phone": phone[-10:]}
+                ))
+        return candidates
+
+    def _company_candidates(self, data: Dict[Platform, Dict]) -> List["_Candidate"]:
+        """Extract and normalize the matchable fields of every company."""
+        entity_keys = {
+            Platform.LOCAL: "companies",
+            Platform.SALESFORCE: "accounts",
+            Platform.DYNAMICS365: "accounts"
+        }
+        website_keys = {
+            Platform.LOCAL: "website",
+            Platform.SALESFORCE: "Website",
+            Platform.DYNAMICS365: "websiteurl"
+        }
+        phone_keys = {
+            Platform.LOCAL: "phone",
+            Platform.SALESFORCE: "Phone",
+            Platform.DYNAMICS365: "telephone1"
+        }
+
+        candidates = []
+        for platform in Platform:
+            for company in data.get(platform, {}).get(entity_keys[platform], []):
+                name = self._extract_company_name(company, platform) or ""
+                name = re.sub(r"[^a-z0-9 ]", " ", self._normalize_company_name(name))
+                name = self._normalize_company_name(" ".join(name.split()))
+                website = self._normalize_website(company.get(website_keys[platform]) or "")
+                phone = self._normalize_phone(company.get(phone_keys[platform]) or "")
+                candidates.append(_Candidate(
+                    platform.value, company,
+                    {"name": name, "website": website, "phone": phone[-10:]}
+                ))
+        return candidates
+
+    def _contact_blocking_keys(self, fields: Dict[str, str]) -> Iterable[str]:
+        """Blocking keys for a contact: name code, email n-grams, phone suffix."""
+        name_parts = fields["name"].split()
+        if name_parts:
+            yield "n:" + self._soundex(name_parts[-1]) + name_parts[0][0]
+        local, domain = fields["local"], fields["domain"]
+        if local and domain:
+            # A single typo leaves at least one half of the local part intact
+            half = max(len(local) // 2, 1)
+            yield "e:" + domain + ":" + local[:half]
+            yield "e:" + domain + ":" + local[half:]
+        if len(fields["phone"]) >= 7:
+            yield "p:" + fields["phone"][-7:]
+
+    def _company_blocking_keys(self, fields: Dict[str, str]) -> Iterable[str]:
+        """Blocking keys for a company: name code, name prefix, domain, phone."""
+        name = fields["name"]
+        if name:
+            yield "n:" + self._soundex(name.split()[0])
+            yield "f:" + name.replace(" ", "")[:5]
+        if fields["website"]:
+            yield "w:" + fields["website"]
+        if len(fields["phone"]) >= 7:
+            yield "p:" + fields["phone"][-7:]
+
+    def _fuzzy_match(
+        self,
+        entity_type: str,
+        candidates: List["_Candidate"],
+        key_func,
+        score_func,
+        progress: Progress = None
+    ) -> List[DuplicateMatch]:
+        """Block, score and cluster candidates into DuplicateMatch objects."""
+        blocks: Dict[str, List[int]] = {}
+        for idx, candidate in enumerate(candidates):
+            for key in set(key_func(candidate.fields)):
+                blocks.setdefault(key, []).append(idx)
+
+        parent = list(range(len(candidates)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        edges: List[Tuple[int, int, float, str]] = []
+
+        def compare(i: int, j: int) -> None:
+            a, b = candidates[i], candidates[j]
+            if a.platform == b.platform:
+                return
+            root_i, root_j = find(i), find(j)
+            if root_i == root_j:
+                return
+            score, field = score_func(a.fields, b.fields)
+            if score >= self.threshold:
+                parent[root_j] = root_i
+                edges.append((i, j, score, field))
+
+        for done, members in enumerate(blocks.values(), 1):
+            if len(members) <= self.max_block_size:
+                for pos, i in enumerate(members):
+                    for j in members[pos + 1:]:
+                        compare(i, j)
+            else:
+                members.sort(key=lambda m: candidates[m].sort_key)
+                for pos, i in enumerate(members):
+                    for j in members[pos + 1:pos + 1 + self.window_size]:
+                        compare(i, j)
+            if done % PROGRESS_EVERY == 0:
+                _report(progress, done, len(blocks), entity_type=entity_type)
+        _report(progress, len(blocks), len(blocks), entity_type=entity_type)
+
+        clusters: Dict[int, Dict] = {}
+        for i, j, score, field in edges:
+            cluster = clusters.setdefault(find(i), {"members": set(), "scores": [], "best": None})
+            cluster["members"].update((i, j))
+            cluster["scores"].append(score)
+            if cluster["best"] is None or score > cluster["best"][0]:
+                cluster["best"] = (score, field, candidates[i].fields[field])
+
+        duplicates = []
+        for cluster in clusters.values():
+            _, field, value = cluster["best"]
+            duplicates.append(DuplicateMatch(
+                entity_type=entity_type,
+                match_field=field,
+                match_value=value,
+                confidence=round(sum(cluster["scores"]) / len(cluster["scores"]), 3),
+                records=[
+                    {"platform": candidates[m].platform, "record": candidates[m].record}
+                    for m in sorted(cluster["members"])
+                ]
+            ))
+
+        duplicates.sort(key=lambda d: d.confidence, reverse=True)
+        return duplicates
+
+    def _score_contacts(self, a: Dict[str, str], b: Dict[str, str]) -> Tuple[float, str]:
+        """Weighted field similarity between two contacts."""
+        if a["email"] and a["email"] == b["email"]:
+            return 1.0, "email"
+
+        comparisons = []
+        if a["phone"] and b["phone"]:
+            comparisons.append(("phone", 1.0, lambda: float(a["phone"][-7:] == b["phone"][-7:])))
+        if a["name"] and b["name"]:
+            comparisons.append(("name", 1.0, lambda: self._similarity(a["name"], b["name"])))
+        if a["email"] and b["email"]:
+            if a["domain"] == b["domain"]:
+                comparisons.append(("email", 1.0, lambda: self._similarity(a["local"], b["local"])))
+            else:
+                comparisons.append(("email", 0.5, lambda: 0.5 * self._similarity(a["email"], b["email"])))
+
+        # A name alone is weak evidence
+        scale = 0.75 if [c[0] for c in comparisons] == ["name"] else 1.0
+        return self._weighted_score(comparisons, self.CONTACT_WEIGHTS, scale)
+
+    def _score_companies(self, a: Dict[str, str], b: Dict[str, str]) -> Tuple[float, str]:
+        """Weighted field similarity between two companies."""
+        comparisons = []
+        if a["website"] and b["website"]:
+            comparisons.append(("website", 1.0, lambda: float(a["website"] == b["website"])))
+        if a["phone"] and b["phone"]:
+            comparisons.append(("phone", 1.0, lambda: float(a["phone"][-7:] == b["phone"][-7:])))
+        if a["name"] and b["name"]:
+            comparisons.append(("name", 1.0, lambda: self._similarity(a["name"], b["name"])))
+        return self._weighted_score(comparisons, self.COMPANY_WEIGHTS)
+
+    def _weighted_score(
+        self,
+        comparisons: List[Tuple[str, float, Callable[[], float]]],
+        weights: Dict[str, float],
+        scale: float = 1.0
+    ) -> Tuple[float, str]:
+        """
+        Combine per-field similarities over the fields both records have.
+
+        Comparisons are (field, max_similarity, compute) tuples ordered cheapest
+        first. As soon as the best still-achievable score drops below the
+        threshold the pair is rejected without running the remaining (costly)
+        string comparisons, so scores under the threshold are upper bounds.
+        """
+        if not comparisons:
+            return 0.0, ""
+
+        total_weight = sum(weights[field] for field, _, _ in comparisons)
+        remaining = sum(weights[field] * ceiling for field, ceiling, _ in comparisons)
+        achieved = 0.0
+        best_field, best_sim = "", -1.0
+
+        for field, ceiling, compute in comparisons:
+            bound = scale * (achieved + remaining) / total_weight
+            if bound < self.threshold:
+                return bound, best_field
+            sim = compute()
+            remaining -= weights[field] * ceiling
+            achieved += weights[field] * sim
+            if sim > best_sim or (sim == best_sim and weights[field] > weights[best_field]):
+                best_field, best_sim = field, sim
+
+        return scale * achieved / total_weight, best_field
+
+    def _similarity(self, a: str, b: str) -> float:
+        """Jaro-Winkler string similarity (0-1), tolerant of typos and transpositions."""
+        if a == b:
+            return 1.0
+        len_a, len_b = len(a), len(b)
+        if not len_a or not len_b:
+            return 0.0
+
+        window = max(max(len_a, len_b) // 2 - 1, 0)
+        matched_b = [False] * len_b
+        matches_a = []
+        for i, char in enumerate(a):
+            hi = min(len_b, i + window + 1)
+            j = b.find(char, max(0, i - window), hi)
+            while j != -1 and matched_b[j]:
+                j = b.find(char, j + 1, hi)
+            if j != -1:
+                matched_b[j] = True
+                matches_a.append(char)
+
+        m = len(matches_a)
+        if not m:
+            return 0.0
+        matches_b = [b[j] for j in range(len_b) if matched_b[j]]
+        transpositions = sum(x != y for x, y in zip(matches_a, matches_b)) / 2
+        jaro = (m / len_a + m / len_b + (m - transpositions) / m) / 3
+
+        prefix = 0
+        for x, y in zip(a[:4], b[:4]):
+            if x != y:
+                break
+            prefix += 1
+        return jaro + prefix * 0.1 * (1 - jaro)
+
+    def _normalize_person_name(self, name: str) -> str:
+        """Normalize a person name for comparison."""
+        return " ".join(re.sub(r"[^a-z ]", "", name.lower()).split())
+
+    def _normalize_website(self, website: str) -> str:
+        """Reduce a website URL to its bare domain."""
+        website = website.lower().strip()
+        website = re.sub(r"^[a-z]+://", "", website)
+        website = website.split("/")[0]
+        if website.startswith("www."):
+            website = website[4:]
+        return website
+
+    def _soundex(self, word: str) -> str:
+        """American Soundex code, used as a phonetic blocking key."""
+        word = re.sub(r"[^a-z]", "", word.lower())
+        if not word:
+            return ""
+
+        codes = {
+            **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"),
+            **dict.fromkeys("dt", "3"), "l": "4", **dict.fromkeys("mn", "5"), "r": "6"
+        }
+        result = word[0].upper()
+        last = codes.get(word[0], "")
+        for char in word[1:]:
+            code = codes.get(char, "")
+            if code and code != last:
+                result += code
+                if len(result) == 4:
+                    break
+            if char not in "hw":
+                last = code
+        return result.ljust(4, "0")
+
     def find_matches_for_record(
         self,
         record: Dict,
@@ -270,5 +649,245 @@ class DuplicateDetector:
         return matches
 
 
+class DuplicateIndex:
+    """
+    Exact-match duplicate index maintained incrementally as mesh data changes.
+
+    Records are grouped by normalized email, phone and company name, with each
+    group split per platform. Groups spanning more than one platform are
+    tracked separately, so duplicate and conflict queries only touch actual
+    matches instead of rescanning every record. Results are identical to
+    DuplicateDetector.detect_duplicates (up to ordering after replace_record).
+    """
+
+    # Index name -> (entity type, match field, confidence)
+    INDEXES = {
+        "email": ("contact", "email", 1.0),
+        "phone": ("contact", "phone", 0.9),
+        "company": ("company", "name", 0.95),
+    }
+
+    COMPANY_ENTITIES = {
+        Platform.LOCAL: "companies",
+        Platform.SALESFORCE: "accounts",
+        Platform.DYNAMICS365: "accounts"
+    }
+
+    def __init__(self, detector: Optional[DuplicateDetector] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            detector: Detector whose extraction/normalization rules to use
+        """
+        self.detector = detector or DuplicateDetector()
+        # index name -> match key -> {platform value: [entries]}
+        self._groups: Dict[str, Dict[str, Dict[str, List[Dict]]]] = {
+            name: {} for name in self.INDEXES
+        }
+        # index name -> keys whose group spans several platforms (ordered set)
+        self._cross: Dict[str, Dict[str, None]] = {name: {} for name in self.INDEXES}
+        # (platform, entity) -> (index name, match key) -> entries under it,
+        # so removal visits each group once and replaced keys are let go
+        self._postings: Dict[Tuple[Platform, str], Dict[Tuple[str, str], int]] = {}
+        # (platform, entity) -> entry of each record, by position in the list
+        self._rows: Dict[Tuple[Platform, str], List[Dict]] = {}
+
+    def index_platform(self, platform: Platform, platform_data: Dict[str, List[Dict]]) -> None:
+        """Replace the indexed records of every entity of a platform."""
+        self.remove_platform(platform)
+        for entity, records in platform_data.items():
+            self.index_entity(platform, entity, records)
+
+    def index_entity(self, platform: Platform, entity: str, records: List[Dict]) -> None:
+        """Replace the indexed records of one (platform, entity) list."""
+        self.remove_entity(platform, entity)
+        self.add_records(platform, entity, records)
+
+    def add_records(self, platform: Platform, entity: str, records: Iterable[Dict]) -> None:
+        """Index records appended to the end of a (platform, entity) list."""
+        if entity == "contacts":
+            build = self.detector._contact_entry
+        elif entity == self.COMPANY_ENTITIES[platform]:
+            build = self.detector._company_entry
+        else:
+            return
+
+        key = (platform, entity)
+        postings = self._postings.setdefault(key, {})
+        rows = self._rows.setdefault(key, [])
+        add = self._add
+        for record in records:
+            entry = build(record, platform)
+            rows.append(entry)
+            if "email" in entry:
+                if entry["email"]:
+                    add(postings, "email", entry["email"], entry)
+                if entry["phone"]:
+                    add(postings, "phone", entry["phone"], entry)
+            elif entry["name"]:
+                add(postings, "company", entry["name"], entry)
+
+    def replace_record(self, platform: Platform, entity: str, row: int, record: Dict) -> None:
+        """
+        Re-index one record of a (platform, entity) list replaced in place.
+
+        When the record keeps its match keys its entry is updated where it
+        stands. Otherwise the entry leaves its old groups and is appended to
+        its new ones, so the order of records within those groups can differ
+        from a fresh scan.
+
+        Args:
+            platform: The record's platform
+            entity: The record's entity list
+            row: Position of the record in the list
+            record: The new record
+        """
+        rows = self._rows.get((platform, entity))
+        if rows is None:
+            return
+        entry = rows[row]
+        new_entry = (self.detector._contact_entry if entity == "contacts"
+                     else self.detector._company_entry)(record, platform)
+        old_keys = self._match_keys(entry)
+        new_keys = self._match_keys(new_entry)
+
+        if old_keys == new_keys:
+            entry.update(new_entry)
+            return
+
+        postings = self._postings[(platform, entity)]
+        for index_name, match_key in old_keys:
+            posting = (index_name, match_key)
+            postings[posting] -= 1
+            if not postings[posting]:
+                del postings[posting]
+            groups = self._groups[index_name]
+            group = groups[match_key]
+            entries = group[platform.value]
+            del entries[next(i for i, e in enumerate(entries) if e is entry)]
+            if not entries:
+                del group[platform.value]
+                if not group:
+                    del groups[match_key]
+                if len(group) < 2:
+                    self._cross[index_name].pop(match_key, None)
+
+        rows[row] = new_entry
+        for index_name, match_key in new_keys:
+            self._add(postings, index_name, match_key, new_entry)
+
+    def remove_platform(self, platform: Platform) -> None:
+        """Drop every indexed record of a platform."""
+        for key in [k for k in self._rows if k[0] == platform]:
+            self.remove_entity(*key)
+
+    def remove_entity(self, platform: Platform, entity: str) -> None:
+        """Drop the indexed records of one (platform, entity) list."""
+        self._rows.pop((platform, entity), None)
+        for index_name, match_key in self._postings.pop((platform, entity), {}):
+            groups = self._groups[index_name]
+            group = groups.get(match_key)
+            if group is None:
+                continue
+            group.pop(platform.value, None)
+            if not group:
+                del groups[match_key]
+            if len(group) < 2:
+                self._cross[index_name].pop(match_key, None)
+
+    def duplicates(self, progress: Progress = None) -> List[DuplicateMatch]:
+        """
+        All cross-platform duplicate groups, in detect_duplicates order.
+
+        Args:
+            progress: Callback receiving the groups scanned so far every
+                PROGRESS_EVERY groups; an exception it raises stops the scan
+        """
+        return self._scan(lambda group: True, progress)
+
+    def conflicts(
+        self,
+        source: Platform,
+        target: Platform,
+        progress: Progress = None
+    ) -> List[DuplicateMatch]:
+        """Duplicate groups that hold records from both platforms (progress as for duplicates)."""
+        return self._scan(lambda group: source.value in group and target.value in group, progress)
+
+    def _scan(self, accept: Callable[[Dict], bool], progress: Progress) -> List[DuplicateMatch]:
+        """Build the matches of the cross-platform groups that accept() keeps."""
+        matches = []
+        total = sum(len(keys) for keys in self._cross.values())
+        done = 0
+        for index_name in self.INDEXES:
+            groups = self._groups[index_name]
+            for match_key in self._cross[index_name]:
+                done += 1
+                if accept(groups[match_key]):
+                    match = self._build_match(index_name, match_key)
+                    if match:
+                        matches.append(match)
+                if done % PROGRESS_EVERY == 0:
+                    _report(progress, done, total, index=index_name)
+        _report(progress, total, total)
+        return matches
+
+    def _match_keys(self, entry: Dict) -> List[Tuple[str, str]]:
+        """(index name, match key) pairs of the indexes an entry belongs to."""
+        names = ("email", "phone") if "email" in entry else ("company",)
+        return [(name, entry[self.INDEXES[name][1]]) for name in names
+                if entry[self.INDEXES[name][1]]]
+
+    def _add(
+        self,
+        postings: Dict[Tuple[str, str], int],
+        index_name: str,
+        match_key: str,
+        entry: Dict
+    ) -> None:
+        """Add an entry to a group (promoting the group once it spans platforms) and count it in postings."""
+        group = self._groups[index_name].setdefault(match_key, {})
+        group.setdefault(entry["platform"], []).append(entry)
+        if len(group) > 1:
+            self._cross[index_name][match_key] = None
+        posting = (index_name, match_key)
+        postings[posting] = postings.get(posting, 0) + 1
+
+    def _build_match(self, index_name: str, match_key: str) -> Optional[DuplicateMatch]:
+        """Build the DuplicateMatch for a cross-platform group."""
+        group = self._groups[index_name][match_key]
+        records = [
+            entry
+            for platform in Platform
+            for entry in group.get(platform.value, [])
+        ]
+
+        # Phone groups only count when email did not already match them
+        if index_name == "phone" and not self.detector._has_distinct_emails(records):
+            return None
+
+        entity_type, match_field, confidence = self.INDEXES[index_name]
+        return DuplicateMatch(
+            entity_type=entity_type,
+            match_field=match_field,
+            match_value=match_key,
+            confidence=confidence,
+            records=records
+        )
+
+
+class _Candidate:
+    """Normalized view of a record used by the fuzzy matching engine."""
+
+    __slots__ = ("platform", "record", "fields", "sort_key")
+
+    def __init__(self, platform: str, record: Dict, fields: Dict[str, str]):
+        self.platform = platform
+        self.record = record
+        self.fields = fields
+        self.sort_key = (fields.get("name", ""), fields.get("email", ""), fields.get("phone", ""))
+
+
 # Global detector instance
 detector = DuplicateDetector()
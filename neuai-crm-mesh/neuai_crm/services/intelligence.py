@@ -2,11 +2,18 @@
 Intelligence Layer - AI-powered operations for the CRM data mesh.
 """
 
+import threading
+import uuid
+from collections import OrderedDict, deque
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 
 from neuai_crm.models.schemas import Platform, SCHEMA_MAPPINGS
 from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.intent_router import IntentRouter
+
+# Longest query text kept in the conversation history
+MAX_HISTORY_QUERY_CHARS = 2000
 
 
 class IntelligenceLayer:
@@ -15,17 +22,33 @@ class IntelligenceLayer:
 
     Provides natural language query processing and intelligent
     recommendations for data operations.
+
+    The conversation history is bounded: it keeps the latest max_history
+    entries, and assistant entries hold a summary of the response (its
+    scalar fields and the sizes of its lists and dicts) with a result_id.
+    Only the keep_results most recent full responses stay retrievable
+    through get_result.
+
+    Queries may be processed concurrently: the mesh operations they run
+    lock the mesh themselves, and the history has a lock of its own that is
+    never held while a query runs.
     """
 
-    def __init__(self, data_mesh: DataMesh):
+    def __init__(self, data_mesh: DataMesh, max_history: int = 200, keep_results: int = 3):
         """
         Initialize the intelligence layer.
 
         Args:
             data_mesh: The data mesh instance to operate on
+            max_history: Conversation entries kept (user and assistant)
+            keep_results: Full responses kept for get_result
         """
         self.mesh = data_mesh
-        self.conversation_history: List[Dict] = []
+        self.router = IntentRouter()
+        self.keep_results = keep_results
+        self.conversation_history: deque = deque(maxlen=max_history)
+        self._results: "OrderedDict[str, Dict]" = OrderedDict()
+        self._history_lock = threading.Lock()
 
     def process_query(self, query: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -38,51 +61,51 @@ class IntelligenceLayer:
         Returns:
             Response dict with intent, action, and result
         """
-        query_lower = query.lower()
-
         # Save to conversation history
-        self.conversation_history.append({
-            "role": "user",
-            "content": query,
-            "timestamp": datetime.now().isoformat()
-        })
+        with self._history_lock:
+            self.conversation_history.append({
+                "role": "user",
+                "content": query[:MAX_HISTORY_QUERY_CHARS],
+                "timestamp": datetime.now().isoformat()
+            })
 
         # Intent detection and handling
-        if self._matches_intent(query_lower, ["sync", "synchronize", "update"]):
-            response = self._handle_sync_intent(query, context)
-        elif self._matches_intent(query_lower, ["migrate", "transfer", "move"]):
-            response = self._handle_migrate_intent(query, context)
-        elif self._matches_intent(query_lower, ["duplicate", "match", "find similar"]):
-            response = self._handle_duplicate_intent(query, context)
-        elif self._matches_intent(query_lower, ["conflict", "differ", "mismatch"]):
-            response = self._handle_conflict_intent(query, context)
-        elif self._matches_intent(query_lower, ["status", "stats", "count", "how many"]):
-            response = self._handle_status_intent(query, context)
-        elif self._matches_intent(query_lower, ["translate", "convert", "transform"]):
-            response = self._handle_translate_intent(query, context)
-        elif self._matches_intent(query_lower, ["schema", "mapping", "fields"]):
-            response = self._handle_schema_intent(query, context)
-        elif self._matches_intent(query_lower, ["help", "what can", "how do"]):
-            response = self._handle_help_intent(query, context)
-        elif self._matches_intent(query_lower, ["clear", "reset", "delete all"]):
-            response = self._handle_clear_intent(query, context)
-        elif self._matches_intent(query_lower, ["export", "download", "save"]):
-            response = self._handle_export_intent(query, context)
+        route = self.router.route(query)
+        if route.needs_confirmation:
+            response = self._confirm_destructive_intent(route)
         else:
-            response = self._handle_general_intent(query, context)
-
-        # Save response to conversation history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
+            response = getattr(self, f"_handle_{route.intent}_intent")(query, context)
+        if route.ambiguous:
+            response["alternative_intents"] = route.alternatives
+
+        # Save a summary of the response to conversation history
+        result_id = uuid.uuid4().hex[:12]
+        with self._history_lock:
+            self._results[result_id] = response
+            while len(self._results) > self.keep_results:
+                self._results.popitem(last=False)
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": self._summarize(response),
+                "result_id": result_id,
+                "timestamp": datetime.now().isoformat()
+            })
 
         return response
 
-    def _matches_intent(self, query: str, keywords: List[str]) -> bool:
-        """Check if query matches any of the intent keywords."""
-        return any(word in query for word in keywords)
+    @staticmethod
+    def _summarize(response: Dict) -> Dict:
+        """Scalar fields of a response, with lists and dicts replaced by their sizes."""
+        summary: Dict[str, Any] = {}
+        omitted: Dict[str, int] = {}
+        for key, value in response.items():
+            if isinstance(value, (list, tuple, dict)):
+                omitted[key] = len(value)
+            else:
+                summary[key] = value
+        if omitted:
+            summary["omitted"] = omitted
+        return summary
 
     def _extract_platforms(self, query: str) -> Tuple[Optional[Platform], Optional[Platform]]:
         """Extract source and target platforms from query."""
@@ -275,6 +298,16 @@ class IntelligenceLayer:
             "message": "Which platform would you like to clear? (Salesforce, Dynamics 365, or Local)"
         }
 
+    def _confirm_destructive_intent(self, route) -> Dict:
+        """Ask before a destructive intent that competed with other intents."""
+        return {
+            "intent": route.intent,
+            "action": "clarification_needed",
+            "message": (f"Your request also matched {', '.join(route.alternatives)}. "
+                        f"To {route.intent} a platform, ask for that alone, "
+                        "for example: 'Clear Salesforce'")
+        }
+
     def _handle_export_intent(self, query: str, context: Optional[Dict]) -> Dict:
         """Handle export queries."""
         platform, _ = self._extract_platforms(query)
@@ -307,8 +340,24 @@ class IntelligenceLayer:
 
     def get_conversation_history(self) -> List[Dict]:
         """Get the conversation history."""
-        return self.conversation_history
+        with self._history_lock:
+            return list(self.conversation_history)
+
+    def get_result(self, result_id: str) -> Optional[Dict]:
+        """
+        Get the full response behind a history entry.
+
+        Args:
+            result_id: result_id of an assistant history entry
+
+        Returns:
+            The response, or None once it has aged out of the kept results
+        """
+        with self._history_lock:
+            return self._results.get(result_id)
 
     def clear_history(self) -> None:
         """Clear the conversation history."""
-        self.conversation_history = []
+        with self._history_lock:
+            self.conversation_history.clear()
+            self._results.clear()
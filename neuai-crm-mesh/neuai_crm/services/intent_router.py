@@ -0,0 +1,120 @@
+"""
+Compiled intent routing for natural language CRM queries.
+
+Every intent keyword is folded into one regex, so a lowercased query is
+routed with a single scan instead of a substring test per keyword.
+Keywords match at word starts ("duplicates" hits "duplicate", "account"
+does not hit "count"), and each intent is scored by the distinct keywords
+it hit, a phrase counting once. The highest score wins; ties go to the
+intent listed first, and the other tied intents are reported as
+alternatives. A destructive intent never wins outright when another
+intent also matched: the route is flagged for confirmation instead.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Intents and their keywords, in tie-break priority order
+INTENT_KEYWORDS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("sync", ("sync", "synchronize", "update")),
+    ("migrate", ("migrate", "transfer", "move")),
+    ("duplicate", ("duplicate", "match", "find similar")),
+    ("conflict", ("conflict", "differ", "mismatch")),
+    ("status", ("status", "stats", "count", "how many")),
+    ("translate", ("translate", "convert", "transform")),
+    ("schema", ("schema", "mapping", "fields")),
+    ("help", ("help", "what can", "how do")),
+    ("clear", ("clear", "reset", "delete all")),
+    ("export", ("export", "download", "save")),
+]
+
+# Intent for queries that hit no keyword
+FALLBACK_INTENT = "general"
+
+# Intents that destroy data, only routed when no other intent matched
+DESTRUCTIVE_INTENTS = frozenset({"clear"})
+
+
+@dataclass
+class Route:
+    """Where a query was routed."""
+    intent: str
+    score: int = 0
+    # Keywords hit, per intent that scored
+    hits: Dict[str, List[str]] = field(default_factory=dict)
+    # Other intents that tied with the winner
+    alternatives: List[str] = field(default_factory=list)
+    # A destructive intent won while other intents also matched
+    needs_confirmation: bool = False
+
+    @property
+    def ambiguous(self) -> bool:
+        return bool(self.alternatives)
+
+
+class IntentRouter:
+    """Routes queries to intents with one compiled regex scan."""
+
+    def __init__(self, intents: Sequence[Tuple[str, Sequence[str]]] = INTENT_KEYWORDS,
+                 destructive: Iterable[str] = DESTRUCTIVE_INTENTS):
+        """
+        Compile the router.
+
+        Args:
+            intents: (intent, keywords) pairs in tie-break priority order
+            destructive: Intents that need confirmation when other intents matched too
+        """
+        self.destructive = frozenset(destructive)
+        self.priority = {intent: rank for rank, (intent, _) in enumerate(intents)}
+        # Keyword -> intent
+        self._intents: Dict[str, str] = {
+            keyword.lower(): intent for intent, keywords in intents for keyword in keywords
+        }
+        # Longest keywords first, so "synchronize" is hit rather than "sync"
+        alternatives = [
+            r"\s+".join(re.escape(word) for word in keyword.split())
+            for keyword in sorted(self._intents, key=len, reverse=True)
+        ]
+        # Lowercasing the query first is several times faster than IGNORECASE
+        self._pattern = re.compile(r"\b(?:" + "|".join(alternatives) + ")")
+
+    def route(self, query: str) -> Route:
+        """
+        Route a query to its best-scoring intent.
+
+        Args:
+            query: The natural language query
+
+        Returns:
+            The route; FALLBACK_INTENT with score 0 when nothing matched.
+            When a destructive intent wins but other intents matched too,
+            the route has needs_confirmation set and lists every other
+            matched intent as an alternative.
+        """
+        found = self._pattern.findall(query.lower())
+        if not found:
+            return Route(FALLBACK_INTENT)
+
+        hits: Dict[str, List[str]] = {}
+        scores: Dict[str, int] = {}
+        for keyword in found:
+            intent = self._intents.get(keyword)
+            if intent is None:  # A phrase matched across other whitespace
+                keyword = " ".join(keyword.split())
+                intent = self._intents[keyword]
+            keywords = hits.setdefault(intent, [])
+            if keyword not in keywords:
+                keywords.append(keyword)
+                scores[intent] = scores.get(intent, 0) + 1
+
+        if len(scores) == 1:
+            return Route(intent, scores[intent], hits)
+        best = max(scores.values())
+        tied = sorted((intent for intent, score in scores.items() if score == best),
+                      key=self.priority.__getitem__)
+        if tied[0] in self.destructive:
+            others = sorted((intent for intent in scores if intent != tied[0]),
+                            key=self.priority.__getitem__)
+            return Route(tied[0], best, hits, others, needs_confirmation=True)
+        return Route(tied[0], best, hits, tied[1:])
@@ -0,0 +1,236 @@
+"""
+Background jobs for long-running mesh operations.
+
+A JobManager runs submitted operations on a bounded thread pool, off the
+API's event loop. Each operation receives a report callback to publish a
+progress dict (the same callback shape load_from_file and sync_platforms
+take); the callback also raises JobCancelled once cancellation was
+requested, so operations stop at their next progress checkpoint. Queued
+jobs are cancelled before they start.
+
+Jobs are kept in memory: the most recent finished jobs are retained for
+polling and older ones are dropped.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised from a job's report callback once the job was cancelled."""
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+# Progress callback handed to operations
+Report = Callable[[Dict], None]
+
+
+@dataclass
+class Job:
+    """A submitted operation and its progress."""
+    id: str
+    kind: str
+    status: JobStatus = JobStatus.QUEUED
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    # Bumped on every change, so watchers can wait for the next one
+    version: int = 0
+    cancel_requested: bool = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": dict(self.progress),
+            "error": self.error
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """
+    Runs operations as background jobs on a bounded thread pool.
+
+    At most max_workers jobs run at once and at most max_pending more wait
+    in the queue; submitting beyond that raises JobQueueFull. The default of
+    one worker runs jobs one after another, so jobs that mutate the same
+    data mesh don't interleave with each other; state shared with other
+    threads still needs a lock of its own (the data mesh and schema
+    discovery lock their state around each read or write).
+    """
+
+    def __init__(self, max_workers: int = 1, max_pending: int = 16, keep_finished: int = 100):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers: Jobs that run concurrently
+            max_pending: Jobs that may wait for a worker
+            keep_finished: Finished jobs retained for polling
+        """
+        if max_workers < 1 or max_pending < 0:
+            raise ValueError("max_workers must be at least 1 and max_pending non-negative")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mesh-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._changed = threading.Condition()
+
+    def submit(self, kind: str, operation: Callable[[Report], Any]) -> Job:
+        """
+        Queue an operation.
+
+        Args:
+            kind: Operation name shown in job listings
+            operation: Called as operation(report) on a worker thread; its
+                return value becomes the job result
+
+        Returns:
+            The queued job
+        """
+        with self._changed:
+            active = sum(1 for job in self._jobs.values() if not job.finished)
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFull(f"{active} jobs are queued or running")
+            job = Job(id=uuid.uuid4().hex[:12], kind=kind)
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._pool.submit(self._run, job, operation)
+            self._prune()
+        return job
+
+    def _run(self, job: Job, operation: Callable[[Report], Any]) -> None:
+        with self._changed:
+            if job.cancel_requested:  # Cancelled as the worker picked it up
+                self._futures.pop(job.id, None)
+                self._update(job, status=JobStatus.CANCELLED, finished_at=datetime.now().isoformat())
+                return
+            self._update(job, status=JobStatus.RUNNING, started_at=datetime.now().isoformat())
+
+        def report(progress: Dict) -> None:
+            with self._changed:
+                if job.cancel_requested:
+                    raise JobCancelled()
+                self._update(job, progress=dict(progress))
+
+        try:
+            result = operation(report)
+        except JobCancelled:
+            self._finish(job, JobStatus.CANCELLED)
+        except Exception as e:
+            self._finish(job, JobStatus.FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(job, JobStatus.SUCCEEDED, result=result)
+
+    def _finish(self, job: Job, status: JobStatus, result: Any = None, error: Optional[str] = None) -> None:
+        with self._changed:
+            self._futures.pop(job.id, None)
+            self._update(job, status=status, result=result, error=error,
+                         finished_at=datetime.now().isoformat())
+
+    def _update(self, job: Job, **changes: Any) -> None:
+        """Apply changes to a job and wake its watchers (caller holds the lock)."""
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.version += 1
+        self._changed.notify_all()
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond keep_finished."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job by ID, or None."""
+        return self._jobs.get(job_id)
+
+    def list(self, status: Optional[JobStatus] = None) -> List[Job]:
+        """Jobs, oldest first, optionally with one status."""
+        with self._changed:
+            return [job for job in self._jobs.values() if status is None or job.status == status]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job.
+
+        A queued job is cancelled at once; a running job stops at its next
+        progress report. Finished jobs are left as they are.
+
+        Returns:
+            The job, or None if it doesn't exist
+        """
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.cancel_requested = True
+            future = self._futures.get(job_id)
+            if job.status == JobStatus.QUEUED and (future is None or future.cancel()):
+                self._futures.pop(job_id, None)
+                self._update(job, status=JobStatus.CANCELLED, finished_at=datetime.now().isoformat())
+            else:
+                self._update(job)
+        return job
+
+    def wait(self, job_id: str, version: int = -1, timeout: Optional[float] = None) -> Optional[Job]:
+        """
+        Wait until a job changes past version, or finishes.
+
+        Args:
+            job_id: Job to watch
+            version: Last version seen (-1 returns at once)
+            timeout: Seconds to wait at most
+
+        Returns:
+            The job (unchanged if the timeout passed), or None if it doesn't exist
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: job_id not in self._jobs or self._jobs[job_id].version != version
+                or self._jobs[job_id].finished,
+                timeout
+            )
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel queued and running jobs and stop the pool."""
+        for job in self.list():
+            self.cancel(job.id)
+        self._pool.shutdown(wait=wait)
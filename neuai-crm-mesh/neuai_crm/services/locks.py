@@ -0,0 +1,91 @@
+"""
+Readers-writer lock guarding shared mesh state.
+
+Any number of threads may read at once; a writer waits for the readers to
+leave and holds the lock alone. Waiting writers keep new readers out, so a
+steady stream of reads can't starve a load or sync. The lock is reentrant
+per thread: a writer may take it again to read or write, and a reader may
+read again, but a reader can't upgrade to writing (two upgrading readers
+would wait on each other forever).
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+class ReadWriteLock:
+    """Many readers or one writer, reentrant per thread."""
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._readers = 0
+        self._writer = None
+        self._waiting_writers = 0
+        # Per thread: what each acquire took ("r", "w", or "" when nested)
+        self._local = threading.local()
+
+    def _held(self) -> List[str]:
+        held = getattr(self._local, "held", None)
+        if held is None:
+            held = self._local.held = []
+        return held
+
+    def acquire_read(self) -> None:
+        """Take the lock for reading, waiting while a writer holds or waits for it."""
+        held = self._held()
+        with self._changed:
+            if self._writer == threading.get_ident() or "r" in held:
+                held.append("")
+                return
+            self._changed.wait_for(lambda: self._writer is None and not self._waiting_writers)
+            self._readers += 1
+            held.append("r")
+
+    def acquire_write(self) -> None:
+        """Take the lock for writing, waiting until no one else holds it."""
+        held = self._held()
+        me = threading.get_ident()
+        with self._changed:
+            if self._writer == me:
+                held.append("")
+                return
+            if "r" in held:
+                raise RuntimeError("A read lock can't be upgraded to a write lock")
+            self._waiting_writers += 1
+            try:
+                self._changed.wait_for(lambda: self._writer is None and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            held.append("w")
+
+    def release(self) -> None:
+        """Release this thread's most recent acquire."""
+        taken = self._held().pop()
+        if not taken:
+            return
+        with self._changed:
+            if taken == "r":
+                self._readers -= 1
+            else:
+                self._writer = None
+            self._changed.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock for reading."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock for writing."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release()
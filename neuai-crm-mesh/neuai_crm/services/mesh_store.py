@@ -0,0 +1,205 @@
+"""
+Durable storage for DataMesh state.
+
+A MeshStore persists mesh records, id mappings and the sync log so that a
+mesh survives restarts. DataMesh writes through to its store as data
+changes, one transaction per mesh operation, and reloads everything from
+it on start.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.streaming import dump_record
+
+
+class MeshStore:
+    """
+    Interface for DataMesh persistence backends.
+
+    Methods may be grouped into one atomic unit with ``transaction()``.
+    """
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into one atomic unit."""
+        yield
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the persisted state.
+
+        Returns:
+            Dict with "data" ({platform: {entity: [records]}}), "id_mappings"
+            and "sync_log"
+        """
+        raise NotImplementedError
+
+    def replace_entity(self, platform: Platform, entity: str, records: Iterable[Dict]) -> None:
+        """Replace every record of one (platform, entity) list."""
+        raise NotImplementedError
+
+    def upsert_rows(self, platform: Platform, entity: str, rows: Iterable[Tuple[int, Dict]]) -> None:
+        """Write records at the given positions of a (platform, entity) list."""
+        raise NotImplementedError
+
+    def save_id_mappings(self, mappings: Dict[str, Dict[Platform, str]]) -> None:
+        """Insert or update id mappings."""
+        raise NotImplementedError
+
+    def append_log(self, entry: Dict) -> None:
+        """Append a sync log entry."""
+        raise NotImplementedError
+
+    def compact(self) -> None:
+        """Reclaim space left by replaced records."""
+
+    def close(self) -> None:
+        """Release the store's resources."""
+
+
+class SQLiteMeshStore(MeshStore):
+    """
+    MeshStore backed by a SQLite database in WAL mode.
+
+    Records are stored one JSON document per row, keyed by their position
+    in the entity list, and reloaded with a single JSON parse per entity.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS records (
+            platform TEXT NOT NULL,
+            entity TEXT NOT NULL,
+            row INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (platform, entity, row)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS id_mappings (
+            mesh_id TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            record_id TEXT NOT NULL,
+            PRIMARY KEY (mesh_id, platform)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS sync_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entry TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, synchronous: str = "NORMAL"):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: SQLite database file
+            synchronous: SQLite synchronous pragma - "NORMAL" (durable on
+                checkpoint, safe against corruption) or "FULL" (fsync every commit)
+        """
+        if synchronous not in ("NORMAL", "FULL"):
+            raise ValueError(f"Unsupported synchronous mode: {synchronous}")
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(self.SCHEMA)
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into one transaction; nested calls join the outer one."""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    def load(self) -> Dict[str, Any]:
+        """Load all records, id mappings and the sync log."""
+        with self._lock:
+            data: Dict[Platform, Dict[str, List[Dict]]] = {}
+            entities = self._conn.execute(
+                "SELECT DISTINCT platform, entity FROM records"
+            ).fetchall()
+            for platform, entity in entities:
+                rows = self._conn.execute(
+                    "SELECT data FROM records WHERE platform = ? AND entity = ? ORDER BY row",
+                    (platform, entity)
+                ).fetchall()
+                # One parse per entity is far faster than one per record
+                data.setdefault(Platform(platform), {})[entity] = json.loads(
+                    "[" + ",".join(row[0] for row in rows) + "]"
+                )
+
+            id_mappings: Dict[str, Dict[Platform, str]] = {}
+            for mesh_id, platform, record_id in self._conn.execute(
+                "SELECT mesh_id, platform, record_id FROM id_mappings"
+            ):
+                id_mappings.setdefault(mesh_id, {})[Platform(platform)] = record_id
+
+            sync_log = [
+                json.loads(entry)
+                for (entry,) in self._conn.execute("SELECT entry FROM sync_log ORDER BY seq")
+            ]
+
+        return {"data": data, "id_mappings": id_mappings, "sync_log": sync_log}
+
+    def replace_entity(self, platform: Platform, entity: str, records: Iterable[Dict]) -> None:
+        """Replace every record of one (platform, entity) list."""
+        with self.transaction():
+            self._conn.execute(
+                "DELETE FROM records WHERE platform = ? AND entity = ?",
+                (platform.value, entity)
+            )
+            self._conn.executemany(
+                "INSERT INTO records (platform, entity, row, data) VALUES (?, ?, ?, ?)",
+                ((platform.value, entity, row, dump_record(record))
+                 for row, record in enumerate(records))
+            )
+
+    def upsert_rows(self, platform: Platform, entity: str, rows: Iterable[Tuple[int, Dict]]) -> None:
+        """Write records at the given positions of a (platform, entity) list."""
+        with self.transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (platform, entity, row, data) VALUES (?, ?, ?, ?)",
+                ((platform.value, entity, row, dump_record(record)) for row, record in rows)
+            )
+
+    def save_id_mappings(self, mappings: Dict[str, Dict[Platform, str]]) -> None:
+        """Insert or update id mappings."""
+        with self.transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO id_mappings (mesh_id, platform, record_id) VALUES (?, ?, ?)",
+                ((mesh_id, platform.value, record_id)
+                 for mesh_id, ids in mappings.items()
+                 for platform, record_id in ids.items())
+            )
+
+    def append_log(self, entry: Dict) -> None:
+        """Append a sync log entry."""
+        with self.transaction():
+            self._conn.execute("INSERT INTO sync_log (entry) VALUES (?)", (dump_record(entry),))
+
+    def compact(self) -> None:
+        """Checkpoint the write-ahead log and rebuild the database file."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
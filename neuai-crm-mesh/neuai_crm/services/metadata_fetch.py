@@ -0,0 +1,120 @@
+"""
+Metadata fetching helpers for schema discovery.
+
+Discovery issues one describe call per CRM object. These helpers retry a
+call with exponential backoff when the failure looks transient, and keep
+an on-disk cache of describe payloads with the marker needed to ask the
+CRM whether an object changed since (an If-Modified-Since date for
+Salesforce, an ETag for Dynamics 365), so re-discovery only downloads
+objects that changed.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+class MetadataRequestError(Exception):
+    """A metadata request that returned an unexpected HTTP status."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header given in seconds (dates are ignored)."""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a failed call is worth retrying.
+
+    Errors carrying an HTTP status (simple_salesforce exceptions and
+    MetadataRequestError have .status) are retried on 429 and 5xx only;
+    errors without one, such as connection failures, are always retried.
+    """
+    status = getattr(error, "status", None)
+    if not isinstance(status, int):
+        return True
+    return status == 429 or status >= 500
+
+
+def call_with_retry(
+    func: Callable[[], Any],
+    retries: int = 3,
+    backoff: float = 0.5,
+    sleep: Callable[[float], None] = time.sleep
+) -> Any:
+    """
+    Call func, retrying transient failures with exponential backoff.
+
+    Args:
+        func: Call to make
+        retries: Retries after the first attempt
+        backoff: Delay before the first retry, doubled for each later one
+            (a Retry-After carried by the error takes precedence)
+        sleep: Sleep function
+
+    Returns:
+        What func returns
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            delay = getattr(e, "retry_after", None)
+            sleep(delay if delay is not None else backoff * 2 ** attempt)
+
+
+class DescribeCache:
+    """
+    On-disk cache of describe payloads, one JSON file per platform object.
+
+    Each entry stores the payload with the marker to send on the next
+    conditional request for that object.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, platform: str, name: str) -> Path:
+        return self.directory / platform / (re.sub(r"[^A-Za-z0-9_.-]", "_", name) + ".json")
+
+    def get(self, platform: str, name: str) -> Optional[Dict]:
+        """
+        Get a cached entry.
+
+        Returns:
+            Dict with "marker" and "describe", or None if not cached
+        """
+        path = self._path(platform, name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get("name") != name:  # Names that sanitize to the same file
+            return None
+        return entry
+
+    def put(self, platform: str, name: str, marker: str, describe: Dict) -> None:
+        """Store a describe payload and its marker."""
+        path = self._path(platform, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"name": name, "marker": marker, "describe": describe}, f, default=str)
+        os.replace(tmp_path, path)
@@ -0,0 +1,79 @@
+"""
+Character trigram index for pruning fuzzy name matching.
+
+Scoring every known name with SequenceMatcher is quadratic across a schema.
+A TrigramIndex ranks names by the trigrams they share with a query so that
+only the best-ranked few need a full similarity score.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+
+def trigrams(name: str) -> Set[str]:
+    """Character trigrams of a lowercased name, padded so short names have some."""
+    padded = f"$${name.lower()}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Trigram postings over named items, used to prune fuzzy name matching.
+
+    Items keep the order in which they were first added.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._order: Dict[str, int] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, item: str, name: str) -> None:
+        """Index an item under a name (re-adding keeps its position)."""
+        if item in self._order:
+            self.remove(item, keep_position=True)
+        else:
+            self._order[item] = self._next
+            self._next += 1
+        grams = trigrams(name)
+        self._grams[item] = grams
+        for gram in grams:
+            self._postings[gram].add(item)
+
+    def remove(self, item: str, keep_position: bool = False) -> None:
+        """Remove an item."""
+        for gram in self._grams.pop(item, ()):
+            postings = self._postings[gram]
+            postings.discard(item)
+            if not postings:
+                del self._postings[gram]
+        if not keep_position:
+            self._order.pop(item, None)
+
+    def ordered(self, items) -> List[str]:
+        """Items sorted by insertion order."""
+        return sorted(items, key=self._order.__getitem__)
+
+    def similar(self, name: str, limit: Optional[int]) -> List[str]:
+        """
+        Items sharing the most trigrams with a name, in insertion order.
+
+        Args:
+            name: Name to match
+            limit: Maximum number of items (None returns every item)
+        """
+        if limit is None:
+            return list(self._order)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in trigrams(name):
+            for item in self._postings.get(gram, ()):
+                shared[item] += 1
+        if len(shared) > limit:
+            shared = dict(heapq.nlargest(limit, shared.items(), key=lambda kv: kv[1]))
+        return self.ordered(shared)
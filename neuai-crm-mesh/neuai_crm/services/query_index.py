@@ -0,0 +1,422 @@
+"""
+Secondary indexes and query execution over mesh records.
+
+Indexes are built lazily per (platform, entity, field) the first time a
+query needs them: a hash index (value -> rows) answers equality and
+membership predicates, and a sorted index of (value, row) entries answers
+range and prefix predicates and sorting. DataMesh keeps built indexes
+current as records are loaded and synced, so a query only touches the rows
+its most selective predicate matches.
+"""
+
+import base64
+import binascii
+import json
+import operator
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.record_store import ColumnarTable
+
+
+# Predicate operators, by the index kind that answers them
+HASH_OPERATORS = ("eq", "in")
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte", "prefix")
+OPERATORS = HASH_OPERATORS + RANGE_OPERATORS + ("ne",)
+
+_COMPARE = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+# Sort ranks: numbers sort before strings, then other values, then missing ones
+_NUMBER, _STRING, _OTHER, _MISSING = range(4)
+
+# Sorts after every string with a given prefix
+_PREFIX_END = "\U0010ffff"
+
+Predicate = Tuple[str, str, Any]
+SortKey = Tuple[int, Any]
+
+
+def sort_key(value: Any) -> SortKey:
+    """Rank a field value so that values of any type can be ordered together."""
+    if value is None:
+        return (_MISSING, "")
+    if isinstance(value, (int, float)):
+        return (_NUMBER, value)
+    if isinstance(value, str):
+        return (_STRING, value)
+    return (_OTHER, json.dumps(value, sort_keys=True, default=str))
+
+
+def parse_where(where: Optional[Dict[str, Any]]) -> List[Predicate]:
+    """
+    Parse query predicates.
+
+    Args:
+        where: Maps field names to a value (equality) or to a dict of
+            {operator: value}, e.g. {"StageName": "Prospecting",
+            "Amount": {"gte": 1000}}
+
+    Returns:
+        List of (field, operator, value) predicates
+    """
+    predicates = []
+    for field, condition in (where or {}).items():
+        if not isinstance(condition, dict):
+            condition = {"eq": condition}
+        for op, value in condition.items():
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown query operator: {op}")
+            if op == "in" and not isinstance(value, (list, tuple)):
+                raise ValueError(f"'in' on {field} requires a list")
+            if op == "prefix" and not isinstance(value, str):
+                raise ValueError(f"'prefix' on {field} requires a string")
+            if op in _COMPARE and sort_key(value)[0] not in (_NUMBER, _STRING):
+                raise ValueError(f"'{op}' on {field} requires a number or string")
+            predicates.append((field, op, value))
+    return predicates
+
+
+def matches(record: Dict, predicates: List[Predicate]) -> bool:
+    """Check a record against predicates (range operators compare like-typed values only)."""
+    for field, op, value in predicates:
+        actual = record.get(field)
+        if op == "eq":
+            ok = actual == value
+        elif op == "ne":
+            ok = actual != value
+        elif op == "in":
+            ok = actual in value
+        elif op == "prefix":
+            ok = isinstance(actual, str) and actual.startswith(value)
+        else:
+            actual_key, value_key = sort_key(actual), sort_key(value)
+            ok = actual_key[0] == value_key[0] and _COMPARE[op](actual_key[1], value_key[1])
+        if not ok:
+            return False
+    return True
+
+
+def encode_cursor(sort: Optional[str], after: Union[int, Tuple]) -> str:
+    """Encode the position after the last returned record as an opaque cursor."""
+    payload = json.dumps({"sort": sort, "after": after}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: Optional[str]) -> Union[int, Tuple]:
+    """Decode a cursor produced by encode_cursor for the same sort."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        after = payload["after"]
+        cursor_sort = payload["sort"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError("Cursor was issued for a different sort")
+    return tuple(after) if isinstance(after, list) else after
+
+
+def _column(table: Union[List[Dict], ColumnarTable], field: str) -> List[Any]:
+    """Values of one field for every row."""
+    if isinstance(table, ColumnarTable):
+        return table.column(field)
+    return [record.get(field) for record in table]
+
+
+def _hash_add(index: Dict[Any, List[int]], value: Any, row: int) -> None:
+    """Add a row to the bucket of its value, keeping buckets in row order."""
+    try:
+        bucket = index.get(value)
+    except TypeError:  # Unhashable values never equal a hashable query value
+        return
+    if bucket is None:
+        index[value] = [row]
+    else:
+        insort(bucket, row)
+
+
+def _hash_remove(index: Dict[Any, List[int]], value: Any, row: int) -> None:
+    """Remove a row from the bucket of its value."""
+    try:
+        bucket = index.get(value)
+    except TypeError:
+        return
+    if bucket:
+        position = bisect_left(bucket, row)
+        if position < len(bucket) and bucket[position] == row:
+            del bucket[position]
+            if not bucket:
+                del index[value]
+
+
+class QueryIndex:
+    """
+    Lazily built secondary indexes over the mesh's entity lists.
+
+    Indexes are tied to the entity list they were built from; when DataMesh
+    replaces a list (load, full sync, clear) its indexes are dropped and
+    rebuilt on the next query that needs them. Row inserts and replacements
+    made through add_row and replace_row are applied in place.
+
+    Queries may run concurrently (DataMesh holds its read lock for them);
+    changes must not run alongside them (DataMesh holds its write lock).
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # (platform, entity) -> {"table", "rows", "hash": {field: ...}, "sorted": {field: ...}}
+        self._entities: Dict[Tuple[Platform, str], Dict[str, Any]] = {}
+
+    def _state(self, platform: Platform, entity: str, table) -> Dict[str, Any]:
+        """Indexes of an entity list, discarded if the list changed underneath them."""
+        key = (platform, entity)
+        state = self._entities.get(key)
+        if state is None or state["table"] is not table or state["rows"] != len(table):
+            state = self._entities[key] = {
+                "table": table, "rows": len(table), "hash": {}, "sorted": {}
+            }
+        return state
+
+    def hash_index(self, platform: Platform, entity: str, table, field: str) -> Dict[Any, List[int]]:
+        """Get (building if needed) the value -> rows index of a field."""
+        indexes = self._state(platform, entity, table)["hash"]
+        index = indexes.get(field)
+        if index is None:
+            # Built before it is published, so concurrent readers never see it half-filled
+            index = {}
+            for row, value in enumerate(_column(table, field)):
+                try:
+                    bucket = index.get(value)
+                except TypeError:
+                    continue
+                if bucket is None:
+                    index[value] = [row]
+                else:
+                    bucket.append(row)
+            indexes[field] = index
+        return index
+
+    def sorted_index(self, platform: Platform, entity: str, table, field: str) -> List[Tuple]:
+        """Get (building if needed) the sorted (rank, value, row) entries of a field."""
+        indexes = self._state(platform, entity, table)["sorted"]
+        entries = indexes.get(field)
+        if entries is None:
+            entries = indexes[field] = sorted(
+                sort_key(value) + (row,) for row, value in enumerate(_column(table, field))
+            )
+        return entries
+
+    def add_row(self, platform: Platform, entity: str, row: int, record: Dict) -> None:
+        """Index a record appended at row."""
+        state = self._entities.get((platform, entity))
+        if state is None:
+            return
+        for field, index in state["hash"].items():
+            _hash_add(index, record.get(field), row)
+        for field, entries in state["sorted"].items():
+            insort(entries, sort_key(record.get(field)) + (row,))
+        state["rows"] += 1
+
+    def replace_row(self, platform: Platform, entity: str, row: int, old: Dict, new: Dict) -> None:
+        """Reindex the record at row; call before the list is updated."""
+        state = self._entities.get((platform, entity))
+        if state is None:
+            return
+        for field, index in state["hash"].items():
+            old_value, new_value = old.get(field), new.get(field)
+            if old_value != new_value:
+                _hash_remove(index, old_value, row)
+                _hash_add(index, new_value, row)
+        for field, entries in state["sorted"].items():
+            old_entry = sort_key(old.get(field)) + (row,)
+            new_entry = sort_key(new.get(field)) + (row,)
+            if old_entry != new_entry:
+                del entries[bisect_left(entries, old_entry)]
+                insort(entries, new_entry)
+
+    def drop_entity(self, platform: Platform, entity: str) -> None:
+        """Discard the indexes of one entity list."""
+        self._entities.pop((platform, entity), None)
+
+    def drop_platform(self, platform: Platform) -> None:
+        """Discard the indexes of every entity list of a platform."""
+        for key in [key for key in self._entities if key[0] == platform]:
+            del self._entities[key]
+
+    def query(
+        self,
+        platform: Platform,
+        entity: str,
+        table,
+        where: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        sort: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        Query one entity list.
+
+        Args:
+            platform: Platform of the entity list
+            entity: Entity list name
+            table: The entity list
+            where: Field predicates (see parse_where)
+            fields: Fields to return (all fields when omitted)
+            sort: Field to sort by, prefixed with "-" for descending
+                (row order when omitted)
+            limit: Maximum records to return
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dict with records, count and next_cursor (None on the last page)
+        """
+        predicates = parse_where(where)
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        after = decode_cursor(cursor, sort) if cursor else None
+        candidates, residual = self._candidates(platform, entity, table, predicates)
+
+        if sort:
+            keys = self._sorted_rows(platform, entity, table, sort, candidates, residual, after, limit)
+        else:
+            keys = self._rows_in_order(table, candidates, residual, after, limit)
+
+        next_cursor = None
+        if len(keys) > limit:
+            keys = keys[:limit]
+            next_cursor = encode_cursor(sort, keys[-1])
+
+        records = []
+        for key in keys:
+            record = table[key if isinstance(key, int) else key[-1]]
+            records.append({f: record.get(f) for f in fields} if fields else dict(record))
+
+        return {"records": records, "count": len(records), "next_cursor": next_cursor}
+
+    def _candidates(
+        self,
+        platform: Platform,
+        entity: str,
+        table,
+        predicates: List[Predicate]
+    ) -> Tuple[Optional[List[int]], List[Predicate]]:
+        """
+        Narrow rows with the most selective indexable predicate.
+
+        Returns:
+            Tuple of (candidate rows in row order, or None for all rows;
+            predicates still to check on each candidate)
+        """
+        best, best_size, best_predicate = None, None, None
+        for predicate in predicates:
+            field, op, value = predicate
+            if op in HASH_OPERATORS:
+                index = self.hash_index(platform, entity, table, field)
+                try:
+                    buckets = [index.get(v, ()) for v in (value if op == "in" else [value])]
+                except TypeError:  # Unhashable query value: check it per record
+                    continue
+                size = sum(len(bucket) for bucket in buckets)
+                rows = buckets
+            elif op in RANGE_OPERATORS:
+                entries = self.sorted_index(platform, entity, table, field)
+                lo, hi = self._range(entries, op, value)
+                size = hi - lo
+                rows = (entries, lo, hi)
+            else:
+                continue
+            if best_size is None or size < best_size:
+                best, best_size, best_predicate = rows, size, predicate
+
+        if best_predicate is None:
+            return None, predicates
+
+        if isinstance(best, tuple):
+            entries, lo, hi = best
+            candidates = sorted(entry[-1] for entry in entries[lo:hi])
+        elif len(best) == 1:
+            candidates = list(best[0])
+        else:
+            candidates = sorted({row for bucket in best for row in bucket})
+        return candidates, [p for p in predicates if p is not best_predicate]
+
+    @staticmethod
+    def _range(entries: List[Tuple], op: str, value: Any) -> Tuple[int, int]:
+        """Slice bounds of the entries a range or prefix predicate selects."""
+        if op == "prefix":
+            return (bisect_left(entries, (_STRING, value)),
+                    bisect_left(entries, (_STRING, value + _PREFIX_END)))
+        rank, value = sort_key(value)
+        lo, hi = bisect_left(entries, (rank,)), bisect_left(entries, (rank + 1,))
+        if op == "gt":
+            lo = bisect_right(entries, (rank, value, float("inf")), lo, hi)
+        elif op == "gte":
+            lo = bisect_left(entries, (rank, value), lo, hi)
+        elif op == "lt":
+            hi = bisect_left(entries, (rank, value), lo, hi)
+        else:
+            hi = bisect_right(entries, (rank, value, float("inf")), lo, hi)
+        return lo, hi
+
+    @staticmethod
+    def _rows_in_order(
+        table,
+        candidates: Optional[List[int]],
+        residual: List[Predicate],
+        after: Optional[int],
+        limit: int
+    ) -> List[int]:
+        """Up to limit + 1 matching rows in row order, after the cursor row."""
+        if candidates is None:
+            rows = range(0 if after is None else after + 1, len(table))
+        else:
+            rows = candidates[0 if after is None else bisect_right(candidates, after):]
+        found = []
+        for row in rows:
+            if not residual or matches(table[row], residual):
+                found.append(row)
+                if len(found) > limit:
+                    break
+        return found
+
+    def _sorted_rows(
+        self,
+        platform: Platform,
+        entity: str,
+        table,
+        sort: str,
+        candidates: Optional[List[int]],
+        residual: List[Predicate],
+        after: Optional[Tuple],
+        limit: int
+    ) -> List[Tuple]:
+        """Up to limit + 1 matching (rank, value, row) keys in sort order, after the cursor key."""
+        descending = sort.startswith("-")
+        field = sort[1:] if descending else sort
+
+        if candidates is not None:
+            # Few enough rows to sort directly
+            entries = sorted(
+                sort_key(record.get(field)) + (row,)
+                for row, record in ((row, table[row]) for row in candidates)
+                if not residual or matches(record, residual)
+            )
+            residual = []
+        else:
+            entries = self.sorted_index(platform, entity, table, field)
+
+        if descending:
+            end = len(entries) if after is None else bisect_left(entries, after)
+            positions = range(end - 1, -1, -1)
+        else:
+            positions = range(0 if after is None else bisect_right(entries, after), len(entries))
+
+        found = []
+        for position in positions:
+            entry = entries[position]
+            if not residual or matches(table[entry[-1]], residual):
+                found.append(entry)
+                if len(found) > limit:
+                    break
+        return found
@@ -0,0 +1,187 @@
+"""
+Columnar record storage for the data mesh.
+
+Stores each entity list as one Python list per field instead of one dict per
+record, which removes the per-dict overhead that dominates memory for large
+tenants. Rows are exposed through lightweight read-only mapping views, so
+code written against lists of dicts keeps working.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+
+class _Missing:
+    """Marker for a field that a row does not have."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = _Missing()
+
+
+class RowView(Mapping):
+    """Read-only dict-like view of one row of a ColumnarTable."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ColumnarTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, field: str) -> Any:
+        column = self._table._columns.get(field)
+        if column is None:
+            raise KeyError(field)
+        value = column[self._index]
+        if value is MISSING:
+            raise KeyError(field)
+        return value
+
+    def get(self, field: str, default: Any = None) -> Any:
+        column = self._table._columns.get(field)
+        if column is None:
+            return default
+        value = column[self._index]
+        return default if value is MISSING else value
+
+    def __contains__(self, field: object) -> bool:
+        column = self._table._columns.get(field)
+        return column is not None and column[self._index] is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        index = self._index
+        for field, column in self._table._columns.items():
+            if column[index] is not MISSING:
+                yield field
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RowView({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the row as a plain dict."""
+        index = self._index
+        return {
+            field: column[index]
+            for field, column in self._table._columns.items()
+            if column[index] is not MISSING
+        }
+
+
+class ColumnarTable:
+    """
+    Column-per-field storage for a list of records.
+
+    Supports the list operations the mesh relies on (len, iteration, indexing,
+    row replacement, append, extend); rows come back as RowView objects.
+    """
+
+    __slots__ = ("_columns", "_length")
+
+    def __init__(self, records: Iterable[Dict] = ()):
+        """
+        Initialize the table.
+
+        Args:
+            records: Initial records to store
+        """
+        self._columns: Dict[str, List[Any]] = {}
+        self._length = 0
+        self.extend(records)
+
+    @property
+    def fields(self) -> List[str]:
+        """Field names in first-seen order."""
+        return list(self._columns)
+
+    def append(self, record: Dict) -> None:
+        """Add a record as a new row."""
+        columns = self._columns
+        index = self._length
+        for field, value in record.items():
+            column = columns.get(field)
+            if column is None:
+                column = columns[sys.intern(field)] = [MISSING] * index
+            column.append(value)
+        self._length = index + 1
+        for column in columns.values():
+            if len(column) == index:
+                column.append(MISSING)
+
+    def extend(self, records: Iterable[Dict]) -> None:
+        """Add several records."""
+        for record in records:
+            self.append(record)
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        self._columns = {}
+        self._length = 0
+
+    def column(self, field: str) -> List[Any]:
+        """Values of one field for every row (None where missing)."""
+        values = self._columns.get(field)
+        if values is None:
+            return [None] * self._length
+        return [None if v is MISSING else v for v in values]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize every row as a plain dict."""
+        return [RowView(self, i).to_dict() for i in range(self._length)]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[RowView]:
+        for i in range(self._length):
+            yield RowView(self, i)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[RowView, List[RowView]]:
+        if isinstance(index, slice):
+            return [RowView(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return RowView(self, index)
+
+    def __setitem__(self, index: int, record: Dict) -> None:
+        """Replace a row with a record."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        columns = self._columns
+        for field, column in columns.items():
+            column[index] = record.get(field, MISSING)
+        for field, value in record.items():
+            if field not in columns:
+                column = columns[sys.intern(field)] = [MISSING] * self._length
+                column[index] = value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ColumnarTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColumnarTable(rows={self._length}, fields={self.fields})"
+
+
+def to_plain(records: Union[List[Dict], ColumnarTable]) -> List[Dict]:
+    """Return records as a list of plain dicts, whatever the storage backend."""
+    if isinstance(records, ColumnarTable):
+        return records.to_dicts()
+    return records
@@ -0,0 +1,108 @@
+"""
+Result cache for read-only mesh queries.
+
+Results are memoized in an LRU keyed by (operation, arguments, data
+version), so a repeated query is answered from memory until the data it
+was computed from changes. The cache is bounded by the total size of the
+cached results (items in a list or dict result), not just by the number
+of entries, so a few large duplicate scans cannot pin unbounded memory.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+def result_size(value: Any) -> int:
+    """Size of a result for eviction: its item count, at least 1."""
+    try:
+        return max(1, len(value))
+    except TypeError:
+        return 1
+
+
+class ResultCache:
+    """
+    Thread-safe LRU of computed results, bounded by total result size.
+
+    Results are computed outside the lock, so concurrent misses on one key
+    may compute it more than once; the last result stored wins. Cached
+    results are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_size: int = 100000, max_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Total result size kept; a result larger than this is
+                returned without being cached
+            max_entries: Results kept
+        """
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key, computing and caching it on a miss.
+
+        Args:
+            key: Cache key, e.g. (operation, arguments, data version)
+            compute: Called without arguments to produce the result
+
+        Returns:
+            The cached or computed result
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        size = result_size(value)
+        if size > self.max_size:
+            return value
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_size or len(self._entries) > self.max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached result, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+                "max_size": self.max_size
+            }
@@ -15,8 +15,9 @@ import json
 import os
 import re
 import hashlib
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Callable, Dict, List, Optional, Tuple, Any, Set
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
@@ -24,6 +25,8 @@ from difflib import SequenceMatcher
 from collections import defaultdict
 
 from neuai_crm.models.schemas import Platform, SCHEMA_MAPPINGS
+from neuai_crm.services.brain_journal import BrainJournal
+from neuai_crm.services.ngram_index import TrigramIndex
 
 
 class MappingSource(str, Enum):
@@ -143,6 +146,140 @@ class LearningEvent:
     def to_dict(self) -> Dict:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LearningEvent':
+        return cls(**data)
+
+
+# Common semantic equivalences between field names
+SEMANTIC_GROUPS = [
+    {'id', 'identifier', 'key', 'uid', 'guid'},
+    {'name', 'title', 'label', 'subject'},
+    {'email', 'emailaddress', 'mail', 'emailaddress1'},
+    {'phone', 'telephone', 'mobile', 'cell', 'telephone1'},
+    {'company', 'account', 'organization', 'org', 'employer'},
+    {'address', 'location', 'street', 'city', 'zip', 'postal'},
+    {'created', 'createdon', 'createddate', 'createdat'},
+    {'modified', 'updated', 'modifiedon', 'lastmodified', 'updatedat'},
+    {'description', 'desc', 'details', 'notes', 'body', 'content'},
+    {'status', 'state', 'statecode', 'stage'},
+    {'amount', 'value', 'price', 'cost', 'total', 'estimatedvalue'},
+    {'probability', 'likelihood', 'chance', 'closeprobability'},
+    {'owner', 'assignee', 'assignedto', 'ownerid'},
+    {'parent', 'parentid', 'parentcustomerid'},
+    {'website', 'url', 'websiteurl', 'homepage'},
+    {'industry', 'industrycode', 'sector', 'vertical'},
+]
+
+_SEMANTIC_PREFIX = re.compile(r'^(billing|shipping|primary|secondary)')
+_SEMANTIC_SUFFIX = re.compile(r'(id|date|time|at|on)$')
+
+# Target field selections used by value type inference (on lowercased names)
+VALUE_TYPE_RULES: Dict[str, Callable[[str], bool]] = {
+    "email": lambda tf: 'email' in tf or 'mail' in tf,
+    "url": lambda tf: 'url' in tf or 'website' in tf or 'web' in tf,
+    "phone": lambda tf: 'phone' in tf or 'tel' in tf or 'mobile' in tf,
+    "date": lambda tf: 'date' in tf or 'time' in tf or tf.endswith('on') or tf.endswith('at'),
+    "probability": lambda tf: 'prob' in tf or 'percent' in tf or 'rate' in tf,
+    "amount": lambda tf: 'amount' in tf or 'value' in tf or 'price' in tf,
+}
+
+
+def semantic_groups(field_name: str) -> Set[int]:
+    """Indexes of the SEMANTIC_GROUPS a field name belongs to."""
+    clean = _SEMANTIC_SUFFIX.sub('', _SEMANTIC_PREFIX.sub('', field_name.lower()))
+    return {i for i, group in enumerate(SEMANTIC_GROUPS) if any(g in clean for g in group)}
+
+
+class TargetFieldIndex:
+    """
+    Known target fields of one (platform, entity), with precomputed lookups.
+
+    Holds lowercase names, pattern sets and semantic groups per field, and
+    a trigram index for fuzzy matching. Fields are reference counted so a
+    learned target field disappears once no mapping uses it.
+    """
+
+    def __init__(self, extract_patterns: Callable[[str], Set[str]]):
+        """
+        Initialize an empty index.
+
+        Args:
+            extract_patterns: Function returning a field name's pattern set
+        """
+        self._extract_patterns = extract_patterns
+        self._refs: Dict[str, int] = {}
+        self.names = TrigramIndex()
+        self.by_lower: Dict[str, List[str]] = defaultdict(list)
+        self.patterns: Dict[str, Set[str]] = {}
+        self.by_pattern: Dict[str, Set[str]] = defaultdict(set)
+        self.by_group: Dict[int, Set[str]] = defaultdict(set)
+        self._fields: Optional[List[str]] = None
+        self._selections: Dict[str, List[str]] = {}
+
+    @property
+    def fields(self) -> List[str]:
+        """Known target fields in the order they became known."""
+        if self._fields is None:
+            self._fields = self.names.ordered(self._refs)
+        return self._fields
+
+    def add(self, field_name: str) -> None:
+        """Add a reference to a target field."""
+        if field_name in self._refs:
+            self._refs[field_name] += 1
+            return
+        self._refs[field_name] = 1
+        self.names.add(field_name, field_name)
+        self.by_lower[field_name.lower()].append(field_name)
+        self.patterns[field_name] = patterns = self._extract_patterns(field_name)
+        for pattern in patterns:
+            self.by_pattern[pattern].add(field_name)
+        for group in semantic_groups(field_name):
+            self.by_group[group].add(field_name)
+        self._fields = None
+        self._selections.clear()
+
+    def remove(self, field_name: str) -> None:
+        """Drop a reference to a target field."""
+        refs = self._refs.get(field_name)
+        if refs is None:
+            return
+        if refs > 1:
+            self._refs[field_name] = refs - 1
+            return
+        del self._refs[field_name]
+        self.names.remove(field_name)
+        self.by_lower[field_name.lower()].remove(field_name)
+        for pattern in self.patterns.pop(field_name):
+            self.by_pattern[pattern].discard(field_name)
+        for group in semantic_groups(field_name):
+            self.by_group[group].discard(field_name)
+        self._fields = None
+        self._selections.clear()
+
+    def sharing_patterns(self, patterns: Set[str]) -> List[str]:
+        """Fields with at least one of the given patterns, in field order."""
+        found = set()
+        for pattern in patterns:
+            found.update(self.by_pattern.get(pattern, ()))
+        return self.names.ordered(found)
+
+    def in_groups(self, groups: Set[int]) -> List[str]:
+        """Fields in any of the given semantic groups, in field order."""
+        found = set()
+        for group in groups:
+            found.update(self.by_group.get(group, ()))
+        return self.names.ordered(found)
+
+    def select(self, rule: str) -> List[str]:
+        """Fields matching a VALUE_TYPE_RULES rule, in field order (cached)."""
+        selection = self._selections.get(rule)
+        if selection is None:
+            predicate = VALUE_TYPE_RULES[rule]
+            selection = self._selections[rule] = [tf for tf in self.fields if predicate(tf.lower())]
+        return selection
+
 
 class SchemaBrain:
     """
@@ -151,9 +288,29 @@ class SchemaBrain:
     Learns from every translation operation to get smarter over time.
     """
 
-    def __init__(self, memory_path: Optional[str] = None):
-        """Initialize the Schema Brain."""
+    # Fuzzy strategies score at most this many trigram-ranked candidates
+    # per unknown field (None scores every known field)
+    CANDIDATE_LIMIT: Optional[int] = 50
+
+    def __init__(
+        self,
+        memory_path: Optional[str] = None,
+        fsync: str = "snapshot",
+        snapshot_every: int = 1000
+    ):
+        """
+        Initialize the Schema Brain.
+
+        Args:
+            memory_path: Directory for persisted memory
+            fsync: When saves fsync - "always" (every journal append),
+                "snapshot" (snapshots only) or "never"
+            snapshot_every: Journal entries after which a save writes a
+                fresh snapshot
+        """
         self.memory_path = memory_path or self._default_memory_path()
+        self.snapshot_every = snapshot_every
+        self._journal = BrainJournal(self.memory_path, fsync)
 
         # In-memory stores
         self.field_mappings: Dict[str, FieldMapping] = {}
@@ -173,11 +330,28 @@ class SchemaBrain:
         self.field_patterns: Dict[str, List[str]] = defaultdict(list)
         self.value_patterns: Dict[str, Dict[str, str]] = defaultdict(dict)
 
+        # Inference indexes, built on first use and kept current by
+        # _put_mapping/_drop_mapping
+        self._target_indexes: Dict[Tuple[str, str], TargetFieldIndex] = {}
+        self._source_indexes: Dict[Tuple[str, str], TrigramIndex] = {}
+
+        # Keys changed since the last save, by memory section, pattern
+        # associations learned since, and what the journal already holds
+        # of the stats and learning log
+        self._changed: Dict[str, Set[str]] = defaultdict(set)
+        self._new_field_patterns: List[Tuple[str, str]] = []
+        self._saved_stats: Dict[str, int] = {}
+        self._saved_log_length = 0
+
+        # Guards the memory above for callers that share the brain between threads
+        self.lock = threading.RLock()
+
         # Load existing memory
         self._load_memory()
 
         # Bootstrap with builtin mappings
         self._bootstrap_from_builtins()
+        self._changed.clear()  # Builtins are never saved
 
     def _default_memory_path(self) -> str:
         """Get default path for schema memory storage."""
@@ -195,6 +369,61 @@ class SchemaBrain:
         """Generate unique key for a value mapping."""
         return f"{source_platform}:{source_value}:{target_platform}:{field_name}"
 
+    def _put_mapping(self, key: str, mapping: FieldMapping) -> None:
+        """Store a field mapping, updating the inference indexes."""
+        old = self.field_mappings.get(key)
+        self.field_mappings[key] = mapping
+        self._changed["field_mappings"].add(key)
+
+        targets = self._target_indexes.get((mapping.target_platform, mapping.entity_type))
+        if targets is not None:
+            targets.add(mapping.target_field)
+            if old is not None:
+                targets.remove(old.target_field)
+
+        sources = self._source_indexes.get((mapping.source_platform, mapping.target_platform))
+        if sources is not None and old is None:
+            sources.add(key, mapping.source_field)
+
+    def _drop_mapping(self, key: str) -> None:
+        """Delete a field mapping, updating the inference indexes."""
+        mapping = self.field_mappings.pop(key)
+        self._changed["field_mappings"].add(key)
+
+        targets = self._target_indexes.get((mapping.target_platform, mapping.entity_type))
+        if targets is not None:
+            targets.remove(mapping.target_field)
+
+        sources = self._source_indexes.get((mapping.source_platform, mapping.target_platform))
+        if sources is not None:
+            sources.remove(key)
+
+    def _target_index(self, platform: Platform, entity_type: str) -> TargetFieldIndex:
+        """Get (building on first use) the known target fields of a platform/entity."""
+        index = self._target_indexes.get((platform.value, entity_type))
+        if index is None:
+            index = TargetFieldIndex(self._extract_field_patterns)
+            entity_fields = SCHEMA_MAPPINGS["fields"].get(entity_type, {})
+            for field_name in entity_fields.get(platform.value, []):
+                index.add(field_name)  # Builtin fields keep one reference for good
+            for mapping in self.field_mappings.values():
+                if mapping.target_platform == platform.value and mapping.entity_type == entity_type:
+                    index.add(mapping.target_field)
+            self._target_indexes[(platform.value, entity_type)] = index
+        return index
+
+    def _source_index(self, source_platform: Platform, target_platform: Platform) -> TrigramIndex:
+        """Get (building on first use) the mapping keys between two platforms, by source field."""
+        pair = (source_platform.value, target_platform.value)
+        index = self._source_indexes.get(pair)
+        if index is None:
+            index = TrigramIndex()
+            for key, mapping in self.field_mappings.items():
+                if (mapping.source_platform, mapping.target_platform) == pair:
+                    index.add(key, mapping.source_field)
+            self._source_indexes[pair] = index
+        return index
+
     # =========================================================================
     # CORE TRANSLATION WITH LEARNING
     # =========================================================================
@@ -205,15 +434,20 @@ class SchemaBrain:
         source_platform: Platform,
         target_platform: Platform,
         entity_type: str,
-        record: Optional[Dict] = None
+        record: Optional[Dict] = None,
+        count: int = 1
     ) -> Tuple[Optional[str], float, bool]:
         """
         Translate a field name, learning if unknown.
 
+        Args:
+            count: Number of records this translation is applied to (batch
+                callers translate each field once for many records)
+
         Returns:
             Tuple of (translated_field, confidence, needs_review)
         """
-        self.stats["total_translations"] += 1
+        self.stats["total_translations"] += count
 
         key = self._mapping_key(
             source_platform.value, field_name,
@@ -223,8 +457,9 @@ class SchemaBrain:
         # Check if we already know this mapping
         if key in self.field_mappings:
             mapping = self.field_mappings[key]
-            mapping.times_used += 1
+            mapping.times_used += count
             mapping.last_used = datetime.now().isoformat()
+            self._changed["field_mappings"].add(key)
             return (mapping.target_field, mapping.confidence,
                     mapping.confidence_level == ConfidenceLevel.UNCERTAIN)
 
@@ -246,7 +481,11 @@ class SchemaBrain:
                 source=MappingSource.INFERRED,
                 inference_reasons=inference.reasons
             )
-            self.field_mappings[key] = new_mapping
+            if count > 1:
+                # The remaining records use the mapping just learned
+                new_mapping.times_used = count - 1
+                new_mapping.last_used = datetime.now().isoformat()
+            self._put_mapping(key, new_mapping)
             self.stats["successful_inferences"] += 1
 
             self._log_learning_event(
@@ -284,6 +523,7 @@ class SchemaBrain:
         if key in self.value_mappings:
             mapping = self.value_mappings[key]
             mapping.times_used += 1
+            self._changed["value_mappings"].add(key)
             return (mapping.target_value, mapping.confidence)
 
         # Try to infer value mapping
@@ -303,11 +543,123 @@ class SchemaBrain:
                 source=MappingSource.INFERRED
             )
             self.value_mappings[key] = new_mapping
+            self._changed["value_mappings"].add(key)
             return (inferred_value, confidence)
 
         # Return original value if can't translate
         return (value, 0.0)
 
+    def translate_records(
+        self,
+        records: List[Dict],
+        source_platform: Platform,
+        target_platform: Platform,
+        entity_type: str
+    ) -> Dict:
+        """
+        Translate a batch of records.
+
+        Field mappings are resolved once per record shape (set of fields),
+        using the first record of that shape for value-based inference, and
+        value translations once per distinct (field, value). Mapping usage
+        counts still count every record.
+
+        Returns:
+            Dict with translated records (in order), per-field mapping info
+            aggregated over the batch, the fields needing review and the
+            number of distinct shapes
+        """
+        # Shape -> (first record, number of records)
+        shapes: Dict[frozenset, List] = {}
+        for record in records:
+            shape = frozenset(record)
+            entry = shapes.get(shape)
+            if entry is None:
+                shapes[shape] = [record, 1]
+            else:
+                entry[1] += 1
+
+        # Records containing each field, for usage counts
+        field_counts: Dict[str, int] = defaultdict(int)
+        for shape, (_, n) in shapes.items():
+            for field_name in shape:
+                field_counts[field_name] += n
+
+        # Resolve each field once, in first-seen order
+        field_plan: Dict[str, Tuple[Optional[str], float, bool]] = {}
+        for shape, (sample, _) in shapes.items():
+            for field_name in sample:
+                if field_name not in field_plan:
+                    field_plan[field_name] = self.translate_field(
+                        field_name, source_platform, target_platform, entity_type,
+                        sample, count=field_counts[field_name]
+                    )
+
+        # (field, value type, value) -> (translated value, mapping or None)
+        value_cache: Dict[Tuple, Tuple[Any, Optional[ValueMapping]]] = {}
+        values_changed: Dict[str, int] = defaultdict(int)
+        translated_records = []
+
+        for record in records:
+            translated = {}
+            for field_name, value in record.items():
+                target_field = field_plan[field_name][0]
+                if not target_field:
+                    translated[field_name] = value
+                    continue
+
+                try:
+                    cache_key = (field_name, type(value), value)
+                    cached = value_cache.get(cache_key)
+                except TypeError:  # Unhashable value
+                    cache_key = cached = None
+
+                if cached is None:
+                    new_value, _ = self.translate_value(
+                        value, field_name, source_platform, target_platform, entity_type
+                    )
+                    if cache_key is not None:
+                        value_key = self._value_key(source_platform.value, str(value),
+                                                    target_platform.value, field_name)
+                        value_cache[cache_key] = (new_value, value_key, self.value_mappings.get(value_key))
+                else:
+                    new_value, value_key, value_mapping = cached
+                    if value_mapping is not None:
+                        value_mapping.times_used += 1
+                        self._changed["value_mappings"].add(value_key)
+
+                translated[target_field] = new_value
+                if value != new_value:
+                    values_changed[field_name] += 1
+            translated_records.append(translated)
+
+        field_info = {}
+        needs_review = []
+        for field_name, (target_field, confidence, review_needed) in field_plan.items():
+            if target_field:
+                field_info[field_name] = {
+                    "mapped_to": target_field,
+                    "confidence": confidence,
+                    "records": field_counts[field_name],
+                    "values_changed": values_changed[field_name]
+                }
+            else:
+                field_info[field_name] = {
+                    "mapped_to": None,
+                    "confidence": 0,
+                    "records": field_counts[field_name],
+                    "error": "No mapping found"
+                }
+            if review_needed or not target_field:
+                needs_review.append(field_name)
+
+        return {
+            "translated": translated_records,
+            "field_mappings": field_info,
+            "needs_review": needs_review,
+            "shapes": len(shapes)
+        }
+
     # =========================================================================
     # INFERENCE ENGINE
     # =========================================================================
@@ -324,33 +676,34 @@ class SchemaBrain:
         Use multiple strategies to infer a field mapping.
         """
         candidates: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        targets = self._target_index(target_platform, entity_type)
+        field_lower = field_name.lower()
 
         # Strategy 1: Exact name match (case-insensitive)
-        target_fields = self._get_known_target_fields(target_platform, entity_type)
-        for tf in target_fields:
-            if tf.lower() == field_name.lower():
-                candidates[tf].append((0.95, "Exact name match (case-insensitive)"))
+        for tf in targets.by_lower.get(field_lower, ()):
+            candidates[tf].append((0.95, "Exact name match (case-insensitive)"))
 
         # Strategy 2: Common suffix/prefix patterns
         patterns = self._extract_field_patterns(field_name)
-        for tf in target_fields:
-            tf_patterns = self._extract_field_patterns(tf)
-            overlap = patterns & tf_patterns
-            if overlap:
-                score = 0.7 + (len(overlap) * 0.05)
-                candidates[tf].append((min(score, 0.9),
-                    f"Shared patterns: {', '.join(overlap)}"))
-
-        # Strategy 3: String similarity (Levenshtein-like)
-        for tf in target_fields:
-            similarity = SequenceMatcher(None,
-                field_name.lower(), tf.lower()).ratio()
+        for tf in targets.sharing_patterns(patterns):
+            overlap = patterns & targets.patterns[tf]
+            score = 0.7 + (len(overlap) * 0.05)
+            candidates[tf].append((min(score, 0.9),
+                f"Shared patterns: {', '.join(overlap)}"))
+
+        # Strategy 3: String similarity (Levenshtein-like), over the fields
+        # sharing the most trigrams; the quick ratios are upper bounds
+        for tf in targets.names.similar(field_name, self.CANDIDATE_LIMIT):
+            matcher = SequenceMatcher(None, field_lower, tf.lower())
+            if matcher.real_quick_ratio() < 0.6 or matcher.quick_ratio() < 0.6:
+                continue
+            similarity = matcher.ratio()
             if similarity >= 0.6:
                 candidates[tf].append((similarity * 0.85,
                     f"String similarity: {similarity:.0%}"))
 
         # Strategy 4: Semantic matching via common field name mappings
-        semantic_matches = self._semantic_field_match(field_name, target_fields)
+        semantic_matches = self._semantic_field_match(field_name, targets)
         for tf, score in semantic_matches:
             candidates[tf].append((score, "Semantic similarity"))
 
@@ -364,7 +717,7 @@ class SchemaBrain:
         # Strategy 6: Value-based inference (if record provided)
         if record and field_name in record:
             value = record[field_name]
-            value_matches = self._value_type_inference(value, target_fields, target_platform)
+            value_matches = self._value_type_inference(value, targets, target_platform)
             for tf, score in value_matches:
                 candidates[tf].append((score, f"Value type match for: {type(value).__name__}"))
 
@@ -466,49 +819,11 @@ class SchemaBrain:
     def _semantic_field_match(
         self,
         source_field: str,
-        target_fields: List[str]
+        targets: TargetFieldIndex
     ) -> List[Tuple[str, float]]:
-        """Match fields based on semantic meaning."""
-        # Common semantic equivalences
-        semantic_groups = [
-            {'id', 'identifier', 'key', 'uid', 'guid'},
-            {'name', 'title', 'label', 'subject'},
-            {'email', 'emailaddress', 'mail', 'emailaddress1'},
-            {'phone', 'telephone', 'mobile', 'cell', 'telephone1'},
-            {'company', 'account', 'organization', 'org', 'employer'},
-            {'address', 'location', 'street', 'city', 'zip', 'postal'},
-            {'created', 'createdon', 'createddate', 'createdat'},
-            {'modified', 'updated', 'modifiedon', 'lastmodified', 'updatedat'},
-            {'description', 'desc', 'details', 'notes', 'body', 'content'},
-            {'status', 'state', 'statecode', 'stage'},
-            {'amount', 'value', 'price', 'cost', 'total', 'estimatedvalue'},
-            {'probability', 'likelihood', 'chance', 'closeprobability'},
-            {'owner', 'assignee', 'assignedto', 'ownerid'},
-            {'parent', 'parentid', 'parentcustomerid'},
-            {'website', 'url', 'websiteurl', 'homepage'},
-            {'industry', 'industrycode', 'sector', 'vertical'},
-        ]
-
-        source_lower = source_field.lower()
-        # Remove common prefixes/suffixes for matching
-        source_clean = re.sub(r'^(billing|shipping|primary|secondary)', '', source_lower)
-        source_clean = re.sub(r'(id|date|time|at|on)$', '', source_clean)
-
-        matches = []
-        for tf in target_fields:
-            tf_lower = tf.lower()
-            tf_clean = re.sub(r'^(billing|shipping|primary|secondary)', '', tf_lower)
-            tf_clean = re.sub(r'(id|date|time|at|on)$', '', tf_clean)
-
-            for group in semantic_groups:
-                source_in = any(g in source_clean for g in group)
-                target_in = any(g in tf_clean for g in group)
-                if source_in and target_in:
-                    # Higher score if both match same semantic group
-                    matches.append((tf, 0.8))
-                    break
-
-        return matches
+        """Match fields based on semantic meaning (SEMANTIC_GROUPS)."""
+        # Common prefixes/suffixes are removed before matching
+        return [(tf, 0.8) for tf in targets.in_groups(semantic_groups(source_field))]
 
     def _pattern_based_match(
         self,
@@ -522,16 +837,16 @@ class SchemaBrain:
 
         # Look for similar field names in other entities that we've already mapped
         field_lower = field_name.lower()
+        sources = self._source_index(source_platform, target_platform)
 
-        for key, mapping in self.field_mappings.items():
-            if mapping.source_platform != source_platform.value:
-                continue
-            if mapping.target_platform != target_platform.value:
-                continue
+        for key in sources.similar(field_name, self.CANDIDATE_LIMIT):
+            mapping = self.field_mappings[key]
 
             # Check if source field is similar
-            sim = SequenceMatcher(None,
-                mapping.source_field.lower(), field_lower).ratio()
+            matcher = SequenceMatcher(None, mapping.source_field.lower(), field_lower)
+            if matcher.real_quick_ratio() < 0.8 or matcher.quick_ratio() < 0.8:
+                continue
+            sim = matcher.ratio()
 
             if sim >= 0.8 and mapping.confidence >= 0.7:
                 # Propose similar target field
@@ -546,7 +861,7 @@ class SchemaBrain:
     def _value_type_inference(
         self,
         value: Any,
-        target_fields: List[str],
+        targets: TargetFieldIndex,
         target_platform: Platform
     ) -> List[Tuple[str, float]]:
         """Infer field based on value type and content."""
@@ -554,21 +869,15 @@ class SchemaBrain:
 
         # Email pattern
         if isinstance(value, str) and '@' in value and '.' in value:
-            for tf in target_fields:
-                if 'email' in tf.lower() or 'mail' in tf.lower():
-                    matches.append((tf, 0.85))
+            matches.extend((tf, 0.85) for tf in targets.select("email"))
 
         # URL pattern
         if isinstance(value, str) and (value.startswith('http') or 'www.' in value):
-            for tf in target_fields:
-                if 'url' in tf.lower() or 'website' in tf.lower() or 'web' in tf.lower():
-                    matches.append((tf, 0.85))
+            matches.extend((tf, 0.85) for tf in targets.select("url"))
 
         # Phone pattern
         if isinstance(value, str) and re.match(r'^[\d\s\-\+\(\)]+$', value) and len(value) >= 7:
-            for tf in target_fields:
-                if 'phone' in tf.lower() or 'tel' in tf.lower() or 'mobile' in tf.lower():
-                    matches.append((tf, 0.8))
+            matches.extend((tf, 0.8) for tf in targets.select("phone"))
 
         # Date pattern
         if isinstance(value, str):
@@ -579,39 +888,21 @@ class SchemaBrain:
             ]
             for pattern in date_patterns:
                 if re.match(pattern, value):
-                    for tf in target_fields:
-                        if 'date' in tf.lower() or 'time' in tf.lower() or tf.lower().endswith('on') or tf.lower().endswith('at'):
-                            matches.append((tf, 0.75))
+                    matches.extend((tf, 0.75) for tf in targets.select("date"))
                     break
 
         # Numeric (could be amount, probability, etc.)
         if isinstance(value, (int, float)):
             if 0 <= value <= 1:  # Probability
-                for tf in target_fields:
-                    if 'prob' in tf.lower() or 'percent' in tf.lower() or 'rate' in tf.lower():
-                        matches.append((tf, 0.7))
+                matches.extend((tf, 0.7) for tf in targets.select("probability"))
             elif value >= 0:  # Positive number - could be amount
-                for tf in target_fields:
-                    if 'amount' in tf.lower() or 'value' in tf.lower() or 'price' in tf.lower():
-                        matches.append((tf, 0.65))
+                matches.extend((tf, 0.65) for tf in targets.select("amount"))
 
         return matches
 
     def _get_known_target_fields(self, platform: Platform, entity_type: str) -> List[str]:
         """Get all known field names for a target platform/entity."""
-        fields = set()
-
-        # From builtin schema
-        entity_fields = SCHEMA_MAPPINGS["fields"].get(entity_type, {})
-        if platform.value in entity_fields:
-            fields.update(entity_fields[platform.value])
-
-        # From learned mappings
-        for mapping in self.field_mappings.values():
-            if mapping.target_platform == platform.value and mapping.entity_type == entity_type:
-                fields.add(mapping.target_field)
-
-        return list(fields)
+        return list(self._target_index(platform, entity_type).fields)
 
     def _get_known_values(self, field_name: str, platform: Platform) -> List[Any]:
         """Get known values for a field from builtin mappings."""
@@ -704,7 +995,7 @@ class SchemaBrain:
             notes=notes
         )
 
-        self.field_mappings[key] = new_mapping
+        self._put_mapping(key, new_mapping)
         self.stats["human_corrections"] += 1
 
         # Log the learning event
@@ -738,6 +1029,7 @@ class SchemaBrain:
             # Boost confidence but not above 0.95 without explicit human verification
             mapping.confidence = min(0.95, mapping.confidence * 1.15)
             mapping.times_used += 1
+            self._changed["field_mappings"].add(key)
 
             self._log_learning_event(
                 "confirmation",
@@ -767,6 +1059,7 @@ class SchemaBrain:
             old_confidence = mapping.confidence
             mapping.confidence *= 0.5  # Significant decrease
             mapping.times_corrected += 1
+            self._changed["field_mappings"].add(key)
 
             self._log_learning_event(
                 "rejection",
@@ -777,7 +1070,7 @@ class SchemaBrain:
 
             if mapping.confidence < 0.2:
                 # Remove very low confidence mappings
-                del self.field_mappings[key]
+                self._drop_mapping(key)
 
             self._save_memory()
             return True
@@ -797,6 +1090,7 @@ class SchemaBrain:
                     self.field_patterns[pattern_key] = []
                 if tp not in self.field_patterns[pattern_key]:
                     self.field_patterns[pattern_key].append(tp)
+                    self._new_field_patterns.append((pattern_key, tp))
 
     # =========================================================================
     # UNKNOWN FIELD DETECTION & PROPOSALS
@@ -906,7 +1200,7 @@ class SchemaBrain:
                             )
 
                             if key not in self.field_mappings:
-                                self.field_mappings[key] = FieldMapping(
+                                self._put_mapping(key, FieldMapping(
                                     source_platform=source_platform.value,
                                     source_field=source_field,
                                     target_platform=target_platform.value,
@@ -914,14 +1208,44 @@ class SchemaBrain:
                                     entity_type=entity_type,
                                     confidence=1.0,
                                     source=MappingSource.BUILTIN
-                                )
+                                ))
 
     def _save_memory(self):
-        """Save learned mappings to disk."""
-        memory_file = Path(self.memory_path) / "schema_brain.json"
+        """
+        Persist what changed since the last save.
 
+        Changes are appended to the journal; once it holds snapshot_every
+        entries a full snapshot is written instead.
+        """
+        changes = []
+        for key in self._changed.pop("field_mappings", ()):
+            mapping = self.field_mappings.get(key)
+            if mapping is None:
+                changes.append(("field_mappings", key, None))
+            elif mapping.source != MappingSource.BUILTIN:  # Don't save builtins
+                changes.append(("field_mappings", key, mapping.to_dict()))
+        for key in self._changed.pop("value_mappings", ()):
+            mapping = self.value_mappings.get(key)
+            changes.append(("value_mappings", key, mapping.to_dict() if mapping else None))
+        for key, target_pattern in self._new_field_patterns:
+            changes.append(("field_patterns", key, target_pattern))
+        self._new_field_patterns.clear()
+        if self.stats != self._saved_stats:
+            changes.append(("stats", None, self.stats))
+        for event in self.learning_log[self._saved_log_length:]:
+            changes.append(("learning_log", None, event.to_dict()))
+
+        self._journal.append(changes)
+        self._saved_stats = dict(self.stats)
+        self._saved_log_length = len(self.learning_log)
+
+        if self._journal.entries_since_snapshot >= self.snapshot_every:
+            self.snapshot_memory()
+
+    def snapshot_memory(self):
+        """Write the full memory as a new snapshot and start an empty journal."""
         data = {
-            "version": "1.0",
+            "version": "1.1",
             "saved_at": datetime.now().isoformat(),
             "field_mappings": {k: v.to_dict() for k, v in self.field_mappings.items()
                               if v.source != MappingSource.BUILTIN},  # Don't save builtins
@@ -930,38 +1254,59 @@ class SchemaBrain:
             "value_patterns": dict(self.value_patterns),
             "stats": self.stats
         }
+        self._journal.write_snapshot(data, [e.to_dict() for e in self.learning_log])
 
-        with open(memory_file, 'w') as f:
-            json.dump(data, f, indent=2)
-
-        # Also save learning log separately (can get large)
-        log_file = Path(self.memory_path) / "learning_log.json"
-        with open(log_file, 'w') as f:
-            json.dump([e.to_dict() for e in self.learning_log[-1000:]], f, indent=2)
+        self._changed.clear()
+        self._new_field_patterns.clear()
+        self._saved_stats = dict(self.stats)
+        self._saved_log_length = len(self.learning_log)
 
     def _load_memory(self):
-        """Load previously learned mappings from disk."""
-        memory_file = Path(self.memory_path) / "schema_brain.json"
-
-        if not memory_file.exists():
-            return
-
-        try:
-            with open(memory_file, 'r') as f:
-                data = json.load(f)
-
-            for k, v in data.get("field_mappings", {}).items():
-                self.field_mappings[k] = FieldMapping.from_dict(v)
-
-            for k, v in data.get("value_mappings", {}).items():
-                self.value_mappings[k] = ValueMapping.from_dict(v)
-
-            self.field_patterns = defaultdict(list, data.get("field_patterns", {}))
-            self.value_patterns = defaultdict(dict, data.get("value_patterns", {}))
-            self.stats = data.get("stats", self.stats)
-
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Warning: Could not load schema memory: {e}")
+        """Load previously learned mappings from the snapshot and journal."""
+        snapshot, log, entries = self._journal.load()
+
+        if snapshot:
+            try:
+                for k, v in snapshot.get("field_mappings", {}).items():
+                    self._put_mapping(k, FieldMapping.from_dict(v))
+
+                for k, v in snapshot.get("value_mappings", {}).items():
+                    self.value_mappings[k] = ValueMapping.from_dict(v)
+
+                self.field_patterns = defaultdict(list, snapshot.get("field_patterns", {}))
+                self.value_patterns = defaultdict(dict, snapshot.get("value_patterns", {}))
+                self.stats = snapshot.get("stats", self.stats)
+
+            except (KeyError, TypeError) as e:
+                print(f"Warning: Could not load schema memory: {e}")
+
+        self.learning_log = [LearningEvent.from_dict(e) for e in log]
+        for entry in entries:
+            self._replay(entry["section"], entry["key"], entry["value"])
+
+        self._changed.clear()
+        self._saved_stats = dict(self.stats)
+        self._saved_log_length = len(self.learning_log)
+
+    def _replay(self, section: str, key: Optional[str], value: Any):
+        """Apply one journal entry to memory."""
+        if section == "field_mappings":
+            if value is not None:
+                self._put_mapping(key, FieldMapping.from_dict(value))
+            elif key in self.field_mappings:
+                self._drop_mapping(key)
+        elif section == "value_mappings":
+            if value is not None:
+                self.value_mappings[key] = ValueMapping.from_dict(value)
+            else:
+                self.value_mappings.pop(key, None)
+        elif section == "field_patterns":
+            if value not in self.field_patterns[key]:
+                self.field_patterns[key].append(value)
+        elif section == "stats":
+            self.stats = dict(value)
+        elif section == "learning_log":
+            self.learning_log.append(LearningEvent.from_dict(value))
 
     def _log_learning_event(
         self,
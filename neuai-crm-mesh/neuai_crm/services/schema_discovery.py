@@ -14,15 +14,24 @@ import os
 import json
 import hashlib
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Callable, Dict, List, Optional, Tuple, Any, Set
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
 from difflib import SequenceMatcher
 from collections import defaultdict
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 
 from neuai_crm.models.schemas import Platform
+from neuai_crm.services.audit_queue import AuditQueue, CONFIDENCE_BUCKETS
+from neuai_crm.services.discovery_store import DiscoveryStore, LazyShards
+from neuai_crm.services.metadata_fetch import (
+    DescribeCache, MetadataRequestError, call_with_retry, parse_retry_after
+)
+from neuai_crm.services.ngram_index import TrigramIndex
 
 
 class FieldType(str, Enum):
@@ -130,6 +139,112 @@ class DiscoveryResult:
     timestamp: str
     duration_seconds: float
     errors: List[str] = field(default_factory=list)
+    entities_from_cache: int = 0
+
+
+# Standard field name mappings (Salesforce -> Dynamics common mappings)
+STANDARD_FIELD_MAPPINGS = {
+    'id': ['id', 'accountid', 'contactid', 'opportunityid'],
+    'name': ['name', 'fullname', 'subject'],
+    'firstname': ['firstname'],
+    'lastname': ['lastname'],
+    'email': ['emailaddress1', 'emailaddress2', 'emailaddress3'],
+    'phone': ['telephone1', 'telephone2', 'telephone3', 'mobilephone'],
+    'website': ['websiteurl'],
+    'industry': ['industrycode'],
+    'description': ['description'],
+    'billingstreet': ['address1_line1'],
+    'billingcity': ['address1_city'],
+    'billingstate': ['address1_stateorprovince'],
+    'billingpostalcode': ['address1_postalcode'],
+    'billingcountry': ['address1_country'],
+    'amount': ['estimatedvalue', 'actualvalue'],
+    'stagename': ['stepname', 'salesstagecode'],
+    'closedate': ['estimatedclosedate', 'actualclosedate'],
+    'probability': ['closeprobability'],
+    'accountid': ['parentaccountid', 'customerid'],
+    'ownerid': ['ownerid', 'owninguser'],
+    'createddate': ['createdon'],
+    'lastmodifieddate': ['modifiedon'],
+    'title': ['jobtitle'],
+}
+
+# (source name/label patterns, target name/label patterns) per semantic group
+SEMANTIC_FIELD_GROUPS = [
+    (['email', 'mail', 'e-mail'], ['emailaddress', 'email']),
+    (['phone', 'tel', 'mobile', 'fax'], ['telephone', 'phone', 'mobile']),
+    (['address', 'street', 'city', 'state', 'zip', 'postal', 'country'], ['address']),
+    (['company', 'account', 'organization', 'org'], ['account', 'company', 'parent']),
+    (['amount', 'value', 'price', 'revenue', 'budget'], ['value', 'amount', 'budget']),
+    (['date', 'time', 'created', 'modified', 'updated'], ['date', 'on', 'time']),
+    (['owner', 'assigned', 'rep', 'user'], ['owner', 'user', 'assigned']),
+    (['stage', 'status', 'state', 'phase'], ['stage', 'status', 'state', 'step']),
+    (['probability', 'likelihood', 'chance', 'percent'], ['probability', 'percent', 'chance']),
+    (['description', 'notes', 'comment', 'details'], ['description', 'notes', 'memo']),
+]
+
+
+class TargetFieldIndex:
+    """
+    Lookups over one target entity's fields, built once per entity pair.
+
+    Holds the exact name/label lookups, fields by type with trigram indexes
+    over their names and labels, the fields in each semantic group, and a
+    SequenceMatcher per target text (which caches its analysis of the text
+    across source fields).
+    """
+
+    def __init__(self, fields: List[FieldMetadata]):
+        self.fields = fields
+        self.by_name = {f.name.lower(): f for f in fields}
+        self.by_label = {f.label.lower(): f for f in fields}
+        self.by_type: Dict[FieldType, Dict[str, FieldMetadata]] = defaultdict(dict)
+        self._names: Dict[FieldType, TrigramIndex] = defaultdict(TrigramIndex)
+        self._labels: Dict[FieldType, TrigramIndex] = defaultdict(TrigramIndex)
+        for f in fields:
+            self.by_type[f.field_type][f.name] = f
+            self._names[f.field_type].add(f.name, f.name)
+            self._labels[f.field_type].add(f.name, f.label)
+
+        self._matchers: Dict[str, SequenceMatcher] = {}
+
+        self.semantic: List[List[FieldMetadata]] = []
+        for _, target_patterns in SEMANTIC_FIELD_GROUPS:
+            self.semantic.append([
+                f for f in fields
+                if any(p in f.name.lower() or p in f.label.lower() for p in target_patterns)
+            ])
+
+    def similar(
+        self,
+        field_type: FieldType,
+        name: str,
+        label: str,
+        limit: Optional[int]
+    ) -> List[FieldMetadata]:
+        """
+        Fields of a type sharing the most name or label trigrams, in field order.
+
+        Args:
+            field_type: Type the fields must have
+            name: Source field name (matched against target names)
+            label: Source field label (matched against target labels)
+            limit: Candidates per name and per label (None returns every field)
+        """
+        if field_type not in self.by_type:
+            return []
+        names = self._names[field_type]
+        found = set(names.similar(name, limit)) | set(self._labels[field_type].similar(label, limit))
+        of_type = self.by_type[field_type]
+        return [of_type[n] for n in names.ordered(found)]
+
+    def matcher(self, source_text: str, target_text: str) -> SequenceMatcher:
+        """A SequenceMatcher comparing source_text to target_text."""
+        matcher = self._matchers.get(target_text)
+        if matcher is None:
+            matcher = self._matchers[target_text] = SequenceMatcher(None, b=target_text)
+        matcher.set_seq1(source_text)
+        return matcher
 
 
 class SchemaDiscovery:
@@ -139,18 +254,30 @@ class SchemaDiscovery:
     Pulls metadata from live CRMs and proposes mappings for human audit.
     """
 
+    # Retries per object describe, and the delay before the first retry
+    FETCH_RETRIES = 3
+    FETCH_BACKOFF = 0.5
+
+    # Name similarity scores at most this many trigram-ranked target fields
+    # per source name and label (None scores every field of the same type)
+    CANDIDATE_LIMIT: Optional[int] = 50
+
+    # Audit journal entries between audit state snapshots
+    SNAPSHOT_EVERY = 1000
+
     def __init__(self, storage_path: Optional[str] = None):
         self.storage_path = storage_path or self._default_storage_path()
+        self.describe_cache = DescribeCache(str(Path(self.storage_path) / "describe_cache"))
+        self.store = DiscoveryStore(self.storage_path)
 
-        # Discovered schemas
+        # Discovered schemas (entity shards are read on first access)
         self.schemas: Dict[str, Dict[str, List[FieldMetadata]]] = {
-            "salesforce": {},
-            "dynamics365": {},
-            "local": {}
+            platform: self._lazy_schemas(platform)
+            for platform in ["salesforce", "dynamics365", "local"] + self.store.platforms()
         }
 
-        # Audit queue
-        self.audit_queue: List[MappingProposal] = []
+        # Audit queue (indexed by ID, status, confidence bucket, platform and entity)
+        self.audit_queue = AuditQueue()
 
         # Approved mappings (after audit)
         self.approved_mappings: Dict[str, MappingProposal] = {}
@@ -158,6 +285,10 @@ class SchemaDiscovery:
         # Discovery history
         self.discovery_history: List[DiscoveryResult] = []
 
+        # Guards the state above; discovery only takes it to commit what it
+        # fetched, never while waiting on the network
+        self.lock = threading.RLock()
+
         # Load existing data
         self._load_state()
 
@@ -170,20 +301,35 @@ class SchemaDiscovery:
     # SALESFORCE METADATA EXTRACTION
     # =========================================================================
 
-    def discover_salesforce(self, sf_client) -> DiscoveryResult:
+    def discover_salesforce(
+        self,
+        sf_client,
+        workers: int = 1,
+        use_cache: bool = True
+    ) -> DiscoveryResult:
         """
         Discover schema from Salesforce using the Describe API.
 
+        Objects are described on a pool of worker threads, each describe
+        retried with backoff on transient errors. With the cache, objects
+        described before are requested with If-Modified-Since and reused
+        when Salesforce answers 304 Not Modified.
+
         Args:
             sf_client: simple_salesforce.Salesforce instance
+            workers: Concurrent describe calls
+            use_cache: Reuse unchanged describes from the describe cache
 
         Returns:
             DiscoveryResult with discovery statistics
         """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
         start_time = datetime.now()
         errors = []
         total_fields = 0
         custom_fields = 0
+        from_cache = 0
 
         # Standard objects we care about for CRM
         target_objects = [
@@ -191,49 +337,45 @@ class SchemaDiscovery:
             'Campaign', 'Case', 'Event', 'Note'
         ]
 
-        discovered_entities = {}
+        # Also discover custom objects
+        custom_objects = []
+        try:
+            global_describe = call_with_retry(sf_client.describe, self.FETCH_RETRIES, self.FETCH_BACKOFF)
+            custom_objects = [
+                obj['name'] for obj in global_describe['sobjects']
+                if obj['custom'] and obj['queryable']
+            ]
+        except Exception as e:
+            errors.append(f"Error discovering custom objects: {str(e)}")
 
-        for obj_name in target_objects:
+        def describe(obj_name: str) -> Tuple[Optional[Dict], bool, Optional[Exception]]:
             try:
-                # Get object description
-                describe = getattr(sf_client, obj_name).describe()
+                return self._describe_salesforce_object(sf_client, obj_name, use_cache) + (None,)
+            except Exception as e:
+                return None, False, e
 
-                fields = []
-                for f in describe['fields']:
-                    field_meta = self._parse_salesforce_field(f, obj_name)
-                    fields.append(field_meta)
-                    total_fields += 1
-                    if field_meta.is_custom:
-                        custom_fields += 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            described = list(pool.map(describe, target_objects + custom_objects))
 
-                discovered_entities[obj_name.lower()] = fields
+        discovered_entities = {}
 
-            except Exception as e:
-                errors.append(f"Error describing {obj_name}: {str(e)}")
+        for obj_name, (obj_describe, cached, error) in zip(target_objects + custom_objects, described):
+            is_custom_object = obj_name not in target_objects
+            if error is not None:
+                if not is_custom_object:
+                    errors.append(f"Error describing {obj_name}: {str(error)}")
+                continue  # Skip custom objects we can't access
+            from_cache += cached
 
-        # Also discover custom objects
-        try:
-            global_describe = sf_client.describe()
-            for obj in global_describe['sobjects']:
-                if obj['custom'] and obj['queryable']:
-                    try:
-                        describe = sf_client.query(f"SELECT Id FROM {obj['name']} LIMIT 0")
-                        obj_describe = getattr(sf_client, obj['name']).describe()
-
-                        fields = []
-                        for f in obj_describe['fields']:
-                            field_meta = self._parse_salesforce_field(f, obj['name'])
-                            fields.append(field_meta)
-                            total_fields += 1
-                            custom_fields += 1
-
-                        discovered_entities[obj['name'].lower()] = fields
-                    except:
-                        pass  # Skip objects we can't access
-        except Exception as e:
-            errors.append(f"Error discovering custom objects: {str(e)}")
+            fields = []
+            for f in obj_describe['fields']:
+                field_meta = self._parse_salesforce_field(f, obj_name)
+                fields.append(field_meta)
+                total_fields += 1
+                if field_meta.is_custom or is_custom_object:
+                    custom_fields += 1
 
-        self.schemas["salesforce"] = discovered_entities
+            discovered_entities[obj_name.lower()] = fields
 
         duration = (datetime.now() - start_time).total_seconds()
         result = DiscoveryResult(
@@ -243,14 +385,48 @@ class SchemaDiscovery:
             custom_fields=custom_fields,
             timestamp=datetime.now().isoformat(),
             duration_seconds=duration,
-            errors=errors
+            errors=errors,
+            entities_from_cache=from_cache
         )
 
-        self.discovery_history.append(result)
-        self._save_state()
+        with self.lock:
+            self.schemas["salesforce"] = discovered_entities
+            self._save_schemas("salesforce")
+            self.discovery_history.append(result)
+            self._journal([("discovery_history", None, asdict(result))])
 
         return result
 
+    def _describe_salesforce_object(self, sf_client, obj_name: str, use_cache: bool) -> Tuple[Dict, bool]:
+        """
+        Describe one Salesforce object, conditionally if it is cached.
+
+        Returns:
+            Tuple of (describe payload, whether it came from the cache)
+        """
+        sobject = getattr(sf_client, obj_name)
+        cached = self.describe_cache.get("salesforce", obj_name) if use_cache else None
+        # Taken before the request so changes made during it are not missed
+        fetched_at = formatdate(usegmt=True)
+
+        try:
+            if cached:
+                obj_describe = call_with_retry(
+                    lambda: sobject.describe(headers={'If-Modified-Since': cached['marker']}),
+                    self.FETCH_RETRIES, self.FETCH_BACKOFF
+                )
+            else:
+                obj_describe = call_with_retry(sobject.describe, self.FETCH_RETRIES, self.FETCH_BACKOFF)
+        except Exception as e:
+            # simple_salesforce raises on any status >= 300, including 304
+            if cached and getattr(e, 'status', None) == 304:
+                return cached['describe'], True
+            raise
+
+        if use_cache:
+            self.describe_cache.put("salesforce", obj_name, fetched_at, obj_describe)
+        return obj_describe, False
+
     def _parse_salesforce_field(self, field_data: Dict, entity: str) -> FieldMetadata:
         """Parse Salesforce field description into normalized FieldMetadata."""
         sf_type = field_data.get('type', '').lower()
@@ -315,23 +491,42 @@ class SchemaDiscovery:
     # DYNAMICS 365 METADATA EXTRACTION
     # =========================================================================
 
-    def discover_dynamics365(self, access_token: str, environment_url: str) -> DiscoveryResult:
+    def discover_dynamics365(
+        self,
+        access_token: str,
+        environment_url: str,
+        workers: int = 1,
+        use_cache: bool = True,
+        http=None
+    ) -> DiscoveryResult:
         """
         Discover schema from Dynamics 365 using EntityDefinitions API.
 
+        Entities are fetched on a pool of worker threads, each request
+        retried with backoff on 429/5xx (honouring Retry-After). With the
+        cache, entities fetched before are requested with If-None-Match and
+        reused when Dynamics answers 304 Not Modified.
+
         Args:
             access_token: OAuth access token
             environment_url: Dynamics 365 environment URL
+            workers: Concurrent metadata requests
+            use_cache: Reuse unchanged entity metadata from the describe cache
+            http: Object with a requests-style get() (defaults to requests)
 
         Returns:
             DiscoveryResult with discovery statistics
         """
-        import requests
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if http is None:
+            import requests as http
 
         start_time = datetime.now()
         errors = []
         total_fields = 0
         custom_fields = 0
+        from_cache = 0
 
         headers = {
             'Authorization': f'Bearer {access_token}',
@@ -351,35 +546,36 @@ class SchemaDiscovery:
             'activitypointer', 'phonecall', 'email'
         ]
 
-        discovered_entities = {}
-
-        for entity_name in target_entities:
+        def fetch(entity_name: str) -> Tuple[Optional[Dict], bool, Optional[Exception]]:
             try:
-                # Get entity metadata
-                url = f"{api_url}/EntityDefinitions(LogicalName='{entity_name}')?$expand=Attributes"
-                response = requests.get(url, headers=headers)
-
-                if response.status_code != 200:
-                    errors.append(f"Error fetching {entity_name}: {response.status_code}")
-                    continue
+                return self._fetch_dynamics_entity(http, api_url, headers, entity_name, use_cache) + (None,)
+            except Exception as e:
+                return None, False, e
 
-                entity_data = response.json()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fetched = list(pool.map(fetch, target_entities))
 
-                fields = []
-                for attr in entity_data.get('Attributes', []):
-                    field_meta = self._parse_dynamics_field(attr, entity_name)
-                    if field_meta:  # Skip null returns
-                        fields.append(field_meta)
-                        total_fields += 1
-                        if field_meta.is_custom:
-                            custom_fields += 1
+        discovered_entities = {}
 
-                discovered_entities[entity_name] = fields
+        for entity_name, (entity_data, cached, error) in zip(target_entities, fetched):
+            if isinstance(error, MetadataRequestError):
+                errors.append(f"Error fetching {entity_name}: {error.status}")
+                continue
+            if error is not None:
+                errors.append(f"Error discovering {entity_name}: {str(error)}")
+                continue
+            from_cache += cached
 
-            except Exception as e:
-                errors.append(f"Error discovering {entity_name}: {str(e)}")
+            fields = []
+            for attr in entity_data.get('Attributes', []):
+                field_meta = self._parse_dynamics_field(attr, entity_name)
+                if field_meta:  # Skip null returns
+                    fields.append(field_meta)
+                    total_fields += 1
+                    if field_meta.is_custom:
+                        custom_fields += 1
 
-        self.schemas["dynamics365"] = discovered_entities
+            discovered_entities[entity_name] = fields
 
         duration = (datetime.now() - start_time).total_seconds()
         result = DiscoveryResult(
@@ -389,14 +585,54 @@ class SchemaDiscovery:
             custom_fields=custom_fields,
             timestamp=datetime.now().isoformat(),
             duration_seconds=duration,
-            errors=errors
+            errors=errors,
+            entities_from_cache=from_cache
         )
 
-        self.discovery_history.append(result)
-        self._save_state()
+        with self.lock:
+            self.schemas["dynamics365"] = discovered_entities
+            self._save_schemas("dynamics365")
+            self.discovery_history.append(result)
+            self._journal([("discovery_history", None, asdict(result))])
 
         return result
 
+    def _fetch_dynamics_entity(
+        self,
+        http,
+        api_url: str,
+        headers: Dict[str, str],
+        entity_name: str,
+        use_cache: bool
+    ) -> Tuple[Dict, bool]:
+        """
+        Fetch one entity definition with its attributes, conditionally if it is cached.
+
+        Returns:
+            Tuple of (entity metadata, whether it came from the cache)
+        """
+        url = f"{api_url}/EntityDefinitions(LogicalName='{entity_name}')?$expand=Attributes"
+        cached = self.describe_cache.get("dynamics365", entity_name) if use_cache else None
+        if cached:
+            headers = {**headers, 'If-None-Match': cached['marker']}
+
+        def request():
+            response = http.get(url, headers=headers)
+            if response.status_code not in (200, 304):
+                raise MetadataRequestError(response.status_code,
+                                           parse_retry_after(response.headers.get('Retry-After')))
+            return response
+
+        response = call_with_retry(request, self.FETCH_RETRIES, self.FETCH_BACKOFF)
+        if response.status_code == 304 and cached:
+            return cached['describe'], True
+
+        entity_data = response.json()
+        etag = response.headers.get('ETag') or entity_data.get('@odata.etag')
+        if use_cache and etag:
+            self.describe_cache.put("dynamics365", entity_name, etag, entity_data)
+        return entity_data, False
+
     def _parse_dynamics_field(self, attr_data: Dict, entity: str) -> Optional[FieldMetadata]:
         """Parse Dynamics 365 attribute metadata into normalized FieldMetadata."""
         attr_type = attr_data.get('AttributeType', '').lower()
@@ -470,7 +706,8 @@ class SchemaDiscovery:
         self,
         source_platform: str,
         target_platform: str,
-        auto_approve_threshold: float = 0.95
+        auto_approve_threshold: float = 0.95,
+        progress: Optional[Callable[[Dict], None]] = None
     ) -> List[MappingProposal]:
         """
         Automatically generate mapping proposals between two platforms.
@@ -481,6 +718,9 @@ class SchemaDiscovery:
             source_platform: Source platform name
             target_platform: Target platform name
             auto_approve_threshold: Confidence above which to auto-approve
+            progress: Callback receiving a progress dict after each entity
+                pair; an exception it raises (e.g. to cancel) stops before
+                the audit queue or approved mappings are touched
 
         Returns:
             List of MappingProposals for human audit
@@ -493,16 +733,11 @@ class SchemaDiscovery:
         # Entity mapping (Account -> account, Contact -> contact, etc.)
         entity_pairs = self._match_entities(source_schemas.keys(), target_schemas.keys())
 
-        for source_entity, target_entity, entity_confidence in entity_pairs:
+        for done, (source_entity, target_entity, entity_confidence) in enumerate(entity_pairs, 1):
             source_fields = source_schemas.get(source_entity, [])
-            target_fields = target_schemas.get(target_entity, [])
 
-            # Create field lookup for target
-            target_lookup = {f.name.lower(): f for f in target_fields}
-            target_by_label = {f.label.lower(): f for f in target_fields}
-            target_by_type = defaultdict(list)
-            for f in target_fields:
-                target_by_type[f.field_type].append(f)
+            # Create field lookups for target
+            targets = TargetFieldIndex(target_schemas.get(target_entity, []))
 
             for source_field in source_fields:
                 # Skip system fields
@@ -511,7 +746,7 @@ class SchemaDiscovery:
 
                 # Find best match
                 best_match, confidence, reasoning, alternatives = self._find_best_field_match(
-                    source_field, target_fields, target_lookup, target_by_label, target_by_type
+                    source_field, targets
                 )
 
                 # Generate proposal ID
@@ -549,15 +784,28 @@ class SchemaDiscovery:
 
                 proposals.append(proposal)
 
+            if progress:
+                progress({
+                    "entity": source_entity,
+                    "entities_processed": done,
+                    "total_entities": len(entity_pairs),
+                    "proposals": len(proposals),
+                    "percent": round(100.0 * done / len(entity_pairs), 1)
+                })
+
         # Add to audit queue
         self.audit_queue.extend([p for p in proposals if p.status == AuditStatus.PENDING])
 
         # Auto-approved go straight to approved
+        changes = []
         for p in proposals:
             if p.status == AuditStatus.AUTO_APPROVED:
                 self.approved_mappings[p.id] = p
+                changes.append(("approved_mappings", p.id, p.to_dict()))
+            elif p.status == AuditStatus.PENDING:
+                changes.append(("audit_queue", p.id, p.to_dict()))
 
-        self._save_state()
+        self._journal(changes)
 
         return proposals
 
@@ -613,10 +861,7 @@ class SchemaDiscovery:
     def _find_best_field_match(
         self,
         source_field: FieldMetadata,
-        target_fields: List[FieldMetadata],
-        target_lookup: Dict[str, FieldMetadata],
-        target_by_label: Dict[str, FieldMetadata],
-        target_by_type: Dict[FieldType, List[FieldMetadata]]
+        targets: TargetFieldIndex
     ) -> Tuple[Optional[FieldMetadata], float, List[str], List[Tuple[str, float]]]:
         """
         Find the best matching target field for a source field.
@@ -625,6 +870,7 @@ class SchemaDiscovery:
             (best_match, confidence, reasoning, alternatives)
         """
         candidates: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        target_lookup = targets.by_name
 
         source_name = source_field.name.lower()
         source_label = source_field.label.lower()
@@ -634,53 +880,28 @@ class SchemaDiscovery:
             candidates[target_lookup[source_name].name].append((0.98, "Exact API name match"))
 
         # Strategy 2: Exact label match
-        if source_label in target_by_label:
-            candidates[target_by_label[source_label].name].append((0.95, "Exact label match"))
+        if source_label in targets.by_label:
+            candidates[targets.by_label[source_label].name].append((0.95, "Exact label match"))
 
         # Strategy 3: Standard field name mappings
-        standard_mappings = {
-            # Salesforce -> Dynamics common mappings
-            'id': ['id', 'accountid', 'contactid', 'opportunityid'],
-            'name': ['name', 'fullname', 'subject'],
-            'firstname': ['firstname'],
-            'lastname': ['lastname'],
-            'email': ['emailaddress1', 'emailaddress2', 'emailaddress3'],
-            'phone': ['telephone1', 'telephone2', 'telephone3', 'mobilephone'],
-            'website': ['websiteurl'],
-            'industry': ['industrycode'],
-            'description': ['description'],
-            'billingstreet': ['address1_line1'],
-            'billingcity': ['address1_city'],
-            'billingstate': ['address1_stateorprovince'],
-            'billingpostalcode': ['address1_postalcode'],
-            'billingcountry': ['address1_country'],
-            'amount': ['estimatedvalue', 'actualvalue'],
-            'stagename': ['stepname', 'salesstagecode'],
-            'closedate': ['estimatedclosedate', 'actualclosedate'],
-            'probability': ['closeprobability'],
-            'accountid': ['parentaccountid', 'customerid'],
-            'ownerid': ['ownerid', 'owninguser'],
-            'createddate': ['createdon'],
-            'lastmodifieddate': ['modifiedon'],
-            'title': ['jobtitle'],
-        }
-
-        # Check standard mappings
         clean_source = re.sub(r'__c$', '', source_name)  # Remove Salesforce custom suffix
-        if clean_source in standard_mappings:
-            for target_name in standard_mappings[clean_source]:
+        if clean_source in STANDARD_FIELD_MAPPINGS:
+            for target_name in STANDARD_FIELD_MAPPINGS[clean_source]:
                 if target_name in target_lookup:
                     candidates[target_lookup[target_name].name].append(
                         (0.92, f"Standard field mapping: {clean_source} -> {target_name}")
                     )
 
-        # Strategy 4: Type + semantic name matching
-        same_type_fields = target_by_type.get(source_field.field_type, [])
-        for tf in same_type_fields:
+        # Strategy 4: Type + semantic name matching, over the same-type fields
+        # sharing the most trigrams; the quick ratios are upper bounds
+        for tf in targets.similar(source_field.field_type, source_name, source_label, self.CANDIDATE_LIMIT):
             # Name similarity
-            name_sim = SequenceMatcher(None, source_name, tf.name.lower()).ratio()
-            label_sim = SequenceMatcher(None, source_label, tf.label.lower()).ratio()
-            best_sim = max(name_sim, label_sim)
+            best_sim = 0.0
+            for source_text, target_text in ((source_name, tf.name.lower()), (source_label, tf.label.lower())):
+                matcher = targets.matcher(source_text, target_text)
+                floor = max(best_sim, 0.6)
+                if matcher.real_quick_ratio() >= floor and matcher.quick_ratio() >= floor:
+                    best_sim = max(best_sim, matcher.ratio())
 
             if best_sim >= 0.6:
                 candidates[tf.name].append(
@@ -688,31 +909,15 @@ class SchemaDiscovery:
                 )
 
         # Strategy 5: Semantic matching
-        semantic_groups = [
-            (['email', 'mail', 'e-mail'], ['emailaddress', 'email']),
-            (['phone', 'tel', 'mobile', 'fax'], ['telephone', 'phone', 'mobile']),
-            (['address', 'street', 'city', 'state', 'zip', 'postal', 'country'], ['address']),
-            (['company', 'account', 'organization', 'org'], ['account', 'company', 'parent']),
-            (['amount', 'value', 'price', 'revenue', 'budget'], ['value', 'amount', 'budget']),
-            (['date', 'time', 'created', 'modified', 'updated'], ['date', 'on', 'time']),
-            (['owner', 'assigned', 'rep', 'user'], ['owner', 'user', 'assigned']),
-            (['stage', 'status', 'state', 'phase'], ['stage', 'status', 'state', 'step']),
-            (['probability', 'likelihood', 'chance', 'percent'], ['probability', 'percent', 'chance']),
-            (['description', 'notes', 'comment', 'details'], ['description', 'notes', 'memo']),
-        ]
-
-        for source_patterns, target_patterns in semantic_groups:
+        for (source_patterns, _), group_fields in zip(SEMANTIC_FIELD_GROUPS, targets.semantic):
             if any(p in source_name or p in source_label for p in source_patterns):
-                for tf in target_fields:
-                    tf_name = tf.name.lower()
-                    tf_label = tf.label.lower()
-                    if any(p in tf_name or p in tf_label for p in target_patterns):
-                        candidates[tf.name].append((0.75, "Semantic group match"))
+                for tf in group_fields:
+                    candidates[tf.name].append((0.75, "Semantic group match"))
 
         # Strategy 6: Reference field matching
         if source_field.field_type == FieldType.REFERENCE and source_field.reference_to:
             ref_lower = source_field.reference_to.lower()
-            for tf in target_by_type.get(FieldType.REFERENCE, []):
+            for tf in targets.by_type.get(FieldType.REFERENCE, {}).values():
                 if ref_lower in tf.name.lower() or (tf.reference_to and ref_lower in tf.reference_to.lower()):
                     candidates[tf.name].append((0.8, f"Reference to same entity type"))
 
@@ -778,27 +983,53 @@ class SchemaDiscovery:
     def get_audit_queue(self, status: Optional[AuditStatus] = None) -> List[MappingProposal]:
         """Get proposals pending human audit."""
         if status:
-            return [p for p in self.audit_queue if p.status == status]
-        return self.audit_queue
+            return self.audit_queue.select(status=status.value)
+        return self.audit_queue.select()
+
+    def query_audit_queue(
+        self,
+        status: Optional[AuditStatus] = None,
+        bucket: Optional[str] = None,
+        platform: Optional[str] = None,
+        entity: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        sort: str = "-confidence",
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        Get one page of the audit queue sorted by confidence.
+
+        Args:
+            status: Only proposals with this status
+            bucket: Only proposals in this confidence bucket (high, medium, low)
+            platform: Only proposals from or to this platform
+            entity: Only proposals from or to this entity
+            min_confidence: Only proposals with at least this confidence
+            sort: "-confidence" (highest first) or "confidence"
+            limit: Maximum proposals to return
+            offset: Proposals to skip (after the cursor, if given)
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dict with proposals, total and next_cursor (None on the last page)
+        """
+        if bucket is not None and bucket not in [name for name, _ in CONFIDENCE_BUCKETS]:
+            raise ValueError(f"Invalid confidence bucket: {bucket}")
+        return self.audit_queue.query(
+            status=status.value if status else None, bucket=bucket, platform=platform, entity=entity,
+            min_confidence=min_confidence, sort=sort, limit=limit, offset=offset, cursor=cursor
+        )
 
     def get_audit_summary(self) -> Dict:
         """Get summary of audit queue status."""
-        total = len(self.audit_queue)
-        by_status = defaultdict(int)
-        by_confidence = {"high": 0, "medium": 0, "low": 0}
-
-        for p in self.audit_queue:
-            by_status[p.status.value] += 1
-            if p.confidence >= 0.8:
-                by_confidence["high"] += 1
-            elif p.confidence >= 0.6:
-                by_confidence["medium"] += 1
-            else:
-                by_confidence["low"] += 1
+        by_confidence = {name: 0 for name, _ in CONFIDENCE_BUCKETS}
+        by_confidence.update(self.audit_queue.counts("bucket"))
 
         return {
-            "total_pending": total,
-            "by_status": dict(by_status),
+            "total_pending": len(self.audit_queue),
+            "by_status": self.audit_queue.counts("status"),
             "by_confidence": by_confidence,
             "auto_approved": len([m for m in self.approved_mappings.values()
                                   if m.status == AuditStatus.AUTO_APPROVED]),
@@ -813,19 +1044,27 @@ class SchemaDiscovery:
         notes: Optional[str] = None
     ) -> Optional[MappingProposal]:
         """Approve a mapping proposal."""
-        for i, p in enumerate(self.audit_queue):
-            if p.id == proposal_id:
-                p.status = AuditStatus.APPROVED
-                p.reviewed_at = datetime.now().isoformat()
-                p.reviewed_by = reviewer
-                p.human_notes = notes
-
-                # Move to approved
-                self.approved_mappings[p.id] = p
-                self.audit_queue.pop(i)
-                self._save_state()
-                return p
-        return None
+        p = self.audit_queue.remove(proposal_id)
+        if p is None:
+            return None
+        self._journal(self._approve(p, reviewer, notes))
+        return p
+
+    def _approve(
+        self,
+        p: MappingProposal,
+        reviewer: Optional[str],
+        notes: Optional[str]
+    ) -> List[Tuple[str, str, Optional[Dict]]]:
+        """Mark a proposal taken off the queue as approved; returns its journal changes."""
+        p.status = AuditStatus.APPROVED
+        p.reviewed_at = datetime.now().isoformat()
+        p.reviewed_by = reviewer
+        p.human_notes = notes
+
+        # Move to approved
+        self.approved_mappings[p.id] = p
+        return [("audit_queue", p.id, None), ("approved_mappings", p.id, p.to_dict())]
 
     def reject_proposal(
         self,
@@ -834,17 +1073,17 @@ class SchemaDiscovery:
         notes: Optional[str] = None
     ) -> Optional[MappingProposal]:
         """Reject a mapping proposal."""
-        for i, p in enumerate(self.audit_queue):
-            if p.id == proposal_id:
-                p.status = AuditStatus.REJECTED
-                p.reviewed_at = datetime.now().isoformat()
-                p.reviewed_by = reviewer
-                p.human_notes = notes
-
-                self.audit_queue.pop(i)
-                self._save_state()
-                return p
-        return None
+        p = self.audit_queue.remove(proposal_id)
+        if p is None:
+            return None
+
+        p.status = AuditStatus.REJECTED
+        p.reviewed_at = datetime.now().isoformat()
+        p.reviewed_by = reviewer
+        p.human_notes = notes
+
+        self._journal([("audit_queue", p.id, None)])
+        return p
 
     def modify_proposal(
         self,
@@ -854,37 +1093,37 @@ class SchemaDiscovery:
         notes: Optional[str] = None
     ) -> Optional[MappingProposal]:
         """Modify and approve a mapping proposal with a different target field."""
-        for i, p in enumerate(self.audit_queue):
-            if p.id == proposal_id:
-                # Find the new target field metadata
-                target_fields = self.schemas.get(p.target_platform, {}).get(p.target_entity, [])
-                new_field = next((f for f in target_fields if f.name == new_target_field), None)
-
-                if not new_field:
-                    # Create minimal metadata for custom mapping
-                    new_field = FieldMetadata(
-                        name=new_target_field,
-                        label=new_target_field,
-                        field_type=p.source_field.field_type,
-                        platform=p.target_platform,
-                        entity=p.target_entity,
-                        api_name=new_target_field
-                    )
-
-                p.target_field = new_field
-                p.status = AuditStatus.MODIFIED
-                p.confidence = 1.0  # Human-verified
-                p.reviewed_at = datetime.now().isoformat()
-                p.reviewed_by = reviewer
-                p.human_notes = notes
-                p.reasoning.append(f"Human corrected: {p.source_field.name} -> {new_target_field}")
+        p = self.audit_queue.remove(proposal_id)
+        if p is None:
+            return None
 
-                # Move to approved
-                self.approved_mappings[p.id] = p
-                self.audit_queue.pop(i)
-                self._save_state()
-                return p
-        return None
+        # Find the new target field metadata
+        target_fields = self.schemas.get(p.target_platform, {}).get(p.target_entity, [])
+        new_field = next((f for f in target_fields if f.name == new_target_field), None)
+
+        if not new_field:
+            # Create minimal metadata for custom mapping
+            new_field = FieldMetadata(
+                name=new_target_field,
+                label=new_target_field,
+                field_type=p.source_field.field_type,
+                platform=p.target_platform,
+                entity=p.target_entity,
+                api_name=new_target_field
+            )
+
+        p.target_field = new_field
+        p.status = AuditStatus.MODIFIED
+        p.confidence = 1.0  # Human-verified
+        p.reviewed_at = datetime.now().isoformat()
+        p.reviewed_by = reviewer
+        p.human_notes = notes
+        p.reasoning.append(f"Human corrected: {p.source_field.name} -> {new_target_field}")
+
+        # Move to approved
+        self.approved_mappings[p.id] = p
+        self._journal([("audit_queue", p.id, None), ("approved_mappings", p.id, p.to_dict())])
+        return p
 
     def bulk_approve(
         self,
@@ -892,77 +1131,140 @@ class SchemaDiscovery:
         reviewer: Optional[str] = None
     ) -> int:
         """Bulk approve all proposals above a confidence threshold."""
-        approved_count = 0
-        to_approve = [p for p in self.audit_queue if p.confidence >= min_confidence]
+        to_approve = self.audit_queue.remove_many(
+            [p.id for p in self.audit_queue.above(min_confidence)]
+        )
 
+        # One journal append for the whole batch
+        changes = []
         for p in to_approve:
-            self.approve_proposal(p.id, reviewer, f"Bulk approved (confidence >= {min_confidence})")
-            approved_count += 1
+            changes.extend(self._approve(p, reviewer, f"Bulk approved (confidence >= {min_confidence})"))
+        self._journal(changes)
 
-        return approved_count
+        return len(to_approve)
 
     # =========================================================================
     # PERSISTENCE
     # =========================================================================
 
-    def _save_state(self):
-        """Save discovery state to disk."""
-        state_file = Path(self.storage_path) / "discovery_state.json"
+    def _lazy_schemas(
+        self,
+        platform: str,
+        loaded: Optional[Dict[str, List[FieldMetadata]]] = None
+    ) -> LazyShards:
+        """A platform's stored entity schemas, read from their shards on first access."""
+        return LazyShards(
+            self.store.entity_names(platform),
+            lambda entity: [FieldMetadata.from_dict(f) for f in self.store.read_entity(platform, entity)],
+            loaded
+        )
 
+    def _save_schemas(self, platform: str):
+        """Write the entity shards of a platform that were set since the last save."""
+        entities = self.schemas.get(platform, {})
+        if isinstance(entities, LazyShards):
+            if not entities.dirty:
+                return
+            loaded = entities.loaded
+            changed = {entity: loaded[entity] for entity in entities.dirty if entity in entities}
+        else:
+            loaded = changed = dict(entities)
+
+        self.store.write_platform(
+            platform,
+            list(entities),
+            {entity: [f.to_dict() for f in fields] for entity, fields in changed.items()}
+        )
+        self.schemas[platform] = self._lazy_schemas(platform, loaded)
+
+    def _journal(self, changes: List[Tuple[str, Optional[str], Any]]):
+        """
+        Append audit state changes, snapshotting once the journal is long.
+
+        Args:
+            changes: (section, key, value) tuples - section is "audit_queue"
+                or "approved_mappings" keyed by proposal ID (a None value
+                removes it), or "discovery_history" with a None key
+        """
+        self.store.audit.append(changes)
+        if self.store.audit.entries_since_snapshot >= self.SNAPSHOT_EVERY:
+            self._snapshot_audit()
+
+    def _snapshot_audit(self):
+        """Write the audit queue, approved mappings and history as a new snapshot."""
         data = {
-            "version": "1.0",
+            "version": "2.0",
             "saved_at": datetime.now().isoformat(),
-            "schemas": {
-                platform: {
-                    entity: [f.to_dict() for f in fields]
-                    for entity, fields in entities.items()
-                }
-                for platform, entities in self.schemas.items()
-            },
             "audit_queue": [p.to_dict() for p in self.audit_queue],
-            "approved_mappings": {k: v.to_dict() for k, v in self.approved_mappings.items()},
-            "discovery_history": [asdict(r) for r in self.discovery_history]
+            "approved_mappings": {k: v.to_dict() for k, v in self.approved_mappings.items()}
         }
+        self.store.audit.write_snapshot(data, [asdict(r) for r in self.discovery_history])
 
-        with open(state_file, 'w') as f:
-            json.dump(data, f, indent=2)
+    def _save_state(self):
+        """Save all discovery state to disk (only changed schema shards are rewritten)."""
+        for platform in list(self.schemas):
+            self._save_schemas(platform)
+        self._snapshot_audit()
 
     def _load_state(self):
-        """Load discovery state from disk."""
-        state_file = Path(self.storage_path) / "discovery_state.json"
-
-        if not state_file.exists():
+        """Load the audit snapshot and journal (schema shards load lazily)."""
+        audit = self.store.audit
+        if self.store.legacy_path.exists() and not audit.snapshot_path.exists() \
+                and not audit.journal_path.exists():
+            self._migrate_legacy_state()
             return
 
         try:
-            with open(state_file, 'r') as f:
+            snapshot, history, entries = audit.load()
+            snapshot = snapshot or {}
+            queue = {p["id"]: p for p in snapshot.get("audit_queue", [])}
+            approved = dict(snapshot.get("approved_mappings", {}))
+            sections = {"audit_queue": queue, "approved_mappings": approved}
+
+            for entry in entries:
+                if entry["section"] == "discovery_history":
+                    history.append(entry["value"])
+                elif entry["value"] is None:
+                    sections[entry["section"]].pop(entry["key"], None)
+                else:
+                    sections[entry["section"]][entry["key"]] = entry["value"]
+
+            self.audit_queue = AuditQueue(MappingProposal.from_dict(p) for p in queue.values())
+            self.approved_mappings = {k: MappingProposal.from_dict(v) for k, v in approved.items()}
+            self.discovery_history = [DiscoveryResult(**r) for r in history]
+
+        except Exception as e:
+            print(f"Warning: Could not load discovery state: {e}")
+
+    def _migrate_legacy_state(self):
+        """Load a single-file discovery_state.json and rewrite it as shards and a snapshot."""
+        legacy_path = self.store.legacy_path
+        try:
+            with open(legacy_path, 'r') as f:
                 data = json.load(f)
 
-            # Load schemas
             for platform, entities in data.get("schemas", {}).items():
                 self.schemas[platform] = {
                     entity: [FieldMetadata.from_dict(f) for f in fields]
                     for entity, fields in entities.items()
                 }
-
-            # Load audit queue
-            self.audit_queue = [
+            self.audit_queue = AuditQueue(
                 MappingProposal.from_dict(p) for p in data.get("audit_queue", [])
-            ]
-
-            # Load approved mappings
+            )
             self.approved_mappings = {
                 k: MappingProposal.from_dict(v)
                 for k, v in data.get("approved_mappings", {}).items()
             }
-
-            # Load history
             self.discovery_history = [
                 DiscoveryResult(**r) for r in data.get("discovery_history", [])
             ]
 
         except Exception as e:
             print(f"Warning: Could not load discovery state: {e}")
+            return
+
+        self._save_state()
+        os.replace(legacy_path, legacy_path.with_name(legacy_path.name + ".migrated"))
 
     def export_approved_mappings(self) -> Dict:
         """Export approved mappings in a format usable by the Schema Brain."""
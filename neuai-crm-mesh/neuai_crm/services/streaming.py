@@ -0,0 +1,338 @@
+"""
+Streaming readers and writers for large CRM exports.
+
+Parses NDJSON and large JSON documents incrementally so that memory used by
+the parser depends on the chunk/batch size rather than on the file size,
+and serializes exports a batch of records at a time for the same reason.
+"""
+
+import codecs
+import json
+import sys
+import zlib
+from collections.abc import Mapping
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+_WHITESPACE = " \t\n\r"
+
+
+def is_ndjson(filepath: str) -> bool:
+    """Check whether a file path looks like newline-delimited JSON."""
+    return filepath.lower().endswith(NDJSON_EXTENSIONS)
+
+
+def record_type(record: Dict) -> Optional[str]:
+    """
+    Get the platform entity name embedded in an exported record, if any.
+
+    Recognizes Salesforce REST exports (``attributes.type``), Dynamics 365
+    OData exports (``@odata.type``) and a plain ``_entity`` marker.
+    """
+    attributes = record.get("attributes")
+    if isinstance(attributes, dict) and attributes.get("type"):
+        return attributes["type"]
+
+    odata_type = record.get("@odata.type")
+    if odata_type:
+        return odata_type.rsplit(".", 1)[-1]
+
+    return record.get("_entity")
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize row views and other non-JSON values."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def dump_record(record: Dict) -> str:
+    """Serialize a record compactly."""
+    return json.dumps(record, separators=(",", ":"), default=_json_default)
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+class JsonStreamReader:
+    """
+    Incremental reader over a JSON document.
+
+    Keeps a small text buffer over the underlying binary file and decodes
+    one value at a time with ``json.JSONDecoder.raw_decode``.
+    """
+
+    def __init__(self, fp: BinaryIO, chunk_size: int = 1 << 16):
+        """
+        Initialize the reader.
+
+        Args:
+            fp: File opened in binary mode
+            chunk_size: Number of bytes read per refill
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk into the buffer, dropping consumed text."""
+        if self._eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            self._buf = self._buf[self._pos:] + self._text.decode(b"", final=True)
+        else:
+            self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the given structural character."""
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(
+                f"Expecting '{char}', found {found!r}", self._buf, self._pos
+            )
+        self._pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue past the end of the buffer
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array_items(self) -> Iterator:
+        """Yield the elements of the array at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def object_items(self) -> Iterator[Tuple[str, "JsonStreamReader"]]:
+        """
+        Yield (key, reader) for each member of the object at the current position.
+
+        The caller must consume the member's value from the reader (with
+        ``value()`` or ``array_items()``) before advancing the iterator.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key, self
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+def iter_export_records(
+    fp: BinaryIO,
+    entity: Optional[str] = None,
+    chunk_size: int = 1 << 16
+) -> Iterator[Tuple[Optional[str], Dict]]:
+    """
+    Yield (entity key, record) pairs from a JSON export without loading it whole.
+
+    Supports an object of entity arrays (``{"Account": [...], "Contact": [...]}``)
+    and a top-level array of records. Records in a top-level array are typed
+    with ``entity`` or, failing that, with ``record_type``.
+
+    Args:
+        fp: Export file opened in binary mode
+        entity: Entity key for records that do not carry their own type
+        chunk_size: Number of bytes read per refill
+    """
+    reader = JsonStreamReader(fp, chunk_size)
+    first = reader.peek()
+    if first == "[":
+        for record in reader.array_items():
+            yield entity or record_type(record), record
+    elif first == "{":
+        for key, member in reader.object_items():
+            if member.peek() == "[":
+                for record in member.array_items():
+                    yield key, record
+            else:
+                member.value()  # Metadata such as "@odata.context"
+    else:
+        raise json.JSONDecodeError("Expecting JSON object or array", first, 0)
+
+
+def iter_ndjson_records(
+    fp: BinaryIO,
+    entity: Optional[str] = None
+) -> Iterator[Tuple[Optional[str], Dict]]:
+    """
+    Yield (entity key, record) pairs from newline-delimited JSON.
+
+    Each line holds one record, typed with ``entity`` or with ``record_type``.
+    A plain ``_entity`` marker is a typing hint only and is removed.
+
+    Args:
+        fp: NDJSON file opened in binary mode
+        entity: Entity key for records that do not carry their own type
+    """
+    for line_number, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(
+                f"Line {line_number}: {e.msg}", e.doc, e.pos
+            ) from None
+        key = entity or record_type(record)
+        record.pop("_entity", None)
+        yield key, record
+
+
+# =============================================================================
+# Writers
+# =============================================================================
+
+def iter_json_export(
+    entities: Iterable[Tuple[str, Iterable[Dict]]],
+    batch_size: int = 1000,
+    pretty: bool = False,
+    on_records: Optional[Callable[[int], None]] = None
+) -> Iterator[bytes]:
+    """
+    Serialize an export object (``{"Account": [...], ...}``) in chunks.
+
+    Args:
+        entities: (export key, records) pairs
+        batch_size: Records serialized per yielded chunk
+        pretty: Put each record on its own indented line (for files)
+        on_records: Called with the number of records in each chunk as
+            it is yielded
+    """
+    if pretty:
+        newline, indent = "\n", "  "
+        item_separator = ",\n" + indent * 2
+
+        def encode(batch: List) -> str:
+            return indent * 2 + item_separator.join(
+                json.dumps(record, default=_json_default) for record in batch
+            )
+    else:
+        newline = indent = ""
+
+        def encode(batch: List) -> str:
+            return dump_record(batch)[1:-1]  # One dumps call per batch
+
+    yield b"{"
+    for i, (key, records) in enumerate(entities):
+        head = ("," if i else "") + newline + indent + json.dumps(key) + (": [" if pretty else ":[")
+        batch: List = []
+        written = False
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                if on_records:
+                    on_records(len(batch))
+                yield ((head if not written else ",") + newline + encode(batch)).encode()
+                written, batch = True, []
+        if batch:
+            if on_records:
+                on_records(len(batch))
+            yield ((head if not written else ",") + newline + encode(batch)).encode()
+            written = True
+        yield (newline + indent + "]" if written else head + "]").encode()
+    yield (newline + "}" + newline).encode()
+
+
+def iter_ndjson_export(
+    entities: Iterable[Tuple[str, Iterable[Dict]]],
+    batch_size: int = 1000,
+    on_records: Optional[Callable[[int], None]] = None
+) -> Iterator[bytes]:
+    """
+    Serialize an export as NDJSON, one record per line, in chunks.
+
+    Records whose ``record_type`` is not their export key get an ``_entity``
+    marker so that ``iter_ndjson_records`` can type them on re-import.
+
+    Args:
+        entities: (export key, records) pairs
+        batch_size: Records serialized per yielded chunk
+        on_records: Called with the number of records in each chunk as
+            it is yielded
+    """
+    for key, records in entities:
+        batch = []
+        for record in records:
+            if record_type(record) != key:
+                record = {**record, "_entity": key}
+            batch.append(dump_record(record))
+            if len(batch) >= batch_size:
+                if on_records:
+                    on_records(len(batch))
+                yield ("\n".join(batch) + "\n").encode()
+                batch = []
+        if batch:
+            if on_records:
+                on_records(len(batch))
+            yield ("\n".join(batch) + "\n").encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a stream of chunks into one gzip stream."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -2,7 +2,7 @@
 Schema translation service for converting records between CRM platforms.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Callable, Optional, Tuple
 from neuai_crm.models.schemas import (
     Platform,
     SCHEMA_MAPPINGS,
@@ -10,16 +10,59 @@ from neuai_crm.models.schemas import (
     translate_stage,
     get_local_entity_name,
 )
-from neuai_crm.models.entities import Contact, Company, Deal, Activity
+
+TranslationPlan = Callable[[Dict], Dict]
+
+
+def _lookup(table: Dict, value: Any) -> Any:
+    """Translate a value through a table, leaving unknown values unchanged."""
+    try:
+        return table.get(value, value)
+    except TypeError:  # Unhashable value
+        return value
+
+
+def _statecode_to_status(statecode: Any) -> str:
+    """Translate a Dynamics 365 activity statecode to a local status."""
+    return "pending" if statecode == 0 else "completed" if statecode == 2 else "in_progress"
 
 
 class SchemaTranslator:
     """
     Translates CRM records between Salesforce, Dynamics 365, and Local CRM formats.
+
+    Entity translations run through plans compiled once per
+    (entity, from, to) triple: a specialized function that reads the source
+    fields and builds the target dict directly, with the same defaults,
+    coercions and stage/status tables as the entity classes in
+    ``neuai_crm.models.entities``.
     """
 
+    # Entities with typed translation semantics (see neuai_crm.models.entities)
+    ENTITY_TYPES = ("contacts", "companies", "deals", "activities")
+
+    # Defaults for missing source fields, by source field name (others default to "")
+    FIELD_DEFAULTS: Dict[str, Dict[str, Dict[str, Any]]] = {
+        "deals": {
+            "local": {"value": 0, "stage": "lead", "probability": 0},
+            "salesforce": {"Amount": 0, "StageName": "Prospecting", "Probability": 0},
+            "dynamics365": {"estimatedvalue": 0, "stepname": "1 - Qualify", "closeprobability": 0}
+        },
+        "activities": {
+            "local": {"type": "task", "status": "pending"},
+            "salesforce": {"TaskSubtype": "Task", "Status": "Not Started"},
+            "dynamics365": {"activitytypecode": "task", "statecode": 0}
+        }
+    }
+
+    # Type coercions, by local field name
+    FIELD_COERCIONS: Dict[str, Dict[str, type]] = {
+        "deals": {"value": float, "probability": int}
+    }
+
     def __init__(self):
         self.schema = SCHEMA_MAPPINGS
+        self._plans: Dict[Tuple[str, Platform, Platform], TranslationPlan] = {}
 
     def translate_record(
         self,
@@ -72,7 +115,7 @@ class SchemaTranslator:
         entity_type: str
     ) -> Any:
         """
-        Translate a record using strongly-typed entity classes.
+        Translate a record with entity-class semantics.
 
         Args:
             record: The record to translate
@@ -83,21 +126,7 @@ class SchemaTranslator:
         Returns:
             Translated record as platform-specific dict
         """
-        local_entity = get_local_entity_name(entity_type, from_platform)
-
-        entity_class = {
-            "contacts": Contact,
-            "companies": Company,
-            "deals": Deal,
-            "activities": Activity
-        }.get(local_entity)
-
-        if entity_class:
-            entity = entity_class.from_platform(record, from_platform)
-            return entity.to_platform(to_platform)
-
-        # Fallback to generic translation
-        return self.translate_record(record, from_platform, to_platform, entity_type)
+        return self.get_plan(entity_type, from_platform, to_platform)(record)
 
     def translate_batch(
         self,
@@ -118,10 +147,99 @@ class SchemaTranslator:
         Returns:
             List of translated records
         """
-        return [
-            self.translate_entity(record, from_platform, to_platform, entity_type)
-            for record in records
-        ]
+        plan = self.get_plan(entity_type, from_platform, to_platform)
+        return [plan(record) for record in records]
+
+    def get_plan(
+        self,
+        entity_type: str,
+        from_platform: Platform,
+        to_platform: Platform
+    ) -> TranslationPlan:
+        """
+        Get the compiled translation plan for an entity type, compiling it on first use.
+
+        Args:
+            entity_type: Type of entity (local, platform or mesh name)
+            from_platform: Source platform
+            to_platform: Target platform
+
+        Returns:
+            Function translating one source record to a target-platform dict
+        """
+        key = (entity_type, from_platform, to_platform)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._compile_plan(entity_type, from_platform, to_platform)
+        return plan
+
+    def _compile_plan(
+        self,
+        entity_type: str,
+        from_platform: Platform,
+        to_platform: Platform
+    ) -> TranslationPlan:
+        """Build the specialized translation function for an entity type."""
+        local_entity = get_local_entity_name(entity_type, from_platform)
+        if local_entity not in self.ENTITY_TYPES:
+            # Fallback to generic translation
+            return lambda record: self.translate_record(
+                record, from_platform, to_platform, entity_type
+            )
+
+        fields = self.schema["fields"][local_entity]
+        local_fields = fields[Platform.LOCAL.value]
+        defaults = self.FIELD_DEFAULTS.get(local_entity, {}).get(from_platform.value, {})
+        coercions = self.FIELD_COERCIONS.get(local_entity, {})
+        namespace: Dict[str, Any] = {"_lookup": _lookup, "_statecode_to_status": _statecode_to_status}
+
+        # Expression reading each local field from the source record
+        values = {}
+        for local_field, source in zip(local_fields, fields[from_platform.value]):
+            expr = f"get({source!r}, {defaults.get(source, '')!r})"
+            coerce = coercions.get(local_field)
+            values[local_field] = f"{coerce.__name__}({expr})" if coerce else expr
+
+        if local_entity == "deals":
+            namespace["_stages"] = self._stage_table(to_platform)
+            values["stage"] = f"_lookup(_stages, {values['stage']})"
+
+        elif local_entity == "activities":
+            if from_platform == Platform.DYNAMICS365:
+                values["status"] = f"_statecode_to_status({values['status']})"
+                values["dealId"] = "''"
+
+            local_statuses = self.schema["status"][Platform.LOCAL.value]
+            target_statuses = dict(zip(local_statuses, self.schema["status"][to_platform.value]))
+            if to_platform == Platform.SALESFORCE:
+                namespace["_statuses"] = target_statuses
+                values["status"] = f"_lookup(_statuses, {values['status']})"
+            elif to_platform == Platform.DYNAMICS365:
+                namespace["_statuses"] = target_statuses
+                values["status"] = f"_statuses.get({values['status']}, 0)"
+                # Dynamics 365 has a single regarding lookup for contact or deal
+                values["contactId"] = f"({values['contactId']} or {values['dealId']})"
+                del values["dealId"]
+
+        lines = ["def plan(record):", "    get = record.get", "    return {"]
+        for local_field, target in zip(local_fields, fields[to_platform.value]):
+            if local_field in values:
+                lines.append(f"        {target!r}: {values[local_field]},")
+        lines.append("    }")
+
+        source = "\n".join(lines)
+        label = f"<translation plan {local_entity} {from_platform.value}->{to_platform.value}>"
+        exec(compile(source, label, "exec"), namespace)
+        return namespace["plan"]
+
+    def _stage_table(self, to_platform: Platform) -> Dict[str, str]:
+        """Map every known stage name, on any platform, to the target platform's stage."""
+        target_stages = self.schema["stages"][to_platform.value]
+        table: Dict[str, str] = {}
+        for stages in self.schema["stages"].values():
+            for idx, stage in enumerate(stages):
+                table.setdefault(stage, target_stages[idx] if idx < len(target_stages) else stage)
+        return table
 
     def get_field_mapping(
         self,
@@ -1,9 +1,16 @@
 """Tests for the API endpoints."""
 
+import json
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
 
-from neuai_crm.api.server import app
+from neuai_crm.api.server import _export_envelope, app, data_mesh
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.audit_queue import AuditQueue
+from neuai_crm.services.schema_brain import schema_brain
+from neuai_crm.services.schema_discovery import FieldMetadata, FieldType, MappingProposal, schema_discovery
 
 
 @pytest.fixture
@@ -99,6 +106,95 @@ class TestDataEndpoints:
         data = response.json()
         assert "data" in data
         assert "companies" in data["data"]
+        assert data["record_count"] == sum(len(records) for records in data["data"].values()) == 1
+
+    def test_export_counts_the_records_sent(self, client):
+        """Test that record_count counts what was streamed, not what the platform held before."""
+        client.post("/load", json={"platform": "local", "data": {"companies": [{"id": "001", "name": "A"}]}})
+        companies = data_mesh.data[Platform.LOCAL]["companies"]
+        record_count = [0]
+
+        def count(records):
+            record_count[0] += records
+
+        chunks = _export_envelope("local", data_mesh.iter_export(Platform.LOCAL, batch_size=1, on_records=count),
+                                  record_count)
+        body = next(chunks) + next(chunks)
+        with data_mesh.lock.write():
+            companies.append({"id": "002", "name": "B"})  # As a delta sync upserts in place
+        body += b"".join(chunks)
+
+        data = json.loads(body)
+        assert data["record_count"] == sum(len(records) for records in data["data"].values()) == 2
+
+    def test_export_ndjson_gzip(self, client):
+        """Test streaming an NDJSON export with gzip compression."""
+        client.post("/load", json={
+            "platform": "local",
+            "data": {"companies": [{"id": "001", "name": "Test Corp"}, {"id": "002", "name": "Beta"}]}
+        })
+
+        response = client.get("/export/local", params={"format": "ndjson", "gzip": True})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [
+            {"id": "001", "name": "Test Corp", "_entity": "companies"},
+            {"id": "002", "name": "Beta", "_entity": "companies"}
+        ]
+
+    def test_export_invalid_format(self, client):
+        """Test that unknown export formats are rejected."""
+        response = client.get("/export/local", params={"format": "xml"})
+
+        assert response.status_code == 400
+
+    def test_query_records(self, client):
+        """Test querying records with predicates, sorting and pagination."""
+        client.post("/load", json={
+            "platform": "local",
+            "data": {
+                "deals": [
+                    {"id": "d1", "title": "A", "stage": "lead", "value": 500},
+                    {"id": "d2", "title": "B", "stage": "won", "value": 9000},
+                    {"id": "d3", "title": "C", "stage": "lead", "value": 7000}
+                ]
+            }
+        })
+
+        query = {"where": {"value": {"gte": 1000}}, "fields": ["id"], "sort": "-value", "limit": 1}
+        first = client.post("/records/local/deals/query", json=query).json()
+        second = client.post("/records/local/deals/query",
+                             json={**query, "cursor": first["next_cursor"]}).json()
+
+        assert first["records"] == [{"id": "d2"}]
+        assert second["records"] == [{"id": "d3"}]
+        assert second["next_cursor"] is None
+
+    def test_query_records_invalid(self, client):
+        """Test that malformed record queries are rejected."""
+        response = client.post("/records/local/deals/query",
+                               json={"where": {"value": {"near": 1}}})
+
+        assert response.status_code == 400
+
+
+class TestCacheEndpoints:
+    """Test query result cache endpoints."""
+
+    def test_polling_hits_cache(self, client):
+        """Test that repeated stats reads hit the cache until data is loaded."""
+        client.get("/stats")
+        before = client.get("/cache").json()
+        client.get("/stats")
+        after = client.get("/cache").json()
+
+        assert after["hits"] == before["hits"] + 1
+        assert after["data_version"] == before["data_version"]
+
+        client.post("/load", json={"platform": "local", "data": {"companies": [{"id": "c1"}]}})
+        assert client.get("/cache").json()["data_version"] > after["data_version"]
 
 
 class TestSchemaEndpoints:
@@ -168,6 +264,48 @@ class TestTranslationEndpoints:
 
         assert response.status_code == 400
 
+    def test_brain_translate_batch(self, client):
+        """Test translating a batch of records with the Schema Brain."""
+        payload = {
+            "records": [
+                {"FirstName": "John", "Email": "john@example.com"},
+                {"FirstName": "Jane", "Email": "jane@example.com"},
+                {"FirstName": "Ann"}
+            ],
+            "from_platform": "salesforce",
+            "to_platform": "dynamics365",
+            "entity_type": "contacts"
+        }
+
+        response = client.post("/brain/translate/batch", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 3
+        assert data["shapes"] == 2
+        assert data["translated"][1] == {"firstname": "Jane", "emailaddress1": "jane@example.com"}
+        assert data["field_mappings"]["FirstName"]["records"] == 3
+        assert data["field_mappings"]["Email"]["records"] == 2
+
+    def test_brain_batch_runs_off_the_event_loop(self, client):
+        """Test that a batch waiting on the brain doesn't hold up other requests."""
+        done = []
+        batch = threading.Thread(target=lambda: done.append(client.post("/brain/translate/batch", json={
+            "records": [{"FirstName": "John"}],
+            "from_platform": "salesforce",
+            "to_platform": "dynamics365",
+            "entity_type": "contacts"
+        }).status_code))
+
+        with schema_brain.lock:
+            batch.start()
+            batch.join(0.2)
+            assert client.get("/health").status_code == 200
+            assert done == []
+        batch.join(5)
+
+        assert done == [200]
+
 
 class TestQueryEndpoints:
     """Test natural language query endpoints."""
@@ -225,6 +363,41 @@ class TestSyncEndpoints:
         data = response.json()
         assert data["status"] == "success"
 
+    def test_sync_platforms_parallel(self, client):
+        """Test syncing with a thread pool."""
+        response = client.post("/sync", json={
+            "source": "salesforce",
+            "target": "local",
+            "workers": 2,
+            "chunk_size": 1,
+            "executor": "thread"
+        })
+
+        assert response.status_code == 200
+
+    def test_sync_delta(self, client):
+        """Test that delta sync reports change counts."""
+        response = client.post("/sync", json={
+            "source": "salesforce",
+            "target": "local",
+            "delta": True
+        })
+
+        assert response.status_code == 200
+        result = response.json()["result"]
+        assert {"inserted", "updated", "skipped"} <= set(result)
+
+    def test_sync_invalid_executor(self, client):
+        """Test syncing with an unknown pool type."""
+        response = client.post("/sync", json={
+            "source": "salesforce",
+            "target": "local",
+            "workers": 2,
+            "executor": "gpu"
+        })
+
+        assert response.status_code == 400
+
     def test_get_sync_log(self, client):
         """Test getting the sync log."""
         response = client.get("/sync-log")
@@ -274,3 +447,140 @@ class TestConflictEndpoints:
         response = client.get("/conflicts/invalid/dynamics365")
 
         assert response.status_code == 400
+
+
+class TestJobEndpoints:
+    """Test background job endpoints."""
+
+    def test_sync_job_streams_progress(self, client):
+        """Test that a sync job streams progress events and ends with the sync result."""
+        response = client.post("/jobs/sync", json={
+            "source": "salesforce",
+            "target": "local",
+            "chunk_size": 1
+        })
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+            body = "".join(stream.iter_text())
+        events = [block.split("\n") for block in body.strip().split("\n\n")]
+        final = json.loads(events[-1][1][len("data: "):])
+
+        assert events[-1][0] == "event: succeeded"
+        assert final["progress"]["percent"] == 100.0
+        assert final["result"]["status"] == "success"
+        assert client.get(f"/jobs/{job_id}").json()["result"] == final["result"]
+        assert job_id in [job["id"] for job in client.get("/jobs?status=succeeded").json()["jobs"]]
+
+    def test_inline_and_job_results_match(self, client):
+        """Test that a duplicate scan job returns what the inline endpoint does."""
+        inline = client.get("/duplicates?threshold=0.5").json()
+        job_id = client.post("/jobs/duplicates?threshold=0.5").json()["id"]
+
+        with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+            "".join(stream.iter_text())
+
+        assert client.get(f"/jobs/{job_id}").json()["result"] == inline
+
+    def test_handlers_wait_for_the_mesh_write_lock(self, client):
+        """Test that loads and inline scans don't run while the mesh is being written."""
+        done = []
+        requests = [
+            threading.Thread(target=lambda: done.append(client.post("/load", json={
+                "platform": "local", "data": {"companies": [{"id": "c1", "name": "Acme"}]}
+            }).status_code)),
+            threading.Thread(target=lambda: done.append(client.get("/duplicates").status_code))
+        ]
+
+        with data_mesh.lock.write():
+            for request in requests:
+                request.start()
+            for request in requests:
+                request.join(0.3)
+            assert done == []
+        for request in requests:
+            request.join(5)
+
+        assert done == [200, 200]
+
+    def test_reads_run_alongside_a_reader(self, client):
+        """Test that reads answer while the mesh is read, and only writes wait."""
+        done = []
+        load = threading.Thread(target=lambda: done.append(client.post("/load", json={
+            "platform": "local", "data": {"companies": [{"id": "c1", "name": "Acme"}]}
+        }).status_code))
+
+        with data_mesh.lock.read():
+            assert client.get("/stats").status_code == 200
+            assert client.get("/duplicates").status_code == 200
+            assert client.get("/export/local").status_code == 200
+            load.start()
+            load.join(0.3)
+            assert done == []
+        load.join(5)
+
+        assert done == [200]
+
+    def test_job_errors(self, client):
+        """Test validation, unknown jobs and cancelling finished jobs."""
+        assert client.post("/jobs/sync", json={"source": "bogus", "target": "local"}).status_code == 400
+        assert client.post("/jobs/conflicts/invalid/local").status_code == 400
+        assert client.get("/jobs?status=done").status_code == 400
+        assert client.get("/jobs/missing").status_code == 404
+        assert client.get("/jobs/missing/events").status_code == 404
+        assert client.delete("/jobs/missing").status_code == 404
+
+
+class TestDiscoveryEndpoints:
+    """Test schema discovery audit endpoints."""
+
+    def test_audit_queue_pages(self, client, monkeypatch):
+        """Test filtering and cursor pagination of the audit queue."""
+        queue = AuditQueue(
+            MappingProposal(
+                id=f"p{i}", source_platform="salesforce", source_entity=entity,
+                source_field=FieldMetadata(name=f"F{i}", label=f"F{i}", field_type=FieldType.STRING,
+                                           platform="salesforce", entity=entity),
+                target_platform="dynamics365", target_entity=entity, target_field=None,
+                confidence=(i % 7) / 10
+            )
+            for i, entity in enumerate(["contact", "account", "contact"] * 10)
+        )
+        monkeypatch.setattr(schema_discovery, "audit_queue", queue)
+        expected = [p.id for p in queue.query(entity="contact", limit=30)["proposals"]]
+
+        ids, cursor = [], None
+        while True:
+            params = {"entity": "contact", "limit": 4, **({"cursor": cursor} if cursor else {})}
+            data = client.get("/discovery/audit-queue", params=params).json()
+            ids.extend(p["id"] for p in data["proposals"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert ids == expected
+        assert data["total"] == len(expected)
+        assert client.get(f"/discovery/audit-queue/{ids[0]}").json()["proposal"]["id"] == ids[0]
+
+    def test_audit_queue_invalid(self, client):
+        """Test that unknown buckets, sorts and cursors are rejected."""
+        for params in ({"bucket": "urgent"}, {"sort": "name"}, {"cursor": "bogus"}, {"status": "done"}):
+            assert client.get("/discovery/audit-queue", params=params).status_code == 400
+
+
+    def test_propose_without_schemas(self, client, monkeypatch):
+        """Test that proposals need discovered schemas, inline and as a job."""
+        monkeypatch.setattr(schema_discovery, "schemas", {"salesforce": {}, "dynamics365": {}})
+        request = {"source_platform": "salesforce", "target_platform": "dynamics365"}
+
+        response = client.post("/discovery/propose", json=request)
+        assert response.status_code == 400
+        assert "No schema discovered for salesforce" in response.json()["detail"]
+
+        job_id = client.post("/jobs/discovery/propose", json=request).json()["id"]
+        with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+            "".join(stream.iter_text())
+        job = client.get(f"/jobs/{job_id}").json()
+        assert job["status"] == "failed"
+        assert "No schema discovered for salesforce" in job["error"]
@@ -0,0 +1,152 @@
+"""Tests for the indexed audit queue."""
+
+import random
+
+import pytest
+from neuai_crm.services.audit_queue import AuditQueue, confidence_bucket
+from neuai_crm.services.schema_discovery import (
+    AuditStatus, FieldMetadata, FieldType, MappingProposal, SchemaDiscovery
+)
+
+
+ENTITIES = ["account", "contact", "opportunity"]
+
+
+def proposals(n: int, seed: int = 3) -> list:
+    """n proposals with repeated confidences across entities and platforms."""
+    rng = random.Random(seed)
+    result = []
+    for i in range(n):
+        entity = rng.choice(ENTITIES)
+        source = FieldMetadata(name=f"Field{i}", label=f"Field {i}", field_type=FieldType.STRING,
+                               platform="salesforce", entity=entity)
+        result.append(MappingProposal(
+            id=f"p{i:04d}", source_platform="salesforce", source_entity=entity, source_field=source,
+            target_platform=rng.choice(["dynamics365", "local"]), target_entity=entity, target_field=None,
+            confidence=rng.choice([0.3, 0.55, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95])
+        ))
+    return result
+
+
+def brute_force(queue, sort="-confidence", entity=None, platform=None, bucket=None, min_confidence=None):
+    """Expected query results without indexes."""
+    rows = [
+        (i, p) for i, p in enumerate(queue)
+        if (entity is None or entity in (p.source_entity, p.target_entity))
+        and (platform is None or platform in (p.source_platform, p.target_platform))
+        and (bucket is None or confidence_bucket(p.confidence) == bucket)
+        and (min_confidence is None or p.confidence >= min_confidence)
+    ]
+    rows.sort(key=lambda row: (-row[1].confidence, row[0]), reverse=sort == "confidence")
+    return [p.id for _, p in rows]
+
+
+def all_pages(queue, limit, cursor=None, **kwargs):
+    """Follow next_cursor through every page of a query."""
+    ids = []
+    while True:
+        page = queue.query(limit=limit, cursor=cursor, **kwargs)
+        assert len(page["proposals"]) <= limit
+        ids.extend(p.id for p in page["proposals"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, page["total"]
+
+
+@pytest.fixture
+def queue():
+    """A queue of 400 proposals, with every fifth removed again."""
+    audit_queue = AuditQueue(proposals(400))
+    for i in range(0, 400, 5):
+        audit_queue.remove(f"p{i:04d}")
+    return audit_queue
+
+
+class TestAuditQueue:
+    """Test cases for AuditQueue."""
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"entity": "contact"},
+        {"platform": "local", "bucket": "high"},
+        {"bucket": "medium", "min_confidence": 0.7},
+        {"entity": "account", "platform": "dynamics365", "min_confidence": 0.85},
+        {"entity": "lead"},
+    ])
+    @pytest.mark.parametrize("sort", ["-confidence", "confidence"])
+    def test_pages_match_brute_force(self, queue, filters, sort):
+        """Test that paging through filtered, sorted results matches a full scan."""
+        expected = brute_force(list(queue), sort, **filters)
+
+        ids, total = all_pages(queue, 7, sort=sort, **filters)
+
+        assert ids == expected
+        assert total == len(expected)
+
+    def test_cursor_survives_removals(self, queue):
+        """Test that removing proposals between pages neither repeats nor skips others."""
+        first = queue.query(limit=10)
+        for p in first["proposals"][:5]:
+            queue.remove(p.id)
+        removed_later = queue.query(limit=3, cursor=first["next_cursor"])["proposals"][0]
+        queue.remove(removed_later.id)
+
+        ids, _ = all_pages(queue, 10, cursor=first["next_cursor"])
+
+        assert ids == brute_force(list(queue))[5:]
+
+    def test_lookup_and_counts(self, queue):
+        """Test ID lookups, index counts and bulk removal."""
+        assert queue.get("p0001").id == "p0001"
+        assert queue.get("p0000") is None
+        assert queue.counts("status") == {"pending": 320}
+        assert sum(queue.counts("bucket").values()) == 320
+
+        high = queue.above(0.8)
+        assert [p.id for p in high] == brute_force(list(queue), min_confidence=0.8)
+        removed = queue.remove_many([p.id for p in high])
+
+        assert removed == high
+        assert queue.above(0.8) == []
+        assert "high" not in queue.counts("bucket")
+        assert brute_force(list(queue)) == [p.id for p in queue.query(limit=1000)["proposals"]]
+
+    def test_re_adding_replaces(self, queue):
+        """Test that queuing a proposal ID again replaces the queued one."""
+        p = queue.get("p0001")
+        p.confidence = 0.99
+        queue.add(p)
+
+        assert len(queue) == 320
+        assert queue.query(limit=1)["proposals"] == [p]
+
+    def test_invalid_query(self, queue):
+        """Test that unknown sorts and foreign cursors are rejected."""
+        cursor = queue.query(limit=1)["next_cursor"]
+        with pytest.raises(ValueError):
+            queue.query(sort="name")
+        with pytest.raises(ValueError):
+            queue.query(sort="confidence", cursor=cursor)
+        with pytest.raises(ValueError):
+            queue.query(cursor="not-a-cursor")
+
+
+class TestSchemaDiscoveryAudit:
+    """Test cases for the audit workflow on the indexed queue."""
+
+    def test_decisions_and_summary(self, tmp_path):
+        """Test approve/reject lookups by ID and the index-backed summary."""
+        discovery = SchemaDiscovery(storage_path=str(tmp_path))
+        discovery.audit_queue.extend(proposals(50))
+
+        assert discovery.approve_proposal("p0001").status == AuditStatus.APPROVED
+        assert discovery.reject_proposal("p0002").status == AuditStatus.REJECTED
+        assert discovery.approve_proposal("p0001") is None
+        approved = discovery.bulk_approve(0.9)
+        summary = discovery.get_audit_summary()
+
+        assert summary["total_pending"] == 48 - approved
+        assert summary["by_confidence"]["high"] + summary["by_confidence"]["medium"] \
+            + summary["by_confidence"]["low"] == summary["total_pending"]
+        assert all(p.confidence < 0.9 for p in discovery.get_audit_queue(AuditStatus.PENDING))
+        assert len(discovery.approved_mappings) == approved + 1
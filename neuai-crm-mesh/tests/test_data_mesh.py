@@ -0,0 +1,251 @@
+"""Tests for the data mesh service."""
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh, _content_hash
+
+
+def salesforce_data(n=25):
+    """Salesforce export with one untranslatable opportunity."""
+    return {
+        "Account": [{"Id": f"001{i:03d}", "Name": f"Company {i}"} for i in range(n)],
+        "Contact": [
+            {"Id": f"003{i:03d}", "FirstName": "Jane", "LastName": f"Doe{i}",
+             "Email": f"jane{i}@example.com"}
+            for i in range(n)
+        ],
+        "Opportunity": [
+            {"Id": f"006{i:03d}", "Name": f"Deal {i}", "Amount": "n/a" if i == 7 else i * 100,
+             "StageName": "Qualification"}
+            for i in range(n)
+        ],
+        "Task": [{"Id": f"00T{i:03d}", "Subject": f"Call {i}", "Status": "Completed"}
+                 for i in range(n)]
+    }
+
+
+@pytest.fixture(params=DataMesh.STORAGE_BACKENDS)
+def mesh(request):
+    """Create a data mesh with Salesforce data on each storage backend."""
+    mesh = DataMesh(storage=request.param)
+    mesh.load_data(Platform.SALESFORCE, salesforce_data())
+    return mesh
+
+
+class TestParallelSync:
+    """Test cases for chunked, pooled sync_platforms."""
+
+    @pytest.mark.parametrize("executor", DataMesh.SYNC_EXECUTORS)
+    def test_matches_serial_sync(self, mesh, executor):
+        """Test that parallel sync keeps order, counts and errors."""
+        reference = DataMesh()
+        reference.load_data(Platform.SALESFORCE, salesforce_data())
+        expected = reference.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+
+        result = mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365,
+                                     workers=2, chunk_size=4, executor=executor)
+
+        assert result == expected
+        assert result["synced"] == 99
+        assert [e["record"]["Id"] for e in result["errors"]] == ["006007"]
+        assert mesh.get_stats() == reference.get_stats()
+        for entity, records in reference.data[Platform.DYNAMICS365].items():
+            assert list(mesh.data[Platform.DYNAMICS365][entity]) == records
+
+    def test_invalid_options(self, mesh):
+        """Test that unknown executors and empty chunks are rejected."""
+        with pytest.raises(ValueError):
+            mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, workers=2, executor="gpu")
+        with pytest.raises(ValueError):
+            mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, workers=2, chunk_size=0)
+
+
+class TestSyncProgress:
+    """Test cases for sync_platforms progress reporting."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_reports_each_chunk(self, mesh, workers):
+        """Test that progress is reported per chunk with running totals."""
+        reports = []
+
+        result = mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, workers=workers,
+                                     chunk_size=10, executor="thread", progress=reports.append)
+
+        assert len(reports) == 12
+        assert [r["records_processed"] for r in reports[:3]] == [10, 20, 25]
+        assert reports[-1] == {"entity": "tasks", "records_processed": 100,
+                               "total_records": 100, "percent": 100.0}
+        assert result["synced"] == 99
+
+    def test_delta_reports_each_entity(self, mesh):
+        """Test that delta sync reports once per entity list."""
+        reports = []
+
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, delta=True, progress=reports.append)
+
+        assert [r["entity"] for r in reports] == ["accounts", "contacts", "opportunities", "tasks"]
+
+    def test_raising_callback_leaves_target_unchanged(self, mesh):
+        """Test that a progress callback can abort a full sync before it writes."""
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+        before = mesh.get_stats()["dynamics365"]
+        mesh.load_data(Platform.SALESFORCE, salesforce_data(40))
+
+        def cancel(progress):
+            if progress["entity"] == "opportunities":
+                raise RuntimeError("cancelled")
+
+        with pytest.raises(RuntimeError):
+            mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, chunk_size=10, progress=cancel)
+
+        assert mesh.get_stats()["dynamics365"] == before
+        assert [entry["action"] for entry in mesh.sync_log].count("sync") == 1
+
+    @pytest.mark.parametrize("delta", [False, True])
+    def test_other_threads_read_during_sync(self, mesh, delta):
+        """Test that a sync only locks readers out while it writes."""
+        answered = []
+
+        def read(progress):
+            reader = threading.Thread(target=lambda: answered.append(mesh.get_stats()))
+            reader.start()
+            reader.join(2)
+
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, chunk_size=10,
+                            delta=delta, progress=read)
+
+        assert len(answered) == (4 if delta else 12)
+
+
+class TestResultCaching:
+    """Test cases for data-version keyed query caching."""
+
+    def test_repeated_reads_hit_until_data_changes(self, mesh):
+        """Test that reads are served from cache until a load, sync or clear."""
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+        version = mesh.data_version
+        conflicts = mesh.get_conflicts(Platform.SALESFORCE, Platform.DYNAMICS365)
+        stats = mesh.get_stats()
+
+        assert mesh.get_conflicts(Platform.SALESFORCE, Platform.DYNAMICS365) is conflicts
+        assert mesh.get_stats() is stats
+        assert mesh.detect_duplicates(0.8) is mesh.detect_duplicates(0.8)
+        assert mesh.detect_duplicates(0.8) is not mesh.detect_duplicates(0.9)
+        assert mesh.result_cache.stats()["hits"] == 4
+
+        mesh.clear_platform(Platform.DYNAMICS365)
+
+        assert mesh.data_version > version
+        assert mesh.get_conflicts(Platform.SALESFORCE, Platform.DYNAMICS365) == []
+        assert mesh.get_stats()["dynamics365"]["accounts"] == 0
+
+    def test_delta_sync_invalidates(self, mesh):
+        """Test that in-place delta upserts change the data version."""
+        before = mesh.get_stats()["local"]["companies"]
+        version = mesh.data_version
+
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, delta=True)
+
+        assert mesh.data_version > version
+        assert mesh.get_stats()["local"]["companies"] == before + 25
+
+
+class TestDeltaSync:
+    """Test cases for delta sync with change tracking."""
+
+    def _sync(self, mesh):
+        return mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, delta=True)
+
+    def test_content_hash_is_stable_across_processes(self):
+        """Test that record fingerprints don't depend on the process's hash seed."""
+        record = {"Id": "003", "Email": "a@example.com", "attributes": {"type": "Contact"}}
+        script = ("from neuai_crm.services.data_mesh import _content_hash; "
+                  f"print(_content_hash({record!r}))")
+        digests = {
+            subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                           env={**os.environ, "PYTHONHASHSEED": seed}).stdout.strip()
+            for seed in ("1", "2")
+        }
+
+        assert digests == {_content_hash(record)}
+        assert _content_hash(dict(reversed(record.items()))) == _content_hash(record)
+
+    def test_first_sync_inserts(self, mesh):
+        """Test that the first delta sync inserts every translatable record."""
+        result = self._sync(mesh)
+
+        assert (result["inserted"], result["updated"], result["skipped"]) == (99, 0, 0)
+        assert [e["record"]["Id"] for e in result["errors"]] == ["006007"]
+        assert mesh.id_mappings["contacts:003000"] == {
+            Platform.SALESFORCE: "003000", Platform.DYNAMICS365: "003000"
+        }
+        assert mesh.sync_log[-1]["mode"] == "delta"
+        assert mesh.sync_log[-1]["inserted"] == 99
+
+    def test_unchanged_records_are_skipped(self, mesh):
+        """Test that a repeated sync translates nothing."""
+        self._sync(mesh)
+        before = list(mesh.data[Platform.DYNAMICS365]["contacts"])
+
+        result = self._sync(mesh)
+
+        assert (result["inserted"], result["updated"], result["skipped"]) == (0, 0, 99)
+        assert result["synced"] == 0
+        assert list(mesh.data[Platform.DYNAMICS365]["contacts"]) == before
+
+    def test_changed_and_new_records_are_upserted(self, mesh):
+        """Test that changes update rows in place and new records are appended."""
+        self._sync(mesh)
+        contacts = mesh.data[Platform.SALESFORCE]["contacts"]
+        changed = dict(contacts[3], Email="new@example.com")
+        mesh.data[Platform.SALESFORCE]["contacts"] = mesh._new_table(
+            [changed if i == 3 else r for i, r in enumerate(contacts)]
+            + [{"Id": "003999", "LastName": "New"}]
+        )
+
+        result = self._sync(mesh)
+
+        assert (result["inserted"], result["updated"]) == (1, 1)
+        target = mesh.data[Platform.DYNAMICS365]["contacts"]
+        assert len(target) == 26
+        assert target[3]["emailaddress1"] == "new@example.com"
+        assert target[25]["contactid"] == "003999"
+        assert "new@example.com" in mesh.duplicate_index._groups["email"]
+
+    def test_watermark_skips_older_records(self, mesh):
+        """Test that records older than the watermark are not re-hashed."""
+        mesh.load_data(Platform.SALESFORCE, {"Contact": [
+            {"Id": "003A", "LastName": "Old", "LastModifiedDate": "2024-01-01T00:00:00Z"},
+            {"Id": "003B", "LastName": "Recent", "LastModifiedDate": "2024-03-01T00:00:00Z"}
+        ]})
+        self._sync(mesh)
+        assert mesh.delta_state[
+            (Platform.SALESFORCE, Platform.DYNAMICS365, "contacts")
+        ]["watermark"] == "2024-03-01T00:00:00Z"
+
+        contacts = mesh.data[Platform.SALESFORCE]["contacts"]
+        mesh.data[Platform.SALESFORCE]["contacts"] = mesh._new_table([
+            dict(contacts[0], LastName="Edited without a new timestamp"),
+            dict(contacts[1], LastName="Edited", LastModifiedDate="2024-04-01T00:00:00Z")
+        ])
+        result = self._sync(mesh)
+
+        assert (result["updated"], result["skipped"]) == (1, 1)
+        target = mesh.data[Platform.DYNAMICS365]["contacts"]
+        assert [r["lastname"] for r in target] == ["Old", "Edited"]
+
+    def test_full_sync_then_delta_matches_by_id(self, mesh):
+        """Test that delta sync matches rows of a target built by a full sync."""
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+
+        result = self._sync(mesh)
+
+        assert (result["inserted"], result["updated"], result["skipped"]) == (0, 0, 99)
+        assert mesh.get_stats()["dynamics365"]["contacts"] == 25
+        assert "companies:001000" in mesh.id_mappings
+        assert self._sync(mesh)["skipped"] == 99
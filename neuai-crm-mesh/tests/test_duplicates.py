@@ -2,6 +2,7 @@
 
 import pytest
 from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
 from neuai_crm.services.duplicates import DuplicateDetector
 
 
@@ -214,3 +215,242 @@ class TestCrossplatformDuplicates:
         for dup in contact_dups:
             platforms = {r["platform"] for r in dup.records}
             assert len(platforms) >= 2
+
+
+class TestFuzzyDuplicates:
+    """Test the blocking fuzzy matching engine."""
+
+    def test_company_name_variants(self, detector):
+        """Test that suffix and case variants of a company name match."""
+        data = {
+            Platform.SALESFORCE: {
+                "accounts": [{"Id": "001", "Name": "Acme Corp"}],
+                "contacts": []
+            },
+            Platform.DYNAMICS365: {
+                "accounts": [{"accountid": "acc-001", "name": "ACME Corporation Ltd"}],
+                "contacts": []
+            },
+            Platform.LOCAL: {"companies": [], "contacts": []}
+        }
+
+        duplicates = detector.detect_duplicates(data, fuzzy=True)
+
+        company_dups = [d for d in duplicates if d.entity_type == "company"]
+        assert len(company_dups) == 1
+        assert company_dups[0].match_value == "acme"
+        assert len(company_dups[0].records) == 2
+
+    def test_typo_in_email(self, detector):
+        """Test that a transposed character in an email still matches."""
+        data = {
+            Platform.SALESFORCE: {
+                "accounts": [],
+                "contacts": [
+                    {"Id": "003", "FirstName": "Jon", "LastName": "Smith",
+                     "Email": "jon.smith@acme.com"}
+                ]
+            },
+            Platform.DYNAMICS365: {"accounts": [], "contacts": []},
+            Platform.LOCAL: {
+                "companies": [],
+                "contacts": [
+                    {"id": "local-001", "firstName": "John", "lastName": "Smith",
+                     "email": "jon.smiht@acme.com"}
+                ]
+            }
+        }
+
+        duplicates = detector.detect_fuzzy_duplicates(data)
+
+        assert len(duplicates) == 1
+        dup = duplicates[0]
+        assert dup.entity_type == "contact"
+        assert detector.threshold <= dup.confidence < 1.0
+        assert {r["platform"] for r in dup.records} == {"salesforce", "local"}
+
+    def test_different_people_same_name(self, detector):
+        """Test that a shared name with conflicting email and phone is not a match."""
+        data = {
+            Platform.SALESFORCE: {
+                "accounts": [],
+                "contacts": [
+                    {"Id": "003", "FirstName": "James", "LastName": "Smith",
+                     "Email": "james.smith@globex.io", "Phone": "555-111-2222"}
+                ]
+            },
+            Platform.DYNAMICS365: {
+                "accounts": [],
+                "contacts": [
+                    {"contactid": "con-001", "firstname": "James", "lastname": "Smith",
+                     "emailaddress1": "jsmith@initech.net", "telephone1": "555-333-4444"}
+                ]
+            },
+            Platform.LOCAL: {"companies": [], "contacts": []}
+        }
+
+        assert detector.detect_fuzzy_duplicates(data) == []
+
+    def test_same_platform_not_flagged(self, detector):
+        """Test that near-duplicates within one platform are not cross-platform matches."""
+        data = {
+            Platform.SALESFORCE: {
+                "accounts": [
+                    {"Id": "001", "Name": "Acme Inc"},
+                    {"Id": "002", "Name": "Acme Incorporated"}
+                ],
+                "contacts": []
+            }
+        }
+
+        assert detector.detect_fuzzy_duplicates(data) == []
+
+    def test_large_block_uses_sorted_neighborhood(self):
+        """Test that oversized blocks still find adjacent matches."""
+        detector = DuplicateDetector(max_block_size=4, window_size=2)
+        sf_contacts = [
+            {"Id": f"sf-{i}", "FirstName": "Maria", "LastName": "Garcia",
+             "Email": f"maria.garcia{i}@example.com", "Phone": f"555-000-{i:04d}"}
+            for i in range(20)
+        ]
+        d365_contacts = [
+            {"contactid": "d365-7", "firstname": "Maria", "lastname": "Garcia",
+             "emailaddress1": "maria.garcia7@example.com", "telephone1": "555-000-0007"}
+        ]
+        data = {
+            Platform.SALESFORCE: {"accounts": [], "contacts": sf_contacts},
+            Platform.DYNAMICS365: {"accounts": [], "contacts": d365_contacts},
+        }
+
+        duplicates = detector.detect_fuzzy_duplicates(data)
+
+        assert len(duplicates) == 1
+        ids = {r["record"].get("Id") or r["record"].get("contactid") for r in duplicates[0].records}
+        assert ids == {"sf-7", "d365-7"}
+
+    def test_reports_progress_per_entity_type(self, detector, sample_data):
+        """Test that fuzzy scans report each entity type's blocks and keep their results."""
+        reports = []
+        duplicates = detector.detect_fuzzy_duplicates(sample_data, progress=reports.append)
+
+        assert [(r["entity_type"], r["percent"]) for r in reports] == [("contact", 100.0), ("company", 100.0)]
+        assert reports[0]["done"] == reports[0]["total"] > 0
+        assert duplicates == detector.detect_fuzzy_duplicates(sample_data)
+
+    def test_soundex(self, detector):
+        """Test the phonetic blocking code."""
+        assert detector._soundex("Robert") == "R163"
+        assert detector._soundex("Rupert") == "R163"
+        assert detector._soundex("Ashcraft") == "A261"
+        assert detector._soundex("Tymczak") == "T522"
+        assert detector._soundex("") == ""
+
+
+class TestDuplicateIndex:
+    """Test the incrementally maintained duplicate index in DataMesh."""
+
+    @pytest.fixture
+    def mesh(self, sample_data):
+        mesh = DataMesh()
+        mesh.load_data(Platform.SALESFORCE, sample_data[Platform.SALESFORCE])
+        mesh.load_data(Platform.DYNAMICS365, sample_data[Platform.DYNAMICS365])
+        return mesh
+
+    def _full_scan(self, mesh):
+        return [d.to_dict() for d in DuplicateDetector().detect_duplicates(mesh.data)]
+
+    def test_matches_full_scan_after_load(self, mesh):
+        """Test that indexed results equal a from-scratch detection."""
+        duplicates = mesh.detect_duplicates()
+        assert duplicates == self._full_scan(mesh)
+        assert {d["type"] for d in duplicates} == {"contact", "company"}
+
+    def test_sync_updates_index(self, mesh):
+        """Test that syncing into a platform reindexes only its target entities."""
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL)
+
+        duplicates = mesh.detect_duplicates()
+        assert duplicates == self._full_scan(mesh)
+        email_dup = [d for d in duplicates if d["match_field"] == "email"][0]
+        assert {r["platform"] for r in email_dup["records"]} == {
+            "salesforce", "dynamics365", "local"
+        }
+
+    def test_reload_replaces_indexed_records(self, mesh):
+        """Test that reloading a platform drops its previously indexed records."""
+        mesh.load_data(Platform.DYNAMICS365, {
+            "contact": [{"contactid": "con-002", "firstname": "Jane",
+                         "emailaddress1": "jane@other.com"}]
+        })
+
+        assert mesh.detect_duplicates() == []
+        assert mesh.get_conflicts(Platform.SALESFORCE, Platform.DYNAMICS365) == []
+
+    def test_delta_sync_updates_index_in_place(self, mesh, sample_data):
+        """Test that delta upserts keep the index equal to a full scan."""
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, delta=True)
+        assert mesh.detect_duplicates() == self._full_scan(mesh)
+
+        salesforce = sample_data[Platform.SALESFORCE]
+        contact = salesforce["contacts"][0]
+        salesforce["contacts"] = [dict(contact, Title="VP Engineering")]
+        mesh.load_data(Platform.SALESFORCE, salesforce)
+        result = mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, delta=True)
+
+        assert (result["inserted"], result["updated"]) == (0, 1)
+        assert mesh.detect_duplicates() == self._full_scan(mesh)
+
+        salesforce["contacts"] = [
+            dict(contact, Email="moved@example.com"),
+            {"Id": "003NEW", "LastName": "Doe", "Email": "john.doe@acme.com"}
+        ]
+        mesh.load_data(Platform.SALESFORCE, salesforce)
+        result = mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, delta=True)
+
+        assert (result["inserted"], result["updated"]) == (1, 1)
+
+        def normalized(duplicates):
+            return sorted(
+                (d["match_field"], d["match_value"],
+                 sorted((r["platform"], str(sorted(r["record"].items()))) for r in d["records"]))
+                for d in duplicates
+            )
+
+        assert normalized(mesh.detect_duplicates()) == normalized(self._full_scan(mesh))
+
+    def test_clear_platform_updates_index(self, mesh):
+        """Test that clearing a platform removes its matches."""
+        assert len(mesh.get_conflicts(Platform.SALESFORCE, Platform.DYNAMICS365)) == 2
+
+        mesh.clear_platform(Platform.DYNAMICS365)
+
+        assert mesh.detect_duplicates() == []
+        assert mesh.get_conflicts(Platform.SALESFORCE, Platform.DYNAMICS365) == []
+
+    def test_conflicts_only_for_requested_pair(self, mesh):
+        """Test that conflict lookups only return groups spanning both platforms."""
+        assert mesh.get_conflicts(Platform.SALESFORCE, Platform.LOCAL) == []
+
+        conflicts = mesh.get_conflicts(Platform.DYNAMICS365, Platform.SALESFORCE)
+        contact_conflicts = [c for c in conflicts if c["type"] == "contact"]
+        assert len(contact_conflicts) == 1
+        assert contact_conflicts[0]["source_record"]["contactid"] == "con-001"
+        assert contact_conflicts[0]["target_record"]["Id"] == "003"
+
+    def test_replaced_keys_leave_the_postings(self, mesh):
+        """Test that records whose match keys keep changing don't grow the postings."""
+        index = mesh.duplicate_index
+        key = (Platform.SALESFORCE, "contacts")
+        before = dict(index._postings[key])
+
+        for i in range(50):
+            index.replace_record(Platform.SALESFORCE, "contacts", 0,
+                                 {"Id": "003", "Email": f"user{i}@example.com", "Phone": f"555-01{i:02d}"})
+
+        assert len(index._postings[key]) == len(before)
+        assert ("email", "user49@example.com") in index._postings[key]
+
+        index.remove_entity(Platform.SALESFORCE, "contacts")
+        assert key not in index._postings
+        assert not any("salesforce" in group for name in ("email", "phone")
+                       for group in index._groups[name].values())
@@ -0,0 +1,136 @@
+"""Tests for intent routing and the intelligence layer."""
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.intelligence import IntelligenceLayer
+from neuai_crm.services.intent_router import IntentRouter
+
+
+@pytest.fixture
+def router():
+    """Create the default intent router."""
+    return IntentRouter()
+
+
+@pytest.fixture
+def intelligence():
+    """Create an intelligence layer over a mesh with Salesforce accounts."""
+    mesh = DataMesh()
+    mesh.load_data(Platform.SALESFORCE, {
+        "Account": [{"Id": f"001{i:03d}", "Name": f"Company {i}"} for i in range(50)]
+    })
+    return IntelligenceLayer(mesh, max_history=6, keep_results=2)
+
+
+class TestIntentRouter:
+    """Test cases for IntentRouter."""
+
+    @pytest.mark.parametrize("query,intent", [
+        ("Sync Salesforce to Dynamics 365", "sync"),
+        ("Synchronize everything", "sync"),
+        ("Migrate from Dynamics to Salesforce", "migrate"),
+        ("Find duplicates across all systems", "duplicate"),
+        ("Show me conflicts between local and Salesforce", "conflict"),
+        ("How many records are in each CRM?", "status"),
+        ("What can you help me with?", "help"),
+        ("Export data for Salesforce", "export"),
+        ("Show me the schema mappings", "schema"),
+        ("Tell me a joke", "general"),
+    ])
+    def test_routes_example_queries(self, router, query, intent):
+        """Test that the documented example queries reach their intents."""
+        assert router.route(query).intent == intent
+
+    def test_matches_at_word_starts(self, router):
+        """Test that keywords inside other words don't route the query."""
+        assert router.route("Show mismatches for each account").intent == "conflict"
+        assert router.route("Discount codes").intent == "general"
+
+    def test_scores_and_ambiguity(self, router):
+        """Test that more keyword hits win and ties report alternatives."""
+        route = router.route("Update the schema mapping")
+        assert route.intent == "schema"
+        assert route.score == 2
+        assert route.hits["sync"] == ["update"]
+        assert not route.ambiguous
+
+        tied = router.route("Sync then export salesforce")
+        assert tied.intent == "sync"
+        assert tied.alternatives == ["export"]
+
+    @pytest.mark.parametrize("query,intent", [
+        ("Delete all salesforce duplicates", "duplicate"),
+        ("How many duplicates are in salesforce", "duplicate"),
+        ("How many conflicts do we have", "conflict"),
+    ])
+    def test_phrases_count_once(self, router, query, intent):
+        """Test that a phrase keyword doesn't outweigh a single-word keyword."""
+        route = router.route(query)
+        assert route.intent == intent
+        assert not route.needs_confirmation
+
+    def test_destructive_intent_needs_confirmation(self, router):
+        """Test that clear only wins outright when nothing else matched."""
+        assert not router.route("Clear Salesforce").needs_confirmation
+
+        route = router.route("Reset and clear the sync status")
+        assert route.intent == "clear"
+        assert route.needs_confirmation
+        assert route.alternatives == ["sync", "status"]
+
+
+class TestIntelligenceLayer:
+    """Test cases for IntelligenceLayer conversation handling."""
+
+    def test_history_summarizes_large_results(self, intelligence):
+        """Test that history keeps sizes of payloads and the full result stays retrievable."""
+        response = intelligence.process_query("Export data for Salesforce")
+        entry = intelligence.get_conversation_history()[-1]
+
+        assert response["record_count"] == 50
+        assert entry["content"]["record_count"] == 50
+        assert "data" not in entry["content"]
+        assert entry["content"]["omitted"] == {"data": len(response["data"])}
+        assert intelligence.get_result(entry["result_id"]) is response
+
+    def test_history_and_results_are_bounded(self, intelligence):
+        """Test that sustained traffic keeps only the newest entries and results."""
+        for i in range(20):
+            intelligence.process_query(f"Export data for Salesforce {i}")
+
+        history = intelligence.get_conversation_history()
+        result_ids = [entry["result_id"] for entry in history if entry["role"] == "assistant"]
+
+        assert len(history) == 6
+        assert history[-2]["content"].endswith(" 19")
+        assert intelligence.get_result(result_ids[0]) is None
+        assert all(intelligence.get_result(result_id) for result_id in result_ids[1:])
+
+        intelligence.clear_history()
+        assert intelligence.get_conversation_history() == []
+        assert intelligence.get_result(result_ids[-1]) is None
+
+    def test_duplicate_query_does_not_clear(self, intelligence):
+        """Test that a duplicate query mentioning "delete all" keeps the data."""
+        response = intelligence.process_query("Delete all salesforce duplicates")
+
+        assert response["intent"] == "duplicate_detection"
+        assert intelligence.mesh.get_stats()["salesforce"]["accounts"] == 50
+
+    def test_contested_clear_asks_for_confirmation(self, intelligence):
+        """Test that clear competing with another intent clears nothing."""
+        response = intelligence.process_query("Clear salesforce and export it")
+
+        assert response["action"] == "clarification_needed"
+        assert response["alternative_intents"] == ["export"]
+        assert intelligence.mesh.get_stats()["salesforce"]["accounts"] == 50
+
+        assert intelligence.process_query("Clear salesforce")["action"] == "cleared"
+
+    def test_ambiguous_query_reports_alternatives(self, intelligence):
+        """Test that tied intents are surfaced on the response."""
+        response = intelligence.process_query("Sync then export")
+
+        assert response["intent"] == "sync"
+        assert response["alternative_intents"] == ["export"]
@@ -0,0 +1,145 @@
+"""Tests for the background job manager."""
+
+import threading
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.duplicates import PROGRESS_EVERY
+from neuai_crm.services.jobs import JobManager, JobQueueFull, JobStatus
+
+
+@pytest.fixture
+def manager():
+    """A job manager with one worker and room for one queued job."""
+    jobs = JobManager(max_workers=1, max_pending=1)
+    yield jobs
+    jobs.shutdown()
+
+
+def blocking_operation(started: threading.Event, release: threading.Event, steps: int = 3):
+    """An operation that reports a step, then waits for release before each further step."""
+    def operation(report):
+        for step in range(1, steps + 1):
+            report({"step": step, "total": steps})
+            started.set()
+            release.wait(5)
+        return {"steps": steps}
+    return operation
+
+
+def wait_finished(manager, job_id):
+    """Wait for a job to finish and return it."""
+    job = manager.get(job_id)
+    while not job.finished:
+        job = manager.wait(job_id, job.version, timeout=5)
+    return job
+
+
+class TestJobManager:
+    """Test cases for JobManager."""
+
+    def test_runs_and_reports_progress(self, manager):
+        """Test that a job publishes progress and its result."""
+        started, release = threading.Event(), threading.Event()
+        job = manager.submit("steps", blocking_operation(started, release))
+
+        assert started.wait(5)
+        running = manager.get(job.id)
+        assert running.status == JobStatus.RUNNING
+        assert running.progress == {"step": 1, "total": 3}
+
+        release.set()
+        done = wait_finished(manager, job.id)
+
+        assert done.status == JobStatus.SUCCEEDED
+        assert done.progress == {"step": 3, "total": 3}
+        assert done.to_dict()["result"] == {"steps": 3}
+        assert done.started_at and done.finished_at
+
+    def test_cancel_running_and_queued(self, manager):
+        """Test that a running job stops at its next report and a queued one never starts."""
+        started, release = threading.Event(), threading.Event()
+        running = manager.submit("steps", blocking_operation(started, release))
+        queued = manager.submit("never", lambda report: pytest.fail("cancelled job ran"))
+        assert started.wait(5)
+
+        assert manager.cancel(queued.id).status == JobStatus.CANCELLED
+        manager.cancel(running.id)
+        release.set()
+
+        assert wait_finished(manager, running.id).status == JobStatus.CANCELLED
+        assert manager.get(running.id).progress == {"step": 1, "total": 3}
+        assert manager.cancel("missing") is None
+
+    def test_cancel_running_duplicate_scan(self, manager):
+        """Test that a duplicate scan reports progress and stops once cancelled."""
+        mesh = DataMesh()
+        count = 3 * PROGRESS_EVERY
+        mesh.load_data(Platform.SALESFORCE, {"Contact": [
+            {"Id": f"sf-{i}", "Email": f"person{i}@example.com"} for i in range(count)
+        ]})
+        mesh.load_data(Platform.DYNAMICS365, {"contact": [
+            {"contactid": f"d-{i}", "emailaddress1": f"person{i}@example.com"} for i in range(count)
+        ]})
+        started, release = threading.Event(), threading.Event()
+
+        def operation(report):
+            def progress(update):
+                report(update)
+                started.set()
+                release.wait(5)
+            return mesh.detect_duplicates(progress=progress)
+
+        job = manager.submit("duplicates", operation)
+        assert started.wait(5)
+        assert manager.get(job.id).progress["done"] == PROGRESS_EVERY
+
+        manager.cancel(job.id)
+        release.set()
+
+        cancelled = wait_finished(manager, job.id)
+        assert cancelled.status == JobStatus.CANCELLED
+        assert cancelled.progress["done"] == PROGRESS_EVERY
+        assert len(mesh.detect_duplicates()) == count
+
+    def test_queue_is_bounded(self, manager):
+        """Test that submitting beyond workers plus pending slots is refused."""
+        started, release = threading.Event(), threading.Event()
+        manager.submit("a", blocking_operation(started, release))
+        manager.submit("b", blocking_operation(threading.Event(), release, steps=1))
+
+        with pytest.raises(JobQueueFull):
+            manager.submit("c", lambda report: None)
+
+        release.set()
+        for job in manager.list():
+            wait_finished(manager, job.id)
+        assert manager.submit("c", lambda report: None)
+
+    def test_failure_and_listing(self, manager):
+        """Test that exceptions fail the job and list filters by status."""
+        def fail(report):
+            raise ValueError("bad input")
+
+        job = manager.submit("fail", fail)
+        ok = manager.submit("ok", lambda report: 1)
+        wait_finished(manager, job.id)
+        wait_finished(manager, ok.id)
+
+        assert manager.get(job.id).error == "ValueError: bad input"
+        assert [j.id for j in manager.list(JobStatus.FAILED)] == [job.id]
+        assert [j.id for j in manager.list()] == [job.id, ok.id]
+
+    def test_keeps_recent_finished_jobs(self):
+        """Test that only the newest finished jobs are retained."""
+        manager = JobManager(keep_finished=2)
+        ids = []
+        for i in range(4):
+            ids.append(manager.submit("n", lambda report, i=i: i).id)
+            wait_finished(manager, ids[-1])
+        manager.submit("n", lambda report: None)
+        manager.shutdown()
+
+        assert manager.get(ids[0]) is None
+        assert [j.id for j in manager.list()][:2] == ids[2:]
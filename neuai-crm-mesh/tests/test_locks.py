@@ -0,0 +1,103 @@
+"""Tests for the readers-writer lock."""
+
+import threading
+
+import pytest
+from neuai_crm.services.locks import ReadWriteLock
+
+
+@pytest.fixture
+def lock():
+    """An unheld lock."""
+    return ReadWriteLock()
+
+
+def _in_thread(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestReadWriteLock:
+    """Test cases for ReadWriteLock."""
+
+    def test_readers_share_the_lock(self, lock):
+        """Test that a second reader gets in while the first holds the lock."""
+        entered = []
+
+        def read():
+            with lock.read():
+                entered.append(1)
+
+        with lock.read():
+            _in_thread(read).join(1)
+            assert entered == [1]
+
+    def test_writer_waits_for_readers(self, lock):
+        """Test that a writer only gets in once every reader has left."""
+        entered = []
+
+        def write():
+            with lock.write():
+                entered.append(1)
+
+        with lock.read():
+            writer = _in_thread(write)
+            writer.join(0.2)
+            assert entered == []
+        writer.join(1)
+        assert entered == [1]
+
+    def test_waiting_writer_holds_off_new_readers(self, lock):
+        """Test that readers arriving after a waiting writer queue behind it."""
+        order = []
+
+        def write():
+            with lock.write():
+                order.append("write")
+
+        def read():
+            with lock.read():
+                order.append("read")
+
+        with lock.read():
+            writer = _in_thread(write)
+            writer.join(0.1)
+            reader = _in_thread(read)
+            reader.join(0.1)
+            assert order == []
+        writer.join(1)
+        reader.join(1)
+        assert order == ["write", "read"]
+
+    def test_reentrant(self, lock):
+        """Test that a holder may take the lock again, and a writer may read."""
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+            assert not _acquired_elsewhere(lock)
+        with lock.read():
+            with lock.read():
+                pass
+        assert _acquired_elsewhere(lock)
+
+    def test_read_lock_cannot_be_upgraded(self, lock):
+        """Test that a reader asking to write gets an error rather than a deadlock."""
+        with lock.read():
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+        with lock.write():
+            pass
+
+
+def _acquired_elsewhere(lock: ReadWriteLock) -> bool:
+    """Whether another thread can take the write lock right now."""
+    acquired = []
+
+    def write():
+        with lock.write():
+            acquired.append(1)
+
+    _in_thread(write).join(0.2)
+    return bool(acquired)
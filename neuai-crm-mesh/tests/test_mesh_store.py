@@ -0,0 +1,114 @@
+"""Tests for durable mesh storage."""
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.mesh_store import SQLiteMeshStore
+from neuai_crm.services.record_store import ColumnarTable
+
+
+SALESFORCE_DATA = {
+    "Account": [{"Id": "001", "Name": "Acme Corp", "attributes": {"type": "Account"}}],
+    "Contact": [
+        {"Id": "003A", "FirstName": "John", "LastName": "Doe", "Email": "john@acme.com"},
+        {"Id": "003B", "FirstName": "Jane", "LastName": "Roe", "Email": "jane@acme.com"}
+    ]
+}
+
+DYNAMICS_DATA = {
+    "contact": [{"contactid": "c-1", "firstname": "John", "emailaddress1": "john@acme.com"}]
+}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a fresh store database."""
+    return str(tmp_path / "mesh.db")
+
+
+def reopen(db_path, storage="dict"):
+    """Start a new mesh from the persisted state."""
+    return DataMesh(storage=storage, store=SQLiteMeshStore(db_path))
+
+
+class TestSQLiteMeshStore:
+    """Test cases for SQLiteMeshStore and DataMesh warm start."""
+
+    @pytest.mark.parametrize("storage", DataMesh.STORAGE_BACKENDS)
+    def test_warm_start_restores_state(self, db_path, storage):
+        """Test that records, id mappings, sync log and duplicates survive a restart."""
+        mesh = reopen(db_path, storage)
+        mesh.load_data(Platform.SALESFORCE, SALESFORCE_DATA)
+        mesh.load_data(Platform.DYNAMICS365, DYNAMICS_DATA)
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.LOCAL, delta=True)
+
+        restored = reopen(db_path, storage)
+
+        for platform in Platform:
+            assert restored.export_to_platform(platform) == mesh.export_to_platform(platform)
+        assert restored.id_mappings == mesh.id_mappings
+        assert restored.sync_log == mesh.sync_log
+        assert restored.detect_duplicates() == mesh.detect_duplicates()
+        if storage == "columnar":
+            assert isinstance(restored.data[Platform.LOCAL]["contacts"], ColumnarTable)
+
+    def test_delta_upserts_are_persisted(self, db_path):
+        """Test that delta updates and inserts are written through."""
+        mesh = reopen(db_path)
+        mesh.load_data(Platform.SALESFORCE, SALESFORCE_DATA)
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, delta=True)
+
+        contacts = [dict(SALESFORCE_DATA["Contact"][0], Title="CTO"),
+                    SALESFORCE_DATA["Contact"][1],
+                    {"Id": "003C", "LastName": "New"}]
+        mesh.load_data(Platform.SALESFORCE, {"Contact": contacts})
+        result = mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, delta=True)
+        assert (result["inserted"], result["updated"]) == (1, 1)
+
+        restored = reopen(db_path)
+        target = restored.data[Platform.DYNAMICS365]["contacts"]
+        assert [r["contactid"] for r in target] == ["003A", "003B", "003C"]
+        assert target[0]["jobtitle"] == "CTO"
+        assert restored.id_mappings["contacts:003C"][Platform.DYNAMICS365] == "003C"
+
+    def test_full_sync_and_clear_are_persisted(self, db_path):
+        """Test that replaced and cleared entity lists are written through."""
+        mesh = reopen(db_path)
+        mesh.load_data(Platform.SALESFORCE, SALESFORCE_DATA)
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+        mesh.clear_platform(Platform.SALESFORCE)
+
+        restored = reopen(db_path)
+
+        assert restored.get_stats()["salesforce"]["contacts"] == 0
+        assert restored.get_stats()["dynamics365"] == {
+            "accounts": 1, "contacts": 2, "opportunities": 0, "activities": 0
+        }
+        assert [e["action"] for e in restored.get_sync_log()] == ["load", "sync", "clear"]
+
+    def test_failed_transaction_rolls_back(self, db_path):
+        """Test that writes inside a failed transaction are discarded."""
+        store = SQLiteMeshStore(db_path)
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.replace_entity(Platform.LOCAL, "contacts", [{"id": "1"}])
+                store.append_log({"action": "load"})
+                raise RuntimeError("boom")
+
+        state = store.load()
+        assert state["data"] == {}
+        assert state["sync_log"] == []
+
+    def test_compact(self, db_path):
+        """Test that compaction keeps the data."""
+        mesh = reopen(db_path)
+        mesh.load_data(Platform.SALESFORCE, SALESFORCE_DATA)
+        mesh.load_data(Platform.SALESFORCE, SALESFORCE_DATA)
+        mesh.store.compact()
+
+        assert reopen(db_path).get_stats() == mesh.get_stats()
+
+    def test_invalid_synchronous_mode(self, db_path):
+        """Test that unknown synchronous pragmas are rejected."""
+        with pytest.raises(ValueError):
+            SQLiteMeshStore(db_path, synchronous="OFF")
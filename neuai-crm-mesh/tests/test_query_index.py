@@ -0,0 +1,145 @@
+"""Tests for indexed record queries."""
+
+import random
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.query_index import matches, parse_where, sort_key
+
+
+STAGES = ["Prospecting", "Qualification", "Proposal", "Closed Won"]
+
+
+def opportunities(n: int, seed: int = 7) -> list:
+    """Build n Salesforce opportunities with some missing and mixed-type fields."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        record = {"Id": f"006{i:04d}", "Name": f"Deal {rng.randint(0, 50)}",
+                  "StageName": rng.choice(STAGES), "AccountId": f"001{i % 5}"}
+        if i % 7:
+            record["Amount"] = rng.choice([rng.randint(0, 100) * 1000, float(rng.randint(0, 100))])
+        if i % 11 == 0:
+            record["Amount"] = "n/a"
+        records.append(record)
+    return records
+
+
+def brute_force(records, where=None, sort=None):
+    """Expected query results without indexes."""
+    predicates = parse_where(where)
+    rows = [i for i, record in enumerate(records) if matches(record, predicates)]
+    if sort:
+        field = sort.lstrip("-")
+        rows.sort(key=lambda i: sort_key(records[i].get(field)) + (i,),
+                  reverse=sort.startswith("-"))
+    return [records[i] for i in rows]
+
+
+def all_pages(mesh, entity, limit, **kwargs):
+    """Follow next_cursor through every page of a query."""
+    records, cursor = [], None
+    while True:
+        page = mesh.query(Platform.SALESFORCE, entity, limit=limit, cursor=cursor, **kwargs)
+        assert page["count"] == len(page["records"]) <= limit
+        records.extend(page["records"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return records
+
+
+@pytest.fixture(params=DataMesh.STORAGE_BACKENDS)
+def mesh(request):
+    """A mesh with Salesforce opportunities loaded."""
+    data_mesh = DataMesh(storage=request.param)
+    data_mesh.load_data(Platform.SALESFORCE, {"Opportunity": opportunities(300)})
+    return data_mesh
+
+
+class TestQuery:
+    """Test cases for DataMesh.query."""
+
+    def test_equality_and_projection(self, mesh):
+        """Test an equality predicate with a field projection."""
+        result = mesh.query(Platform.SALESFORCE, "Opportunity",
+                            where={"StageName": "Proposal"}, fields=["Id", "Amount"])
+
+        expected = brute_force(opportunities(300), {"StageName": "Proposal"})
+        assert result["records"] == [{"Id": r["Id"], "Amount": r.get("Amount")} for r in expected]
+        assert result["next_cursor"] is None
+
+    @pytest.mark.parametrize("where,sort", [
+        (None, None),
+        (None, "Amount"),
+        (None, "-Amount"),
+        ({"Amount": {"gte": 20000, "lt": 60000}}, None),
+        ({"Amount": {"gt": 50}, "StageName": {"ne": "Closed Won"}}, "-Name"),
+        ({"StageName": {"in": ["Prospecting", "Proposal"]}, "AccountId": "0013"}, "Amount"),
+        ({"Name": {"prefix": "Deal 1"}}, "-StageName"),
+        ({"Amount": {"lte": 30}}, "Id"),
+        ({"Amount": "n/a"}, None),
+        ({"Amount": None}, "-Id"),
+        ({"StageName": {"ne": "Prospecting"}}, "Amount"),
+    ])
+    def test_matches_brute_force_across_pages(self, mesh, where, sort):
+        """Test that paged, indexed results equal filtering and sorting every record."""
+        expected = brute_force(opportunities(300), where, sort)
+
+        assert all_pages(mesh, "opportunities", 17, where=where, sort=sort) == expected
+
+    def test_range_only_matches_like_types(self, mesh):
+        """Test that numeric ranges skip string and missing values."""
+        result = mesh.query(Platform.SALESFORCE, "opportunities",
+                            where={"Amount": {"gte": 0}}, limit=1000)
+
+        assert all(isinstance(r["Amount"], (int, float)) for r in result["records"])
+        assert result["count"] == len(brute_force(opportunities(300), {"Amount": {"gte": 0}}))
+
+    def test_indexes_follow_delta_sync(self, mesh):
+        """Test that built indexes are updated by delta upserts on the target."""
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, delta=True)
+        where = {"estimatedvalue": {"gte": 50000}}
+        mesh.query(Platform.DYNAMICS365, "opportunities", where=where, sort="-estimatedvalue")
+        mesh.query(Platform.DYNAMICS365, "opportunities", where={"name": "Deal 3"})
+
+        records = opportunities(300)
+        records[0] = dict(records[0], Amount=99000, Name="Deal 3")
+        records[1] = dict(records[1], Amount=0)
+        records.append({"Id": "006new", "Name": "Deal 3", "StageName": "Proposal", "Amount": 75000})
+        mesh.load_data(Platform.SALESFORCE, {"Opportunity": records})
+        mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365, delta=True)
+
+        target = [dict(r) for r in mesh.data[Platform.DYNAMICS365]["opportunities"]]
+        for where, sort in [(where, "-estimatedvalue"), ({"name": "Deal 3"}, None)]:
+            result = mesh.query(Platform.DYNAMICS365, "opportunities",
+                                where=where, sort=sort, limit=1000)
+            assert result["records"] == brute_force(target, where, sort)
+
+    def test_reload_replaces_indexes(self, mesh):
+        """Test that loading new data is reflected by previously used indexes."""
+        mesh.query(Platform.SALESFORCE, "opportunities", where={"StageName": "Proposal"})
+        mesh.load_data(Platform.SALESFORCE, {"Opportunity": [
+            {"Id": "006X", "StageName": "Proposal"}
+        ]})
+
+        result = mesh.query(Platform.SALESFORCE, "opportunities", where={"StageName": "Proposal"})
+
+        assert result["records"] == [{"Id": "006X", "StageName": "Proposal"}]
+
+    def test_invalid_queries(self, mesh):
+        """Test that malformed queries raise ValueError."""
+        cursor = mesh.query(Platform.SALESFORCE, "opportunities", sort="Amount", limit=1)["next_cursor"]
+
+        with pytest.raises(ValueError):
+            mesh.query(Platform.SALESFORCE, "deals")
+        with pytest.raises(ValueError):
+            mesh.query(Platform.SALESFORCE, "opportunities", where={"Amount": {"between": 1}})
+        with pytest.raises(ValueError):
+            mesh.query(Platform.SALESFORCE, "opportunities", where={"Amount": {"gt": [1]}})
+        with pytest.raises(ValueError):
+            mesh.query(Platform.SALESFORCE, "opportunities", cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            mesh.query(Platform.SALESFORCE, "opportunities", sort="Name", cursor=cursor)
+        with pytest.raises(ValueError):
+            mesh.query(Platform.SALESFORCE, "opportunities", limit=0)
@@ -0,0 +1,128 @@
+"""Tests for the columnar record store."""
+
+import json
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.record_store import ColumnarTable, RowView
+
+
+@pytest.fixture
+def records():
+    """Records with differing key sets."""
+    return [
+        {"Id": "001", "Name": "Acme Corp", "Industry": "Technology"},
+        {"Id": "002", "Name": "Globex"},
+        {"Id": "003", "Website": "https://initech.example.com", "Industry": None},
+    ]
+
+
+class TestColumnarTable:
+    """Test cases for ColumnarTable and RowView."""
+
+    def test_round_trip(self, records):
+        """Test that rows come back exactly as stored, including missing keys."""
+        table = ColumnarTable(records)
+
+        assert len(table) == 3
+        assert table.to_dicts() == records
+        assert table == records
+
+    def test_row_view_mapping(self, records):
+        """Test that row views behave like read-only dicts."""
+        row = ColumnarTable(records)[1]
+
+        assert isinstance(row, RowView)
+        assert row["Name"] == "Globex"
+        assert row.get("Industry") is None
+        assert row.get("Industry", "n/a") == "n/a"
+        assert "Industry" not in row
+        assert list(row) == ["Id", "Name"]
+        assert dict(row) == records[1]
+        with pytest.raises(KeyError):
+            row["Website"]
+
+    def test_explicit_none_is_kept(self, records):
+        """Test that a stored None differs from a missing field."""
+        row = ColumnarTable(records)[2]
+
+        assert "Industry" in row
+        assert row["Industry"] is None
+
+    def test_replace_row(self, records):
+        """Test that replacing a row clears old fields and adds new columns."""
+        table = ColumnarTable(records)
+
+        table[1] = {"Id": "002", "Phone": "555-0100"}
+
+        assert table[1].to_dict() == {"Id": "002", "Phone": "555-0100"}
+        assert "Phone" not in table[0]
+        assert table.to_dicts()[2] == records[2]
+        with pytest.raises(IndexError):
+            table[3] = {}
+
+    def test_indexing_and_slices(self, records):
+        """Test negative indexes, slices and bounds."""
+        table = ColumnarTable(records)
+
+        assert table[-1]["Id"] == "003"
+        assert [r["Id"] for r in table[:2]] == ["001", "002"]
+        with pytest.raises(IndexError):
+            table[3]
+
+    def test_column_access(self, records):
+        """Test whole-column reads."""
+        table = ColumnarTable(records)
+
+        assert table.column("Name") == ["Acme Corp", "Globex", None]
+        assert table.column("Phone") == [None, None, None]
+        assert table.fields == ["Id", "Name", "Industry", "Website"]
+
+
+class TestColumnarDataMesh:
+    """Test DataMesh running on the columnar backend."""
+
+    @pytest.fixture
+    def mesh(self):
+        mesh = DataMesh(storage="columnar")
+        mesh.load_data(Platform.SALESFORCE, {
+            "Account": [{"Id": "001", "Name": "Acme Corp"}],
+            "Contact": [{"Id": "003", "FirstName": "John", "LastName": "Doe",
+                         "Email": "john@acme.com"}]
+        })
+        return mesh
+
+    def test_invalid_backend(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            DataMesh(storage="parquet")
+
+    def test_stats_and_export(self, mesh):
+        """Test that stats and exports match the dict backend."""
+        reference = DataMesh()
+        reference.load_data(Platform.SALESFORCE, mesh.export_to_platform(Platform.SALESFORCE))
+
+        assert mesh.get_stats() == reference.get_stats()
+        exported = mesh.export_to_platform(Platform.SALESFORCE)
+        assert exported == reference.export_to_platform(Platform.SALESFORCE)
+        assert json.loads(json.dumps(exported)) == exported
+
+    def test_sync_and_duplicates(self, mesh):
+        """Test that sync output lands in columnar tables and duplicates still match."""
+        result = mesh.sync_platforms(Platform.SALESFORCE, Platform.DYNAMICS365)
+
+        assert result["synced"] == 2
+        contacts = mesh.data[Platform.DYNAMICS365]["contacts"]
+        assert isinstance(contacts, ColumnarTable)
+        assert contacts[0]["emailaddress1"] == "john@acme.com"
+
+        duplicates = mesh.detect_duplicates()
+        assert [d["match_value"] for d in duplicates if d["type"] == "contact"] == ["john@acme.com"]
+
+    def test_clear_platform(self, mesh):
+        """Test that clearing resets to empty columnar tables."""
+        mesh.clear_platform(Platform.SALESFORCE)
+
+        assert all(isinstance(t, ColumnarTable) and len(t) == 0
+                   for t in mesh.data[Platform.SALESFORCE].values())
@@ -0,0 +1,63 @@
+"""Tests for the query result cache."""
+
+import pytest
+from neuai_crm.services.result_cache import ResultCache
+
+
+@pytest.fixture
+def cache():
+    """A cache holding at most 10 result items in 3 entries."""
+    return ResultCache(max_size=10, max_entries=3)
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def test_hits_and_misses(self, cache):
+        """Test that a key is computed once and then served from cache."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return [1, 2]
+
+        first = cache.get_or_compute(("dup", 1), compute)
+        second = cache.get_or_compute(("dup", 1), compute)
+
+        assert first is second
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["size"] == 2
+
+    def test_evicts_least_recently_used_by_size(self, cache):
+        """Test that total result size bounds the cache, oldest use first."""
+        cache.get_or_compute("a", lambda: list(range(4)))
+        cache.get_or_compute("b", lambda: list(range(4)))
+        cache.get_or_compute("a", lambda: None)
+        cache.get_or_compute("c", lambda: list(range(4)))
+
+        assert cache.get_or_compute("a", lambda: "recomputed") == [0, 1, 2, 3]
+        assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+        assert cache.stats()["evictions"] >= 1
+        assert cache.stats()["size"] <= 10
+
+    def test_entry_limit_and_oversized_results(self, cache):
+        """Test the entry bound and that oversized results are not cached."""
+        for key in range(5):
+            cache.get_or_compute(key, lambda: {"n": 1})
+        big = cache.get_or_compute("big", lambda: list(range(11)))
+
+        assert len(cache) == 3
+        assert cache.get_or_compute("big", lambda: None) is None
+        assert len(big) == 11
+
+    def test_clear_keeps_counters(self, cache):
+        """Test that clearing drops results but not the hit counters."""
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("a", lambda: 1)
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 1
+        assert cache.get_or_compute("a", lambda: 2) == 2
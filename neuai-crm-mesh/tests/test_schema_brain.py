@@ -0,0 +1,244 @@
+"""Tests for the Schema Brain."""
+
+import json
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.brain_journal import BrainJournal
+from neuai_crm.services.schema_brain import MappingSource, SchemaBrain
+
+
+@pytest.fixture
+def brain(tmp_path):
+    """A Schema Brain with its memory in a temporary directory."""
+    return SchemaBrain(memory_path=str(tmp_path))
+
+
+def opportunities(n):
+    """Salesforce opportunities in two shapes, one with an unmappable field."""
+    records = []
+    for i in range(n):
+        record = {"Id": f"006{i}", "Name": f"Deal {i}", "StageName": ["Prospecting", "Closed Won"][i % 2],
+                  "Amount": 1000 * i}
+        if i % 3 == 0:
+            record["Zz_Q9__c"] = i
+        records.append(record)
+    return records
+
+
+def translate_one_by_one(brain, records, source, target, entity_type):
+    """Translate records with per-record field and value calls."""
+    results = []
+    for record in records:
+        translated = {}
+        for field_name, value in record.items():
+            target_field, _, _ = brain.translate_field(field_name, source, target, entity_type, record)
+            if target_field:
+                translated[target_field] = brain.translate_value(
+                    value, field_name, source, target, entity_type
+                )[0]
+            else:
+                translated[field_name] = value
+        results.append(translated)
+    return results
+
+
+class TestBatchTranslation:
+    """Test cases for SchemaBrain.translate_records."""
+
+    def test_matches_per_record_translation(self, tmp_path, brain):
+        """Test that batch results and usage counts equal per-record translation."""
+        records = opportunities(30)
+        reference = SchemaBrain(memory_path=str(tmp_path / "reference"))
+
+        result = brain.translate_records(records, Platform.SALESFORCE, Platform.DYNAMICS365, "deals")
+        expected = translate_one_by_one(reference, records, Platform.SALESFORCE,
+                                        Platform.DYNAMICS365, "deals")
+
+        assert result["translated"] == expected
+        assert result["shapes"] == 2
+        for key, mapping in reference.field_mappings.items():
+            assert brain.field_mappings[key].times_used == mapping.times_used
+        for key, mapping in reference.value_mappings.items():
+            assert brain.value_mappings[key].times_used == mapping.times_used
+        assert brain.stats["total_translations"] == reference.stats["total_translations"]
+
+    def test_fields_resolved_once(self, brain, monkeypatch):
+        """Test that each field is resolved once for the whole batch."""
+        calls = []
+        translate_field = brain.translate_field
+        monkeypatch.setattr(brain, "translate_field",
+                            lambda name, *args, **kwargs: calls.append(name) or translate_field(name, *args, **kwargs))
+
+        brain.translate_records(opportunities(300), Platform.SALESFORCE, Platform.DYNAMICS365, "deals")
+
+        assert sorted(calls) == sorted(["Id", "Name", "StageName", "Amount", "Zz_Q9__c"])
+
+    def test_aggregated_field_info(self, brain):
+        """Test per-field confidence, record counts and review flags."""
+        result = brain.translate_records(opportunities(30), Platform.SALESFORCE,
+                                         Platform.DYNAMICS365, "deals")
+
+        info = result["field_mappings"]
+        assert info["Amount"] == {"mapped_to": "estimatedvalue", "confidence": 1.0,
+                                  "records": 30, "values_changed": 0}
+        assert info["StageName"]["values_changed"] == 30
+        assert info["Zz_Q9__c"]["records"] == 10
+        assert "Zz_Q9__c" in result["needs_review"]
+        assert "Amount" not in result["needs_review"]
+
+
+def custom_fields(n):
+    """Generated custom field names in the style of a large org."""
+    words = ["Region", "Tier", "Score", "Email", "Phone", "Renewal", "Owner", "Budget", "Segment", "Status"]
+    return [f"{words[i % 10]}_{words[(i // 10) % 10]}_{i}__c" for i in range(n)]
+
+
+class TestCandidatePruning:
+    """Test cases for index-pruned field inference."""
+
+    @pytest.fixture
+    def large_brain(self, brain, monkeypatch):
+        """A brain that has learned mappings to 300 custom Dynamics fields."""
+        monkeypatch.setattr(brain, "_save_memory", lambda: None)
+        for name in custom_fields(300):
+            brain.provide_feedback("salesforce", name, "dynamics365", "deals", f"new_{name.lower()[:-3]}")
+        return brain
+
+    def infer_all(self, brain, fields, record=None):
+        """Inference results for each field, as comparable tuples."""
+        results = []
+        for name in fields:
+            result = brain._infer_field_mapping(name, Platform.SALESFORCE, Platform.DYNAMICS365,
+                                                "deals", record)
+            results.append((result.proposed_mapping, round(result.confidence, 9), result.reasons))
+        return results
+
+    def test_pruned_matches_exhaustive(self, large_brain, monkeypatch):
+        """Test that pruned inference proposes what scoring every field proposes."""
+        fields = ["Amount", "CloseDate", "ExpectedRevenue", "Region_Tier_1", "Renewal_Phone_44__c",
+                  "BudgetSegment", "owner_email", "Zz_Q9__c"] + custom_fields(400)[290:]
+        record = {"Amount": 2500.0, "CloseDate": "2024-12-31", "owner_email": "jane@example.com"}
+
+        pruned = self.infer_all(large_brain, fields) + self.infer_all(large_brain, record, record)
+        monkeypatch.setattr(SchemaBrain, "CANDIDATE_LIMIT", None)
+        exhaustive = self.infer_all(large_brain, fields) + self.infer_all(large_brain, record, record)
+
+        assert pruned == exhaustive
+
+    def test_indexes_follow_mapping_changes(self, large_brain):
+        """Test that incremental index updates equal a rebuild from the mappings."""
+        brain = large_brain
+        brain._infer_field_mapping("Region", Platform.SALESFORCE, Platform.DYNAMICS365, "deals")
+        name = custom_fields(1)[0]
+        brain.provide_feedback("salesforce", name, "dynamics365", "deals", "new_region_override")
+        for _ in range(3):
+            brain.reject_mapping("salesforce", custom_fields(2)[1], "dynamics365", "deals")
+
+        incremental = brain._get_known_target_fields(Platform.DYNAMICS365, "deals")
+        fields = ["Region_Tier_0__c", "Tier_Region", "new_region_override"]
+        before = self.infer_all(brain, fields)
+        brain._target_indexes.clear()
+        brain._source_indexes.clear()
+
+        assert "new_region_override" in incremental
+        assert "new_region_region_0" not in incremental
+        assert "new_tier_region_1" not in incremental
+        assert sorted(brain._get_known_target_fields(Platform.DYNAMICS365, "deals")) == sorted(incremental)
+        assert self.infer_all(brain, fields) == before
+
+
+def memory_state(brain):
+    """Everything a brain persists, in comparable form (builtins are not persisted)."""
+    return {
+        "field_mappings": {k: m.to_dict() for k, m in brain.field_mappings.items()
+                           if m.source != MappingSource.BUILTIN},
+        "value_mappings": {k: m.to_dict() for k, m in brain.value_mappings.items()},
+        "field_patterns": dict(brain.field_patterns),
+        "stats": brain.stats,
+        "learning_log": [e.to_dict() for e in brain.learning_log],
+    }
+
+
+def teach_some(brain, start=0, n=3):
+    """Apply translations and a few kinds of feedback."""
+    brain.translate_records(opportunities(6), Platform.SALESFORCE, Platform.DYNAMICS365, "deals")
+    for i in range(start, start + n):
+        brain.provide_feedback("salesforce", f"Custom_{i}__c", "dynamics365", "deals", f"new_custom{i}")
+    brain.confirm_mapping("salesforce", f"Custom_{start}__c", "dynamics365", "deals")
+    brain.reject_mapping("salesforce", "Zz_Q9__c", "dynamics365", "deals")
+
+
+class TestPersistence:
+    """Test cases for journaled Schema Brain memory."""
+
+    def test_reload_restores_memory(self, tmp_path, brain):
+        """Test that a new brain replays everything saved."""
+        teach_some(brain)
+        for _ in range(4):
+            brain.reject_mapping("salesforce", "Custom_1__c", "dynamics365", "deals")
+
+        assert "salesforce:Custom_1__c:dynamics365:deals" not in brain.field_mappings
+        assert memory_state(SchemaBrain(memory_path=str(tmp_path))) == memory_state(brain)
+
+    def test_save_appends_only_changes(self, tmp_path, brain):
+        """Test that a save journals the changed keys, not the whole brain."""
+        teach_some(brain, n=20)
+        journal = tmp_path / BrainJournal.JOURNAL_FILE
+        before = journal.read_text().splitlines()
+
+        brain.provide_feedback("salesforce", "Custom_5__c", "dynamics365", "deals", "new_other")
+
+        added = [json.loads(line) for line in journal.read_text().splitlines()[len(before):]]
+        assert not (tmp_path / BrainJournal.SNAPSHOT_FILE).exists()
+        assert [e["section"] for e in added if e["section"] != "field_patterns"] == [
+            "field_mappings", "stats", "learning_log"]
+        assert added[0]["key"] == "salesforce:Custom_5__c:dynamics365:deals"
+
+    def test_snapshot_compacts_journal(self, tmp_path):
+        """Test that saves snapshot once the journal is long enough."""
+        brain = SchemaBrain(memory_path=str(tmp_path), snapshot_every=10)
+        teach_some(brain, n=8)
+        teach_some(brain, start=8, n=2)
+
+        assert (tmp_path / BrainJournal.SNAPSHOT_FILE).exists()
+        assert len((tmp_path / BrainJournal.JOURNAL_FILE).read_text().splitlines()) < 10
+        assert memory_state(SchemaBrain(memory_path=str(tmp_path))) == memory_state(brain)
+
+    def test_journal_entries_in_snapshot_are_skipped(self, tmp_path, brain):
+        """Test a crash between writing a snapshot and resetting the journal."""
+        teach_some(brain)
+        journal = tmp_path / BrainJournal.JOURNAL_FILE
+        stale = journal.read_text()
+        brain.snapshot_memory()
+        journal.write_text(stale)
+
+        assert memory_state(SchemaBrain(memory_path=str(tmp_path))) == memory_state(brain)
+
+    def test_torn_journal_tail_is_dropped(self, tmp_path, brain):
+        """Test that a partially written journal line is discarded on load."""
+        teach_some(brain)
+        journal = tmp_path / BrainJournal.JOURNAL_FILE
+        with open(journal, "a") as f:
+            f.write('{"seq": 999, "section": "field_mapp')
+
+        restored = SchemaBrain(memory_path=str(tmp_path))
+        restored.provide_feedback("salesforce", "Late__c", "dynamics365", "deals", "new_late")
+
+        reloaded = SchemaBrain(memory_path=str(tmp_path))
+        assert "salesforce:Late__c:dynamics365:deals" in reloaded.field_mappings
+        assert memory_state(reloaded) == memory_state(restored)
+
+    def test_corrupt_snapshot_is_moved_aside(self, tmp_path):
+        """Test that an unreadable snapshot is kept for inspection, not overwritten."""
+        (tmp_path / BrainJournal.SNAPSHOT_FILE).write_text('{"field_mappings": {')
+
+        brain = SchemaBrain(memory_path=str(tmp_path))
+        brain.snapshot_memory()
+
+        assert (tmp_path / (BrainJournal.SNAPSHOT_FILE + ".corrupt")).read_text() == '{"field_mappings": {'
+
+    def test_invalid_fsync_policy(self, tmp_path):
+        """Test that unknown fsync policies are rejected."""
+        with pytest.raises(ValueError):
+            SchemaBrain(memory_path=str(tmp_path), fsync="sometimes")
@@ -0,0 +1,376 @@
+"""Tests for schema discovery metadata fetching and mapping proposals."""
+
+import json
+import threading
+import time
+
+import pytest
+from neuai_crm.services import discovery_store
+from neuai_crm.services.metadata_fetch import call_with_retry, MetadataRequestError
+from neuai_crm.services.schema_discovery import FieldMetadata, FieldType, SchemaDiscovery
+
+
+class StubSalesforceError(Exception):
+    """Mimics simple_salesforce errors, which carry the HTTP status."""
+
+    def __init__(self, status):
+        super().__init__(f"status {status}")
+        self.status = status
+
+
+class StubSObject:
+    """One object of StubSalesforce."""
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def describe(self, headers=None):
+        return self.client.describe_object(self.name, headers or {})
+
+
+class StubSalesforce:
+    """
+    Local stand-in for simple_salesforce.Salesforce's describe surface.
+
+    Objects change when their version is bumped; a describe sent with an
+    If-Modified-Since marker from the same version answers 304.
+    """
+
+    STANDARD = ['Account', 'Contact', 'Opportunity', 'Task', 'Lead', 'Campaign', 'Case', 'Event', 'Note']
+
+    def __init__(self, custom_objects=3, latency=0.0):
+        self.objects = {name: [f"{name}Field"] for name in self.STANDARD}
+        for i in range(custom_objects):
+            self.objects[f"Custom{i}__c"] = ["Name", f"Score{i}__c"]
+        self.versions = {name: 0 for name in self.objects}
+        self.latency = latency
+        self.failures = {}  # Object name -> statuses to fail with, in order
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._markers = {}
+
+    def describe(self):
+        return {"sobjects": [
+            {"name": name, "custom": name.endswith("__c"), "queryable": True} for name in self.objects
+        ] + [{"name": "Hidden__c", "custom": True, "queryable": False}]}
+
+    def query(self, soql):
+        raise AssertionError("Discovery should not issue queries")
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return StubSObject(self, name)
+
+    def describe_object(self, name, headers):
+        with self._lock:
+            self.calls.append((name, dict(headers)))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if self.failures.get(name):
+                raise StubSalesforceError(self.failures[name].pop(0))
+            if name not in self.objects:
+                raise StubSalesforceError(404)
+            since = headers.get("If-Modified-Since")
+            if since is not None and self._markers.get(since, {}).get(name) == self.versions[name]:
+                raise StubSalesforceError(304)
+            return {"name": name, "fields": [{"name": f, "type": "string", "label": f} for f in self.objects[name]]}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def snapshot_markers(self, marker):
+        """Record object versions as of a marker handed out by discovery."""
+        self._markers[marker] = dict(self.versions)
+
+
+class StubResponse:
+    """requests-style response."""
+
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+class StubDynamicsHttp:
+    """Local stand-in for the Dynamics 365 EntityDefinitions endpoint, with ETags."""
+
+    def __init__(self):
+        self.attributes = {"contact": ["firstname", "emailaddress1"], "account": ["name", "new_tier"]}
+        self.versions = {name: 1 for name in self.attributes}
+        self.failures = {}
+        self.calls = []
+
+    def get(self, url, headers):
+        entity = url.split("LogicalName='")[1].split("'")[0]
+        self.calls.append((entity, headers.get("If-None-Match")))
+        if self.failures.get(entity):
+            status, retry_after = self.failures[entity].pop(0)
+            return StubResponse(status, headers={"Retry-After": retry_after} if retry_after else {})
+        if entity not in self.attributes:
+            return StubResponse(404)
+        etag = f'W/"{self.versions[entity]}"'
+        if headers.get("If-None-Match") == etag:
+            return StubResponse(304, headers={"ETag": etag})
+        attrs = [{"LogicalName": a, "AttributeType": "String"} for a in self.attributes[entity]]
+        return StubResponse(200, {"LogicalName": entity, "Attributes": attrs}, {"ETag": etag})
+
+
+@pytest.fixture
+def discovery(tmp_path, monkeypatch):
+    """A SchemaDiscovery storing state in a temporary directory, without retry delays."""
+    monkeypatch.setattr(SchemaDiscovery, "FETCH_BACKOFF", 0)
+    return SchemaDiscovery(storage_path=str(tmp_path))
+
+
+def field_names(discovery, platform):
+    """Discovered field names per entity."""
+    return {entity: [f.name for f in fields] for entity, fields in discovery.schemas[platform].items()}
+
+
+class TestSalesforceDiscovery:
+    """Test cases for concurrent, cached Salesforce discovery."""
+
+    def test_concurrent_matches_serial(self, tmp_path, discovery):
+        """Test that a worker pool discovers the same schema, in parallel."""
+        (tmp_path / "serial").mkdir()
+        serial = SchemaDiscovery(storage_path=str(tmp_path / "serial"))
+        serial.discover_salesforce(StubSalesforce(), use_cache=False)
+        client = StubSalesforce(latency=0.02)
+
+        result = discovery.discover_salesforce(client, workers=6, use_cache=False)
+
+        assert field_names(discovery, "salesforce") == field_names(serial, "salesforce")
+        assert list(discovery.schemas["salesforce"]) == list(serial.schemas["salesforce"])
+        assert result.entities_discovered == 12
+        assert result.custom_fields == 6
+        assert client.max_in_flight > 1
+
+    def test_rediscovery_refetches_only_changed(self, discovery, monkeypatch):
+        """Test that unchanged objects are served from the describe cache."""
+        client = StubSalesforce()
+        marker = ["m1"]
+        monkeypatch.setattr("neuai_crm.services.schema_discovery.formatdate", lambda usegmt: marker[0])
+        client.snapshot_markers("m1")
+        discovery.discover_salesforce(client, workers=4)
+        client.objects["Custom1__c"].append("Added__c")
+        client.versions["Custom1__c"] += 1
+        client.calls.clear()
+
+        marker[0] = "m2"
+        client.snapshot_markers("m2")
+        result = discovery.discover_salesforce(client, workers=4)
+
+        assert result.entities_from_cache == 11
+        assert all(headers.get("If-Modified-Since") for _, headers in client.calls)
+        assert "Added__c" in field_names(discovery, "salesforce")["custom1__c"]
+        assert field_names(discovery, "salesforce")["account"] == ["AccountField"]
+
+    def test_transient_errors_are_retried(self, discovery):
+        """Test per-object retry on 503 and no retry on 404."""
+        client = StubSalesforce(custom_objects=0)
+        client.failures = {"Lead": [503, 503], "Case": [404]}
+
+        result = discovery.discover_salesforce(client, use_cache=False)
+
+        assert "lead" in discovery.schemas["salesforce"]
+        assert [name for name, _ in client.calls].count("Lead") == 3
+        assert [name for name, _ in client.calls].count("Case") == 1
+        assert result.errors == ["Error describing Case: status 404"]
+
+    def test_invalid_workers(self, discovery):
+        """Test that a pool needs at least one worker."""
+        with pytest.raises(ValueError):
+            discovery.discover_salesforce(StubSalesforce(), workers=0)
+
+
+class TestDynamicsDiscovery:
+    """Test cases for concurrent, cached Dynamics 365 discovery."""
+
+    def test_etag_cache_and_errors(self, discovery):
+        """Test ETag revalidation, Retry-After retries and error reporting."""
+        http = StubDynamicsHttp()
+        http.failures = {"contact": [(429, "0")]}
+
+        first = discovery.discover_dynamics365("token", "https://org.crm.dynamics.com", workers=4, http=http)
+        http.attributes["account"].append("new_region")
+        http.versions["account"] += 1
+        http.calls.clear()
+        second = discovery.discover_dynamics365("token", "https://org.crm.dynamics.com", workers=4, http=http)
+
+        assert first.entities_discovered == 2
+        assert "Error fetching lead: 404" in first.errors
+        assert second.entities_from_cache == 1
+        assert ("contact", 'W/"1"') in http.calls
+        assert field_names(discovery, "dynamics365")["account"] == ["name", "new_tier", "new_region"]
+
+
+class TestRetry:
+    """Test cases for call_with_retry."""
+
+    def test_backoff_and_retry_after(self):
+        """Test exponential delays, with Retry-After taking precedence."""
+        errors = [ConnectionError(), MetadataRequestError(503, retry_after=7), ConnectionError()]
+        delays = []
+
+        def flaky():
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        assert call_with_retry(flaky, retries=3, backoff=0.5, sleep=delays.append) == "ok"
+        assert delays == [0.5, 7, 2.0]
+
+    def test_gives_up(self):
+        """Test that the last error is raised once retries run out."""
+        with pytest.raises(MetadataRequestError):
+            call_with_retry(lambda: (_ for _ in ()).throw(MetadataRequestError(500)), retries=2,
+                            sleep=lambda _: None)
+
+
+WORDS = ["Region", "Tier", "Score", "Email", "Phone", "Renewal", "Owner", "Budget", "Segment", "Status",
+         "Partner", "Channel"]
+TYPES = [FieldType.STRING, FieldType.PICKLIST, FieldType.DECIMAL, FieldType.DATE]
+
+
+def account_fields(platform, n):
+    """Standard account fields plus n generated custom fields in the platform's naming style."""
+    if platform == "salesforce":
+        names = ["Id", "Name", "Phone", "Website", "Industry", "BillingCity", "OwnerId", "Description"]
+        custom = [f"{WORDS[i % 12]}_{WORDS[(i // 12) % 12]}_{i}__c" for i in range(n)]
+    else:
+        names = ["accountid", "name", "telephone1", "websiteurl", "industrycode", "address1_city",
+                 "ownerid", "description"]
+        custom = [f"new_{WORDS[(i * 5) % 12].lower()}{WORDS[(i // 12) % 12].lower()}{i}" for i in range(n)]
+    return [
+        FieldMetadata(name=name, label=name.replace("_", " ").replace("__c", "").title(),
+                      field_type=TYPES[i % 4], platform=platform, entity="account")
+        for i, name in enumerate(names + custom)
+    ]
+
+
+class TestMappingProposals:
+    """Test cases for index-pruned mapping proposals."""
+
+    def proposals(self, discovery):
+        """Generated proposals as (comparable tuple, alternatives) pairs."""
+        return [
+            ((p.source_field.name, p.target_field.name if p.target_field else None, round(p.confidence, 9),
+              sorted(p.reasoning)), [(name, round(score, 9)) for name, score in p.alternatives])
+            for p in discovery.generate_mapping_proposals("salesforce", "dynamics365")
+        ]
+
+    def test_pruned_matches_exhaustive(self, tmp_path, discovery, monkeypatch):
+        """Test that pruned similarity proposes what scoring every field proposes."""
+        discovery.schemas["salesforce"] = {"account": account_fields("salesforce", 400)}
+        discovery.schemas["dynamics365"] = {"account": account_fields("dynamics365", 400)}
+        pruned = self.proposals(discovery)
+
+        monkeypatch.setattr(SchemaDiscovery, "CANDIDATE_LIMIT", None)
+        exhaustive = self.proposals(discovery)
+
+        # Best matches agree; alternatives are drawn from the pruned
+        # candidates, so a weak tail alternative may be missing
+        assert [match for match, _ in pruned] == [match for match, _ in exhaustive]
+        for (_, alternatives), (_, all_alternatives) in zip(pruned, exhaustive):
+            assert set(alternatives) <= set(all_alternatives)
+        assert ("BillingCity", "address1_city") == pruned[5][0][:2]
+
+
+def audit_state(discovery):
+    """Queue, approved mappings and history as comparable values."""
+    return json.dumps([[p.to_dict() for p in discovery.audit_queue],
+                       {k: v.to_dict() for k, v in discovery.approved_mappings.items()},
+                       [r.timestamp for r in discovery.discovery_history]])
+
+
+class TestDiscoveryPersistence:
+    """Test cases for sharded schemas and the journaled audit queue."""
+
+    @pytest.fixture
+    def proposed(self, discovery):
+        """A discovery with schema shards saved and proposals queued."""
+        discovery.schemas["salesforce"] = {"account": account_fields("salesforce", 30)}
+        discovery.schemas["dynamics365"] = {"account": account_fields("dynamics365", 30)}
+        discovery._save_state()
+        discovery.generate_mapping_proposals("salesforce", "dynamics365")
+        return discovery
+
+    def test_schemas_load_lazily(self, tmp_path, discovery):
+        """Test that a reloaded schema reads each entity shard on first access."""
+        discovery.discover_salesforce(StubSalesforce(), use_cache=False)
+
+        reloaded = SchemaDiscovery(storage_path=str(tmp_path))
+        shards = reloaded.schemas["salesforce"]
+
+        assert list(shards) == list(discovery.schemas["salesforce"])
+        assert shards.loaded == {}
+        assert [f.name for f in shards["account"]] == ["AccountField"]
+        assert list(shards.loaded) == ["account"]
+        assert field_names(reloaded, "salesforce") == field_names(discovery, "salesforce")
+
+    def test_rediscovery_writes_changed_shards(self, discovery, monkeypatch):
+        """Test that only shards whose content changed are rewritten."""
+        client = StubSalesforce()
+        discovery.discover_salesforce(client, use_cache=False)
+        client.objects["Lead"].append("Rating")
+        written = []
+        write_atomic = discovery_store._write_atomic
+        monkeypatch.setattr(discovery_store, "_write_atomic",
+                            lambda path, text: (written.append(path.name), write_atomic(path, text)))
+
+        discovery.discover_salesforce(client, use_cache=False)
+
+        assert len(written) == 2
+        assert written[0].startswith("lead-") and written[1] == "index.json"
+
+    def test_audit_decisions_are_journaled(self, tmp_path, proposed):
+        """Test that decisions append to the journal and survive a reload."""
+        snapshot = (tmp_path / "audit_state.json").read_bytes()
+        pending = proposed.get_audit_queue()
+
+        proposed.approve_proposal(pending[0].id, reviewer="ana")
+        proposed.reject_proposal(pending[0].id)
+        proposed.modify_proposal(pending[0].id, "name", notes="fixed")
+        proposed.bulk_approve(min_confidence=0.5)
+
+        assert (tmp_path / "audit_state.json").read_bytes() == snapshot
+        assert audit_state(SchemaDiscovery(storage_path=str(tmp_path))) == audit_state(proposed)
+
+    def test_long_journal_is_snapshotted(self, tmp_path, proposed, monkeypatch):
+        """Test that the journal is folded into a snapshot once it is long."""
+        monkeypatch.setattr(SchemaDiscovery, "SNAPSHOT_EVERY", 5)
+        for p in list(proposed.audit_queue)[:4]:
+            proposed.approve_proposal(p.id)
+
+        assert len((tmp_path / "audit.journal").read_text().splitlines()) < 5
+        assert audit_state(SchemaDiscovery(storage_path=str(tmp_path))) == audit_state(proposed)
+
+    def test_legacy_state_is_migrated(self, tmp_path, proposed):
+        """Test that a single-file discovery_state.json is split into shards."""
+        (tmp_path / "legacy").mkdir()
+        legacy = tmp_path / "legacy" / "discovery_state.json"
+        legacy.write_text(json.dumps({
+            "version": "1.0",
+            "schemas": {"salesforce": {"account": [f.to_dict() for f in account_fields("salesforce", 3)]}},
+            "audit_queue": [p.to_dict() for p in proposed.audit_queue],
+            "approved_mappings": {},
+            "discovery_history": []
+        }))
+
+        migrated = SchemaDiscovery(storage_path=str(legacy.parent))
+        reloaded = SchemaDiscovery(storage_path=str(legacy.parent))
+
+        assert not legacy.exists()
+        assert len(reloaded.schemas["salesforce"]["account"]) == 11
+        assert audit_state(reloaded) == audit_state(migrated)
+        assert len(reloaded.audit_queue) == len(proposed.audit_queue)
@@ -0,0 +1,195 @@
+"""Tests for the streaming import and export paths."""
+
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pytest
+from neuai_crm.models.schemas import Platform
+from neuai_crm.services.data_mesh import DataMesh
+from neuai_crm.services.streaming import (
+    gzip_chunks,
+    iter_export_records,
+    iter_json_export,
+    iter_ndjson_export,
+    iter_ndjson_records,
+)
+
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+def _stream(document, chunk_size=7, entity=None):
+    """Stream a JSON document through a deliberately tiny buffer."""
+    fp = io.BytesIO(json.dumps(document).encode("utf-8"))
+    return list(iter_export_records(fp, entity=entity, chunk_size=chunk_size))
+
+
+class TestJsonStreamReader:
+    """Test incremental JSON parsing."""
+
+    def test_object_of_entity_arrays(self):
+        """Test that records are yielded with their entity key across chunk boundaries."""
+        document = {
+            "Account": [{"Id": "001", "Name": "Acme \"Corp\" [HQ]", "Amount": 123456789}],
+            "Contact": [{"Id": "003", "Email": "j@acme.com"}, {"Id": "004", "Tags": [1, 2.5]}],
+            "Empty": []
+        }
+
+        records = _stream(document)
+
+        assert records == [
+            ("Account", document["Account"][0]),
+            ("Contact", document["Contact"][0]),
+            ("Contact", document["Contact"][1]),
+        ]
+
+    def test_metadata_members_are_skipped(self):
+        """Test that non-array members such as OData context are ignored."""
+        document = {"@odata.context": "https://org/api/data/v9.2/$metadata", "contact": [{"contactid": "c1"}]}
+
+        assert _stream(document) == [("contact", {"contactid": "c1"})]
+
+    def test_top_level_array_uses_record_type(self):
+        """Test that untyped arrays fall back to embedded record types."""
+        document = [
+            {"attributes": {"type": "Contact"}, "Id": "003"},
+            {"@odata.type": "#Microsoft.Dynamics.CRM.account", "accountid": "a1"},
+            {"id": "x"}
+        ]
+
+        keys = [key for key, _ in _stream(document)]
+
+        assert keys == ["Contact", "account", None]
+        assert [key for key, _ in _stream(document[2:], entity="contacts")] == ["contacts"]
+
+    def test_invalid_json_raises(self):
+        """Test that malformed input raises JSONDecodeError."""
+        fp = io.BytesIO(b'{"Contact": [{"Id": "003"},, ]}')
+
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_export_records(fp, chunk_size=4))
+
+    def test_ndjson(self):
+        """Test newline-delimited parsing with blank lines."""
+        fp = io.BytesIO(b'{"attributes": {"type": "Contact"}, "Id": "1"}\n\n{"Id": "2"}\n')
+
+        records = list(iter_ndjson_records(fp, entity=None))
+
+        assert records == [
+            ("Contact", {"attributes": {"type": "Contact"}, "Id": "1"}),
+            (None, {"Id": "2"}),
+        ]
+
+
+class TestStreamingLoad:
+    """Test DataMesh.load_from_file in streaming mode."""
+
+    @pytest.mark.parametrize("platform, filename", [
+        (Platform.SALESFORCE, "salesforce-data.json"),
+        (Platform.DYNAMICS365, "dynamics-data.json"),
+        (Platform.LOCAL, "local-data.json"),
+    ])
+    def test_matches_json_load(self, platform, filename):
+        """Test that streaming produces the same mesh data as json.load."""
+        eager, streamed = DataMesh(), DataMesh()
+
+        eager.load_from_file(platform, str(EXAMPLES / filename))
+        result = streamed.load_from_file(platform, str(EXAMPLES / filename), stream=True, batch_size=2)
+
+        assert streamed.data[platform] == eager.data[platform]
+        assert result["records_loaded"] == sum(len(v) for v in eager.data[platform].values())
+        assert result["batches"] >= 2
+
+    def test_ndjson_file_with_progress(self, tmp_path):
+        """Test that NDJSON files stream automatically and report progress."""
+        path = tmp_path / "export.ndjson"
+        lines = [{"attributes": {"type": "Contact"}, "Id": f"003-{i}"} for i in range(10)]
+        lines.append({"attributes": {"type": "Lead"}, "Id": "00Q-1"})
+        path.write_text("\n".join(json.dumps(line) for line in lines))
+        updates = []
+
+        mesh = DataMesh()
+        result = mesh.load_from_file(Platform.SALESFORCE, str(path), batch_size=4, progress=updates.append)
+
+        assert result["records_loaded"] == 10
+        assert result["records_skipped"] == 1
+        assert len(mesh.data[Platform.SALESFORCE]["contacts"]) == 10
+        assert [u["records_loaded"] for u in updates] == [4, 8, 10]
+        assert updates[-1]["percent"] == 100.0
+
+    def test_alias_precedence(self, tmp_path):
+        """Test that the platform key wins over its alias, as in _normalize_import."""
+        path = tmp_path / "export.json"
+        path.write_text(json.dumps({
+            "contacts": [{"Id": "alias"}],
+            "Contact": [{"Id": "primary"}]
+        }))
+
+        mesh = DataMesh()
+        mesh.load_from_file(Platform.SALESFORCE, str(path), stream=True)
+
+        assert mesh.data[Platform.SALESFORCE]["contacts"] == [{"Id": "primary"}]
+
+
+class TestStreamingExport:
+    """Test the chunked export writers and DataMesh.save_to_file."""
+
+    ENTITIES = [
+        ("Account", [{"Id": "001", "Name": "Acme \u00e9", "attributes": {"type": "Account"}}]),
+        ("Contact", [{"Id": f"003-{i}", "Amount": i * 1.5} for i in range(5)]),
+        ("Task", [])
+    ]
+
+    @pytest.mark.parametrize("pretty", [False, True])
+    @pytest.mark.parametrize("batch_size", [1, 2, 1000])
+    def test_json_export_matches_json_dumps(self, pretty, batch_size):
+        """Test that chunked JSON parses to the same export object."""
+        chunks = list(iter_json_export(self.ENTITIES, batch_size=batch_size, pretty=pretty))
+
+        assert json.loads(b"".join(chunks)) == dict(self.ENTITIES)
+        if batch_size == 1:
+            assert len(chunks) > len(self.ENTITIES) + 2
+
+    def test_ndjson_export_marks_untyped_records(self):
+        """Test that NDJSON lines re-import under their export key."""
+        lines = b"".join(iter_ndjson_export(self.ENTITIES, batch_size=2))
+
+        records = list(iter_ndjson_records(io.BytesIO(lines)))
+
+        assert [key for key, _ in records] == ["Account"] + ["Contact"] * 5
+        assert b'"_entity":"Contact"' in lines
+        assert records[1][1] == {"Id": "003-0", "Amount": 0.0}
+
+    @pytest.mark.parametrize("export", [iter_json_export, iter_ndjson_export])
+    def test_export_counts_records_as_yielded(self, export):
+        """Test that on_records counts each chunk's records before the chunk is yielded."""
+        counts = []
+        chunks = export(self.ENTITIES, batch_size=2, on_records=counts.append)
+
+        next(chunks)
+        assert sum(counts) <= 2
+        list(chunks)
+        assert counts == [1, 2, 2, 1]
+
+    def test_gzip_chunks(self):
+        """Test that compressed chunks form one gzip stream."""
+        chunks = list(iter_json_export(self.ENTITIES, batch_size=1))
+
+        assert gzip.decompress(b"".join(gzip_chunks(chunks))) == b"".join(chunks)
+
+    @pytest.mark.parametrize("storage", DataMesh.STORAGE_BACKENDS)
+    @pytest.mark.parametrize("filename", ["export.json", "export.ndjson"])
+    def test_save_to_file_round_trip(self, tmp_path, storage, filename):
+        """Test that saved files load back into the same records."""
+        mesh = DataMesh(storage=storage)
+        mesh.load_from_file(Platform.SALESFORCE, str(EXAMPLES / "salesforce-data.json"))
+        path = str(tmp_path / filename)
+
+        result = mesh.save_to_file(Platform.SALESFORCE, path)
+        restored = DataMesh()
+        restored.load_from_file(Platform.SALESFORCE, path)
+
+        assert result["records"] == sum(mesh.get_stats()["salesforce"].values())
+        assert restored.export_to_platform(Platform.SALESFORCE) == mesh.export_to_platform(Platform.SALESFORCE)
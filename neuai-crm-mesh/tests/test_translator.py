@@ -1,7 +1,8 @@
 """Tests for the schema translator service."""
 
 import pytest
-from neuai_crm.models.schemas import Platform
+from neuai_crm.models.entities import Activity, Company, Contact, Deal
+from neuai_crm.models.schemas import Platform, SCHEMA_MAPPINGS
 from neuai_crm.services.translator import SchemaTranslator
 
 
@@ -206,3 +207,92 @@ class TestStageTranslation:
 
             assert result["StageName"] == expected_sf_stage, \
                 f"Expected {expected_sf_stage} but got {result['StageName']}"
+
+
+class TestTranslationPlans:
+    """Test that compiled translation plans match the entity classes."""
+
+    ENTITY_CLASSES = {
+        "contacts": Contact,
+        "companies": Company,
+        "deals": Deal,
+        "activities": Activity
+    }
+
+    def _samples(self, entity, platform):
+        """Full, empty and edge-case records for an entity on a platform."""
+        fields = SCHEMA_MAPPINGS["fields"][entity][platform.value]
+        full = {field: f"{field}-value" for field in fields}
+        samples = [full, {}, {fields[0]: "only-id"}]
+
+        if entity == "deals":
+            full.update({fields[2]: 1000, fields[6]: 50})
+            stage_field = fields[3]
+            for stages in SCHEMA_MAPPINGS["stages"].values():
+                for stage in stages + ["Unknown Stage"]:
+                    samples.append({fields[0]: "d", fields[2]: "12.5", fields[6]: 40,
+                                    stage_field: stage})
+            samples.append({stage_field: ["unhashable"]})
+        elif entity == "activities":
+            status_field = fields[5]
+            values = [v for statuses in SCHEMA_MAPPINGS["status"].values() for v in statuses]
+            for status in values + ["unknown"]:
+                samples.append({fields[0]: "a", status_field: status})
+            samples.append({fields[6]: "", fields[7]: "deal-1"})
+        return samples
+
+    @pytest.mark.parametrize("entity", ["contacts", "companies", "deals", "activities"])
+    def test_plans_match_entity_classes(self, translator, entity):
+        """Test every platform pair against from_platform/to_platform."""
+        entity_class = self.ENTITY_CLASSES[entity]
+        for source in Platform:
+            for target in Platform:
+                for record in self._samples(entity, source):
+                    expected = entity_class.from_platform(record, source).to_platform(target)
+                    result = translator.translate_entity(record, source, target, entity)
+                    assert result == expected, (source, target, record)
+                    assert list(result) == list(expected)
+
+    def test_plan_is_cached(self, translator):
+        """Test that a plan is compiled once per (entity, from, to)."""
+        plan = translator.get_plan("contacts", Platform.SALESFORCE, Platform.LOCAL)
+
+        assert translator.get_plan("contacts", Platform.SALESFORCE, Platform.LOCAL) is plan
+        assert translator.get_plan("contacts", Platform.LOCAL, Platform.SALESFORCE) is not plan
+
+    def test_invalid_amount_raises(self, translator):
+        """Test that coercion errors surface as they do for the entity classes."""
+        with pytest.raises(ValueError):
+            translator.translate_entity(
+                {"Amount": "lots"}, Platform.SALESFORCE, Platform.LOCAL, "deals"
+            )
+
+    @pytest.mark.parametrize("entity_type,platform,field", [
+        ("accounts", Platform.SALESFORCE, "accountid"),
+        ("opportunities", Platform.SALESFORCE, "opportunityid"),
+        ("tasks", Platform.SALESFORCE, "activityid"),
+        ("Account", Platform.SALESFORCE, "accountid")
+    ])
+    def test_mesh_entity_names(self, translator, entity_type, platform, field):
+        """Test that data mesh entity keys resolve to their entity type."""
+        result = translator.translate_entity(
+            {"Id": "x-1"}, platform, Platform.DYNAMICS365, entity_type
+        )
+        assert result[field] == "x-1"
+
+    def test_translate_batch(self, translator):
+        """Test that batches translate record by record."""
+        records = [{"Id": str(i), "Email": f"u{i}@example.com"} for i in range(3)]
+
+        result = translator.translate_batch(
+            records, Platform.SALESFORCE, Platform.DYNAMICS365, "contacts"
+        )
+
+        assert [r["emailaddress1"] for r in result] == [r["Email"] for r in records]
+
+    def test_unknown_entity_falls_back(self, translator):
+        """Test that entities without a typed plan use generic translation."""
+        result = translator.translate_entity(
+            {"Id": "1"}, Platform.SALESFORCE, Platform.LOCAL, "Campaign"
+        )
+        assert result == {}
@@ -17,8 +17,13 @@ import os
 import sys
 import json
 import time
+import copy
 import tempfile
 import shutil
+import socket
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from datetime import datetime
 from typing import Tuple, List, Dict, Any
@@ -109,6 +114,7 @@ class TestSuite:
         self.config.memory_file = self.config.data_dir / "memories.json"
         self.config.context_file = self.config.data_dir / "context.json"
         self.config.config_file = self.config.data_dir / "config.json"
+        self.config.user_guid = "test-user"
 
         if self.verbose:
             print(f"\n📁 Test directory: {self.temp_dir}")
@@ -303,6 +309,202 @@ def test_memory_clear(suite: TestSuite) -> Tuple[bool, str]:
     return True, "Memories cleared successfully"
 
 
+def test_memory_ranked_recall(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that keyword recall ranks by relevance within the requested subjects."""
+    memory = MemoryManager(suite.config, subject_id="ranking-test")
+
+    memory.store_memory("User drinks coffee every morning", "fact")
+    best = memory.store_memory("Coffee order: oat milk coffee, no sugar", "preference")
+    memory.store_memory("User lives in Seattle", "fact")
+    memory.store_memory("Coffee budget approved", "fact", subjects=["other-subject"])
+
+    results = memory.recall_memories(keywords=["coffee"])
+    if [m["id"] for m in results][:1] != [best]:
+        return False, f"Expected the two-mention memory first, got {[m['content'] for m in results]}"
+    if len(results) != 2:
+        return False, f"Expected 2 matches in subject, got {len(results)}"
+
+    typed = memory.recall_memories(keywords=["coffee", "seattle"], memory_type="fact")
+    if sorted(m["content"] for m in typed) != ["User drinks coffee every morning", "User lives in Seattle"]:
+        return False, f"Type filter returned {[m['content'] for m in typed]}"
+
+    both = memory.recall_memories(keywords=["budget"], subjects=["ranking-test", "other-subject"])
+    if len(both) != 1:
+        return False, f"Expected 1 match across subjects, got {len(both)}"
+
+    # Keywords inside longer words still match, after whole-word matches
+    memory.store_memory("User preferences: python3 over java", "preference")
+    memory.store_memory("Prefer short answers", "preference")
+    partial = [m["content"] for m in memory.recall_memories(keywords=["prefer"])]
+    if partial != ["Prefer short answers", "User preferences: python3 over java"]:
+        return False, f"Substring recall returned {partial}"
+    if len(memory.recall_memories(keywords=["python"])) != 1 or len(memory.recall_memories(keywords=["eatt"])) != 1:
+        return False, "Partial words not recalled"
+    if memory.recall_memories(keywords=["!!", " "]):
+        return False, "Keywords without words matched"
+
+    return True, "Keyword recall ranked and filtered"
+
+
+def test_memory_index_updates(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that duplicate detection and recall follow store, link, unlink and reload."""
+    memory = MemoryManager(suite.config, subject_id="index-test")
+
+    first = memory.store_memory("Prefers email over phone", "preference")
+    second = memory.store_memory("Timezone is UTC+2", "fact")
+    if memory.find_duplicate_content("  prefers EMAIL over phone ") != first:
+        return False, "Duplicate content not found"
+
+    mem_id, was_new = memory.store_or_link_memory("Prefers email over phone", subjects=["team"])
+    if mem_id != first or was_new:
+        return False, "Duplicate was stored instead of linked"
+    if [m["id"] for m in memory.recall_memories(keywords=["email"], subjects=["team"])] != [first]:
+        return False, "Linked memory not recalled for new subject"
+
+    newest = [m["id"] for m in memory.recall_memories()]
+    if newest != [second, first]:
+        return False, "Recall without keywords is not newest first"
+
+    memory.unlink_memory_from_subject(first, "team")
+    if memory.recall_memories(keywords=["email"], subjects=["team"]):
+        return False, "Unlinked memory still recalled"
+
+    memory.unlink_memory_from_subject(second, "index-test")
+    if memory.find_duplicate_content("Timezone is UTC+2") or memory.recall_memories(keywords=["timezone"]):
+        return False, "Deleted memory still indexed"
+
+    reloaded = MemoryManager(suite.config, subject_id="index-test")
+    if [m["id"] for m in reloaded.recall_memories(keywords=["phone"])] != [first]:
+        return False, "Index not rebuilt on load"
+
+    return True, "Index follows store, link, unlink and reload"
+
+
+def sqlite_config(suite: TestSuite, name: str) -> "Config":
+    """Copy of the suite config using SQLite storage in its own data directory."""
+    config = copy.copy(suite.config)
+    config.data_dir = Path(suite.temp_dir) / name
+    config.data_dir.mkdir(parents=True, exist_ok=True)
+    config.memory_file = config.data_dir / "memories.json"
+    config.context_file = config.data_dir / "context.json"
+    config.database_file = config.data_dir / "neuai.db"
+    config.storage = "sqlite"
+    return config
+
+
+def test_sqlite_memory_storage(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that SQLite storage persists store, link, unlink and clear."""
+    config = sqlite_config(suite, "sqlite-memories")
+    memory = MemoryManager(config)
+
+    kept = memory.store_memory("Works remotely on Fridays", "fact", tags=["schedule"])
+    shared = memory.store_memory("Team standup is at 9am", "fact", subjects=[config.user_guid, "team"])
+    dropped = memory.store_memory("Temporary note", "fact")
+    memory.link_memory_to_subject(kept, "team")
+    memory.unlink_memory_from_subject(dropped, config.user_guid)
+
+    reloaded = MemoryManager(config)
+    if reloaded.data != memory.data:
+        return False, "Reloaded data differs from what was written"
+    if reloaded.get_memory_by_id(kept)["tags"] != ["schedule"]:
+        return False, "Memory fields not persisted"
+    if reloaded.get_memory_by_id(dropped):
+        return False, "Memory with no subjects was not deleted"
+
+    reloaded.clear_memories()
+    again = MemoryManager(config)
+    if again.recall_memories() or [m["id"] for m in again.recall_memories(subjects=["team"])] != [shared, kept]:
+        return False, "Clear did not keep only the other subject's memories"
+    if config.memory_file.exists():
+        return False, "SQLite storage wrote the JSON file"
+
+    return True, "Store, link, unlink and clear persisted"
+
+
+def test_sqlite_migration(suite: TestSuite) -> Tuple[bool, str]:
+    """Test the one-shot import of JSON memories and context into SQLite."""
+    config = sqlite_config(suite, "sqlite-migration")
+    json_config = copy.copy(config)
+    json_config.storage = "json"
+
+    old = MemoryManager(json_config)
+    first = old.store_memory("Prefers tea", "preference", subjects=[config.user_guid, "family"])
+    second = old.store_memory("Lives in Oslo", "fact")
+    conv = ConversationManager(json_config)
+    conv.add_message("user", "Hello")
+    conv.add_message("assistant", "Hi!")
+
+    memory = MemoryManager(config)
+    if memory.data != old.data:
+        return False, "Migrated memories differ from the JSON file"
+    if ConversationManager(config).get_messages() != conv.get_messages():
+        return False, "Conversation context not migrated"
+
+    # The import runs once: deletions in SQLite are not undone by the JSON file
+    memory.unlink_memory_from_subject(second, config.user_guid)
+    if MemoryManager(config).get_memory_by_id(second):
+        return False, "JSON memories were imported again"
+
+    return True, f"Migrated memories ({first[:8]}...) and context once"
+
+
+def test_sqlite_shared_across_processes(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that a memory stored by another process is seen without reopening."""
+    config = sqlite_config(suite, "sqlite-shared")
+    memory = MemoryManager(config)
+    memory.store_memory("Stored by the CLI", "fact")
+
+    script = (
+        "import sys\n"
+        "from importlib.machinery import SourceFileLoader\n"
+        "from pathlib import Path\n"
+        "neuai = SourceFileLoader('neuai_cli', sys.argv[1]).load_module()\n"
+        "config = neuai.Config.__new__(neuai.Config)\n"
+        "config.data_dir = Path(sys.argv[2])\n"
+        "config.memory_file = config.data_dir / 'memories.json'\n"
+        "config.database_file = config.data_dir / 'neuai.db'\n"
+        "config.storage = 'sqlite'\n"
+        "config.user_guid = sys.argv[3]\n"
+        "neuai.MemoryManager(config).store_memory('Stored by the bridge', 'fact')\n"
+    )
+    subprocess.run([sys.executable, "-c", script, neuai_path, str(config.data_dir), config.user_guid],
+                   check=True, timeout=60)
+
+    contents = [m["content"] for m in memory.recall_memories()]
+    if contents != ["Stored by the bridge", "Stored by the CLI"]:
+        return False, f"Expected both processes' memories, got {contents}"
+    if memory.find_duplicate_content("stored by the bridge") is None:
+        return False, "Index not refreshed after the other process wrote"
+
+    return True, "Memories shared across processes"
+
+
+def test_sqlite_conversation(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that SQLite context keeps tool messages and the newest max_history."""
+    config = sqlite_config(suite, "sqlite-context")
+    conv = ConversationManager(config)
+    conv.max_history = 5
+
+    conv.add_message("user", "What time is it?")
+    conv.add_assistant_with_tools(None, [{"id": "call_1", "type": "function",
+                                          "function": {"name": "DateTime", "arguments": "{}"}}])
+    conv.add_tool_result("call_1", "12:00")
+    for i in range(4):
+        conv.add_message("assistant", f"Reply {i}")
+
+    reloaded = ConversationManager(config)
+    if reloaded.get_messages() != conv.get_messages()[-5:]:
+        return False, "Reloaded context is not the newest messages"
+    if reloaded.get_messages()[0].get("role") != "tool":
+        return False, "Tool result was not persisted"
+
+    reloaded.clear()
+    if ConversationManager(config).get_messages():
+        return False, "Context not cleared"
+
+    return True, "Context persisted per message and trimmed"
+
+
 def test_conversation_manager(suite: TestSuite) -> Tuple[bool, str]:
     """Test conversation history management."""
     conv = ConversationManager(suite.config)
@@ -346,6 +548,432 @@ def test_conversation_persistence(suite: TestSuite) -> Tuple[bool, str]:
     return True, "Conversation persists correctly"
 
 
+class MockAzureServer:
+    """Local stand-in for the Azure chat completions endpoint.
+
+    Replies to each POST with the next scripted response: a list of chunks
+    sent as server-sent events (chunked, delay seconds apart) when the
+    request asks to stream, a JSON body otherwise, or an error for a
+    (status, headers) tuple. Request payloads are recorded in requests.
+
+    Each new connection costs connect_delay seconds, standing in for the
+    TCP and TLS handshakes; with drop_idle the server closes connections
+    after every response without announcing it, as idle keep-alive
+    connections get dropped.
+    """
+
+    def __init__(self, responses: List[Any], delay: float = 0.0, connect_delay: float = 0.0,
+                 drop_idle: bool = False):
+        self.responses = list(responses)
+        self.delay = delay
+        self.connect_delay = connect_delay
+        self.drop_idle = drop_idle
+        self.requests: List[Dict] = []
+        self.connections = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                # Send each event as written, as a real SSE endpoint does
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                server.connections += 1
+                time.sleep(server.connect_delay)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                payload = json.loads(body)
+                server.requests.append(payload)
+                response = server.responses.pop(0)
+                self.close_connection = server.drop_idle
+                if isinstance(response, dict) and "slow" in response:
+                    time.sleep(response["slow"])
+                    response = response["response"]
+                if isinstance(response, tuple):
+                    status, headers = response
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", "2")
+                    self.end_headers()
+                    self.wfile.write(b"{}")
+                    return
+                if not payload.get("stream"):
+                    data = json.dumps(response).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for chunk in response:
+                    event = chunk if isinstance(chunk, str) else f"data: {json.dumps(chunk)}\n\n"
+                    data = event.encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                    time.sleep(server.delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05},
+                                       daemon=True)
+
+    def __enter__(self) -> "MockAzureServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def stream_chunks(content: List[str] = (), tool_calls: List[Dict] = (), finish: str = "stop") -> List[Any]:
+    """SSE events for a streamed completion, shaped like Azure's."""
+    events: List[Any] = [{"choices": [], "prompt_filter_results": [{"prompt_index": 0}]}, ": keep-alive\n\n"]
+    for delta in tool_calls:
+        events.append({"choices": [{"index": 0, "delta": {"tool_calls": [delta]}, "finish_reason": None}]})
+    for piece in content:
+        events.append({"choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+    events.append({"choices": [{"index": 0, "delta": {}, "finish_reason": finish}]})
+    events.append("data: [DONE]\n\n")
+    return events
+
+
+def slow(seconds: float, response: Any) -> Dict:
+    """A mock server response sent only after seconds."""
+    return {"slow": seconds, "response": response}
+
+
+def mock_config(suite: TestSuite, name: str, endpoint: str) -> "Config":
+    """Copy of the suite config pointing at a mock endpoint, with its own data directory."""
+    config = copy.copy(suite.config)
+    config.endpoint = endpoint
+    config.api_key = "test-key"
+    config.deployment = "test-deployment"
+    config.data_dir = Path(suite.temp_dir) / name
+    config.data_dir.mkdir(parents=True, exist_ok=True)
+    config.memory_file = config.data_dir / "memories.json"
+    config.context_file = config.data_dir / "context.json"
+    return config
+
+
+def test_sse_parsing(suite: TestSuite) -> Tuple[bool, str]:
+    """Test SSE parsing and assembly of content and tool call deltas."""
+    lines = [
+        b": keep-alive\n", b"\n",
+        b'data: {"choices": [{"index": 0, "delta": {"content": "Hel"}}]}\n', b"\n",
+        b'data: {"choices": [{"index": 0, "delta": {"tool_calls": [{"index": 1, "id": "b",\n',
+        b'data: "function": {"name": "datetime", "arguments": "{}"}}]}}]}\n', b"\n",
+        b'data: {"choices": [{"index": 0, "delta": {"content": "lo", "tool_calls": '
+        b'[{"index": 0, "id": "a", "function": {"name": "calc", "arguments": "{\\"x\\": 1"}}]}}]}\r\n', b"\r\n",
+        b'data: {"choices": [{"index": 0, "delta": {"tool_calls": [{"index": 0, "function": {"arguments": "}"}}]}, '
+        b'"finish_reason": "tool_calls"}]}\n', b"\n",
+        b"data: [DONE]\n", b"\n",
+        b'data: {"choices": [{"index": 0, "delta": {"content": "ignored"}}]}\n', b"\n",
+    ]
+    completion = neuai.StreamedCompletion()
+    texts = [completion.add(chunk) for chunk in neuai.iter_sse_events(lines)]
+    message = completion.result()["choices"][0]["message"]
+
+    if texts != ["Hel", "", "lo", ""] or message["content"] != "Hello":
+        return False, f"Content assembled wrong: {texts}"
+    calls = [(c["id"], c["function"]["name"], c["function"]["arguments"]) for c in message["tool_calls"]]
+    if calls != [("a", "calc", '{"x": 1}'), ("b", "datetime", "{}")]:
+        return False, f"Tool calls assembled wrong: {calls}"
+    if completion.finish_reason != "tool_calls" or completion.deltas != 4:
+        return False, "Finish reason or delta count wrong"
+
+    try:
+        neuai.StreamedCompletion().add({"error": {"message": "content filtered"}})
+        return False, "Error event not raised"
+    except ValueError:
+        pass
+
+    return True, "Events parsed and deltas assembled"
+
+
+def test_streaming_chat(suite: TestSuite) -> Tuple[bool, str]:
+    """Test a streamed chat turn with a tool call round against a mock Azure endpoint."""
+    delay = 0.05
+    tool_deltas = [
+        {"index": 0, "id": "call_1", "type": "function", "function": {"name": "calculator", "arguments": ""}},
+        {"index": 0, "function": {"arguments": '{"expr'}},
+        {"index": 0, "function": {"arguments": 'ession": "2 + 2"}'}},
+    ]
+    answer = ["2", " +", " 2", " =", " 4"]
+    with MockAzureServer([stream_chunks(tool_calls=tool_deltas, finish="tool_calls"),
+                          stream_chunks(content=answer)], delay=delay) as server:
+        assistant = NeuAIAssistant(mock_config(suite, "streaming", server.endpoint))
+        arrivals = []
+        response = assistant.chat("What is 2 + 2?", on_token=lambda text: arrivals.append((time.perf_counter(), text)))
+
+    if response != "2 + 2 = 4" or "".join(text for _, text in arrivals) != response:
+        return False, f"Streamed text mismatch: {response!r}"
+    if not all(request.get("stream") for request in server.requests):
+        return False, "Requests did not ask to stream"
+    tool_messages = [m for m in server.requests[1]["messages"] if m.get("role") == "tool"]
+    if not tool_messages or tool_messages[0]["content"] != "Result: 4":
+        return False, f"Tool call not assembled and executed: {tool_messages}"
+    # Tokens are rendered as they arrive, not all at once at the end
+    if arrivals[-1][0] - arrivals[0][0] < delay * (len(answer) - 1) * 0.8:
+        return False, "Tokens were not rendered incrementally"
+
+    stats = assistant.last_turn_stats
+    if stats["requests"] != 2 or stats["ttft"] is None or not stats["ttft"] < stats["duration"]:
+        return False, f"Unexpected turn stats: {stats}"
+    if not stats["tokens_per_second"]:
+        return False, "Tokens per second not reported"
+
+    return True, f"TTFT {stats['ttft'] * 1000:.0f}ms, {stats['tokens_per_second']:.0f} tok/s over 2 requests"
+
+
+def test_non_streaming_chat(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that chat without on_token still makes one blocking request."""
+    reply = {"choices": [{"index": 0, "message": {"role": "assistant", "content": "Hi!"}, "finish_reason": "stop"}]}
+    with MockAzureServer([reply]) as server:
+        assistant = NeuAIAssistant(mock_config(suite, "non-streaming", server.endpoint))
+        response = assistant.chat("Hello")
+
+    if response != "Hi!" or server.requests[0].get("stream"):
+        return False, f"Unexpected response {response!r}"
+    if assistant.last_turn_stats is not None:
+        return False, "Stream stats set for a blocking request"
+
+    return True, "Blocking request unchanged"
+
+
+def reply(content: str) -> Dict:
+    """A non-streaming chat completion response."""
+    return {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]}
+
+
+def test_connection_reuse(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that turns share one pooled connection and skip the per-connection cost."""
+    turns, connect_delay = 4, 0.05
+    timings = {}
+    for name, pool in (("pooled", neuai.ConnectionPool()), ("unpooled", neuai.ConnectionPool(max_idle_per_host=0))):
+        with MockAzureServer([stream_chunks(content=["ok"]) for _ in range(turns)],
+                             connect_delay=connect_delay) as server:
+            assistant = NeuAIAssistant(mock_config(suite, f"reuse-{name}", server.endpoint))
+            assistant.client = neuai.AzureOpenAIClient(assistant.config, pool=pool)
+            started = time.perf_counter()
+            for i in range(turns):
+                assistant.chat(f"Turn {i}", on_token=lambda text: None)
+            timings[name] = (time.perf_counter() - started, server.connections, assistant.client.connection_stats())
+
+    pooled_time, pooled_connections, stats = timings["pooled"]
+    unpooled_time, unpooled_connections, _ = timings["unpooled"]
+    if pooled_connections != 1 or unpooled_connections != turns:
+        return False, f"Expected 1 and {turns} connections, got {pooled_connections} and {unpooled_connections}"
+    if stats["connections_reused"] != turns - 1 or stats["requests"] != turns or "latency_ms" not in stats:
+        return False, f"Unexpected connection stats: {stats}"
+    if unpooled_time - pooled_time < (turns - 1) * connect_delay * 0.8:
+        return False, f"Pooling saved too little: {pooled_time:.3f}s vs {unpooled_time:.3f}s"
+
+    return True, f"{turns} turns: {pooled_time * 1000:.0f}ms pooled vs {unpooled_time * 1000:.0f}ms unpooled"
+
+
+def test_reconnect_and_retry_after(suite: TestSuite) -> Tuple[bool, str]:
+    """Test reconnecting after a dropped idle connection and honoring Retry-After."""
+    with MockAzureServer([reply("first"), (429, {"Retry-After": "0.3"}), reply("second")],
+                         drop_idle=True) as server:
+        config = mock_config(suite, "reconnect", server.endpoint)
+        client = neuai.AzureOpenAIClient(config, pool=neuai.ConnectionPool())
+        client.chat_completion([{"role": "user", "content": "Hi"}])
+        started = time.perf_counter()
+        second = client.chat_completion([{"role": "user", "content": "Hi again"}])
+        waited = time.perf_counter() - started
+
+    stats = client.connection_stats()
+    if second["choices"][0]["message"]["content"] != "second":
+        return False, "Retried request did not return the final response"
+    if stats["reconnects"] < 1 or stats["retries"] != 1:
+        return False, f"Expected a reconnect and one retry: {stats}"
+    if not 0.3 <= waited < 2:
+        return False, f"Retry-After not honored: waited {waited:.2f}s"
+
+    # A response timeout on a reused connection may have reached the server,
+    # so it is a counted, backed-off retry rather than a free reconnect
+    with MockAzureServer([reply("first"), slow(1.0, reply("late")), reply("second")]) as server:
+        client = neuai.AzureOpenAIClient(mock_config(suite, "timeout", server.endpoint),
+                                         pool=neuai.ConnectionPool(timeout=0.3))
+        client.retry_delay = 0.05
+        client.chat_completion([{"role": "user", "content": "Hi"}])
+        second = client.chat_completion([{"role": "user", "content": "Hi again"}])
+    stats = client.connection_stats()
+    if second["choices"][0]["message"]["content"] != "second" or stats["retries"] != 1 or stats["reconnects"]:
+        return False, f"Response timeout not retried with backoff: {stats}"
+
+    pool = neuai.ConnectionPool(idle_timeout=0.0)
+    with MockAzureServer([reply("a"), reply("b")]) as server:
+        client = neuai.AzureOpenAIClient(mock_config(suite, "evict", server.endpoint), pool=pool)
+        client.chat_completion([{"role": "user", "content": "a"}])
+        client.chat_completion([{"role": "user", "content": "b"}])
+    if pool.stats()["connections_evicted"] != 1:
+        return False, "Idle connection not evicted"
+
+    return True, f"Reconnected and waited {waited:.2f}s for Retry-After"
+
+
+def test_bridge_multi_turn_latency(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that bridge multi_turn_chat pays the connection cost only on its first turn."""
+    bridge_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "neuai-agent-bridge.py")
+    bridge_module = SourceFileLoader("neuai_agent_bridge", bridge_path).load_module()
+
+    connect_delay = 0.1
+    with MockAzureServer([reply(f"Answer {i}") for i in range(3)], connect_delay=connect_delay) as server:
+        bridge = bridge_module.NeuAIBridge.__new__(bridge_module.NeuAIBridge)
+        bridge.config = mock_config(suite, "bridge", server.endpoint)
+        bridge._assistant = None
+        result = bridge.multi_turn_chat(["One", "Two", "Three"])
+
+    if not result["success"]:
+        return False, f"multi_turn_chat failed: {result.get('error')}"
+    latencies = [turn["latency_ms"] for turn in result["conversation"]]
+    if result["connections"]["connections_opened"] != 1 or server.connections != 1:
+        return False, f"Expected one connection: {result['connections']}"
+    if max(latencies[1:]) > latencies[0] - connect_delay * 1000 / 2:
+        return False, f"Later turns not faster: {latencies}"
+
+    return True, f"Per-turn latency {latencies} ms"
+
+
+class SleepAgent(neuai.BasicAgent):
+    """Tool that takes a while, for concurrency and timeout tests."""
+
+    def __init__(self, name: str, seconds: float, timeout: float = 30.0):
+        super().__init__(name, "Sleeps, then reports its name")
+        self.seconds = seconds
+        self.timeout = timeout
+
+    def perform(self, **kwargs) -> str:
+        time.sleep(self.seconds)
+        return f"{self.name} done"
+
+
+def test_concurrent_tool_calls(suite: TestSuite) -> Tuple[bool, str]:
+    """Test that a turn's tool calls run concurrently and slow tools time out."""
+    seconds = 0.3
+    names = ["slow_a", "slow_b", "slow_c", "stuck"]
+    tool_deltas = [
+        {"index": i, "id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": "{}"}}
+        for i, name in enumerate(names)
+    ]
+    with MockAzureServer([stream_chunks(tool_calls=tool_deltas, finish="tool_calls"),
+                          stream_chunks(content=["Done"])]) as server:
+        assistant = NeuAIAssistant(mock_config(suite, "tools", server.endpoint))
+        for name in names[:3]:
+            assistant.agents[name] = SleepAgent(name, seconds)
+        assistant.agents["stuck"] = SleepAgent("stuck", 2.0, timeout=0.2)
+        started = time.perf_counter()
+        assistant.chat("Run the slow tools", on_token=lambda text: None)
+        elapsed = time.perf_counter() - started
+
+    results = [m["content"] for m in server.requests[1]["messages"] if m.get("role") == "tool"]
+    if results[:3] != ["slow_a done", "slow_b done", "slow_c done"]:
+        return False, f"Results missing or out of order: {results}"
+    if "timed out" not in results[3]:
+        return False, f"Stuck tool did not time out: {results[3]}"
+    if elapsed >= seconds * 2:
+        return False, f"Tools ran serially: {elapsed:.2f}s for 3 x {seconds}s"
+
+    # Memory tools blocked on a held memory lock give up at their deadline
+    # and free their workers, even with more calls than workers
+    recalls = [{"id": f"r{i}", "function": {"name": "recall_memory", "arguments": "{}"}} for i in range(6)]
+    assistant.agents["recall_memory"].timeout = 0.2
+    assistant.agents["calculator"].timeout = 0.5
+    sums = [{"id": f"s{i}", "function": {"name": "calculator", "arguments": '{"expression": "1+1"}'}}
+            for i in range(4)]
+    with assistant.memory._lock:
+        held = threading.Thread(target=lambda: results.extend(
+            r["result"] for r in assistant._handle_tool_calls(recalls)))
+        held.start()
+        held.join(2)
+        time.sleep(0.05)
+        free = [r["result"] for r in assistant._handle_tool_calls(sums)]
+    if held.is_alive() or not all("busy" in r or "timed out" in r for r in results[4:]):
+        return False, f"Memory tools did not give up on the held lock: {results[4:]}"
+    if any("Error" in r for r in free):
+        return False, f"Workers still held after memory tools timed out: {free}"
+
+    return True, f"3 x {seconds}s tools and a timeout in {elapsed:.2f}s"
+
+
+def test_context_budget(suite: TestSuite) -> Tuple[bool, str]:
+    """Test budgeted context assembly: ranked memories, trimmed history, cached counts."""
+    calls = []
+
+    def words(text: str) -> int:
+        calls.append(text)
+        return len(text.split())
+
+    memory = MemoryManager(suite.config, subject_id="context-test")
+    memory.store_memory("Allergic to peanuts", "fact")
+    for i in range(100):
+        memory.store_memory(f"Note number {i} about general things", "fact")
+    if len(memory.format_memories_for_context().splitlines()) != 21:
+        return False, "format_memories_for_context did not keep 20 memories"
+
+    history = []
+    for i in range(60):
+        history += [
+            {"role": "user", "content": f"Question {i} " + "word " * 20},
+            {"role": "assistant", "content": "", "tool_calls": [
+                {"id": f"c{i}", "type": "function", "function": {"name": "calculator", "arguments": '{"expression": "1+1"}'}}
+            ]},
+            {"role": "tool", "tool_call_id": f"c{i}", "content": "Result: 2"},
+            {"role": "assistant", "content": f"Answer {i} " + "word " * 30},
+        ]
+
+    builder = neuai.ContextBuilder(memory, budget=600, tokenizer=words)
+    full = sum(builder.count_message(m) for m in [{"role": "system", "content": "You are NeuAI."}] + history)
+    for budget in range(300, 1200, 37):
+        builder.budget = budget
+        messages = builder.build("You are NeuAI.", history, "Can I eat peanuts?")
+        tokens = sum(builder.count_message(m) for m in messages)
+        if tokens != builder.last_stats["tokens"] or tokens > budget:
+            return False, f"Budget {budget} exceeded or miscounted: {tokens}"
+        kept = messages[2:-1]
+        if kept and (kept[0]["role"] == "tool" or kept[-1] is not history[-1]):
+            return False, f"History cut badly at budget {budget}"
+        if "peanuts" not in messages[1]["content"].split("\n")[2]:
+            return False, "Relevant memory not ranked first"
+
+    counted = len(calls)
+    builder.build("You are NeuAI.", history, "Can I eat peanuts?")
+    if len(calls) != counted:
+        return False, "Token counts were not cached"
+
+    # After tool calls the question stays, and oversized tool results are cut
+    turn = history + [
+        {"role": "user", "content": "Summarize the report"},
+        {"role": "assistant", "content": "", "tool_calls": [
+            {"id": "big", "type": "function", "function": {"name": "web_search", "arguments": '{"query": "report"}'}}
+        ]},
+        {"role": "tool", "tool_call_id": "big", "content": "finding " * 2000},
+    ]
+    builder.budget = 300
+    messages = builder.build("You are NeuAI.", turn, None)
+    if [m["role"] for m in messages[-3:]] != ["user", "assistant", "tool"] or messages[-3] is not turn[-3]:
+        return False, "Current question dropped after tool calls"
+    if builder.last_stats["truncated"] != 1 or sum(builder.count_message(m) for m in messages) > 300:
+        return False, "Oversized tool result not truncated to the budget"
+    if turn[-1]["content"] != "finding " * 2000:
+        return False, "Truncation modified the conversation history"
+
+    return True, f"Prompt {builder.last_stats['tokens']} tokens within budget vs {full} for full history"
+
+
 def test_calculator_agent(suite: TestSuite) -> Tuple[bool, str]:
     """Test calculator agent."""
     calc = CalculatorAgent()
@@ -531,12 +1159,35 @@ def run_tests(verbose: bool = False, quick: bool = False):
         suite.run_test("Memory Storage", lambda: test_memory_storage(suite))
         suite.run_test("Memory Recall", lambda: test_memory_recall(suite))
         suite.run_test("Memory Clear", lambda: test_memory_clear(suite))
+        suite.run_test("Memory Ranked Recall", lambda: test_memory_ranked_recall(suite))
+        suite.run_test("Memory Index Updates", lambda: test_memory_index_updates(suite))
 
         # Conversation Tests
         print("\n📝 Conversation Tests")
         suite.run_test("Conversation Manager", lambda: test_conversation_manager(suite))
         suite.run_test("Conversation Persistence", lambda: test_conversation_persistence(suite))
 
+        # Storage Tests
+        print("\n🗄️  Storage Tests")
+        suite.run_test("SQLite Memory Storage", lambda: test_sqlite_memory_storage(suite))
+        suite.run_test("SQLite Migration", lambda: test_sqlite_migration(suite))
+        suite.run_test("SQLite Shared Across Processes", lambda: test_sqlite_shared_across_processes(suite))
+        suite.run_test("SQLite Conversation", lambda: test_sqlite_conversation(suite))
+
+        # Streaming and Connection Tests (local mock endpoint)
+        print("\n📡 Streaming and Connection Tests")
+        suite.run_test("SSE Parsing", lambda: test_sse_parsing(suite))
+        suite.run_test("Streaming Chat", lambda: test_streaming_chat(suite))
+        suite.run_test("Non-Streaming Chat", lambda: test_non_streaming_chat(suite))
+        suite.run_test("Connection Reuse", lambda: test_connection_reuse(suite))
+        suite.run_test("Reconnect and Retry-After", lambda: test_reconnect_and_retry_after(suite))
+        suite.run_test("Bridge Multi-Turn Latency", lambda: test_bridge_multi_turn_latency(suite))
+
+        # Assistant Tests (local mock endpoint)
+        print("\n🧩 Assistant Tests")
+        suite.run_test("Concurrent Tool Calls", lambda: test_concurrent_tool_calls(suite))
+        suite.run_test("Context Budget", lambda: test_context_budget(suite))
+
         # Agent Tests
         print("\n🤖 Agent Tests")
         suite.run_test("Calculator Agent", lambda: test_calculator_agent(suite))